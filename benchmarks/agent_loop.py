@@ -0,0 +1,320 @@
+"""
+Agent loop throughput and latency benchmark.
+
+Runs ``OmniCoreAgent`` end to end against a deterministic mock LLM (see
+``mock_llm.py``) and a ``lookup`` tool served either locally or by a stdio
+MCP server (see ``mock_mcp_server.py``), for every memory and event backend
+given. For each backend pair it reports:
+
+- throughput: steps (LLM calls) per second for sequential sessions
+- phases: time per step spent in response parsing, memory store calls, tool
+  execution, event appends and the LLM call; "other" is the rest of the
+  agent loop (prompt building, bookkeeping). Nested phases are not counted
+  twice: memory writes made by the tool executor count as memory, not tool.
+- memory: Python heap retained per finished session (tracemalloc)
+- concurrency: steps per second and run latency for concurrent sessions
+
+Backends that need a server are run when it is configured (REDIS_URL,
+MONGODB_URI, DATABASE_URL) and reported as skipped otherwise; "database"
+falls back to a temporary SQLite file.
+
+Prints JSON so results can be tracked over time.
+
+Usage:
+    python benchmarks/agent_loop.py [--tools local|mcp] [--steps N]
+        [--sessions N] [--concurrency 1 8 32] [--llm-latency-ms MS]
+        [--tool-latency-ms MS] [--payload-bytes N]
+        [--memory-backends in_memory database redis mongodb]
+        [--event-backends in_memory redis_stream]
+"""
+
+import argparse
+import asyncio
+import contextvars
+import functools
+import gc
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+
+from mock_llm import bench_query, install_mock_llm, mock_llm_client
+from mock_mcp_server import payload
+
+from omnicoreagent import EventRouter, MemoryRouter, OmniCoreAgent, ToolRegistry
+from omnicoreagent.core.tools.tools_handler import ToolExecutor
+
+PHASES = ("parse", "memory", "tool", "event", "llm")
+
+# Memory and event backends and the setting each one needs
+BACKEND_SETTINGS = {
+    "database": "DATABASE_URL",
+    "redis": "REDIS_URL",
+    "mongodb": "MONGODB_URI",
+    "redis_stream": "REDIS_URL",
+}
+
+
+class PhaseProfiler:
+    """
+    Accumulates exclusive wall time per phase of wrapped coroutine functions.
+
+    Time spent in a wrapped call is subtracted from the wrapped call it is
+    nested in when both run in the same task; calls in background tasks
+    (event appends) are timed on their own.
+    """
+
+    def __init__(self):
+        self.totals = defaultdict(float)
+        self.counts = defaultdict(int)
+        self._frame = contextvars.ContextVar("bench_phase_frame", default=None)
+
+    def wrap(self, phase: str, func):
+        @functools.wraps(func)
+        async def timed(*args, **kwargs):
+            task = asyncio.current_task()
+            parent = self._frame.get()
+            frame = [task, 0.0]
+            token = self._frame.set(frame)
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                self._frame.reset(token)
+                self.totals[phase] += elapsed - frame[1]
+                self.counts[phase] += 1
+                if parent is not None and parent[0] is task:
+                    parent[1] += elapsed
+
+        return timed
+
+    def reset(self):
+        self.totals.clear()
+        self.counts.clear()
+
+
+def local_tools(payload_bytes: int, latency: float) -> ToolRegistry:
+    registry = ToolRegistry()
+
+    @registry.register_tool(name="lookup", description="Look up a key")
+    async def lookup(key: str) -> str:
+        if latency:
+            await asyncio.sleep(latency)
+        return payload(key, payload_bytes)
+
+    return registry
+
+
+def p95(values: list[float]) -> float:
+    """95th percentile, interpolated; a single sample is its own p95"""
+    if len(values) < 2:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[94]
+
+
+def backend_missing(name: str):
+    setting = BACKEND_SETTINGS.get(name)
+    if setting and not os.environ.get(setting):
+        return f"{setting} is not set"
+    return None
+
+
+async def build_agent(args, memory_backend: str, event_backend: str, profiler):
+    kwargs = {}
+    if args.tools == "mcp":
+        kwargs["mcp_tools"] = [
+            {
+                "name": "bench",
+                "transport_type": "stdio",
+                "command": sys.executable,
+                "args": [str(Path(__file__).with_name("mock_mcp_server.py"))],
+                "env": {
+                    "BENCH_MCP_PAYLOAD_BYTES": str(args.payload_bytes),
+                    "BENCH_MCP_LATENCY": str(args.tool_latency_ms / 1000),
+                },
+            }
+        ]
+    else:
+        kwargs["local_tools"] = local_tools(
+            args.payload_bytes, args.tool_latency_ms / 1000
+        )
+
+    agent = OmniCoreAgent(
+        name="bench",
+        system_instruction="You are a benchmark agent.",
+        model_config={"provider": "openai", "model": "gpt-4o-mini", "api_key": "bench"},
+        agent_config={
+            "max_steps": args.steps + 5,
+            "tool_call_timeout": 60,
+            "max_sessions": 1_000_000,
+        },
+        memory_router=MemoryRouter(memory_store_type=memory_backend),
+        event_router=EventRouter(event_store_type=event_backend),
+        **kwargs,
+    )
+    await agent.connect_mcp_servers()
+    agent.llm_connection.client = mock_llm_client()
+
+    connection = agent.llm_connection
+    connection.llm_call = profiler.wrap("llm", connection.llm_call)
+    agent.agent.extract_action_or_answer = profiler.wrap(
+        "parse", agent.agent.extract_action_or_answer
+    )
+    router = agent.memory_router
+    router.store_message = profiler.wrap("memory", router.store_message)
+    router.get_messages = profiler.wrap("memory", router.get_messages)
+    agent.event_router.append = profiler.wrap("event", agent.event_router.append)
+    return agent
+
+
+async def run_session(agent, steps: int, queries: int, session_id: str) -> float:
+    start = time.perf_counter()
+    for query in range(queries):
+        result = await agent.run(bench_query(steps, f"#{query}"), session_id=session_id)
+        if not str(result["response"]).startswith("Finished"):
+            raise RuntimeError(f"Unexpected agent response: {result['response']}")
+    return time.perf_counter() - start
+
+
+async def measure_sequential(agent, profiler, args) -> dict:
+    await run_session(agent, args.steps, 1, "warmup")
+    profiler.reset()
+
+    start = time.perf_counter()
+    for i in range(args.sessions):
+        await run_session(agent, args.steps, args.queries, f"seq-{i}")
+    wall = time.perf_counter() - start
+    # Let background event appends finish before reading the totals.
+    await asyncio.sleep(0.05)
+
+    steps = profiler.counts["llm"]
+    phases = {phase: profiler.totals[phase] * 1000 / steps for phase in PHASES}
+    phases["other"] = max(wall * 1000 / steps - sum(phases.values()), 0.0)
+    return {
+        "steps": steps,
+        "steps_per_sec": steps / wall,
+        "step_ms": wall * 1000 / steps,
+        "overhead_ms": wall * 1000 / steps - phases["llm"],
+        "phases_ms": phases,
+    }
+
+
+async def measure_memory(agent, args) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for i in range(args.memory_sessions):
+            await run_session(agent, args.steps, args.queries, f"mem-{i}")
+        await asyncio.sleep(0.05)
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return {
+        "sessions": args.memory_sessions,
+        "bytes_per_session": (after - before) / args.memory_sessions,
+    }
+
+
+async def measure_concurrency(agent, profiler, args) -> dict:
+    results = {}
+    for concurrency in args.concurrency:
+        profiler.reset()
+        start = time.perf_counter()
+        latencies = await asyncio.gather(
+            *(
+                run_session(agent, args.steps, args.queries, f"c{concurrency}-{i}")
+                for i in range(concurrency)
+            )
+        )
+        wall = time.perf_counter() - start
+        results[str(concurrency)] = {
+            "steps_per_sec": profiler.counts["llm"] / wall,
+            "p50_ms": statistics.median(latencies) * 1000,
+            "p95_ms": p95(latencies) * 1000,
+        }
+    return results
+
+
+async def measure_backends(args, memory_backend: str, event_backend: str) -> dict:
+    profiler = PhaseProfiler()
+    agent = await build_agent(args, memory_backend, event_backend, profiler)
+    execute = ToolExecutor.execute
+    ToolExecutor.execute = profiler.wrap("tool", execute)
+    try:
+        return {
+            "memory_store": type(agent.memory_router.memory_store).__name__,
+            "sequential": await measure_sequential(agent, profiler, args),
+            "memory": await measure_memory(agent, args),
+            "concurrency": await measure_concurrency(agent, profiler, args),
+        }
+    finally:
+        ToolExecutor.execute = execute
+        await agent.cleanup()
+
+
+async def run(args) -> dict:
+    install_mock_llm(latency=args.llm_latency_ms / 1000, tools=["lookup"])
+    results = {}
+    for memory_backend in args.memory_backends:
+        for event_backend in args.event_backends:
+            name = f"{memory_backend}+{event_backend}"
+            missing = backend_missing(memory_backend) or backend_missing(event_backend)
+            if missing:
+                results[name] = {"skipped": missing}
+                continue
+            results[name] = await measure_backends(args, memory_backend, event_backend)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tools", choices=["local", "mcp"], default="local")
+    parser.add_argument("--steps", type=int, default=4, help="Tool calls per query")
+    parser.add_argument("--queries", type=int, default=2, help="Queries per session")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--memory-sessions", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--llm-latency-ms", type=float, default=0)
+    parser.add_argument("--tool-latency-ms", type=float, default=0)
+    parser.add_argument("--payload-bytes", type=int, default=256)
+    parser.add_argument(
+        "--memory-backends",
+        nargs="+",
+        default=["in_memory", "database", "redis", "mongodb"],
+    )
+    parser.add_argument(
+        "--event-backends", nargs="+", default=["in_memory", "redis_stream"]
+    )
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    # The mock provider ignores the key, but the agent requires one.
+    os.environ.setdefault("LLM_API_KEY", "bench")
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.setdefault("DATABASE_URL", f"sqlite:///{Path(tmp) / 'bench.db'}")
+        results = asyncio.run(run(args))
+
+    config = {
+        key: value
+        for key, value in vars(args).items()
+        if key not in ("memory_backends", "event_backends")
+    }
+    print(
+        json.dumps(
+            {"benchmark": "agent_loop", "config": config, "results": results},
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
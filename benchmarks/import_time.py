@@ -0,0 +1,61 @@
+"""
+Import-time benchmark.
+
+Measures cold-start import cost of the public entry points in fresh
+interpreters and prints the results as JSON so they can be tracked over time.
+
+Usage:
+    python benchmarks/import_time.py [--repeat N]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+TARGETS = {
+    "omnicoreagent": "import omnicoreagent",
+    "OmniCoreAgent": "from omnicoreagent import OmniCoreAgent",
+    "MemoryRouter": "from omnicoreagent import MemoryRouter",
+    "MCPClient": "from omnicoreagent import MCPClient",
+    "BackgroundAgentManager": "from omnicoreagent import BackgroundAgentManager",
+}
+
+SCRIPT = """
+import time
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+
+def measure(statement: str, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", SCRIPT.format(statement=statement)],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        samples.append(float(result.stdout.strip().splitlines()[-1]))
+    return {
+        "min_s": min(samples),
+        "median_s": statistics.median(samples),
+        "max_s": max(samples),
+        "samples": len(samples),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = {name: measure(stmt, args.repeat) for name, stmt in TARGETS.items()}
+    print(json.dumps({"benchmark": "import_time", "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
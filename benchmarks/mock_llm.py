@@ -0,0 +1,98 @@
+"""
+Deterministic LiteLLM provider for the benchmarks.
+
+``MockReactLLM`` is registered with LiteLLM as the ``mock`` provider, so
+requests go through the real LiteLLM call path. It plays a scripted ReAct
+agent: for a query containing ``BENCH steps=N`` it answers with N tool calls,
+one per step, and then a final answer. Each response takes ``latency``
+seconds.
+"""
+
+import asyncio
+import json
+import re
+import time
+
+from omnicoreagent.core.llm_client import LLMClient, get_litellm
+
+QUERY_PATTERN = re.compile(r"BENCH steps=(\d+)")
+
+
+def bench_query(steps: int, label: str = "") -> str:
+    """User query that makes the mock LLM call ``steps`` tools"""
+    return f"BENCH steps={steps} {label}".strip()
+
+
+def scripted_response(messages: list, tools: list) -> str:
+    """The next ReAct response for a conversation"""
+    steps = 0
+    tool_calls = 0
+    for message in messages:
+        content = message.get("content") or ""
+        if message.get("role") == "user":
+            match = QUERY_PATTERN.search(content)
+            if match:
+                steps = int(match.group(1))
+                tool_calls = 0
+        elif message.get("role") == "assistant" and "<tool_call>" in content:
+            tool_calls += 1
+
+    if tool_calls < steps:
+        tool = tools[tool_calls % len(tools)]
+        args = json.dumps({"key": f"item-{tool_calls}"})
+        return (
+            f"<thought>Step {tool_calls + 1} of {steps}: calling {tool}.</thought>\n"
+            f"<tool_call><tool_name>{tool}</tool_name>"
+            f"<parameters>{args}</parameters></tool_call>"
+        )
+    return (
+        f"<thought>All {steps} steps are done.</thought>\n"
+        f"<final_answer>Finished {steps} steps.</final_answer>"
+    )
+
+
+def _make_handler(latency: float, tools: list):
+    from litellm import CustomLLM
+    from litellm.types.utils import Usage
+
+    class MockReactLLM(CustomLLM):
+        def _respond(self, messages, model_response):
+            text = scripted_response(messages, tools)
+            prompt_tokens = sum(len(str(m.get("content") or "")) for m in messages) // 4
+            completion_tokens = len(text) // 4
+            model_response.choices[0].message.content = text
+            model_response.usage = Usage(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=prompt_tokens + completion_tokens,
+            )
+            return model_response
+
+        def completion(self, model, messages, *args, **kwargs):
+            if latency:
+                time.sleep(latency)
+            return self._respond(messages, kwargs["model_response"])
+
+        async def acompletion(self, model, messages, *args, **kwargs):
+            if latency:
+                await asyncio.sleep(latency)
+            return self._respond(messages, kwargs["model_response"])
+
+    return MockReactLLM()
+
+
+def install_mock_llm(latency: float = 0.0, tools: list = ("lookup",)) -> None:
+    """Register the ``mock`` provider with LiteLLM"""
+    litellm = get_litellm()
+    litellm.custom_provider_map = [
+        {"provider": "mock", "custom_handler": _make_handler(latency, list(tools))}
+    ]
+    # custom_provider_map is read when LiteLLM's providers are set up
+    from litellm.utils import custom_llm_setup
+
+    custom_llm_setup()
+
+
+def mock_llm_client() -> LLMClient:
+    """Client that sends requests to the mock provider"""
+    return LLMClient(provider="mock", model="mock/react", api_key="bench")
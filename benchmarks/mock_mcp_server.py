@@ -0,0 +1,39 @@
+"""
+Stand-in MCP server for the benchmarks, served over stdio.
+
+Exposes the same ``lookup`` tool as the benchmarks' local tool: it returns a
+deterministic payload of ``BENCH_MCP_PAYLOAD_BYTES`` bytes after sleeping
+``BENCH_MCP_LATENCY`` seconds.
+
+Usage:
+    python benchmarks/mock_mcp_server.py
+"""
+
+import asyncio
+import os
+
+from mcp.server.fastmcp import FastMCP
+
+
+def payload(key: str, size: int) -> str:
+    """Deterministic tool output of about ``size`` bytes"""
+    line = f"{key}: value\n"
+    return (line * (size // len(line) + 1))[:size]
+
+
+PAYLOAD_BYTES = int(os.environ.get("BENCH_MCP_PAYLOAD_BYTES", "256"))
+LATENCY = float(os.environ.get("BENCH_MCP_LATENCY", "0"))
+
+server = FastMCP("bench")
+
+
+@server.tool()
+async def lookup(key: str) -> str:
+    """Look up a key and return its record"""
+    if LATENCY:
+        await asyncio.sleep(LATENCY)
+    return payload(key, PAYLOAD_BYTES)
+
+
+if __name__ == "__main__":
+    server.run("stdio")
@@ -0,0 +1,92 @@
+"""
+Working-memory benchmark.
+
+Measures the per-step cost of the agent loop's message handling for
+conversations of different lengths, comparing the Pydantic ``Message`` model
+with the slotted ``AgentMessage``:
+
+- load: turning stored history dicts into working-memory messages
+- step: appending an assistant reply and an observation, then building the
+  request parameters for the next LLM call (the whole conversation is
+  serialized on every call)
+
+Prints JSON so results can be tracked over time.
+
+Usage:
+    python benchmarks/working_memory.py [--sizes 50 500 5000] [--steps N]
+"""
+
+import argparse
+import json
+import time
+
+from omnicoreagent.core.llm_client import LLMClient
+from omnicoreagent.core.types import AgentMessage, Message
+
+
+def make_history(size: int) -> list:
+    history = [{"role": "system", "content": "You are a helpful agent. " * 50}]
+    for i in range(size - 1):
+        if i % 2:
+            history.append(
+                {
+                    "role": "assistant",
+                    "content": f"Thought: step {i}. Calling a tool.",
+                    "metadata": {"agent_name": "bench"},
+                }
+            )
+        else:
+            history.append(
+                {
+                    "role": "user",
+                    "content": f"<observations><observation>{'result ' * 20}"
+                    f"</observation></observations> #{i}",
+                }
+            )
+    return history
+
+
+def load(message_type, history: list) -> list:
+    if message_type is Message:
+        return [Message.model_validate(dict(msg)) for msg in history]
+    return [AgentMessage.from_message(msg) for msg in history]
+
+
+def measure(message_type, size: int, steps: int) -> dict:
+    history = make_history(size)
+    client = LLMClient(provider="openai", model="gpt-4o-mini", api_key="bench")
+
+    start = time.perf_counter()
+    messages = load(message_type, history)
+    load_s = time.perf_counter() - start
+
+    client.request_params(messages)
+    start = time.perf_counter()
+    for step in range(steps):
+        messages.append(message_type(role="assistant", content=f"Action {step}"))
+        messages.append(
+            message_type(role="user", content=f"<observations>{step}</observations>")
+        )
+        client.request_params(messages)
+    step_s = (time.perf_counter() - start) / steps
+
+    return {"load_ms": load_s * 1000, "step_ms": step_s * 1000}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--steps", type=int, default=20)
+    args = parser.parse_args()
+
+    results = {}
+    for size in args.sizes:
+        results[str(size)] = {
+            "Message": measure(Message, size, args.steps),
+            "AgentMessage": measure(AgentMessage, size, args.steps),
+        }
+    print(json.dumps({"benchmark": "working_memory", "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,30 +2,69 @@
 OmniCoreAgent AI Framework
 
 A comprehensive AI agent framework with MCP client capabilities.
+
+Public names are loaded lazily on first access so that ``import omnicoreagent``
+does not pay for LLM, MCP, database or scheduler dependencies it never uses.
 """
 
-from .core.agents import ReactAgent
-from .core.memory_store import MemoryRouter
-from .core.llm import LLMConnection
-from .core.events import EventRouter
-from .core.database import DatabaseMessageStore
-from .core.tools import ToolRegistry, Tool
-from .core.utils import logger
-
-from .omni_agent.agent import OmniCoreAgent, OmniAgent
-from .omni_agent.background_agent import (
-    BackgroundOmniCoreAgent,
-    BackgroundAgentManager,
-    TaskRegistry,
-    APSchedulerBackend,
-    BackgroundTaskScheduler,
-)
-
-from .mcp_clients_connection import MCPClient, Configuration
-
-from .omni_agent.workflow.parallel_agent import ParallelAgent
-from .omni_agent.workflow.sequential_agent import SequentialAgent
-from .omni_agent.workflow.router_agent import RouterAgent
+from typing import TYPE_CHECKING
+
+from .core.lazy_imports import lazy_module_attrs
+
+if TYPE_CHECKING:
+    from .core.agents import ReactAgent
+    from .core.memory_store import MemoryRouter
+    from .core.llm import LLMConnection
+    from .core.events import EventRouter
+    from .core.database import DatabaseMessageStore
+    from .core.tools import ToolRegistry, Tool
+    from .core.utils import logger
+
+    from .omni_agent.agent import OmniCoreAgent, OmniAgent
+    from .omni_agent.agent_pool import AgentPool
+    from .omni_agent.background_agent import (
+        BackgroundOmniCoreAgent,
+        BackgroundAgentManager,
+        TaskRegistry,
+        APSchedulerBackend,
+        BackgroundTaskScheduler,
+        DistributedSchedulerBackend,
+    )
+
+    from .mcp_clients_connection import MCPClient, Configuration
+
+    from .omni_agent.workflow.parallel_agent import ParallelAgent
+    from .omni_agent.workflow.sequential_agent import SequentialAgent
+    from .omni_agent.workflow.router_agent import RouterAgent
+    from .omni_agent.workflow.graph_agent import GraphAgent
+
+_LAZY_IMPORTS = {
+    "ReactAgent": ".core.agents",
+    "MemoryRouter": ".core.memory_store",
+    "LLMConnection": ".core.llm",
+    "EventRouter": ".core.events",
+    "DatabaseMessageStore": ".core.database",
+    "ToolRegistry": ".core.tools",
+    "Tool": ".core.tools",
+    "logger": ".core.utils",
+    "OmniCoreAgent": ".omni_agent.agent",
+    "OmniAgent": ".omni_agent.agent",
+    "AgentPool": ".omni_agent.agent_pool",
+    "BackgroundOmniCoreAgent": ".omni_agent.background_agent",
+    "BackgroundAgentManager": ".omni_agent.background_agent",
+    "TaskRegistry": ".omni_agent.background_agent",
+    "APSchedulerBackend": ".omni_agent.background_agent",
+    "BackgroundTaskScheduler": ".omni_agent.background_agent",
+    "DistributedSchedulerBackend": ".omni_agent.background_agent",
+    "ParallelAgent": ".omni_agent.workflow.parallel_agent",
+    "SequentialAgent": ".omni_agent.workflow.sequential_agent",
+    "RouterAgent": ".omni_agent.workflow.router_agent",
+    "GraphAgent": ".omni_agent.workflow.graph_agent",
+    "MCPClient": ".mcp_clients_connection",
+    "Configuration": ".mcp_clients_connection",
+}
+
+__getattr__, __dir__ = lazy_module_attrs(__name__, _LAZY_IMPORTS)
 
 __all__ = [
     "ReactAgent",
@@ -38,14 +77,17 @@ __all__ = [
     "logger",
     "OmniCoreAgent",
     "OmniAgent",
+    "AgentPool",
     "BackgroundOmniCoreAgent",
     "BackgroundAgentManager",
     "TaskRegistry",
     "APSchedulerBackend",
     "BackgroundTaskScheduler",
+    "DistributedSchedulerBackend",
     "ParallelAgent",
     "SequentialAgent",
     "RouterAgent",
+    "GraphAgent",
     "MCPClient",
     "Configuration",
 ]
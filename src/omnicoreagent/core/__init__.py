@@ -9,21 +9,51 @@ This package contains the core AI agent functionality including:
 - Database Layer
 - Tools Management
 - Utilities and Constants
+
+Components are imported lazily on first attribute access.
 """
 
-from .agents import ReactAgent
-from .memory_store import MemoryRouter
-from .llm import LLMConnection
-from .events import EventRouter
-from .database import DatabaseMessageStore
-from .tools import ToolRegistry, Tool
-from .types import AgentConfig, ParsedResponse, ToolCall
-from .token_usage import UsageLimits, Usage, UsageLimitExceeded
+from typing import TYPE_CHECKING
+
+from .lazy_imports import lazy_module_attrs
+
+if TYPE_CHECKING:
+    from .agents import ReactAgent
+    from .memory_store import MemoryRouter
+    from .llm import LLMConnection
+    from .llm_client import LLMClient
+    from .events import EventRouter
+    from .database import DatabaseMessageStore
+    from .tools import ToolRegistry, Tool
+    from .types import AgentConfig, ParsedResponse, ToolCall
+    from .token_usage import UsageLimits, Usage, UsageLimitExceeded
+    from .usage_ledger import UsageLedger
+
+_LAZY_IMPORTS = {
+    "ReactAgent": ".agents",
+    "MemoryRouter": ".memory_store",
+    "LLMConnection": ".llm",
+    "LLMClient": ".llm_client",
+    "EventRouter": ".events",
+    "DatabaseMessageStore": ".database",
+    "ToolRegistry": ".tools",
+    "Tool": ".tools",
+    "AgentConfig": ".types",
+    "ParsedResponse": ".types",
+    "ToolCall": ".types",
+    "UsageLimits": ".token_usage",
+    "Usage": ".token_usage",
+    "UsageLimitExceeded": ".token_usage",
+    "UsageLedger": ".usage_ledger",
+}
+
+__getattr__, __dir__ = lazy_module_attrs(__name__, _LAZY_IMPORTS)
 
 __all__ = [
     "ReactAgent",
     "MemoryRouter",
     "LLMConnection",
+    "LLMClient",
     "EventRouter",
     "DatabaseMessageStore",
     "ToolRegistry",
@@ -34,4 +64,5 @@ __all__ = [
     "UsageLimits",
     "Usage",
     "UsageLimitExceeded",
+    "UsageLedger",
 ]
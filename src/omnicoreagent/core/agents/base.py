@@ -5,7 +5,7 @@ import json
 import re
 import uuid
 from collections.abc import Callable
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from contextlib import asynccontextmanager
 from typing import Any, Tuple, List, Dict
 from omnicoreagent.core.system_prompts import (
@@ -19,8 +19,11 @@ from omnicoreagent.core.token_usage import (
     Usage,
     UsageLimitExceeded,
     UsageLimits,
-    session_stats,
-    usage,
+)
+from omnicoreagent.core.usage_ledger import (
+    UsageLedger,
+    get_default_usage_ledger,
+    make_usage_key,
 )
 from omnicoreagent.core.tools.tools_handler import (
     LocalToolHandler,
@@ -28,8 +31,8 @@ from omnicoreagent.core.tools.tools_handler import (
     ToolExecutor,
 )
 from omnicoreagent.core.types import (
+    AgentMessage,
     AgentState,
-    Message,
     ParsedResponse,
     ToolCall,
     ToolCallMetadata,
@@ -74,11 +77,27 @@ from omnicoreagent.core.tools.advance_tools_use import (
 from omnicoreagent.core.tools.memory_tool.memory_tool import (
     build_tool_registry_memory_tool,
 )
+from omnicoreagent.core.tools.artifacts import (
+    ToolOutputSpiller,
+    build_tool_registry_artifact_tools,
+    get_artifact_store,
+)
 from omnicoreagent.core.skills.tools import build_skill_tools
+from omnicoreagent.core.tracing import tracer
 
 
 class BaseReactAgent:
-    """Autonomous agent implementing the ReAct paradigm for task solving through iterative reasoning and tool usage."""
+    """Autonomous agent implementing the ReAct paradigm for task solving through iterative reasoning and tool usage.
+
+    Concurrency contract: a single agent instance may serve many sessions
+    concurrently. Runs on different session IDs proceed in parallel; runs on
+    the same session ID are queued and execute one at a time in arrival
+    order. Per-session state is kept for at most ``max_sessions`` sessions
+    (least recently used first) and, when ``session_ttl`` is set, dropped
+    after that many idle seconds. Sessions with a run in progress or queued
+    are never evicted. Conversation history lives in the memory store and is
+    not affected by eviction.
+    """
 
     def __init__(
         self,
@@ -90,6 +109,17 @@ class BaseReactAgent:
         enable_advanced_tool_use: bool = False,
         memory_tool_backend: str = None,
         enable_agent_skills: bool = False,
+        skill_manager: Any = None,
+        max_sessions: int = 1024,
+        session_ttl: float = 0,
+        usage_ledger: UsageLedger | None = None,
+        usage_limit_scope: str = "session",
+        output_guard: Any = None,
+        max_parallel_sub_agents: int = 4,
+        sub_agent_timeout: float = 0,
+        artifact_store: str = None,
+        artifact_threshold_chars: int = 20000,
+        artifact_preview_chars: int = 2000,
     ):
         self.agent_name = agent_name
         self.max_steps = max(max_steps, 5)
@@ -105,19 +135,51 @@ class BaseReactAgent:
         self.enable_advanced_tool_use = enable_advanced_tool_use
 
         self.memory_tool_backend = memory_tool_backend
+        # Tool outputs over artifact_threshold_chars are stored in the
+        # artifact store and replaced by a preview and an artifact handle.
+        self.artifact_store = artifact_store
+        self.artifact_spiller = (
+            ToolOutputSpiller(
+                get_artifact_store(artifact_store),
+                threshold_chars=artifact_threshold_chars,
+                preview_chars=artifact_preview_chars,
+            )
+            if artifact_store
+            else None
+        )
         self.enable_agent_skills = enable_agent_skills
-        self.skill_manager = None
+        self.skill_manager = skill_manager
         self.usage_limits = UsageLimits(
             request_limit=self.request_limit, total_tokens_limit=self.total_tokens_limit
         )
-
-        self._session_states: dict[Tuple[str, str], SessionState] = {}
+        self.usage_ledger = usage_ledger or get_default_usage_ledger()
+        self.usage_limit_scope = usage_limit_scope
+        # Optional PromptInjectionGuard applied to tool and sub-agent outputs
+        # before they are added to the conversation.
+        self.output_guard = output_guard
+
+        # Sub-agent calls from one step run at most this many at a time
+        # (0 = no limit), each for at most sub_agent_timeout seconds (0 = none).
+        self.max_parallel_sub_agents = max_parallel_sub_agents
+        self.sub_agent_timeout = sub_agent_timeout
+        self._connected_sub_agents: dict[int, Any] = {}
+        self._sub_agent_connect_locks: dict[int, asyncio.Lock] = {}
+        self._sub_agents_registry_cache: Tuple[tuple, str] | None = None
+
+        self.max_sessions = max(max_sessions, 1)
+        self.session_ttl = session_ttl
+        self._session_states: OrderedDict[Tuple[str, str], SessionState] = OrderedDict()
+        self._session_last_used: dict[Tuple[str, str], float] = {}
+        self._session_locks: dict[Tuple[str, str], asyncio.Lock] = {}
+        self._session_active_runs: dict[Tuple[str, str], int] = defaultdict(int)
         self.background_task_manager = BackgroundTaskManager()
         self.init_skills()
         self.register_internal_tool = ToolRegistry()
 
     def init_skills(self):
-        if self.enable_agent_skills:
+        # A skill manager handed in by the caller (e.g. a cloned agent) has
+        # already scanned the skills directory.
+        if self.enable_agent_skills and self.skill_manager is None:
             from omnicoreagent.core.skills.manager import SkillManager
 
             self.skill_manager = SkillManager()
@@ -128,16 +190,60 @@ class BaseReactAgent:
 
     def _get_session_state(self, session_id: str, debug: bool) -> SessionState:
         key = (session_id, self.agent_name)
-        if key not in self._session_states:
-            self._session_states[key] = SessionState(
-                messages=[],
-                state=AgentState.IDLE,
-                loop_detector=RobustLoopDetector(debug=debug),
-                assistant_with_tool_calls=None,
-                pending_tool_responses=[],
-            )
+        self._session_last_used[key] = time.monotonic()
+        if key in self._session_states:
+            self._session_states.move_to_end(key)
+            return self._session_states[key]
+
+        self._session_states[key] = SessionState(
+            messages=[],
+            state=AgentState.IDLE,
+            loop_detector=RobustLoopDetector(debug=debug),
+            assistant_with_tool_calls=None,
+            pending_tool_responses=[],
+        )
+        self._evict_session_states(keep=key)
         return self._session_states[key]
 
+    def _evict_session_states(self, keep: Tuple[str, str] | None = None):
+        """Drop idle session states beyond ``max_sessions`` or older than ``session_ttl``"""
+        now = time.monotonic()
+        excess = len(self._session_states) - self.max_sessions
+        for key in list(self._session_states):
+            if key == keep or self._session_active_runs.get(key):
+                continue
+            expired = (
+                self.session_ttl > 0
+                and now - self._session_last_used.get(key, now) > self.session_ttl
+            )
+            if excess > 0 or expired:
+                self._drop_session_state(key)
+                excess -= 1
+            elif self.session_ttl <= 0:
+                break
+
+    def _drop_session_state(self, key: Tuple[str, str]):
+        self._session_states.pop(key, None)
+        self._session_last_used.pop(key, None)
+        self._session_locks.pop(key, None)
+        self._session_active_runs.pop(key, None)
+
+    @asynccontextmanager
+    async def session_lock(self, session_id: str):
+        """Serialize runs on the same session; other sessions are unaffected"""
+        key = (session_id, self.agent_name)
+        lock = self._session_locks.setdefault(key, asyncio.Lock())
+        self._session_active_runs[key] += 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._session_active_runs[key] -= 1
+            if not self._session_active_runs[key]:
+                del self._session_active_runs[key]
+                if key not in self._session_states:
+                    self._session_locks.pop(key, None)
+
     async def extract_action_or_answer(
         self,
         response: str,
@@ -323,8 +429,7 @@ class BaseReactAgent:
             return
 
         validated_messages = [
-            Message.model_validate(msg) if isinstance(msg, dict) else msg
-            for msg in short_term_memory_message_history
+            AgentMessage.from_message(msg) for msg in short_term_memory_message_history
         ]
         session_state = self._get_session_state(session_id=session_id, debug=debug)
         for message in validated_messages:
@@ -335,7 +440,7 @@ class BaseReactAgent:
                 if not message.content.strip().startswith("<observations>"):
                     self._try_flush_pending(session_id=session_id, debug=debug)
                     session_state.messages.append(
-                        Message(role="user", content=message.content)
+                        AgentMessage(role="user", content=message.content)
                     )
 
             elif role == "assistant":
@@ -354,7 +459,7 @@ class BaseReactAgent:
                 else:
                     self._try_flush_pending(session_id=session_id, debug=debug)
                     session_state.messages.append(
-                        Message(role="assistant", content=message.content)
+                        AgentMessage(role="assistant", content=message.content)
                     )
 
             elif role == "tool":
@@ -645,13 +750,14 @@ class BaseReactAgent:
     ):
         session_state = self._get_session_state(session_id=session_id, debug=debug)
 
-        tool_call_result = await self.resolve_tool_call_request(
-            parsed_response=parsed_response,
-            mcp_tools=mcp_tools,
-            sessions=sessions,
-            local_tools=local_tools,
-            sub_agents=sub_agents,
-        )
+        with tracer.span("tool.resolve"):
+            tool_call_result = await self.resolve_tool_call_request(
+                parsed_response=parsed_response,
+                mcp_tools=mcp_tools,
+                sessions=sessions,
+                local_tools=local_tools,
+                sub_agents=sub_agents,
+            )
 
         tools_results = []
         obs_text = None
@@ -688,8 +794,8 @@ class BaseReactAgent:
                     )
                 session_state.loop_detector.record_tool_call(
                     str(tool_name),
-                    str(tool_args),
-                    str(error_message),
+                    tool_args,
+                    error_message,
                 )
 
             combined_tool_name = "_and_".join(
@@ -752,7 +858,9 @@ class BaseReactAgent:
                 metadata=tool_calls_metadata.model_dump(),
                 session_id=session_id,
             )
-            session_state.messages.append(Message(role="assistant", content=response))
+            session_state.messages.append(
+                AgentMessage(role="assistant", content=response)
+            )
 
             tools_results = []
             try:
@@ -765,6 +873,10 @@ class BaseReactAgent:
                         tool_call_id=tool_call_id,
                         add_message_to_history=add_message_to_history,
                         session_id=session_id,
+                        artifact_spiller=self.artifact_spiller,
+                        output_guard=self.guard_outputs
+                        if self.output_guard is not None
+                        else None,
                     )
 
                 observation = await self.parse_tool_observation(tool_output)
@@ -792,8 +904,10 @@ class BaseReactAgent:
                         seen_tools.add(tool_name)
                         session_state.loop_detector.record_tool_call(
                             str(tool_name),
-                            str(args),
-                            str(display_value),
+                            args,
+                            display_value,
+                            input_digest=result.get("input_digest"),
+                            output_digest=result.get("output_digest"),
                         )
 
                     if status == "success":
@@ -846,7 +960,7 @@ class BaseReactAgent:
                 for single_tool in tool_call_result:
                     session_state.loop_detector.record_tool_call(
                         str(single_tool.tool_name),
-                        str(single_tool.tool_args),
+                        single_tool.tool_args,
                         obs_text,
                     )
 
@@ -890,7 +1004,7 @@ class BaseReactAgent:
                 for single_tool in tool_call_result:
                     session_state.loop_detector.record_tool_call(
                         str(single_tool.tool_name),
-                        str(single_tool.tool_args),
+                        single_tool.tool_args,
                         obs_text,
                     )
 
@@ -937,7 +1051,7 @@ class BaseReactAgent:
 
         xml_obs_block = build_xml_observations_block(tools_results)
         session_state.messages.append(
-            Message(
+            AgentMessage(
                 role="user",
                 content=xml_obs_block,
             )
@@ -1010,7 +1124,7 @@ class BaseReactAgent:
                     )
 
                 session_state.messages.append(
-                    Message(role="user", content=loop_message)
+                    AgentMessage(role="user", content=loop_message)
                 )
 
                 if debug:
@@ -1021,9 +1135,43 @@ class BaseReactAgent:
                 session_state.state = AgentState.STUCK
                 session_state.loop_detector.reset(tool_name)
 
+    async def guard_outputs(self, outputs: List[Any]) -> List[str | None]:
+        """
+        Scan tool or sub-agent outputs with the output guard.
+
+        Args:
+            outputs: Raw outputs, in order
+
+        Returns:
+            For each output, a notice to show the LLM instead of it, or None
+            if the output is safe to pass through
+        """
+        texts = [
+            json.dumps(output, separators=(",", ":"))
+            if isinstance(output, (dict, list))
+            else str(output)
+            for output in outputs
+        ]
+        with tracer.span("guardrail.check", target="outputs", outputs=len(texts)):
+            results = await self.output_guard.scan_outputs(texts)
+
+        notices = []
+        for result in results:
+            if result.is_safe:
+                notices.append(None)
+                continue
+            logger.warning(
+                f"Agent {self.agent_name}: output withheld by guardrail: {result.message}"
+            )
+            notices.append(
+                f"[Output withheld by guardrail: {result.message}. "
+                "It may contain instructions intended to manipulate the agent.]"
+            )
+        return notices
+
     async def reset_system_prompt(self, messages: list, system_prompt: str):
         old_messages = messages[1:]
-        messages = [Message(role="system", content=system_prompt)]
+        messages = [AgentMessage(role="system", content=system_prompt)]
         messages.extend(old_messages)
         return messages
 
@@ -1073,6 +1221,18 @@ class BaseReactAgent:
                     memory_tool_backend=self.memory_tool_backend,
                     registry=local_tools,
                 )
+        if self.artifact_spiller:
+            if local_tools:
+                build_tool_registry_artifact_tools(
+                    store=self.artifact_spiller.store,
+                    registry=local_tools,
+                )
+            else:
+                local_tools = self.register_internal_tool
+                build_tool_registry_artifact_tools(
+                    store=self.artifact_spiller.store,
+                    registry=local_tools,
+                )
         if self.enable_agent_skills and self.skill_manager:
             if local_tools:
                 build_skill_tools(
@@ -1296,17 +1456,38 @@ class BaseReactAgent:
         updated_system_prompt += f"\n[AVAILABLE TOOLS REGISTRY]\n{tools_section}"
 
         session_state.messages.insert(
-            0, Message(role="system", content=updated_system_prompt)
+            0, AgentMessage(role="system", content=updated_system_prompt)
         )
 
     async def sub_agents_registry(self, sub_agents: List[Any]) -> str:
         """
         Compact JSON-based registry format.
         More concise while maintaining all necessary information.
+
+        The text is cached until the sub-agents (or their name, description
+        or ``run`` method) change.
         """
         if not sub_agents:
             return "No sub-agents available."
 
+        cache_key = tuple(
+            (
+                id(agent),
+                getattr(agent, "name", None),
+                getattr(agent, "system_instruction", None),
+                getattr(agent.run, "__func__", agent.run),
+            )
+            for agent in sub_agents
+        )
+        cached = self._sub_agents_registry_cache
+        if cached is not None and cached[0] == cache_key:
+            return cached[1]
+
+        registry_text = self._build_sub_agents_registry(sub_agents)
+        self._sub_agents_registry_cache = (cache_key, registry_text)
+        return registry_text
+
+    def _build_sub_agents_registry(self, sub_agents: List[Any]) -> str:
         registry = []
 
         for agent in sub_agents:
@@ -1376,6 +1557,33 @@ class BaseReactAgent:
 
         return "\n".join(output_lines)
 
+    async def _ensure_sub_agent_connected(self, agent: Any):
+        """Connect a sub-agent's MCP servers once and keep them for later calls."""
+        if not getattr(agent, "mcp_tools", None):
+            return
+        client = getattr(agent, "mcp_client", None)
+        if client is not None and client.sessions:
+            return
+        lock = self._sub_agent_connect_locks.setdefault(id(agent), asyncio.Lock())
+        async with lock:
+            if client is not None and client.sessions:
+                return
+            logger.info(f"Connecting MCP servers for {agent.name}...")
+            await agent.connect_mcp_servers()
+            self._connected_sub_agents[id(agent)] = agent
+
+    async def cleanup_sub_agents(self):
+        """Close the MCP connections opened for sub-agent calls."""
+        agents = list(self._connected_sub_agents.values())
+        self._connected_sub_agents.clear()
+        self._sub_agent_connect_locks.clear()
+        for agent in agents:
+            try:
+                await agent.cleanup_mcp_servers()
+            except Exception as e:
+                logger.warning(f"Failed to clean up sub-agent {agent.name}: {e}")
+
+    @track("sub_agent_action_execution")
     async def execute_sub_agent_calls(
         self,
         response: str,
@@ -1392,8 +1600,11 @@ class BaseReactAgent:
         Execute multiple sub-agent calls in parallel with proper observation formatting.
 
         This function:
-        1. Connects all MCP servers concurrently (if needed)
-        2. Executes all sub-agent runs concurrently
+        1. Connects sub-agents' MCP servers on first use and keeps them
+           connected for later calls (see ``cleanup_sub_agents``)
+        2. Executes the sub-agent runs concurrently, at most
+           ``max_parallel_sub_agents`` at a time and each within
+           ``sub_agent_timeout``
         3. Formats results into proper XML observations
         4. Adds observations to message history
         """
@@ -1419,11 +1630,23 @@ class BaseReactAgent:
             metadata=metadata,
             session_id=session_id,
         )
-        session_state.messages.append(Message(role="assistant", content=response))
+        session_state.messages.append(AgentMessage(role="assistant", content=response))
 
         if isinstance(agent_calls, str):
             agent_calls = json.loads(agent_calls)
 
+        semaphore = (
+            asyncio.Semaphore(self.max_parallel_sub_agents)
+            if self.max_parallel_sub_agents > 0
+            else None
+        )
+
+        async def run_agent(agent, kwargs):
+            if self.sub_agent_timeout > 0:
+                async with asyncio.timeout(self.sub_agent_timeout):
+                    return await agent.run(**kwargs)
+            return await agent.run(**kwargs)
+
         async def execute_single_agent(call: dict) -> tuple[str, Any]:
             """Execute a single agent, handling MCP connection if needed."""
             agent_name = call.get("agent")
@@ -1436,21 +1659,29 @@ class BaseReactAgent:
                 params["session_id"] = session_id
                 kwargs = build_kwargs(agent, params)
 
-                if hasattr(agent, "mcp_tools") and agent.mcp_tools:
-                    logger.info(f"Connecting MCP servers for {agent_name}...")
-                    await agent.connect_mcp_servers()
-
-                logger.info(f"Running sub-agent: {agent_name}")
-                result = await agent.run(**kwargs)
-                await agent.cleanup_mcp_servers()
-                return agent_name, result
+                if semaphore is None:
+                    await self._ensure_sub_agent_connected(agent)
+                    logger.info(f"Running sub-agent: {agent_name}")
+                    return agent_name, await run_agent(agent, kwargs)
+                async with semaphore:
+                    await self._ensure_sub_agent_connected(agent)
+                    logger.info(f"Running sub-agent: {agent_name}")
+                    return agent_name, await run_agent(agent, kwargs)
 
+            except TimeoutError:
+                logger.error(
+                    f"Sub-agent {agent_name} timed out after {self.sub_agent_timeout}s"
+                )
+                return agent_name, TimeoutError(
+                    f"Sub-agent '{agent_name}' timed out after {self.sub_agent_timeout}s"
+                )
             except Exception as e:
                 logger.error(f"Error executing agent {agent_name}: {e}", exc_info=True)
                 return agent_name, e
 
         logger.info(
-            f"Executing {len(agent_calls)} sub-agents with concurrent MCP connections..."
+            f"Executing {len(agent_calls)} sub-agents "
+            f"(max parallel: {self.max_parallel_sub_agents or 'unlimited'})..."
         )
         tasks = [execute_single_agent(call) for call in agent_calls]
         results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -1521,7 +1752,6 @@ class BaseReactAgent:
                         sub_usage = obs_data.get("metric")
                         if sub_usage and isinstance(sub_usage, Usage):
                             run_usage.incr(sub_usage)
-                            usage.incr(sub_usage)
 
                     event = Event(
                         type=EventType.SUB_AGENT_CALL_RESULT,
@@ -1539,6 +1769,14 @@ class BaseReactAgent:
                             event_router(session_id=session_id, event=event)
                         )
 
+        if self.output_guard is not None and observations:
+            withheld = await self.guard_outputs(
+                [obs.get("output", "") for obs in observations]
+            )
+            for obs, notice in zip(observations, withheld):
+                if notice is not None:
+                    obs["output"] = notice
+
         xml_obs_block = build_sub_agents_observation_xml(observations)
         agent_call_result = {
             "agent_name": self.agent_name,
@@ -1549,7 +1787,7 @@ class BaseReactAgent:
         if debug:
             show_sub_agent_call_result(agent_call_result)
 
-        session_state.messages.append(Message(role="user", content=xml_obs_block))
+        session_state.messages.append(AgentMessage(role="user", content=xml_obs_block))
         await add_message_to_history(
             role="user",
             content=xml_obs_block,
@@ -1557,6 +1795,22 @@ class BaseReactAgent:
             metadata={"agent_name": self.agent_name, "sub_agent_results": True},
         )
 
+    @track("llm_call")
+    async def call_llm(self, llm_connection: Callable, messages: list) -> Any:
+        """Send the working memory to the LLM inside an ``llm.call`` span"""
+        with tracer.span("llm.call", agent=self.agent_name) as span:
+            response = await llm_connection.llm_call(messages)
+            if span.recording:
+                span.set_attribute("messages", len(messages))
+                usage = getattr(response, "usage", None)
+                if usage is not None:
+                    span.set_attributes(
+                        prompt_tokens=usage.prompt_tokens,
+                        completion_tokens=usage.completion_tokens,
+                        total_tokens=usage.total_tokens,
+                    )
+            return response
+
     @track("agent_execution")
     async def run(
         self,
@@ -1572,10 +1826,47 @@ class BaseReactAgent:
         session_id: str = None,
         event_router: Callable[[str, Event], Any] = None,
         sub_agents: list = None,
+        tenant_id: str = None,
     ) -> Any:
         """Execute ReAct loop with JSON communication
         kwargs: if mcp is enbale then it will be sessions and availables_tools else it will be local_tools
+
+        Concurrent runs on the same session are queued, see the class docstring.
         """
+        async with self.session_lock(session_id):
+            with tracer.span("agent.run", agent=self.agent_name, session_id=session_id):
+                return await self._run_session(
+                    system_prompt=system_prompt,
+                    query=query,
+                    llm_connection=llm_connection,
+                    add_message_to_history=add_message_to_history,
+                    message_history=message_history,
+                    debug=debug,
+                    sessions=sessions,
+                    mcp_tools=mcp_tools,
+                    local_tools=local_tools,
+                    session_id=session_id,
+                    event_router=event_router,
+                    sub_agents=sub_agents,
+                    tenant_id=tenant_id,
+                )
+
+    async def _run_session(
+        self,
+        system_prompt: str,
+        query: str,
+        llm_connection: Callable,
+        add_message_to_history: Callable[[str, str, dict | None], Any],
+        message_history: Callable[[], Any],
+        debug: bool = False,
+        sessions: dict = None,
+        mcp_tools: dict = None,
+        local_tools: Any = None,
+        session_id: str = None,
+        event_router: Callable[[str, Event], Any] = None,
+        sub_agents: list = None,
+        tenant_id: str = None,
+    ) -> Any:
         session_state = self._get_session_state(session_id=session_id, debug=debug)
         session_state.messages = []
         session_state.assistant_with_tool_calls = None
@@ -1583,6 +1874,7 @@ class BaseReactAgent:
         session_state.loop_detector.reset()
         start_time = time.perf_counter()
         run_usage = Usage()
+        usage_key = make_usage_key(tenant_id, self.agent_name, session_id)
 
         event = Event(
             type=EventType.USER_MESSAGE,
@@ -1602,17 +1894,18 @@ class BaseReactAgent:
             session_id=session_id,
             metadata={"agent_name": self.agent_name},
         )
-        await self.prepare_initial_messages(
-            system_prompt=system_prompt,
-            session_state=session_state,
-            llm_connection=llm_connection,
-            message_history=message_history,
-            mcp_tools=mcp_tools,
-            local_tools=local_tools,
-            session_id=session_id,
-            debug=debug,
-            sub_agents=sub_agents,
-        )
+        with tracer.span("agent.prepare_initial_messages", agent=self.agent_name):
+            await self.prepare_initial_messages(
+                system_prompt=system_prompt,
+                session_state=session_state,
+                llm_connection=llm_connection,
+                message_history=message_history,
+                mcp_tools=mcp_tools,
+                local_tools=local_tools,
+                session_id=session_id,
+                debug=debug,
+                sub_agents=sub_agents,
+            )
         if session_state.state not in [
             AgentState.IDLE,
             AgentState.ERROR,
@@ -1636,15 +1929,16 @@ class BaseReactAgent:
                     )
                 current_steps += 1
                 if self._limits_enabled:
-                    self.usage_limits.check_before_request(usage=usage)
+                    self.usage_limits.check_before_request(
+                        usage=self.usage_ledger.get_usage(
+                            usage_key, self.usage_limit_scope
+                        )
+                    )
 
                 try:
-
-                    @track("llm_call")
-                    async def make_llm_call():
-                        return await llm_connection.llm_call(session_state.messages)
-
-                    response = await make_llm_call()
+                    response = await self.call_llm(
+                        llm_connection, session_state.messages
+                    )
 
                     if response:
                         event = Event(
@@ -1666,37 +1960,22 @@ class BaseReactAgent:
                                 response_tokens=response.usage.completion_tokens,
                                 total_tokens=response.usage.total_tokens,
                             )
-                            usage.incr(request_usage)
+                            self.usage_ledger.record(usage_key, request_usage)
                             run_usage.incr(request_usage)
 
                             if self._limits_enabled:
-                                self.usage_limits.check_tokens(usage)
-                                remaining_tokens = self.usage_limits.remaining_tokens(
-                                    usage
-                                )
-                                used_tokens = usage.total_tokens
-                                used_requests = usage.requests
-                                remaining_requests = self.request_limit - used_requests
-                                session_stats.update(
-                                    {
-                                        "used_requests": used_requests,
-                                        "used_tokens": used_tokens,
-                                        "remaining_requests": remaining_requests,
-                                        "remaining_tokens": remaining_tokens,
-                                        "request_tokens": request_usage.request_tokens,
-                                        "response_tokens": request_usage.response_tokens,
-                                        "total_tokens": request_usage.total_tokens,
-                                    }
+                                scoped_usage = self.usage_ledger.get_usage(
+                                    usage_key, self.usage_limit_scope
                                 )
+                                self.usage_limits.check_tokens(scoped_usage)
                                 if debug:
                                     logger.info(
-                                        f"API Call Stats - Requests: {used_requests}/{self.request_limit}, "
-                                        f"Tokens: {used_tokens}/{self.usage_limits.total_tokens_limit}, "
+                                        f"API Call Stats ({self.usage_limit_scope} {usage_key}) - "
+                                        f"Requests: {scoped_usage.requests}/{self.request_limit}, "
+                                        f"Tokens: {scoped_usage.total_tokens}/{self.usage_limits.total_tokens_limit}, "
                                         f"Request Tokens: {request_usage.request_tokens}, "
                                         f"Response Tokens: {request_usage.response_tokens}, "
-                                        f"Total Tokens: {request_usage.total_tokens}, "
-                                        f"Remaining Requests: {remaining_requests}, "
-                                        f"Remaining Tokens: {remaining_tokens}"
+                                        f"Total Tokens: {request_usage.total_tokens}"
                                     )
                         if hasattr(response, "choices"):
                             response = response.choices[0].message.content.strip()
@@ -1714,19 +1993,20 @@ class BaseReactAgent:
                     logger.error(e)
                     return {"answer": error_message, "usage": run_usage}
 
-                parsed_response = await self.extract_action_or_answer(
-                    response=response,
-                    debug=debug,
-                    session_id=session_id,
-                    event_router=event_router,
-                )
+                with tracer.span("agent.parse"):
+                    parsed_response = await self.extract_action_or_answer(
+                        response=response,
+                        debug=debug,
+                        session_id=session_id,
+                        event_router=event_router,
+                    )
                 if debug:
                     logger.info(f"current steps: {current_steps}")
                 if parsed_response.answer is not None:
                     last_valid_response = parsed_response.answer
 
                     session_state.messages.append(
-                        Message(
+                        AgentMessage(
                             role="assistant",
                             content=parsed_response.answer,
                         )
@@ -1756,47 +2036,36 @@ class BaseReactAgent:
 
                 if parsed_response.action is not None:
                     if parsed_response.agent_calls is not None:
-                        agent_calls = parsed_response.data
-
-                        @track("sub_agent_action_execution")
-                        async def execute_sub_agent_calls():
-                            await self.execute_sub_agent_calls(
-                                response=response,
-                                agent_calls=agent_calls,
-                                sub_agents=sub_agents,
-                                session_id=session_id,
-                                session_state=session_state,
-                                add_message_to_history=add_message_to_history,
-                                run_usage=run_usage,
-                                event_router=event_router,
-                                debug=debug,
-                            )
-
-                        await execute_sub_agent_calls()
+                        await self.execute_sub_agent_calls(
+                            response=response,
+                            agent_calls=parsed_response.data,
+                            sub_agents=sub_agents,
+                            session_id=session_id,
+                            session_state=session_state,
+                            add_message_to_history=add_message_to_history,
+                            run_usage=run_usage,
+                            event_router=event_router,
+                            debug=debug,
+                        )
                     else:
-
-                        @track("action_execution")
-                        async def execute_action():
-                            await self.act(
-                                parsed_response=parsed_response,
-                                response=response,
-                                add_message_to_history=add_message_to_history,
-                                system_prompt=system_prompt,
-                                mcp_tools=mcp_tools,
-                                debug=debug,
-                                sessions=sessions,
-                                local_tools=local_tools,
-                                session_id=session_id,
-                                event_router=event_router,
-                                sub_agents=sub_agents,
-                            )
-
-                        await execute_action()
+                        await self.act(
+                            parsed_response=parsed_response,
+                            response=response,
+                            add_message_to_history=add_message_to_history,
+                            system_prompt=system_prompt,
+                            mcp_tools=mcp_tools,
+                            debug=debug,
+                            sessions=sessions,
+                            local_tools=local_tools,
+                            session_id=session_id,
+                            event_router=event_router,
+                            sub_agents=sub_agents,
+                        )
 
                 if parsed_response.error is not None:
                     logger.error(f"Error in parsed response: {parsed_response.error}")
                     session_state.messages.append(
-                        Message(
+                        AgentMessage(
                             role="user",
                             content=(
                                 f"{parsed_response.error}\n\n"
@@ -3,10 +3,17 @@ from typing import Any
 
 from omnicoreagent.core.agents.base import BaseReactAgent
 from omnicoreagent.core.types import AgentConfig
+from omnicoreagent.core.usage_ledger import UsageLedger
 
 
 class ReactAgent(BaseReactAgent):
-    def __init__(self, config: AgentConfig):
+    def __init__(
+        self,
+        config: AgentConfig,
+        skill_manager: Any = None,
+        usage_ledger: UsageLedger | None = None,
+        output_guard: Any = None,
+    ):
         super().__init__(
             agent_name=config.agent_name,
             max_steps=config.max_steps,
@@ -16,6 +23,17 @@ class ReactAgent(BaseReactAgent):
             enable_advanced_tool_use=config.enable_advanced_tool_use,
             memory_tool_backend=config.memory_tool_backend,
             enable_agent_skills=config.enable_agent_skills,
+            skill_manager=skill_manager,
+            max_sessions=config.max_sessions,
+            session_ttl=config.session_ttl,
+            usage_ledger=usage_ledger,
+            usage_limit_scope=config.usage_limit_scope,
+            output_guard=output_guard,
+            max_parallel_sub_agents=config.max_parallel_sub_agents,
+            sub_agent_timeout=config.sub_agent_timeout,
+            artifact_store=config.artifact_store,
+            artifact_threshold_chars=config.artifact_threshold_chars,
+            artifact_preview_chars=config.artifact_preview_chars,
         )
 
     async def _run(
@@ -42,5 +60,6 @@ class ReactAgent(BaseReactAgent):
             local_tools=kwargs.get("local_tools"),
             session_id=kwargs.get("session_id"),
             sub_agents=kwargs.get("sub_agents"),
+            tenant_id=kwargs.get("tenant_id"),
         )
         return response
@@ -4,9 +4,22 @@ Database Package
 This package provides database functionality:
 - DatabaseMessageStore: SQL-based message storage
 - MongoDb: MongoDB connection and operations
+
+Drivers are imported lazily on first use.
 """
 
-from .database_message_store import DatabaseMessageStore
+from typing import TYPE_CHECKING
+
+from omnicoreagent.core.lazy_imports import lazy_module_attrs
+
+if TYPE_CHECKING:
+    from .database_message_store import DatabaseMessageStore
+
+_LAZY_IMPORTS = {
+    "DatabaseMessageStore": ".database_message_store",
+}
+
+__getattr__, __dir__ = lazy_module_attrs(__name__, _LAZY_IMPORTS)
 
 __all__ = [
     "DatabaseMessageStore",
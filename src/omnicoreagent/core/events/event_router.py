@@ -6,7 +6,7 @@ from typing import Optional, Dict, Any, List
 from omnicoreagent.core.utils import logger
 from omnicoreagent.core.events.base import BaseEventStore, Event
 from omnicoreagent.core.events.in_memory import InMemoryEventStore
-from omnicoreagent.core.events.redis_stream import RedisStreamEventStore
+from omnicoreagent.core.tracing import tracer
 
 
 class EventRouter:
@@ -38,6 +38,10 @@ class EventRouter:
         """Initialize the event store based on type."""
         try:
             if self.event_store_type == "redis_stream":
+                from omnicoreagent.core.events.redis_stream import (
+                    RedisStreamEventStore,
+                )
+
                 self._event_store = RedisStreamEventStore()
                 logger.info("Initialized Redis Stream Event Store")
             elif self.event_store_type == "in_memory":
@@ -61,7 +65,10 @@ class EventRouter:
         if not self._event_store:
             raise RuntimeError("No event store available")
 
-        await self._event_store.append(session_id=session_id, event=event)
+        with tracer.span(
+            "event.emit", store=self.event_store_type, event_type=event.type
+        ):
+            await self._event_store.append(session_id=session_id, event=event)
 
     async def get_events(self, session_id: str) -> List[Event]:
         """Get events from the current event store."""
@@ -1,16 +1,22 @@
 import re
+import asyncio
 import logging
+import threading
+import time
 from typing import Dict, List, Tuple, Optional, Set, Any
 from enum import Enum
 import unicodedata
 import json
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 import hashlib
-from collections import defaultdict
+import math
+import os
+from collections import Counter, OrderedDict, defaultdict
 from functools import lru_cache
 import sys
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
 
 
 
@@ -38,6 +44,12 @@ class DetectionConfig:
     log_level: str = "INFO"
     allowlist_patterns: List[str] = field(default_factory=list)
     blocklist_patterns: List[str] = field(default_factory=list)
+    cache_size: int = 1024
+    max_analysis_time_ms: float = 0
+    offload_min_length: int = 512
+    process_pool_threshold: int = 256
+    max_workers: Optional[int] = None
+    scan_tool_outputs: bool = False
 
 
 @dataclass
@@ -78,6 +90,200 @@ class DetectionResult:
         return json.dumps(self.to_dict())
 
 
+_ZERO_WIDTH_CHARS = [
+    *range(0x200B, 0x2010),
+    *range(0x202A, 0x202F),
+    *range(0x2060, 0x2070),
+    0xFEFF,
+]
+
+_LEET_MAP = {
+    "0": "o",
+    "1": "i",
+    "3": "e",
+    "4": "a",
+    "5": "s",
+    "7": "t",
+    "8": "b",
+    "@": "a",
+    "$": "s",
+    "!": "i",
+    "|": "i",
+    "€": "e",
+    "©": "c",
+    "®": "r",
+    "£": "e",
+    "¥": "y",
+    "¢": "c",
+    "µ": "u",
+    "°": "o",
+}
+
+# Zero-width removal and leet substitution in a single str.translate pass.
+_NORMALIZE_TABLE = {
+    **dict.fromkeys(_ZERO_WIDTH_CHARS),
+    **str.maketrans(_LEET_MAP),
+}
+
+# Control characters are stripped after whitespace is collapsed, as some of
+# them (\x0b, \x0c, \x1c-\x1f) count as whitespace.
+_CONTROL_CHARS_TABLE = dict.fromkeys(
+    [*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20), 0x7F]
+)
+
+_SEPARATOR_RE = re.compile(r"([a-z])[\.\-_,;:\/\\]+([a-z])", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+_BENIGN_INDICATORS = (
+    "help me understand",
+    "can you explain",
+    "how do i",
+    "what does",
+    "tutorial",
+    "example of",
+    "learn about",
+    "advice on",
+    "guide me",
+    "teach me",
+    "for learning",
+    "educational purpose",
+)
+
+_CONTEXT_BENIGN_RE = re.compile(
+    r"\b(?:how|why|what|when|where|can|could|should|would|will|help|teach|learn|avoid|prevent|don't|do not|not to)\b"
+    r"|\?"
+    r"|\b(?:about|regarding|concerning|regardless)\b"
+    r"|\b(?:if|whether)\b"
+)
+_CONTEXT_ATTACK_RE = re.compile(
+    r"\b(?:system|prompt|instruction|override|bypass|ignore|disregard|reveal)\b"
+)
+
+_SPECIAL_CHARS_RE = re.compile(r"[<>{}[\]\\|`~!@#$%^&*()+=]")
+_BOUNDARY_RE = re.compile(
+    r"(?:---|===|```|\*\*\*|\[system\]|<system>|</?prompt>)", re.IGNORECASE
+)
+_ENCODING_RE = re.compile(
+    r"(?:\\x[0-9a-f]{2}|\\u[0-9a-f]{4}|&#\d+;|%[0-9a-f]{2})", re.IGNORECASE
+)
+_ROLE_RE = re.compile(
+    r"you\s+(?:are|become|act\s+as)\s+(?:an?\s+)?(?!.*(?:teacher|tutor|helper|assistant|guide|expert))",
+    re.IGNORECASE,
+)
+_QUOTES_RE = re.compile(r'["\'`]{3,}')
+
+_RISK_WORDS = (
+    "ignore",
+    "disregard",
+    "system",
+    "prompt",
+    "reveal",
+    "instruction",
+    "override",
+    "bypass",
+    "admin",
+    "root",
+    "jailbreak",
+    "DAN",
+    "secret",
+    "hidden",
+    "unrestricted",
+)
+_INSTRUCTION_WORDS = ("ignore", "disregard", "override", "reveal", "show", "system")
+
+_RANDOM_LIKE_RE = re.compile(
+    r"[a-z]{2}\d{2}[a-z]{2}\d{2}|\b\w{8,12}\b.*\b\w{8,12}\b.*\b\w{8,12}\b"
+)
+
+_SEVERE_PATTERNS = [
+    (pattern_str, re.compile(pattern_str, re.IGNORECASE), weight)
+    for pattern_str, weight in (
+        (r"system\s*[:=]\s*(?:ignore|override|bypass|break)", 10),
+        (r"\bDAN\s*(?:mode|activate|enabled)", 9),
+        (r"<\s*/?\s*system\s*>", 9),
+        (r"jailbreak", 8),
+        (r"ignore\s+all\s+previous\s+instructions", 12),
+    )
+]
+
+# Non-ASCII characters that IGNORECASE treats as equal to an ASCII letter and
+# that can survive NFKC + lower(). Replacing them (1:1, so match offsets are
+# unchanged) lets ASCII patterns run case-sensitively on normalized text.
+_CASE_FOLD_TABLE = str.maketrans(
+    {"\u0131": "i", "\u0130": "i", "\u017f": "s", "\u212a": "k"}
+)
+
+_PATTERN_TOKEN_RE = re.compile(r"\\.|[A-Z]", re.DOTALL)
+_UNSAFE_ESCAPES = frozenset("123456789xuUN")
+
+
+@lru_cache(maxsize=1024)
+def _compile_list_pattern(pattern: str) -> re.Pattern:
+    """Compile a user-supplied allow/block list pattern once"""
+    return re.compile(pattern, re.IGNORECASE)
+
+
+def _case_sensitive_variant(pattern: re.Pattern) -> Optional[re.Pattern]:
+    """
+    Return an equivalent case-sensitive pattern for case-folded, lowercased text.
+
+    ``re.IGNORECASE`` is markedly slower than a case-sensitive scan. Text passed
+    to the group patterns is already lowercased, so lowercasing the pattern's
+    literals gives the same matches on ``normalized.translate(_CASE_FOLD_TABLE)``.
+    Patterns with non-ASCII characters, backreferences or character escapes
+    (``\\x``, ``\\u``, ``\\N``...) are not rewritten and None is returned.
+    """
+    source = pattern.pattern
+    if not source.isascii() or "(?P=" in source:
+        return None
+
+    def lower_token(match: re.Match) -> str:
+        token = match.group()
+        if token.startswith("\\"):
+            if token[1] in _UNSAFE_ESCAPES:
+                raise ValueError(token)
+            return token
+        return token.lower()
+
+    try:
+        rewritten = _PATTERN_TOKEN_RE.sub(lower_token, source)
+        return re.compile(rewritten, pattern.flags & ~re.IGNORECASE)
+    except (ValueError, re.error):
+        return None
+
+
+def _build_group_matchers(
+    patterns: List[Tuple[re.Pattern, bool]],
+) -> Tuple[List[Tuple[re.Pattern, bool, bool]], Optional[re.Pattern]]:
+    """
+    Prepare a pattern group for matching.
+
+    Returns ``(matchers, prefilter)``. Each matcher is ``(pattern, is_strict,
+    folded)`` where ``folded`` tells whether the pattern runs on the case-folded
+    text. The prefilter is one alternation of every (case-sensitive) pattern in
+    the group: a single ``search`` finds a match iff at least one member matches,
+    so groups without any hit, the common case, cost one scan instead of one per
+    pattern. It is None when a pattern could not be rewritten.
+    """
+    matchers = []
+    sources = []
+    for pattern, is_strict in patterns:
+        fast = _case_sensitive_variant(pattern)
+        if fast is None:
+            matchers.append((pattern, is_strict, False))
+            sources = None
+        else:
+            matchers.append((fast, is_strict, True))
+            if sources is not None:
+                sources.append(f"(?:{fast.pattern})")
+
+    prefilter = None
+    if sources:
+        try:
+            prefilter = re.compile("|".join(sources), re.MULTILINE | re.UNICODE)
+        except re.error:
+            prefilter = None
+    return matchers, prefilter
 
 
 class PatternManager:
@@ -86,6 +292,7 @@ class PatternManager:
     def __init__(self):
         self.pattern_version = "1.2.0"
         self._compiled_patterns = {}
+        self.custom_patterns: List[Tuple[str, str, int, bool]] = []
         self._load_patterns()
 
     def _load_patterns(self):
@@ -271,6 +478,15 @@ class PatternManager:
                 except re.error as e:
                     logging.warning(f"Failed to compile pattern {pattern_str}: {e}")
             config["patterns"] = compiled_patterns
+            self._update_prefilter(group_name)
+
+    def _update_prefilter(self, group: str):
+        """(Re)build the fast matchers and prefilter regex for a pattern group"""
+        config = self.patterns[group]
+        config["matchers"], config["prefilter"] = _build_group_matchers(
+            config["patterns"]
+        )
+        self.generation = getattr(self, "generation", 0) + 1
 
     def get_patterns(self) -> Dict:
         """Get all compiled patterns"""
@@ -290,6 +506,8 @@ class PatternManager:
         try:
             compiled = re.compile(pattern, re.IGNORECASE | re.MULTILINE | re.UNICODE)
             self.patterns[group]["patterns"].append((compiled, requires_target))
+            self._update_prefilter(group)
+            self.custom_patterns.append((group, pattern, weight, requires_target))
         except re.error as e:
             logging.error(f"Failed to add pattern {pattern}: {e}")
 
@@ -304,6 +522,8 @@ class DetectionEngine:
         self.pattern_manager = PatternManager()
         self.logger = self._setup_logger()
         self._benign_patterns = self._compile_benign_patterns()
+        self._result_cache: OrderedDict[Tuple, DetectionResult] = OrderedDict()
+        self._cache_lock = threading.Lock()
 
     def _setup_logger(self) -> logging.Logger:
         """Setup logging"""
@@ -344,7 +564,9 @@ class DetectionEngine:
                 compiled.append(re.compile(pattern, re.IGNORECASE))
             except re.error:
                 continue
-        return compiled
+        return [
+            re.compile("|".join(f"(?:{p.pattern})" for p in compiled), re.IGNORECASE)
+        ]
 
     def analyze(self, user_input: str) -> DetectionResult:
         """Main analysis pipeline"""
@@ -360,84 +582,28 @@ class DetectionEngine:
             if not user_input:
                 return self._create_safe_result(input_hash, 0, start_time)
 
-            if len(user_input) > self.config.max_input_length:
-                return self._create_result(
-                    threat_level=ThreatLevel.SUSPICIOUS,
-                    flags=["input_too_long"],
-                    score=10,
-                    message="Input exceeds maximum allowed length",
-                    input_length=len(user_input),
-                    input_hash=input_hash,
-                    start_time=start_time,
-                )
-
-            if self.config.allowlist_patterns:
-                if any(
-                    re.search(p, user_input, re.IGNORECASE)
-                    for p in self.config.allowlist_patterns
-                ):
-                    return self._create_safe_result(
-                        input_hash, len(user_input), start_time
+            cache_key = None
+            if self.config.cache_size > 0:
+                cache_key = (input_hash, self._config_fingerprint())
+                with self._cache_lock:
+                    cached = self._result_cache.get(cache_key)
+                    if cached is not None:
+                        self._result_cache.move_to_end(cache_key)
+                if cached is not None:
+                    return replace(
+                        cached,
+                        detection_time=datetime.now(),
+                        metadata={**cached.metadata, "cache_hit": True},
                     )
 
-            if self.config.blocklist_patterns:
-                for pattern in self.config.blocklist_patterns:
-                    if re.search(pattern, user_input, re.IGNORECASE):
-                        return self._create_result(
-                            threat_level=ThreatLevel.DANGEROUS,
-                            flags=[f"blocklist_match: {pattern[:50]}"],
-                            score=20,
-                            message="Input matches blocklist pattern",
-                            input_length=len(user_input),
-                            input_hash=input_hash,
-                            start_time=start_time,
-                        )
-
-            normalized = self._normalize_input(user_input)
-
-            if self._is_likely_benign(user_input, normalized):
-                result = self._analyze_with_reduced_sensitivity(user_input, normalized)
-                if result["threat_level"] in [ThreatLevel.SAFE, ThreatLevel.LOW_RISK]:
-                    result.update(
-                        {
-                            "input_hash": input_hash,
-                            "detection_time": datetime.now(),
-                            "input_length": len(user_input),
-                        }
-                    )
-                    return DetectionResult(**result)
-
-            flags = []
-            total_score = 0
-
-            pattern_score, pattern_flags = self._pattern_matching(normalized)
-            total_score += pattern_score
-            flags.extend(pattern_flags)
-
-            if self.config.enable_heuristic_analysis:
-                heuristic_score, heuristic_flags = self._heuristic_analysis(
-                    user_input, normalized
-                )
-                total_score += heuristic_score
-                flags.extend(heuristic_flags)
-
-            if self.config.enable_sequential_analysis:
-                seq_score, seq_flags = self._sequential_analysis(user_input)
-                total_score += seq_score
-                flags.extend(seq_flags)
-
-            if self.config.enable_entropy_analysis:
-                entropy_score, entropy_flags = self._entropy_analysis(user_input)
-                total_score += entropy_score
-                flags.extend(entropy_flags)
-
-            total_score = int(total_score * self.config.sensitivity)
-
-            result = self._calculate_threat(
-                total_score, flags, user_input, input_hash, start_time
-            )
+            result = self._analyze_uncached(user_input, input_hash, start_time)
 
-            self._log_detection(result)
+            # Partial results depend on timing, so they are not cached.
+            if cache_key is not None and not result.metadata.get("budget_exceeded"):
+                with self._cache_lock:
+                    self._result_cache[cache_key] = result
+                    while len(self._result_cache) > self.config.cache_size:
+                        self._result_cache.popitem(last=False)
 
             return result
 
@@ -453,45 +619,142 @@ class DetectionEngine:
                 start_time=start_time,
             )
 
+    def _config_fingerprint(self) -> Tuple:
+        """Everything besides the input that affects a detection result"""
+        config = self.config
+        return (
+            config.strict_mode,
+            config.sensitivity,
+            config.max_input_length,
+            config.enable_encoding_detection,
+            config.enable_heuristic_analysis,
+            config.enable_sequential_analysis,
+            config.enable_entropy_analysis,
+            config.max_analysis_time_ms,
+            tuple(config.allowlist_patterns),
+            tuple(config.blocklist_patterns),
+            self.pattern_manager.generation,
+        )
+
+    def clear_cache(self):
+        """Drop all cached detection results"""
+        with self._cache_lock:
+            self._result_cache.clear()
+
+    def _analyze_uncached(
+        self, user_input: str, input_hash: str, start_time: datetime
+    ) -> DetectionResult:
+        """Run the detection stages on a stripped, non-empty input"""
+        if len(user_input) > self.config.max_input_length:
+            return self._create_result(
+                threat_level=ThreatLevel.SUSPICIOUS,
+                flags=["input_too_long"],
+                score=10,
+                message="Input exceeds maximum allowed length",
+                input_length=len(user_input),
+                input_hash=input_hash,
+                start_time=start_time,
+            )
+
+        if self.config.allowlist_patterns:
+            if any(
+                _compile_list_pattern(pattern).search(user_input)
+                for pattern in self.config.allowlist_patterns
+            ):
+                return self._create_safe_result(input_hash, len(user_input), start_time)
+
+        if self.config.blocklist_patterns:
+            for pattern in self.config.blocklist_patterns:
+                if _compile_list_pattern(pattern).search(user_input):
+                    return self._create_result(
+                        threat_level=ThreatLevel.DANGEROUS,
+                        flags=[f"blocklist_match: {pattern[:50]}"],
+                        score=20,
+                        message="Input matches blocklist pattern",
+                        input_length=len(user_input),
+                        input_hash=input_hash,
+                        start_time=start_time,
+                    )
+
+        normalized = self._normalize_input(user_input)
+
+        if self._is_likely_benign(user_input, normalized):
+            result = self._analyze_with_reduced_sensitivity(user_input, normalized)
+            if result["threat_level"] in [ThreatLevel.SAFE, ThreatLevel.LOW_RISK]:
+                result.update(
+                    {
+                        "input_hash": input_hash,
+                        "detection_time": datetime.now(),
+                        "input_length": len(user_input),
+                    }
+                )
+                return DetectionResult(**result)
+
+        deadline = None
+        if self.config.max_analysis_time_ms > 0:
+            deadline = time.perf_counter() + self.config.max_analysis_time_ms / 1000
+
+        flags = []
+        total_score = 0
+
+        pattern_score, pattern_flags = self._pattern_matching(normalized)
+        total_score += pattern_score
+        flags.extend(pattern_flags)
+
+        stages = []
+        if self.config.enable_heuristic_analysis:
+            stages.append(lambda: self._heuristic_analysis(user_input, normalized))
+        if self.config.enable_sequential_analysis:
+            stages.append(lambda: self._sequential_analysis(user_input))
+        if self.config.enable_entropy_analysis:
+            stages.append(lambda: self._entropy_analysis(user_input))
+
+        # Pattern matching always runs; the optional stages are skipped once
+        # the time budget is spent and the verdict is based on what ran.
+        budget_exceeded = False
+        for stage in stages:
+            if deadline is not None and time.perf_counter() > deadline:
+                budget_exceeded = True
+                break
+            stage_score, stage_flags = stage()
+            total_score += stage_score
+            flags.extend(stage_flags)
+
+        total_score = int(total_score * self.config.sensitivity)
+
+        result = self._calculate_threat(
+            total_score, flags, user_input, input_hash, start_time
+        )
+        if budget_exceeded:
+            # Stages that would have added to the score did not run, so do not
+            # let partial evidence pass as safe.
+            if flags and result.is_safe:
+                result = self._create_result(
+                    threat_level=ThreatLevel.SUSPICIOUS,
+                    flags=flags[:10],
+                    score=total_score,
+                    message="Analysis time budget exceeded - manual review recommended",
+                    input_length=len(user_input),
+                    input_hash=input_hash,
+                    start_time=start_time,
+                )
+            result.metadata["budget_exceeded"] = True
+
+        self._log_detection(result)
+
+        return result
+
     def _normalize_input(self, text: str) -> str:
         """Advanced normalization with obfuscation detection"""
         normalized = unicodedata.normalize("NFKC", text)
 
-        normalized = re.sub(
-            r"[\u200b-\u200f\u202a-\u202e\u2060-\u206f\ufeff]", "", normalized
-        )
-
-        leet_map = {
-            "0": "o",
-            "1": "i",
-            "3": "e",
-            "4": "a",
-            "5": "s",
-            "7": "t",
-            "8": "b",
-            "@": "a",
-            "$": "s",
-            "!": "i",
-            "|": "i",
-            "€": "e",
-            "©": "c",
-            "®": "r",
-            "£": "e",
-            "¥": "y",
-            "¢": "c",
-            "µ": "u",
-            "°": "o",
-        }
-        for leet, normal in leet_map.items():
-            normalized = normalized.replace(leet, normal)
+        normalized = normalized.translate(_NORMALIZE_TABLE)
 
-        normalized = re.sub(
-            r"([a-z])[\.\-_,;:\/\\]+([a-z])", r"\1 \2", normalized, flags=re.IGNORECASE
-        )
+        normalized = _SEPARATOR_RE.sub(r"\1 \2", normalized)
 
-        normalized = re.sub(r"\s+", " ", normalized)
+        normalized = _WHITESPACE_RE.sub(" ", normalized)
 
-        normalized = re.sub(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]", "", normalized)
+        normalized = normalized.translate(_CONTROL_CHARS_TABLE)
 
         return normalized.strip().lower()
 
@@ -501,37 +764,32 @@ class DetectionEngine:
             if pattern.search(original):
                 return True
 
-        benign_indicators = [
-            "help me understand",
-            "can you explain",
-            "how do i",
-            "what does",
-            "tutorial",
-            "example of",
-            "learn about",
-            "advice on",
-            "guide me",
-            "teach me",
-            "for learning",
-            "educational purpose",
-        ]
-
         original_lower = original.lower()
-        return any(indicator in original_lower for indicator in benign_indicators)
+        return any(indicator in original_lower for indicator in _BENIGN_INDICATORS)
 
     def _pattern_matching(self, normalized: str) -> Tuple[int, List[str]]:
         """Pattern matching analysis"""
         score = 0
         flags = []
         patterns = self.pattern_manager.get_patterns()
+        folded = normalized.translate(_CASE_FOLD_TABLE)
 
         for group_name, config in patterns.items():
+            prefilter = config.get("prefilter")
+            if prefilter is not None and not prefilter.search(folded):
+                continue
+
+            matchers = config.get("matchers") or [
+                (pattern, is_strict, False) for pattern, is_strict in config["patterns"]
+            ]
             group_score = 0
-            for pattern, is_strict in config["patterns"]:
+            for pattern, is_strict, use_folded in matchers:
                 try:
-                    matches = list(pattern.finditer(normalized))
+                    matches = list(
+                        pattern.finditer(folded if use_folded else normalized)
+                    )
                     for match in matches:
-                        matched_text = match.group().strip()
+                        matched_text = normalized[match.start() : match.end()].strip()
                         if len(matched_text) < 4:
                             continue
 
@@ -554,22 +812,9 @@ class DetectionEngine:
         end = min(len(text), match.end() + 100)
         context = text[start:end]
 
-        benign_indicators = [
-            r"\b(?:how|why|what|when|where|can|could|should|would|will|help|teach|learn|avoid|prevent|don't|do not|not to)\b",
-            r"\?",
-            r"\b(?:about|regarding|concerning|regardless)\b",
-            r"\b(?:if|whether)\b",
-        ]
-
-        for indicator in benign_indicators:
-            if re.search(indicator, context):
-                attack_indicators = len(
-                    re.findall(
-                        r"\b(?:system|prompt|instruction|override|bypass|ignore|disregard|reveal)\b",
-                        context,
-                    )
-                )
-                return attack_indicators >= 2
+        if _CONTEXT_BENIGN_RE.search(context):
+            attack_indicators = len(_CONTEXT_ATTACK_RE.findall(context))
+            return attack_indicators >= 2
 
         return True
 
@@ -584,7 +829,7 @@ class DetectionEngine:
         if n == 0:
             return score, flags
 
-        special_chars = re.findall(r"[<>{}[\]\\|`~!@#$%^&*()+=]", original)
+        special_chars = _SPECIAL_CHARS_RE.findall(original)
         special_density = len(special_chars) / n
         if special_density > 0.2:
             flags.append("very_high_delimiter_density")
@@ -595,13 +840,7 @@ class DetectionEngine:
         elif special_density > 0.1:
             score += 3
 
-        boundaries = len(
-            re.findall(
-                r"(?:---|===|```|\*\*\*|\[system\]|<system>|</?prompt>)",
-                original,
-                re.IGNORECASE,
-            )
-        )
+        boundaries = len(_BOUNDARY_RE.findall(original))
         if boundaries >= 4:
             flags.append("multiple_context_boundaries")
             score += 10
@@ -611,24 +850,7 @@ class DetectionEngine:
         elif boundaries >= 2:
             score += 4
 
-        risk_words = [
-            "ignore",
-            "disregard",
-            "system",
-            "prompt",
-            "reveal",
-            "instruction",
-            "override",
-            "bypass",
-            "admin",
-            "root",
-            "jailbreak",
-            "DAN",
-            "secret",
-            "hidden",
-            "unrestricted",
-        ]
-        risk_count = sum(normalized.count(w) for w in risk_words)
+        risk_count = sum(normalized.count(w) for w in _RISK_WORDS)
 
         if risk_count >= 5:
             flags.append("very_dense_attack_keywords")
@@ -640,13 +862,7 @@ class DetectionEngine:
             score += 5
 
         if self.config.enable_encoding_detection:
-            encoding_patterns = len(
-                re.findall(
-                    r"(?:\\x[0-9a-f]{2}|\\u[0-9a-f]{4}|&#\d+;|%[0-9a-f]{2})",
-                    original,
-                    re.IGNORECASE,
-                )
-            )
+            encoding_patterns = len(_ENCODING_RE.findall(original))
             if encoding_patterns >= 5:
                 flags.append("multiple_encoding_attempts")
                 score += 8
@@ -654,16 +870,8 @@ class DetectionEngine:
                 flags.append("encoding_detected")
                 score += 5
 
-        instruction_words = [
-            "ignore",
-            "disregard",
-            "override",
-            "reveal",
-            "show",
-            "system",
-        ]
         repeat_count = sum(
-            1 for word in instruction_words if normalized.count(word) >= 2
+            1 for word in _INSTRUCTION_WORDS if normalized.count(word) >= 2
         )
         if repeat_count >= 3:
             flags.append("repetitive_injection_pattern")
@@ -671,8 +879,7 @@ class DetectionEngine:
         elif repeat_count >= 2:
             score += 3
 
-        role_pattern = r"you\s+(?:are|become|act\s+as)\s+(?:an?\s+)?(?!.*(?:teacher|tutor|helper|assistant|guide|expert))"
-        if re.search(role_pattern, normalized, re.IGNORECASE):
+        if _ROLE_RE.search(normalized):
             flags.append("role_manipulation_attempt")
             score += 7
 
@@ -680,7 +887,7 @@ class DetectionEngine:
             flags.append("potential_context_stuffing")
             score += 6
 
-        if re.search(r'["\'`]{3,}', original):
+        if _QUOTES_RE.search(original):
             flags.append("quote_manipulation")
             score += 4
 
@@ -730,9 +937,6 @@ class DetectionEngine:
         if len(text) < 20:
             return score, flags
 
-        import math
-        from collections import Counter
-
         freq = Counter(text)
         entropy = -sum(
             (count / len(text)) * math.log2(count / len(text))
@@ -743,16 +947,9 @@ class DetectionEngine:
             flags.append(f"high_entropy_{entropy:.2f}")
             score += 4
 
-        random_patterns = [
-            r"[a-z]{2}\d{2}[a-z]{2}\d{2}",
-            r"\b\w{8,12}\b.*\b\w{8,12}\b.*\b\w{8,12}\b",
-        ]
-
-        for pattern in random_patterns:
-            if re.search(pattern, text):
-                flags.append("random_like_pattern")
-                score += 3
-                break
+        if _RANDOM_LIKE_RE.search(text):
+            flags.append("random_like_pattern")
+            score += 3
 
         return score, flags
 
@@ -763,16 +960,8 @@ class DetectionEngine:
         flags = []
         score = 0
 
-        severe_patterns = [
-            (r"system\s*[:=]\s*(?:ignore|override|bypass|break)", 10),
-            (r"\bDAN\s*(?:mode|activate|enabled)", 9),
-            (r"<\s*/?\s*system\s*>", 9),
-            (r"jailbreak", 8),
-            (r"ignore\s+all\s+previous\s+instructions", 12),
-        ]
-
-        for pattern_str, weight in severe_patterns:
-            if re.search(pattern_str, normalized, re.IGNORECASE):
+        for pattern_str, pattern, weight in _SEVERE_PATTERNS:
+            if pattern.search(normalized):
                 flags.append(f"severe_pattern: {pattern_str[:30]}")
                 score += weight
 
@@ -1012,6 +1201,7 @@ class PromptInjectionGuard:
         self.config = config or DetectionConfig()
         self.detection_engine = DetectionEngine(self.config)
         self.detection_stats = defaultdict(int)
+        self._process_pool: Optional[ProcessPoolExecutor] = None
 
     def check(self, user_input: str) -> DetectionResult:
         """
@@ -1024,15 +1214,111 @@ class PromptInjectionGuard:
             DetectionResult: Structured analysis result
         """
         result = self.detection_engine.analyze(user_input)
+        self._record(result)
+        return result
+
+    def check_batch(self, inputs: List[str]) -> List[DetectionResult]:
+        """Analyze multiple inputs; duplicates are analyzed once"""
+        texts = [text if isinstance(text, str) else str(text) for text in inputs]
+        results = {
+            text: self.detection_engine.analyze(text) for text in dict.fromkeys(texts)
+        }
+        return [self._record(results[text]) for text in texts]
 
+    async def check_async(self, user_input: str) -> DetectionResult:
+        """
+        Analyze input without blocking the event loop.
+
+        Inputs shorter than ``offload_min_length`` are analyzed inline, where
+        the thread hand-off would cost more than the analysis itself.
+        """
+        text = user_input if isinstance(user_input, str) else str(user_input)
+        if len(text) < self.config.offload_min_length:
+            return self.check(text)
+        result = await asyncio.to_thread(self.detection_engine.analyze, text)
+        return self._record(result)
+
+    async def check_batch_async(self, inputs: List[str]) -> List[DetectionResult]:
+        """
+        Analyze multiple inputs without blocking the event loop.
+
+        Duplicates are analyzed once. Batches of at least
+        ``process_pool_threshold`` distinct inputs are split across a process
+        pool; smaller batches run in a worker thread.
+        """
+        texts = [text if isinstance(text, str) else str(text) for text in inputs]
+        unique = list(dict.fromkeys(texts))
+        if not unique:
+            return []
+
+        threshold = self.config.process_pool_threshold
+        if threshold > 0 and len(unique) >= threshold:
+            analyzed = await self._analyze_in_processes(unique)
+        else:
+            analyzed = await asyncio.to_thread(
+                lambda: [self.detection_engine.analyze(text) for text in unique]
+            )
+
+        results = dict(zip(unique, analyzed))
+        return [self._record(results[text]) for text in texts]
+
+    async def scan_outputs(self, outputs: List[str]) -> List[DetectionResult]:
+        """
+        Check tool or sub-agent outputs before they are fed back to the LLM.
+
+        Outputs longer than ``max_input_length`` are checked in overlapping
+        windows instead of being rejected for their length; the most severe
+        window is reported for each output.
+        """
+        size = self.config.max_input_length
+        overlap = min(200, size // 10)
+        windows: List[str] = []
+        owners: List[int] = []
+        for index, output in enumerate(outputs):
+            text = output if isinstance(output, str) else str(output)
+            for start in range(0, max(len(text) - overlap, 1), size - overlap):
+                windows.append(text[start : start + size])
+                owners.append(index)
+
+        worst: List[Optional[DetectionResult]] = [None] * len(outputs)
+        for owner, result in zip(owners, await self.check_batch_async(windows)):
+            current = worst[owner]
+            if current is None or result.threat_score > current.threat_score:
+                worst[owner] = result
+        return worst
+
+    async def _analyze_in_processes(self, texts: List[str]) -> List[DetectionResult]:
+        workers = self.config.max_workers or os.cpu_count() or 1
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=workers)
+
+        chunk_size = max(1, math.ceil(len(texts) / workers))
+        custom_patterns = tuple(self.detection_engine.pattern_manager.custom_patterns)
+        loop = asyncio.get_running_loop()
+        chunks = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    self._process_pool,
+                    _analyze_in_worker,
+                    self.config,
+                    custom_patterns,
+                    texts[start : start + chunk_size],
+                )
+                for start in range(0, len(texts), chunk_size)
+            )
+        )
+        return [result for chunk in chunks for result in chunk]
+
+    def _record(self, result: DetectionResult) -> DetectionResult:
         self.detection_stats[result.threat_level.value] += 1
         self.detection_stats["total_checks"] += 1
-
         return result
 
-    def check_batch(self, inputs: List[str]) -> List[DetectionResult]:
-        """Analyze multiple inputs"""
-        return [self.check(input_text) for input_text in inputs]
+    def close(self):
+        """Shut down the process pool used for large batches, if any"""
+        if self._process_pool is not None:
+            self._process_pool.shutdown(cancel_futures=True)
+            self._process_pool = None
 
     def get_stats(self) -> Dict[str, Any]:
         """Get detection statistics"""
@@ -1056,6 +1342,24 @@ class PromptInjectionGuard:
         self.detection_engine.pattern_manager.add_pattern(group, pattern, **kwargs)
 
 
+_worker_engines: Dict[Tuple, DetectionEngine] = {}
+
+
+def _analyze_in_worker(
+    config: DetectionConfig,
+    custom_patterns: Tuple[Tuple[str, str, int, bool], ...],
+    texts: List[str],
+) -> List[DetectionResult]:
+    """Process pool entry point; engines are reused across calls per worker"""
+    key = (repr(config), custom_patterns)
+    engine = _worker_engines.get(key)
+    if engine is None:
+        engine = DetectionEngine(config)
+        for group, pattern, weight, requires_target in custom_patterns:
+            engine.pattern_manager.add_pattern(group, pattern, weight, requires_target)
+        _worker_engines.clear()
+        _worker_engines[key] = engine
+    return [engine.analyze(text) for text in texts]
 
 
 def create_guard(
@@ -0,0 +1,41 @@
+"""
+Lazy attribute loading for package ``__init__`` modules (PEP 562).
+
+Packages declare which public names live in which submodule; the submodule is
+only imported the first time one of those names is accessed. This keeps
+``import omnicoreagent`` cheap and defers heavy optional backends (litellm,
+redis, SQLAlchemy, motor, APScheduler, mcp, ...) until they are actually used.
+"""
+
+import importlib
+from typing import Any, Callable
+
+
+def lazy_module_attrs(
+    package_name: str, lazy_imports: dict[str, str]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """Build ``__getattr__`` and ``__dir__`` hooks for a package.
+
+    Args:
+        package_name: ``__name__`` of the package installing the hooks
+        lazy_imports: Mapping of public attribute name to the (relative or
+            absolute) module path that defines it
+
+    Returns:
+        The ``(__getattr__, __dir__)`` pair to assign at package level
+    """
+    package = importlib.import_module(package_name)
+
+    def __getattr__(name: str) -> Any:
+        module_path = lazy_imports.get(name)
+        if module_path is None:
+            raise AttributeError(f"module {package_name!r} has no attribute {name!r}")
+        module = importlib.import_module(module_path, package_name)
+        value = getattr(module, name)
+        setattr(package, name, value)
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(vars(package)) | set(lazy_imports))
+
+    return __getattr__, __dir__
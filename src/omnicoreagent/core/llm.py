@@ -1,10 +1,8 @@
-import os
-from typing import Any, Union, List
+from typing import Any
 import time
 import random
 
-from dotenv import load_dotenv
-import litellm
+from omnicoreagent.core.llm_client import LLMClient, get_litellm, message_to_dict
 from omnicoreagent.core.utils import logger
 import warnings
 
@@ -13,28 +11,31 @@ warnings.filterwarnings(
 )
 
 
-load_dotenv()
-
-
-import logging
-import os
-
-os.environ["LITELLM_LOG"] = "CRITICAL"
-
-litellm.set_verbose = False
-
-litellm.callbacks = []
-litellm.success_callback = []
-litellm.failure_callback = []
+def __getattr__(name: str) -> Any:
+    if name == "litellm":
+        return get_litellm()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+RETRYABLE_ERROR_KEYWORDS = (
+    "rate limit",
+    "rate_limit",
+    "rpm",
+    "tpm",
+    "quota",
+    "throttle",
+    "too many requests",
+    "429",
+    "temporary",
+    "timeout",
+    "connection",
+)
 
-logging.getLogger("LiteLLM").disabled = True
-logging.getLogger("litellm").disabled = True
-logging.getLogger("litellm.proxy").disabled = True
 
-for logger_name in ["LiteLLM", "litellm", "litellm.proxy"]:
-    logger = logging.getLogger(logger_name)
-    logger.setLevel(logging.CRITICAL)
-    logger.propagate = False
+def is_retryable_error(error: Exception) -> bool:
+    """Whether an LLM error is transient (rate limits, timeouts, connection errors)"""
+    error_msg = str(error).lower()
+    return any(keyword in error_msg for keyword in RETRYABLE_ERROR_KEYWORDS)
 
 
 def retry_with_backoff(max_retries=3, base_delay=1, max_delay=60, backoff_factor=2):
@@ -57,24 +58,7 @@ def retry_with_backoff(max_retries=3, base_delay=1, max_delay=60, backoff_factor
 
                 except Exception as e:
                     last_exception = e
-                    error_msg = str(e).lower()
-
-                    if any(
-                        keyword in error_msg
-                        for keyword in [
-                            "rate limit",
-                            "rate_limit",
-                            "rpm",
-                            "tpm",
-                            "quota",
-                            "throttle",
-                            "too many requests",
-                            "429",
-                            "temporary",
-                            "timeout",
-                            "connection",
-                        ]
-                    ):
+                    if is_retryable_error(e):
                         if attempt < max_retries:
                             delay = min(
                                 base_delay * (backoff_factor**attempt), max_delay
@@ -107,10 +91,26 @@ def retry_with_backoff(max_retries=3, base_delay=1, max_delay=60, backoff_factor
 class LLMConnection:
     """Manages LLM connections using LiteLLM."""
 
-    def __init__(self, config: dict[str, Any] | Any, config_filename: str):
+    def __init__(
+        self,
+        config: dict[str, Any] | Any,
+        config_filename: str | None = None,
+        config_data: dict[str, Any] | None = None,
+    ):
+        """
+        Initialize the LLM connection.
+
+        Args:
+            config: Configuration object providing ``llm_api_key`` and ``load_config``
+            config_filename: Path of a servers_config JSON file to read the LLM section from
+            config_data: Already-parsed configuration; when given, no file is read
+        """
         self.config = config
         self.config_filename = config_filename
         self.llm_config = None
+        self.client: LLMClient | None = None
+        if config_data is not None:
+            self._loaded_config = config_data
 
         if hasattr(self.config, "llm_api_key"):
             if not self.llm_config:
@@ -118,8 +118,6 @@ class LLMConnection:
                 llm_config_result = self.llm_configuration()
                 if llm_config_result:
                     logger.info(f"LLM configuration: {self.llm_config}")
-
-                    self._set_llm_environment_variables()
                 else:
                     logger.debug("LLM configuration not available or invalid")
         else:
@@ -127,7 +125,9 @@ class LLMConnection:
 
     def __str__(self):
         """Return a readable string representation of the LLMConnection."""
-        config_file = self.config_filename or "default"
+        config_file = self.config_filename or (
+            "in-memory" if hasattr(self, "_loaded_config") else "default"
+        )
         return f"LLMConnection(config={config_file})"
 
     def __repr__(self):
@@ -162,84 +162,24 @@ class LLMConnection:
                 )
                 return None
 
-            provider_model_map = {
-                "openai": f"openai/{model}",
-                "anthropic": f"anthropic/{model}",
-                "groq": f"groq/{model}",
-                "openrouter": f"openrouter/{model}",
-                "deepseek": f"deepseek/{model}",
-                "gemini": f"gemini/{model}",
-                "azure": f"azure/{model}",
-                "ollama": f"ollama/{model}",
-                "mistral": f"mistral/{model}",
-            }
-
-            provider_key = (
-                provider.lower() if provider and isinstance(provider, str) else ""
+            self.client = LLMClient.from_config(
+                llm_config,
+                api_key=llm_config.get("api_key")
+                or getattr(self.config, "llm_api_key", None),
             )
-            full_model = provider_model_map.get(provider_key, model)
-
             self.llm_config = {
                 "provider": provider,
-                "model": full_model,
+                "model": self.client.model,
                 "temperature": llm_config.get("temperature"),
                 "max_tokens": llm_config.get("max_tokens"),
                 "top_p": llm_config.get("top_p"),
             }
 
-            if (
-                provider
-                and isinstance(provider, str)
-                and provider.lower() == "azureopenai"
-            ):
-                azure_endpoint = llm_config.get("azure_endpoint")
-                azure_api_version = llm_config.get("azure_api_version")
-                azure_deployment = llm_config.get("azure_deployment")
-
-                if azure_endpoint and isinstance(azure_endpoint, str):
-                    os.environ["AZURE_API_BASE"] = azure_endpoint
-                if azure_api_version and isinstance(azure_api_version, str):
-                    os.environ["AZURE_API_VERSION"] = azure_api_version
-                if azure_deployment and isinstance(azure_deployment, str):
-                    self.llm_config["model"] = f"azure/{azure_deployment}"
-
-            if provider and isinstance(provider, str) and provider.lower() == "ollama":
-                ollama_host = llm_config.get("ollama_host")
-                if ollama_host and isinstance(ollama_host, str):
-                    os.environ["OLLAMA_API_BASE"] = ollama_host
-
             return self.llm_config
         except Exception as e:
             logger.error(f"Error loading LLM configuration: {e}")
             return None
 
-    def _set_llm_environment_variables(self):
-        """Set environment variables only for the configured LLM provider."""
-        if not self.llm_config or not self.llm_config.get("provider"):
-            return
-
-        provider = self.llm_config["provider"].lower()
-        api_key = self.config.llm_api_key
-
-        if provider == "openai":
-            os.environ["OPENAI_API_KEY"] = api_key
-        elif provider == "anthropic":
-            os.environ["ANTHROPIC_API_KEY"] = api_key
-        elif provider == "groq":
-            os.environ["GROQ_API_KEY"] = api_key
-        elif provider == "mistral":
-            os.environ["MISTRAL_API_KEY"] = api_key
-        elif provider == "gemini":
-            os.environ["GEMINI_API_KEY"] = api_key
-        elif provider == "deepseek":
-            os.environ["DEEPSEEK_API_KEY"] = api_key
-        elif provider == "openrouter":
-            os.environ["OPENROUTER_API_KEY"] = api_key
-        elif provider == "azure" or provider == "azureopenai":
-            os.environ["AZURE_API_KEY"] = api_key
-
-        logger.debug(f"Set environment variable for LLM provider: {provider}")
-
     def is_llm_available(self) -> bool:
         """Check if LLM functionality is available (API key is set)"""
         return (
@@ -247,20 +187,9 @@ class LLMConnection:
         )
 
     def to_dict(self, msg):
-        if hasattr(msg, "model_dump"):
-            msg_dict = msg.model_dump(exclude_none=True)
-
-            if "timestamp" in msg_dict and hasattr(msg_dict["timestamp"], "timestamp"):
-                msg_dict["timestamp"] = msg_dict["timestamp"].timestamp()
-            elif "timestamp" in msg_dict and hasattr(msg_dict["timestamp"], "tzinfo"):
-                msg_dict["timestamp"] = msg_dict["timestamp"].timestamp()
-            return msg_dict
-        elif isinstance(msg, dict):
-            return msg
-        elif hasattr(msg, "__dict__"):
-            return {k: v for k, v in msg.__dict__.items() if v is not None}
-        else:
-            return msg
+        if self.client is not None:
+            return self.client.messages.to_dict(msg)
+        return message_to_dict(msg)
 
     @retry_with_backoff(max_retries=3, base_delay=1, max_delay=30)
     async def llm_call(
@@ -274,34 +203,7 @@ class LLMConnection:
                 logger.debug("LLM configuration not loaded, skipping LLM call")
                 return None
 
-            messages_dicts = [self.to_dict(m) for m in messages]
-
-            params = {
-                "model": self.llm_config["model"],
-                "messages": messages_dicts,
-            }
-
-            if self.llm_config.get("temperature") is not None:
-                params["temperature"] = self.llm_config["temperature"]
-
-            if self.llm_config.get("max_tokens") is not None:
-                params["max_tokens"] = self.llm_config["max_tokens"]
-
-            if self.llm_config.get("top_p") is not None:
-                params["top_p"] = self.llm_config["top_p"]
-
-            if tools:
-                params["tools"] = tools
-                params["tool_choice"] = "auto"
-
-            if self.llm_config["provider"].lower() == "openrouter":
-                if not tools:
-                    params["stop"] = ["\n\nObservation:"]
-
-            litellm.drop_params = True
-
-            response = await litellm.acompletion(**params)
-            return response
+            return await self.client.acompletion(messages, tools)
 
         except Exception as e:
             error_message = (
@@ -323,34 +225,7 @@ class LLMConnection:
                 logger.debug("LLM configuration not loaded, skipping LLM call")
                 return None
 
-            messages_dicts = [self.to_dict(m) for m in messages]
-
-            params = {
-                "model": self.llm_config["model"],
-                "messages": messages_dicts,
-            }
-
-            if self.llm_config.get("temperature") is not None:
-                params["temperature"] = self.llm_config["temperature"]
-
-            if self.llm_config.get("max_tokens") is not None:
-                params["max_tokens"] = self.llm_config["max_tokens"]
-
-            if self.llm_config.get("top_p") is not None:
-                params["top_p"] = self.llm_config["top_p"]
-
-            if tools:
-                params["tools"] = tools
-                params["tool_choice"] = "auto"
-
-            if self.llm_config["provider"].lower() == "openrouter":
-                if not tools:
-                    params["stop"] = ["\n\nObservation:"]
-
-            litellm.drop_params = True
-
-            response = litellm.completion(**params)
-            return response
+            return self.client.completion(messages, tools)
 
         except Exception as e:
             error_message = (
@@ -0,0 +1,394 @@
+"""
+Reusable LiteLLM client with per-instance credentials.
+
+``LLMClient`` carries its own API key and base URL and passes them to every
+request, so agents using different providers or keys can share one process
+without going through ``os.environ``. HTTP connections to a provider endpoint
+are pooled and kept alive across clients, and the parts of a request that do
+not change between calls are built once.
+"""
+
+from collections import OrderedDict
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import copy
+import importlib.util
+import logging
+import os
+import threading
+import weakref
+
+from omnicoreagent.core.types import AgentMessage
+
+
+@lru_cache(maxsize=1)
+def get_litellm():
+    """Import and configure litellm on first use.
+
+    litellm takes seconds to import, so it is loaded when the first LLM
+    request is made rather than when this module is imported.
+    """
+    os.environ["LITELLM_LOG"] = "CRITICAL"
+
+    import litellm
+
+    litellm.set_verbose = False
+
+    litellm.callbacks = []
+    litellm.success_callback = []
+    litellm.failure_callback = []
+    litellm.drop_params = True
+
+    for logger_name in ["LiteLLM", "litellm", "litellm.proxy"]:
+        litellm_logger = logging.getLogger(logger_name)
+        litellm_logger.disabled = True
+        litellm_logger.setLevel(logging.CRITICAL)
+        litellm_logger.propagate = False
+
+    return litellm
+
+
+PROVIDER_MODEL_PREFIXES = {
+    "openai": "openai",
+    "anthropic": "anthropic",
+    "groq": "groq",
+    "openrouter": "openrouter",
+    "deepseek": "deepseek",
+    "gemini": "gemini",
+    "azure": "azure",
+    "azureopenai": "azure",
+    "ollama": "ollama",
+    "mistral": "mistral",
+}
+
+# Providers whose requests go through the OpenAI SDK, which accepts our pooled
+# httpx client. Other providers use litellm's own module-level HTTP handler.
+POOLED_PROVIDERS = {"openai"}
+
+OPENROUTER_STOP = ["\n\nObservation:"]
+
+
+def message_to_dict(msg: Any) -> Any:
+    """Convert a message to the dict LiteLLM expects"""
+    if isinstance(msg, AgentMessage):
+        return msg.to_dict()
+    elif hasattr(msg, "model_dump"):
+        msg_dict = msg.model_dump(exclude_none=True)
+
+        if "timestamp" in msg_dict and hasattr(msg_dict["timestamp"], "timestamp"):
+            msg_dict["timestamp"] = msg_dict["timestamp"].timestamp()
+        return msg_dict
+    elif isinstance(msg, dict):
+        return msg
+    elif hasattr(msg, "__dict__"):
+        return {k: v for k, v in msg.__dict__.items() if v is not None}
+    else:
+        return msg
+
+
+# Field values that cannot change in place, so a reference to them is enough
+# to notice when the message changed.
+_IMMUTABLE_FIELD_TYPES = (str, bytes, int, float, bool, type(None), date, datetime)
+
+
+def _field_fingerprint(value: Any) -> Any:
+    if isinstance(value, _IMMUTABLE_FIELD_TYPES):
+        return value
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    return copy.deepcopy(value)
+
+
+class MessageCache:
+    """
+    Serialized form of recently sent messages.
+
+    A conversation is re-sent in full on every LLM call, so without a cache
+    each message goes through ``model_dump`` once per turn. Entries are keyed
+    by object identity and hold only a weak reference to the message; an
+    entry is rebuilt when any of the message's fields has been reassigned or,
+    for nested models and containers such as ``metadata``, edited in place.
+    AgentMessage caches its own dict and bypasses this cache.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[int, Tuple[Any, Tuple, Dict[str, Any]]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def to_dict(self, msg: Any) -> Any:
+        """Serialized copy of ``msg``, from the cache when unchanged"""
+        if isinstance(msg, AgentMessage) or not hasattr(msg, "model_dump"):
+            return message_to_dict(msg)
+        try:
+            ref = weakref.ref(msg)
+        except TypeError:
+            return message_to_dict(msg)
+
+        key = id(msg)
+        fingerprint = tuple(_field_fingerprint(v) for v in msg.__dict__.values())
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0]() is msg and entry[1] == fingerprint:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(entry[2])
+
+        msg_dict = message_to_dict(msg)
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (ref, fingerprint, msg_dict)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return dict(msg_dict)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_HTTP_LIMITS = {
+    "max_connections": 100,
+    "max_keepalive_connections": 20,
+    "keepalive_expiry": 30.0,
+}
+_sync_http_clients: Dict[Tuple[str, str], Any] = {}
+_async_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, str], Any]]" = weakref.WeakKeyDictionary()
+_http_clients_lock = threading.Lock()
+
+
+def _http_client_options() -> Dict[str, Any]:
+    import httpx
+
+    return {
+        "http2": importlib.util.find_spec("h2") is not None,
+        "limits": httpx.Limits(**_HTTP_LIMITS),
+        "timeout": httpx.Timeout(600.0, connect=10.0),
+    }
+
+
+def shared_http_client(provider: str, api_base: Optional[str], asynchronous: bool):
+    """
+    The pooled httpx client for a provider endpoint.
+
+    Async clients are kept per event loop, since their connections cannot be
+    used from another loop. HTTP/2 is used when the ``h2`` package is
+    installed.
+    """
+    import httpx
+
+    key = (provider, api_base or "")
+    with _http_clients_lock:
+        if asynchronous:
+            clients = _async_http_clients.setdefault(asyncio.get_running_loop(), {})
+        else:
+            clients = _sync_http_clients
+        client = clients.get(key)
+        if client is None or client.is_closed:
+            client_class = httpx.AsyncClient if asynchronous else httpx.Client
+            client = clients[key] = client_class(**_http_client_options())
+        return client
+
+
+async def close_http_clients():
+    """Close every pooled HTTP client."""
+    with _http_clients_lock:
+        sync_clients = list(_sync_http_clients.values())
+        _sync_http_clients.clear()
+        async_clients = _async_http_clients.pop(asyncio.get_running_loop(), {})
+    for client in sync_clients:
+        client.close()
+    for client in async_clients.values():
+        await client.aclose()
+
+
+class LLMClient:
+    """Sends chat completion requests for one model and set of credentials."""
+
+    def __init__(
+        self,
+        provider: str,
+        model: str,
+        api_key: Optional[str] = None,
+        api_base: Optional[str] = None,
+        api_version: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        top_p: Optional[float] = None,
+        message_cache_size: int = 4096,
+    ):
+        """
+        Initialize the LLMClient.
+
+        Args:
+            provider: Provider name from the LLM configuration
+            model: LiteLLM model name, including its provider prefix
+            api_key: API key sent with this client's requests
+            api_base: Endpoint URL (Azure endpoint, Ollama host, proxies)
+            api_version: API version (Azure)
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            top_p: Nucleus sampling parameter
+            message_cache_size: Number of serialized messages kept
+        """
+        self.provider = provider
+        self.model = model
+        self.api_key = api_key
+        self.api_base = api_base
+        self.api_version = api_version
+        self.messages = MessageCache(message_cache_size)
+
+        template = {
+            "model": model,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "top_p": top_p,
+            **self.credentials,
+        }
+        self._template = {k: v for k, v in template.items() if v is not None}
+        self._stop = OPENROUTER_STOP if provider.lower() == "openrouter" else None
+        self._pooled = provider.lower() in POOLED_PROVIDERS
+        self._sdk_clients: Dict[Any, Any] = {}
+
+    @classmethod
+    def from_config(
+        cls, llm_config: Dict[str, Any], api_key: Optional[str] = None
+    ) -> "LLMClient":
+        """
+        Build a client from the ``LLM`` section of a servers config.
+
+        Args:
+            llm_config: Provider, model, sampling settings and endpoint options
+            api_key: API key for the provider
+
+        Returns:
+            The configured client
+        """
+        provider = llm_config["provider"]
+        model = llm_config["model"]
+        provider_key = provider.lower()
+        prefix = PROVIDER_MODEL_PREFIXES.get(provider_key)
+        full_model = f"{prefix}/{model}" if prefix else model
+
+        api_base = llm_config.get("api_base")
+        api_version = None
+        if provider_key == "azureopenai":
+            azure_endpoint = llm_config.get("azure_endpoint")
+            azure_api_version = llm_config.get("azure_api_version")
+            azure_deployment = llm_config.get("azure_deployment")
+            if azure_endpoint and isinstance(azure_endpoint, str):
+                api_base = azure_endpoint
+            if azure_api_version and isinstance(azure_api_version, str):
+                api_version = azure_api_version
+            if azure_deployment and isinstance(azure_deployment, str):
+                full_model = f"azure/{azure_deployment}"
+        elif provider_key == "ollama":
+            ollama_host = llm_config.get("ollama_host")
+            if ollama_host and isinstance(ollama_host, str):
+                api_base = ollama_host
+
+        return cls(
+            provider=provider,
+            model=full_model,
+            api_key=api_key,
+            api_base=api_base,
+            api_version=api_version,
+            temperature=llm_config.get("temperature"),
+            max_tokens=llm_config.get("max_tokens"),
+            top_p=llm_config.get("top_p"),
+        )
+
+    @property
+    def credentials(self) -> Dict[str, str]:
+        """API key, base URL and version to pass to LiteLLM"""
+        credentials = {
+            "api_key": self.api_key,
+            "api_base": self.api_base,
+            "api_version": self.api_version,
+        }
+        return {k: v for k, v in credentials.items() if v is not None}
+
+    def request_params(
+        self,
+        messages: List[Any],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **overrides: Any,
+    ) -> Dict[str, Any]:
+        """Keyword arguments for a LiteLLM completion call
+
+        Args:
+            messages: Conversation to send
+            tools: Tool schemas the model may call
+            **overrides: Per-request settings replacing the client's
+                (temperature, max_tokens, stop, ...); None values are ignored
+        """
+        params = dict(self._template)
+        params["messages"] = [self.messages.to_dict(m) for m in messages]
+        if tools:
+            params["tools"] = tools
+            params["tool_choice"] = "auto"
+        elif self._stop:
+            params["stop"] = self._stop
+        for key, value in overrides.items():
+            if value is not None:
+                params[key] = value
+        return params
+
+    def _sdk_client(self, asynchronous: bool):
+        """OpenAI SDK client on the shared connection pool"""
+        scope = asyncio.get_running_loop() if asynchronous else None
+        http_client = shared_http_client(self.provider, self.api_base, asynchronous)
+        cached = self._sdk_clients.get(scope)
+        if cached is not None and cached[0] is http_client:
+            return cached[1]
+
+        import openai
+
+        client_class = openai.AsyncOpenAI if asynchronous else openai.OpenAI
+        client = client_class(
+            api_key=self.api_key,
+            base_url=self.api_base,
+            http_client=http_client,
+            max_retries=0,
+        )
+        self._sdk_clients = {
+            loop: entry
+            for loop, entry in self._sdk_clients.items()
+            if loop is None or not loop.is_closed()
+        }
+        self._sdk_clients[scope] = (http_client, client)
+        return client
+
+    async def acompletion(
+        self,
+        messages: List[Any],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **overrides: Any,
+    ):
+        """Send a chat completion request"""
+        params = self.request_params(messages, tools, **overrides)
+        if self._pooled and self.api_key:
+            params["client"] = self._sdk_client(asynchronous=True)
+        return await get_litellm().acompletion(**params)
+
+    def completion(
+        self,
+        messages: List[Any],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **overrides: Any,
+    ):
+        """Send a chat completion request synchronously"""
+        params = self.request_params(messages, tools, **overrides)
+        if self._pooled and self.api_key:
+            params["client"] = self._sdk_client(asynchronous=False)
+        return get_litellm().completion(**params)
+
+    def __repr__(self):
+        return f"LLMClient(provider={self.provider!r}, model={self.model!r})"
@@ -7,13 +7,30 @@ This package provides different memory storage backends:
 - DatabaseMemory: SQL database storage
 - MongoDBMemory: MongoDB storage
 - MemoryRouter: Routes to appropriate backend
+
+Backends are imported lazily so that only the selected store's driver is loaded.
 """
 
-from .base import AbstractMemoryStore
-from .in_memory import InMemoryStore
-from .redis_memory import RedisMemoryStore
-from .database_memory import DatabaseMemory
-from .memory_router import MemoryRouter
+from typing import TYPE_CHECKING
+
+from omnicoreagent.core.lazy_imports import lazy_module_attrs
+
+if TYPE_CHECKING:
+    from .base import AbstractMemoryStore
+    from .in_memory import InMemoryStore
+    from .redis_memory import RedisMemoryStore
+    from .database_memory import DatabaseMemory
+    from .memory_router import MemoryRouter
+
+_LAZY_IMPORTS = {
+    "AbstractMemoryStore": ".base",
+    "InMemoryStore": ".in_memory",
+    "RedisMemoryStore": ".redis_memory",
+    "DatabaseMemory": ".database_memory",
+    "MemoryRouter": ".memory_router",
+}
+
+__getattr__, __dir__ = lazy_module_attrs(__name__, _LAZY_IMPORTS)
 
 __all__ = [
     "AbstractMemoryStore",
@@ -1,13 +1,11 @@
 from typing import Any, Optional
 from decouple import config as decouple_config
 from omnicoreagent.core.memory_store.in_memory import InMemoryStore
-from omnicoreagent.core.memory_store.database_memory import DatabaseMemory
-from omnicoreagent.core.memory_store.redis_memory import RedisMemoryStore
 from omnicoreagent.core.utils import logger
 from omnicoreagent.core.utils import normalize_metadata
-from omnicoreagent.core.database.mongodb import MongoDb
 from omnicoreagent.core.memory_store.base import AbstractMemoryStore
 from omnicoreagent.core.utils import normalize_content
+from omnicoreagent.core.tracing import tracer
 
 
 class MemoryRouter:
@@ -28,6 +26,8 @@ class MemoryRouter:
         self.memory_store.set_memory_config(mode, value)
 
     def initialize_memory_store(self):
+        # Backends are imported on selection so unused drivers
+        # (SQLAlchemy, redis, motor) never load.
         if self.memory_store_type == "in_memory":
             self.memory_store = InMemoryStore()
         elif self.memory_store_type == "database":
@@ -36,6 +36,10 @@ class MemoryRouter:
                 logger.info("Database not configured, using in_memory")
                 self.memory_store = InMemoryStore()
             else:
+                from omnicoreagent.core.memory_store.database_memory import (
+                    DatabaseMemory,
+                )
+
                 self.memory_store = DatabaseMemory(db_url=db_url)
         elif self.memory_store_type == "redis":
             redis_url = decouple_config("REDIS_URL", default=None)
@@ -43,6 +47,10 @@ class MemoryRouter:
                 logger.info("Redis not configured, using in_memory")
                 self.memory_store = InMemoryStore()
             else:
+                from omnicoreagent.core.memory_store.redis_memory import (
+                    RedisMemoryStore,
+                )
+
                 self.memory_store = RedisMemoryStore(redis_url=redis_url)
         elif self.memory_store_type == "mongodb":
             uri = decouple_config("MONGODB_URI", default=None)
@@ -50,6 +58,8 @@ class MemoryRouter:
                 logger.info("MongoDB not configured, using in_memory")
                 self.memory_store = InMemoryStore()
             else:
+                from omnicoreagent.core.database.mongodb import MongoDb
+
                 db_name = decouple_config("MONGODB_DB_NAME", default="omnicoreagent")
                 collection = decouple_config("MONGODB_COLLECTION", default="messages")
                 self.memory_store = MongoDb(
@@ -80,12 +90,15 @@ class MemoryRouter:
         metadata = normalize_metadata(metadata)
         content = normalize_content(content)
 
-        await self.memory_store.store_message(role, content, metadata, session_id)
+        with tracer.span("memory.write", store=self.memory_store_type, role=role):
+            await self.memory_store.store_message(role, content, metadata, session_id)
 
     async def get_messages(
         self, session_id: str, agent_name: str = None
     ) -> list[dict[str, Any]]:
-        messages = await self.memory_store.get_messages(session_id, agent_name)
+        with tracer.span("memory.read", store=self.memory_store_type) as span:
+            messages = await self.memory_store.get_messages(session_id, agent_name)
+            span.set_attribute("messages", len(messages))
         for message in messages:
             message["metadata"] = message.pop("msg_metadata", None)
         return messages
@@ -0,0 +1,570 @@
+"""
+In-process metrics and a Prometheus endpoint.
+
+MetricsRegistry holds counters, gauges and fixed-bucket latency histograms
+with labels, and renders them in the Prometheus text format. It is fed by:
+
+- MetricsSpanProcessor: turns the hot-path spans (see ``tracing``) into
+  per-agent run and LLM latency, per-tool latency, and memory-store and
+  event-store operation latency histograms
+- collectors: callables rendering extra metrics at scrape time, such as the
+  usage ledger's token counters or a BackgroundAgentManager's scheduler queue
+  and MCP connection pool gauges
+
+``metrics_asgi_app`` serves a registry from any ASGI server or framework:
+
+    registry = enable_metrics()
+    app.mount("/metrics", metrics_asgi_app(registry))
+"""
+
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import threading
+
+from omnicoreagent.core.tracing import (
+    DEFAULT_BUCKETS_MS,
+    Span,
+    SpanProcessor,
+    bucket_percentile,
+    tracer,
+)
+from omnicoreagent.core.utils import logger
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Prometheus convention is seconds; same bounds as the span histograms
+DEFAULT_BUCKETS_SECONDS = tuple(bound / 1000 for bound in DEFAULT_BUCKETS_MS)
+
+Collector = Callable[[str], str]
+"""Called with the metric name prefix; returns Prometheus text"""
+
+
+def format_labels(**labels: Any) -> str:
+    """Render ``name="value"`` label pairs, escaped for the text format"""
+    return ",".join(
+        f'{name}="{_escape_label(str(value))}"' for name, value in labels.items()
+    )
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def format_metric_family(
+    name: str,
+    kind: str,
+    documentation: str,
+    samples: Iterable[Tuple[Dict[str, Any], float]],
+) -> str:
+    """
+    Render one counter or gauge in the Prometheus text format.
+
+    Args:
+        name: Full metric name, including the prefix
+        kind: "counter" or "gauge"
+        documentation: HELP text
+        samples: (labels, value) pairs
+
+    Returns:
+        HELP and TYPE lines followed by one line per sample
+    """
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        series = f"{name}{{{format_labels(**labels)}}}" if labels else name
+        lines.append(f"{series} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket histogram of durations in seconds.
+
+    Memory stays constant however many values are observed; percentiles are
+    estimated as the upper bound of the bucket they fall in.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "sum", "max")
+
+    def __init__(self, bounds: Tuple[float, ...] = DEFAULT_BUCKETS_SECONDS):
+        self.bounds = bounds
+        # One more bucket for values above the last bound
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> float:
+        return bucket_percentile(self.bounds, self.counts, self.count, self.max, q)
+
+    def summary(self) -> Dict[str, float]:
+        """Count, total, mean, max and p50/p95/p99 in seconds"""
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "max": self.max,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+        }
+
+
+def format_histogram_family(
+    name: str,
+    documentation: str,
+    series: Iterable[Tuple[Dict[str, Any], LatencyHistogram]],
+) -> str:
+    """
+    Render latency histograms in the Prometheus text format.
+
+    Args:
+        name: Full metric name, including the prefix
+        documentation: HELP text
+        series: (labels, histogram) pairs
+
+    Returns:
+        HELP and TYPE lines followed by the cumulative buckets, sum and count
+        of each histogram
+    """
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} histogram"]
+    for labels, histogram in series:
+        cumulative = 0
+        for bound, count in zip(histogram.bounds + (float("inf"),), histogram.counts):
+            cumulative += count
+            bucket_labels = format_labels(**labels, le=_format_value(bound))
+            lines.append(f"{name}_bucket{{{bucket_labels}}} {cumulative}")
+        suffix = f"{{{format_labels(**labels)}}}" if labels else ""
+        lines.append(f"{name}_sum{suffix} {_format_value(histogram.sum)}")
+        lines.append(f"{name}_count{suffix} {histogram.count}")
+    return "\n".join(lines) + "\n"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(
+                f"Metric {self.name} takes labels {self.labelnames}, got {tuple(labels)}"
+            )
+        try:
+            return tuple(str(labels[name]) for name in self.labelnames)
+        except KeyError as e:
+            raise ValueError(
+                f"Metric {self.name} takes labels {self.labelnames}, got {tuple(labels)}"
+            ) from e
+
+    def _labels(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def render(self, prefix: str) -> str:
+        with self._lock:
+            samples = [
+                (self._labels(key), value) for key, value in self._values.items()
+            ]
+        return format_metric_family(
+            f"{prefix}_{self.name}",
+            self.kind,
+            self.documentation,
+            sorted(samples, key=_by_labels),
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+def _by_labels(sample: Tuple[Dict[str, str], Any]) -> Tuple[str, ...]:
+    return tuple(sample[0].values())
+
+
+class Counter(_Metric):
+    """Monotonically increasing total per label set"""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        if amount < 0:
+            raise ValueError(f"Counter {self.name} cannot decrease")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    """Current value per label set"""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0)
+
+
+class Histogram(_Metric):
+    """Latency histogram in seconds per label set"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...],
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS_SECONDS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            histogram = self._values.get(key)
+            if histogram is None:
+                histogram = self._values[key] = LatencyHistogram(self.buckets)
+            histogram.observe(value)
+
+    def summary(self, **labels: Any) -> Optional[Dict[str, float]]:
+        """Count, total, mean, max and p50/p95/p99 for one label set"""
+        key = self._key(labels)
+        with self._lock:
+            histogram = self._values.get(key)
+            return histogram.summary() if histogram is not None else None
+
+    def summaries(self) -> List[Dict[str, Any]]:
+        """Labels and summary of every label set observed"""
+        with self._lock:
+            return [
+                {**self._labels(key), **histogram.summary()}
+                for key, histogram in sorted(self._values.items())
+            ]
+
+    def render(self, prefix: str) -> str:
+        with self._lock:
+            return format_histogram_family(
+                f"{prefix}_{self.name}",
+                self.documentation,
+                [
+                    (self._labels(key), histogram)
+                    for key, histogram in sorted(self._values.items())
+                ],
+            )
+
+
+class MetricsRegistry:
+    """
+    Named metrics of one process, exported with a common name prefix.
+
+    ``counter``, ``gauge`` and ``histogram`` return the existing metric when
+    one is already registered under the name, so modules can declare the
+    metrics they record without coordinating.
+    """
+
+    def __init__(self, prefix: str = "omnicoreagent"):
+        self.prefix = prefix
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Collector] = []
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(
+                    name, documentation, tuple(labelnames), **kwargs
+                )
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(
+                    f"Metric {name} is already registered as a {metric.kind} "
+                    f"with labels {metric.labelnames}"
+                )
+            return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Iterable[str] = ()
+    ) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Iterable[str] = ()
+    ) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS_SECONDS,
+    ) -> Histogram:
+        return self._get_or_create(
+            Histogram, name, documentation, labelnames, buckets=buckets
+        )
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def register_collector(self, collector: Collector) -> Collector:
+        """
+        Render ``collector(prefix)`` after the registry's own metrics on export.
+
+        Collectors read state at scrape time, e.g. queue depths or connection
+        counts, instead of having it pushed on every change.
+        """
+        with self._lock:
+            if collector not in self._collectors:
+                self._collectors.append(collector)
+        return collector
+
+    def unregister_collector(self, collector: Collector) -> None:
+        with self._lock:
+            self._collectors = [c for c in self._collectors if c != collector]
+
+    def export_prometheus(self) -> str:
+        """Render every metric and collector in the Prometheus text format"""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+            collectors = list(self._collectors)
+        parts = [metric.render(self.prefix) for metric in metrics]
+        for collector in collectors:
+            try:
+                parts.append(collector(self.prefix))
+            except Exception as e:
+                logger.error(f"Metrics collector {collector!r} failed: {e}")
+        return "".join(parts)
+
+    def reset(self) -> None:
+        """Clear recorded values; metrics and collectors stay registered"""
+        for metric in list(self._metrics.values()):
+            metric.clear()
+
+
+def _agent_of(span: Span) -> str:
+    while span is not None:
+        agent = span.attributes.get("agent")
+        if agent:
+            return str(agent)
+        span = span.parent
+    return ""
+
+
+class MetricsSpanProcessor(SpanProcessor):
+    """
+    Records the duration of finished hot-path spans in a MetricsRegistry.
+
+    Tool and memory spans carry no agent name; it is taken from the closest
+    enclosing span that has one.
+    """
+
+    def __init__(self, registry: MetricsRegistry):
+        self.registry = registry
+        self.agent_runs = registry.histogram(
+            "agent_run_seconds", "Duration of agent runs.", ("agent", "status")
+        )
+        self.llm_calls = registry.histogram(
+            "llm_call_seconds", "Duration of LLM requests.", ("agent", "status")
+        )
+        self.tool_calls = registry.histogram(
+            "tool_call_seconds",
+            "Duration of tool calls.",
+            ("agent", "tool", "status"),
+        )
+        self.memory_ops = registry.histogram(
+            "memory_store_operation_seconds",
+            "Duration of memory store operations.",
+            ("store", "operation", "status"),
+        )
+        self.event_ops = registry.histogram(
+            "event_store_operation_seconds",
+            "Duration of event store operations.",
+            ("store", "operation", "status"),
+        )
+        self.guardrail_checks = registry.histogram(
+            "guardrail_check_seconds",
+            "Duration of guardrail checks.",
+            ("target", "status"),
+        )
+
+    def on_end(self, span: Span) -> None:
+        name = span.name
+        seconds = (span.end_ns - span.start_ns) / 1e9
+        status = "error" if span.error is not None else "ok"
+        attributes = span.attributes
+        if name == "tool.execute":
+            self.tool_calls.observe(
+                seconds,
+                agent=_agent_of(span),
+                tool=attributes.get("tool", ""),
+                status=status,
+            )
+        elif name == "memory.read" or name == "memory.write":
+            self.memory_ops.observe(
+                seconds,
+                store=attributes.get("store", ""),
+                operation=name[7:],
+                status=status,
+            )
+        elif name == "llm.call":
+            self.llm_calls.observe(seconds, agent=_agent_of(span), status=status)
+        elif name == "event.emit":
+            self.event_ops.observe(
+                seconds,
+                store=attributes.get("store", ""),
+                operation="append",
+                status=status,
+            )
+        elif name == "agent.run":
+            self.agent_runs.observe(seconds, agent=_agent_of(span), status=status)
+        elif name == "guardrail.check":
+            self.guardrail_checks.observe(
+                seconds, target=attributes.get("target", ""), status=status
+            )
+
+
+_default_registry: Optional[MetricsRegistry] = None
+
+
+def get_default_metrics_registry() -> MetricsRegistry:
+    """Registry used when none is given explicitly"""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = MetricsRegistry()
+    return _default_registry
+
+
+def enable_metrics(
+    registry: Optional[MetricsRegistry] = None, usage_ledger: Any = None
+) -> MetricsRegistry:
+    """
+    Start recording agent metrics into ``registry``.
+
+    Registers a MetricsSpanProcessor with the global tracer, which enables the
+    hot-path spans, and exports the usage ledger's per-tenant and per-agent
+    token counters with the registry. Calling it again is a no-op.
+
+    Args:
+        registry: Registry to record into (defaults to the process-wide one)
+        usage_ledger: Ledger whose token counters are exported (defaults to
+            the one agents use when not given their own)
+
+    Returns:
+        The registry
+    """
+    registry = registry or get_default_metrics_registry()
+    if not any(
+        isinstance(processor, MetricsSpanProcessor) and processor.registry is registry
+        for processor in tracer.processors
+    ):
+        tracer.add_processor(MetricsSpanProcessor(registry))
+    if usage_ledger is None:
+        from omnicoreagent.core.usage_ledger import get_default_usage_ledger
+
+        usage_ledger = get_default_usage_ledger()
+    registry.register_collector(usage_ledger.export_prometheus)
+    return registry
+
+
+def disable_metrics(registry: Optional[MetricsRegistry] = None) -> None:
+    """Stop feeding ``registry`` from spans; recorded values are kept"""
+    registry = registry or get_default_metrics_registry()
+    for processor in tracer.processors:
+        if (
+            isinstance(processor, MetricsSpanProcessor)
+            and processor.registry is registry
+        ):
+            tracer.remove_processor(processor)
+
+
+def metrics_asgi_app(registry: Optional[MetricsRegistry] = None):
+    """
+    ASGI application serving ``registry`` in the Prometheus text format.
+
+    Answers GET and HEAD on any path, so it can be mounted under a prefix,
+    e.g. ``app.mount("/metrics", metrics_asgi_app())`` in Starlette or
+    FastAPI, or served on its own by uvicorn.
+
+    Args:
+        registry: Registry to serve (defaults to the process-wide one)
+
+    Returns:
+        An ASGI 3 application
+    """
+    registry = registry or get_default_metrics_registry()
+
+    async def app(scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+
+        method = scope.get("method", "GET")
+        if method not in ("GET", "HEAD"):
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 405,
+                    "headers": [(b"allow", b"GET, HEAD"), (b"content-length", b"0")],
+                }
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        body = registry.export_prometheus().encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", PROMETHEUS_CONTENT_TYPE.encode()),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            }
+        )
+        await send(
+            {"type": "http.response.body", "body": b"" if method == "HEAD" else body}
+        )
+
+    return app
@@ -0,0 +1,196 @@
+"""
+Process-wide caches for Agent Skills.
+
+- SkillCatalogCache: parsed SKILL.md metadata per skills directory, reused
+  until a stat of the directory or of a SKILL.md file shows a change
+- SkillFileCache: LRU cache of skill file contents, bounded by entry count
+  and total size, revalidated with a stat on every read
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+import os
+import threading
+
+from omnicoreagent.core.skills.models import SkillMetadata
+from omnicoreagent.core.utils import logger
+
+# (inode, modification time in ns, size) of a file or directory
+StatKey = Tuple[int, int, int]
+
+
+def stat_key(path: Path) -> Optional[StatKey]:
+    """Identity of ``path``'s current contents, or None if it does not exist"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class SkillCatalogCache:
+    """
+    Parsed skill metadata, shared by every SkillManager in the process.
+
+    A catalog is keyed by the skills root and a signature made of the stat
+    of the root and of every ``<skill>/SKILL.md``. Checking the signature
+    costs one directory listing and a stat per skill; only SKILL.md files
+    whose stat changed are read and parsed again.
+    """
+
+    def __init__(self):
+        self._catalogs: Dict[Path, Tuple[tuple, Dict[str, SkillMetadata]]] = {}
+        self._files: Dict[Path, Tuple[StatKey, Optional[SkillMetadata]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def signature(skills_root: Path) -> tuple:
+        """Current signature of a skills directory"""
+        entries = []
+        with os.scandir(skills_root) as it:
+            for entry in it:
+                if entry.is_dir():
+                    entries.append(
+                        (entry.name, stat_key(Path(entry.path) / "SKILL.md"))
+                    )
+        entries.sort()
+        return (stat_key(skills_root), tuple(entries))
+
+    def load(
+        self,
+        skills_root: Path,
+        parse: Callable[[Path], Optional[SkillMetadata]],
+    ) -> Tuple[tuple, Dict[str, SkillMetadata]]:
+        """
+        Skills found under ``skills_root``, parsing only changed SKILL.md files.
+
+        Args:
+            skills_root: Resolved skills directory
+            parse: Loads the metadata of one skill directory
+
+        Returns:
+            The directory signature and the skills by name
+        """
+        signature = self.signature(skills_root)
+        with self._lock:
+            cached = self._catalogs.get(skills_root)
+            if cached is not None and cached[0] == signature:
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+            skills: Dict[str, SkillMetadata] = {}
+            for name, key in signature[1]:
+                skill_dir = skills_root / name
+                skill_md = skill_dir / "SKILL.md"
+                if key is None:
+                    continue
+                known = self._files.get(skill_md)
+                if known is not None and known[0] == key:
+                    metadata = known[1]
+                else:
+                    try:
+                        metadata = parse(skill_dir)
+                    except Exception as e:
+                        logger.warning(f"Failed to load skill {name}: {e}")
+                        metadata = None
+                    self._files[skill_md] = (key, metadata)
+                if metadata is not None:
+                    skills[metadata.name] = metadata
+
+            self._catalogs[skills_root] = (signature, skills)
+            return signature, skills
+
+    def invalidate(self, skills_root: Optional[Path] = None):
+        """Forget the catalog of ``skills_root`` (every catalog if None)"""
+        with self._lock:
+            if skills_root is None:
+                self._catalogs.clear()
+                self._files.clear()
+                return
+            self._catalogs.pop(skills_root, None)
+            for path in [p for p in self._files if p.is_relative_to(skills_root)]:
+                del self._files[path]
+
+
+class SkillFileCache:
+    """
+    LRU cache of skill file contents.
+
+    Entries are validated against the file's stat on every read, so edited
+    files are picked up immediately. Files larger than ``max_file_bytes`` are
+    read from disk each time rather than cached.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 16 * 1024 * 1024,
+        max_file_bytes: int = 1024 * 1024,
+    ):
+        """
+        Initialize the SkillFileCache.
+
+        Args:
+            max_entries: Files kept
+            max_bytes: Total size of the files kept
+            max_file_bytes: Largest file that is cached
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_file_bytes = max_file_bytes
+        self._entries: OrderedDict[Path, Tuple[StatKey, str]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def read(self, path: Path) -> str:
+        """Text of ``path``, served from the cache while the file is unchanged"""
+        key = stat_key(path)
+        if key is None:
+            raise FileNotFoundError(path)
+        with self._lock:
+            cached = self._entries.get(path)
+            if cached is not None and cached[0] == key:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+
+        content = path.read_text(encoding="utf-8")
+        if key[2] > self.max_file_bytes:
+            return content
+
+        with self._lock:
+            previous = self._entries.pop(path, None)
+            if previous is not None:
+                self._size -= previous[0][2]
+            self._entries[path] = (key, content)
+            self._size += key[2]
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._size > self.max_bytes
+            ):
+                _, (evicted_key, _) = self._entries.popitem(last=False)
+                self._size -= evicted_key[2]
+        return content
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+skill_catalog_cache = SkillCatalogCache()
+skill_file_cache = SkillFileCache()
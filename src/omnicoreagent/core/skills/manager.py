@@ -6,12 +6,23 @@ Handles:
 - Parsing SKILL.md YAML frontmatter
 - Runtime validation when tools access skills
 - Generating XML context for agent prompts
+
+Parsed skills and skill file contents are cached process-wide (see
+``omnicoreagent.core.skills.cache``), so constructing many agents with
+skills enabled scans the skills directory with stats only.
 """
 
+import asyncio
 import re
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from omnicoreagent.core.utils import logger
+from omnicoreagent.core.skills.cache import (
+    SkillCatalogCache,
+    SkillFileCache,
+    skill_catalog_cache,
+    skill_file_cache,
+)
 from omnicoreagent.core.skills.models import SkillMetadata
 
 
@@ -25,52 +36,132 @@ class SkillManager:
         xml_context = manager.get_skills_context_xml()
     """
 
-    def __init__(self, skills_root: Path = Path(".agents/skills")):
+    def __init__(
+        self,
+        skills_root: Path = Path(".agents/skills"),
+        catalog_cache: Optional[SkillCatalogCache] = None,
+        file_cache: Optional[SkillFileCache] = None,
+    ):
         """
         Initialize the SkillManager.
 
         Args:
             skills_root: Root directory containing skill subdirectories.
                          Each subdirectory should contain a SKILL.md file.
+            catalog_cache: Cache of parsed skills (defaults to the
+                           process-wide cache)
+            file_cache: Cache of skill file contents (defaults to the
+                        process-wide cache)
         """
         self.skills_root = skills_root.resolve()
         self.skills: Dict[str, SkillMetadata] = {}
+        self.catalog_cache = catalog_cache or skill_catalog_cache
+        self.file_cache = file_cache or skill_file_cache
+        self._signature: Optional[tuple] = None
+        self._context_xml: Optional[str] = None
+        self._watch_task: Optional[asyncio.Task] = None
 
     def discover_skills(self) -> List[SkillMetadata]:
         """
         Scan the skills directory and load metadata for all valid skills.
 
+        Skills whose SKILL.md has not changed since it was last parsed (by
+        any SkillManager in the process) are taken from the catalog cache.
+
         Returns:
             List of SkillMetadata for all discovered skills.
         """
-        self.skills.clear()
+        self._install(*self._scan())
+        return list(self.skills.values())
 
+    def _scan(self) -> Tuple[Optional[tuple], Dict[str, SkillMetadata]]:
+        """Signature and skills of the skills directory; changes no state"""
         if not self.skills_root.exists():
             logger.debug(f"Skills directory not found: {self.skills_root}")
-            return []
+            return None, {}
 
         if not self.skills_root.is_dir():
             logger.warning(f"Skills root is not a directory: {self.skills_root}")
-            return []
-
-        for skill_dir in self.skills_root.iterdir():
-            if not skill_dir.is_dir():
-                continue
-
-            skill_md = skill_dir / "SKILL.md"
-            if not skill_md.exists():
-                logger.debug(f"Skipping {skill_dir.name}: no SKILL.md found")
-                continue
+            return None, {}
+
+        signature, skills = self.catalog_cache.load(
+            self.skills_root, self._parse_skill_dir
+        )
+        return signature, dict(skills)
+
+    def _scan_if_changed(
+        self,
+    ) -> Optional[Tuple[Optional[tuple], Dict[str, SkillMetadata]]]:
+        """``_scan()`` if the directory changed since the last scan, else None"""
+        current = (
+            self.catalog_cache.signature(self.skills_root)
+            if self.skills_root.is_dir()
+            else None
+        )
+        if current == self._signature:
+            return None
+        return self._scan()
+
+    def _install(
+        self, signature: Optional[tuple], skills: Dict[str, SkillMetadata]
+    ) -> None:
+        # Swapped in whole so readers never see a half-built catalog.
+        self.skills = skills
+        self._signature = signature
+        self._context_xml = None
+
+    def _parse_skill_dir(self, skill_dir: Path) -> Optional[SkillMetadata]:
+        metadata = self._load_skill_metadata(skill_dir)
+        if metadata:
+            logger.info(f"Loaded skill: {metadata.name}")
+        return metadata
+
+    def refresh(self) -> bool:
+        """
+        Rediscover skills if the skills directory changed since the last scan.
 
+        Returns:
+            True if skills were added, removed or edited.
+        """
+        scan = self._scan_if_changed()
+        if scan is None:
+            return False
+        self._install(*scan)
+        return True
+
+    def start_watching(self, interval: float = 2.0) -> None:
+        """Poll the skills directory every ``interval`` seconds and reload changes"""
+        if self._watch_task is None or self._watch_task.done():
+            self._watch_task = asyncio.create_task(self._watch_loop(interval))
+
+    async def stop_watching(self) -> None:
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
+
+    async def _watch_loop(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
             try:
-                metadata = self._load_skill_metadata(skill_dir)
-                if metadata:
-                    self.skills[metadata.name] = metadata
-                    logger.info(f"Loaded skill: {metadata.name}")
+                # Only the filesystem scan runs in the thread; the catalog is
+                # replaced on the event loop.
+                scan = await asyncio.to_thread(self._scan_if_changed)
+                if scan is not None:
+                    self._install(*scan)
+                    logger.info(
+                        f"Reloaded skills from {self.skills_root}: "
+                        f"{len(self.skills)} skills"
+                    )
             except Exception as e:
-                logger.warning(f"Failed to load skill {skill_dir.name}: {e}")
+                logger.warning(f"Failed to reload skills: {e}")
 
-        return list(self.skills.values())
+    def read_skill_file(self, path: Path) -> str:
+        """Contents of a file inside a skill, served from the file cache"""
+        return self.file_cache.read(path)
 
     def validate_skill(self, skill_name: str) -> Path:
         """
@@ -125,6 +216,8 @@ class SkillManager:
         """
         if not self.skills:
             return ""
+        if self._context_xml is not None:
+            return self._context_xml
 
         lines = ["<available_skills>"]
         for skill in self.skills.values():
@@ -135,7 +228,8 @@ class SkillManager:
             lines.append("  </skill>")
         lines.append("</available_skills>")
 
-        return "\n".join(lines)
+        self._context_xml = "\n".join(lines)
+        return self._context_xml
 
     def _load_skill_metadata(self, skill_dir: Path) -> Optional[SkillMetadata]:
         """
@@ -98,7 +98,7 @@ def build_skill_tools(
             return {"status": "error", "message": f"Not a file: {file_path}"}
 
         try:
-            content = target.read_text(encoding="utf-8")
+            content = skill_manager.read_skill_file(target)
             return {
                 "status": "success",
                 "data": content,
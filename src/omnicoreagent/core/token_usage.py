@@ -217,6 +217,8 @@ class UsageLimits:
             )
 
 
+# Process-wide counters used by the MCP client prompt/resource helpers.
+# Agents account usage per tenant, agent and session in core.usage_ledger.
 session_stats = {
     "used_requests": 0,
     "used_tokens": 0,
@@ -0,0 +1,541 @@
+"""
+Artifact store for large tool outputs.
+
+Tool results over a size threshold are written to an artifact store instead
+of being inlined into the conversation. The agent's history and the next
+prompt carry a short preview and the artifact id; the agent pages through or
+searches the full output with the ``read_artifact`` and ``grep_artifact``
+tools.
+
+- InMemoryArtifactStore: bounded LRU in the process
+- LocalArtifactStore: one file per artifact, read and searched through mmap
+- RedisArtifactStore: one key per artifact, paged with GETRANGE
+"""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, List, Optional, Tuple, Union
+import asyncio
+import hashlib
+import json
+import mmap
+import os
+import re
+import tempfile
+
+from decouple import config as decouple_config
+
+from omnicoreagent.core.tools.local_tools_registry import ToolRegistry
+from omnicoreagent.core.utils import logger
+
+ARTIFACT_TOOL_NAMES = frozenset({"read_artifact", "grep_artifact"})
+MAX_PAGE_BYTES = 16 * 1024
+MAX_GREP_LINE_BYTES = 300
+MAX_GREP_PATTERN_CHARS = 256
+
+_ARTIFACT_ID = re.compile(r"art_[0-9a-f]{32}")
+
+
+def artifact_id_for(content: bytes) -> str:
+    """Content-addressed id, so storing the same output twice is free"""
+    return "art_" + hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def grep_bytes(
+    buf: Union[bytes, mmap.mmap],
+    pattern: str,
+    max_matches: int = 20,
+    ignore_case: bool = False,
+    regex: bool = True,
+) -> List[Tuple[int, str]]:
+    """
+    Lines of ``buf`` matching a regular expression or literal text.
+
+    Scans can be slow, so the stores run this in a worker thread.
+
+    Args:
+        buf: UTF-8 content, either in memory or memory-mapped
+        pattern: Regular expression, or literal text if ``regex`` is false
+        max_matches: Matching lines returned at most
+        ignore_case: Match case-insensitively
+        regex: Treat ``pattern`` as a regular expression
+
+    Returns:
+        (byte offset of the line, line text) for each matching line; long
+        lines are cut to a window around the match
+
+    Raises:
+        re.error: If the pattern is invalid or longer than
+            ``MAX_GREP_PATTERN_CHARS``
+    """
+    if len(pattern) > MAX_GREP_PATTERN_CHARS:
+        raise re.error(f"pattern longer than {MAX_GREP_PATTERN_CHARS} characters")
+    if not regex:
+        pattern = re.escape(pattern)
+    compiled = re.compile(pattern.encode("utf-8"), re.IGNORECASE if ignore_case else 0)
+    matches: List[Tuple[int, str]] = []
+    last_line = -1
+    for match in compiled.finditer(buf):
+        line_start = buf.rfind(b"\n", 0, match.start()) + 1
+        if line_start == last_line:
+            continue
+        last_line = line_start
+        line_end = buf.find(b"\n", match.end())
+        if line_end == -1:
+            line_end = len(buf)
+        if line_end - line_start > MAX_GREP_LINE_BYTES:
+            half = MAX_GREP_LINE_BYTES // 2
+            start = max(line_start, match.start() - half)
+            end = min(line_end, start + MAX_GREP_LINE_BYTES)
+        else:
+            start, end = line_start, line_end
+        matches.append((start, buf[start:end].decode("utf-8", errors="ignore")))
+        if len(matches) >= max_matches:
+            break
+    return matches
+
+
+class ArtifactStore(ABC):
+    """
+    Storage for large tool outputs.
+
+    Artifacts are immutable UTF-8 blobs addressed by ``artifact_id_for``.
+    Offsets and lengths are in bytes.
+    """
+
+    @abstractmethod
+    async def put(self, content: bytes) -> str:
+        """Store ``content`` and return its artifact id"""
+
+    @abstractmethod
+    async def size(self, artifact_id: str) -> Optional[int]:
+        """Size in bytes, or None if the artifact does not exist"""
+
+    @abstractmethod
+    async def read(
+        self, artifact_id: str, offset: int = 0, length: int = MAX_PAGE_BYTES
+    ) -> Optional[str]:
+        """Text of ``length`` bytes starting at ``offset``, or None if missing"""
+
+    @abstractmethod
+    async def grep(
+        self,
+        artifact_id: str,
+        pattern: str,
+        max_matches: int = 20,
+        ignore_case: bool = False,
+        regex: bool = True,
+    ) -> Optional[List[Tuple[int, str]]]:
+        """Matching lines (see ``grep_bytes``), or None if missing"""
+
+    @abstractmethod
+    async def delete(self, artifact_id: str) -> None:
+        """Remove an artifact if it exists"""
+
+
+class InMemoryArtifactStore(ArtifactStore):
+    """Artifacts kept in the process, least recently used dropped past ``max_bytes``"""
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._artifacts: OrderedDict[str, bytes] = OrderedDict()
+        self._size = 0
+
+    def _get(self, artifact_id: str) -> Optional[bytes]:
+        content = self._artifacts.get(artifact_id)
+        if content is not None:
+            self._artifacts.move_to_end(artifact_id)
+        return content
+
+    async def put(self, content: bytes) -> str:
+        artifact_id = artifact_id_for(content)
+        if self._get(artifact_id) is not None:
+            return artifact_id
+        self._artifacts[artifact_id] = content
+        self._size += len(content)
+        while len(self._artifacts) > 1 and self._size > self.max_bytes:
+            _, evicted = self._artifacts.popitem(last=False)
+            self._size -= len(evicted)
+        return artifact_id
+
+    async def size(self, artifact_id: str) -> Optional[int]:
+        content = self._get(artifact_id)
+        return None if content is None else len(content)
+
+    async def read(
+        self, artifact_id: str, offset: int = 0, length: int = MAX_PAGE_BYTES
+    ) -> Optional[str]:
+        content = self._get(artifact_id)
+        if content is None:
+            return None
+        return content[offset : offset + length].decode("utf-8", errors="ignore")
+
+    async def grep(
+        self,
+        artifact_id: str,
+        pattern: str,
+        max_matches: int = 20,
+        ignore_case: bool = False,
+        regex: bool = True,
+    ) -> Optional[List[Tuple[int, str]]]:
+        content = self._get(artifact_id)
+        if content is None:
+            return None
+        return await asyncio.to_thread(
+            grep_bytes, content, pattern, max_matches, ignore_case, regex
+        )
+
+    async def delete(self, artifact_id: str) -> None:
+        content = self._artifacts.pop(artifact_id, None)
+        if content is not None:
+            self._size -= len(content)
+
+
+class LocalArtifactStore(ArtifactStore):
+    """
+    One file per artifact under ``base_dir``.
+
+    Pages are read with a seek, and grep scans a memory map of the file, so
+    neither loads the whole artifact into Python objects.
+    """
+
+    def __init__(self, base_dir: Union[str, Path] = "artifacts"):
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, artifact_id: str) -> Path:
+        if not _ARTIFACT_ID.fullmatch(artifact_id):
+            raise ValueError(f"Invalid artifact id: {artifact_id}")
+        return self.base_dir / f"{artifact_id}.txt"
+
+    def _put(self, content: bytes) -> str:
+        artifact_id = artifact_id_for(content)
+        path = self._path(artifact_id)
+        if path.exists():
+            return artifact_id
+        fd, tmp = tempfile.mkstemp(dir=self.base_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return artifact_id
+
+    def _size(self, artifact_id: str) -> Optional[int]:
+        try:
+            return self._path(artifact_id).stat().st_size
+        except (OSError, ValueError):
+            return None
+
+    def _read(self, artifact_id: str, offset: int, length: int) -> Optional[str]:
+        try:
+            with open(self._path(artifact_id), "rb") as f:
+                f.seek(offset)
+                return f.read(length).decode("utf-8", errors="ignore")
+        except (OSError, ValueError):
+            return None
+
+    def _grep(
+        self,
+        artifact_id: str,
+        pattern: str,
+        max_matches: int,
+        ignore_case: bool,
+        regex: bool,
+    ) -> Optional[List[Tuple[int, str]]]:
+        try:
+            f = open(self._path(artifact_id), "rb")
+        except (OSError, ValueError):
+            return None
+        with f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                return grep_bytes(buf, pattern, max_matches, ignore_case, regex)
+
+    async def put(self, content: bytes) -> str:
+        return await asyncio.to_thread(self._put, content)
+
+    async def size(self, artifact_id: str) -> Optional[int]:
+        return await asyncio.to_thread(self._size, artifact_id)
+
+    async def read(
+        self, artifact_id: str, offset: int = 0, length: int = MAX_PAGE_BYTES
+    ) -> Optional[str]:
+        return await asyncio.to_thread(self._read, artifact_id, offset, length)
+
+    async def grep(
+        self,
+        artifact_id: str,
+        pattern: str,
+        max_matches: int = 20,
+        ignore_case: bool = False,
+        regex: bool = True,
+    ) -> Optional[List[Tuple[int, str]]]:
+        return await asyncio.to_thread(
+            self._grep, artifact_id, pattern, max_matches, ignore_case, regex
+        )
+
+    async def delete(self, artifact_id: str) -> None:
+        try:
+            await asyncio.to_thread(self._path(artifact_id).unlink, True)
+        except ValueError:
+            pass
+
+
+class RedisArtifactStore(ArtifactStore):
+    """One Redis key per artifact, expiring ``ttl`` seconds after it was stored"""
+
+    def __init__(
+        self,
+        redis_url: str,
+        key_prefix: str = "omnicoreagent:artifact:",
+        ttl: int = 24 * 60 * 60,
+    ):
+        import redis.asyncio as redis
+
+        self._client = redis.from_url(redis_url)
+        self.key_prefix = key_prefix
+        self.ttl = ttl
+
+    def _key(self, artifact_id: str) -> str:
+        return f"{self.key_prefix}{artifact_id}"
+
+    async def put(self, content: bytes) -> str:
+        artifact_id = artifact_id_for(content)
+        await self._client.set(self._key(artifact_id), content, ex=self.ttl or None)
+        return artifact_id
+
+    async def size(self, artifact_id: str) -> Optional[int]:
+        if not await self._client.exists(self._key(artifact_id)):
+            return None
+        return await self._client.strlen(self._key(artifact_id))
+
+    async def read(
+        self, artifact_id: str, offset: int = 0, length: int = MAX_PAGE_BYTES
+    ) -> Optional[str]:
+        if length <= 0:
+            return "" if await self.size(artifact_id) is not None else None
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.exists(self._key(artifact_id))
+            pipe.getrange(self._key(artifact_id), offset, offset + length - 1)
+            exists, content = await pipe.execute()
+        if not exists:
+            return None
+        return content.decode("utf-8", errors="ignore")
+
+    async def grep(
+        self,
+        artifact_id: str,
+        pattern: str,
+        max_matches: int = 20,
+        ignore_case: bool = False,
+        regex: bool = True,
+    ) -> Optional[List[Tuple[int, str]]]:
+        content = await self._client.get(self._key(artifact_id))
+        if content is None:
+            return None
+        return await asyncio.to_thread(
+            grep_bytes, content, pattern, max_matches, ignore_case, regex
+        )
+
+    async def delete(self, artifact_id: str) -> None:
+        await self._client.delete(self._key(artifact_id))
+
+
+@lru_cache(maxsize=None)
+def get_artifact_store(name: str) -> ArtifactStore:
+    """
+    Process-wide store for an ``artifact_store`` name.
+
+    Environment:
+        ARTIFACT_STORE_DIR: Directory of the "local" store (default "artifacts")
+        ARTIFACT_STORE_REDIS_URL: Redis of the "redis" store (falls back to
+            REDIS_URL)
+        ARTIFACT_STORE_MAX_BYTES: Size limit of the "in_memory" store
+    """
+    if name == "in_memory":
+        return InMemoryArtifactStore(
+            max_bytes=decouple_config(
+                "ARTIFACT_STORE_MAX_BYTES", default=256 * 1024 * 1024, cast=int
+            )
+        )
+    if name == "local":
+        return LocalArtifactStore(
+            decouple_config("ARTIFACT_STORE_DIR", default="artifacts")
+        )
+    if name == "redis":
+        redis_url = decouple_config(
+            "ARTIFACT_STORE_REDIS_URL", default=None
+        ) or decouple_config("REDIS_URL", default=None)
+        if not redis_url:
+            raise ValueError(
+                "ARTIFACT_STORE_REDIS_URL or REDIS_URL is required for the redis artifact store"
+            )
+        return RedisArtifactStore(redis_url)
+    raise ValueError(f"Unsupported artifact store: {name}")
+
+
+class ToolOutputSpiller:
+    """
+    Replaces tool outputs over ``threshold_chars`` with a preview and an artifact handle.
+
+    The full output goes to the store once; the conversation history and every
+    later prompt only carry the first ``preview_chars`` characters.
+    """
+
+    def __init__(
+        self,
+        store: ArtifactStore,
+        threshold_chars: int = 20000,
+        preview_chars: int = 2000,
+    ):
+        self.store = store
+        self.threshold_chars = threshold_chars
+        self.preview_chars = min(preview_chars, threshold_chars)
+
+    async def spill(self, tool_name: str, data: Any) -> Any:
+        """
+        ``data`` itself if it is small, otherwise its preview and artifact handle.
+
+        Args:
+            tool_name: Tool that produced the output
+            data: Tool output as returned by the tool
+
+        Returns:
+            The output to record in history and the observation
+        """
+        if data is None or tool_name in ARTIFACT_TOOL_NAMES:
+            return data
+        if isinstance(data, str):
+            text = data
+        elif isinstance(data, (dict, list)):
+            text = json.dumps(data, ensure_ascii=False)
+        else:
+            text = str(data)
+        if len(text) <= self.threshold_chars:
+            return data
+
+        content = text.encode("utf-8")
+        try:
+            artifact_id = await self.store.put(content)
+        except Exception as e:
+            logger.warning(f"Failed to store output of {tool_name} as artifact: {e}")
+            return data
+        return (
+            f"{text[: self.preview_chars]}\n"
+            f"[Output truncated: the full {len(content)}-byte output of {tool_name} "
+            f"is stored as artifact {artifact_id}. Use read_artifact to page "
+            f"through it or grep_artifact to search it.]"
+        )
+
+
+def build_tool_registry_artifact_tools(
+    store: ArtifactStore, registry: ToolRegistry
+) -> ToolRegistry:
+    """Register the tools that page through and search stored artifacts"""
+
+    @registry.register_tool(
+        name="read_artifact",
+        description="""
+        Read part of a large tool output that was stored as an artifact.
+
+        Tool outputs that are too large for the conversation are replaced by a
+        preview and an artifact id. Use this to read the rest, one page at a time.
+        """,
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "artifact_id": {
+                    "type": "string",
+                    "description": "Artifact id from the truncated output, e.g. 'art_3f2a...'.",
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Byte offset to start reading at (default 0).",
+                },
+                "length": {
+                    "type": "integer",
+                    "description": f"Bytes to read (default and maximum {MAX_PAGE_BYTES}).",
+                },
+            },
+            "required": ["artifact_id"],
+            "additionalProperties": False,
+        },
+    )
+    async def read_artifact(
+        artifact_id: str, offset: int = 0, length: int = MAX_PAGE_BYTES
+    ) -> str:
+        offset = max(int(offset), 0)
+        length = min(max(int(length), 0), MAX_PAGE_BYTES)
+        total = await store.size(artifact_id)
+        if total is None:
+            return f"Artifact not found: {artifact_id}"
+        page = await store.read(artifact_id, offset, length)
+        end = min(offset + length, total)
+        return f"[{artifact_id} bytes {offset}-{end} of {total}]\n{page}"
+
+    @registry.register_tool(
+        name="grep_artifact",
+        description="""
+        Search a large tool output that was stored as an artifact.
+
+        Returns the matching lines with their byte offsets; pass an offset to
+        read_artifact to see the surrounding content.
+        """,
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "artifact_id": {
+                    "type": "string",
+                    "description": "Artifact id from the truncated output.",
+                },
+                "pattern": {
+                    "type": "string",
+                    "description": f"Text to search for (at most {MAX_GREP_PATTERN_CHARS} characters).",
+                },
+                "regex": {
+                    "type": "boolean",
+                    "description": "Treat pattern as a regular expression (default false: literal text).",
+                },
+                "max_matches": {
+                    "type": "integer",
+                    "description": "Matching lines returned at most (default 20).",
+                },
+                "ignore_case": {
+                    "type": "boolean",
+                    "description": "Match case-insensitively (default false).",
+                },
+            },
+            "required": ["artifact_id", "pattern"],
+            "additionalProperties": False,
+        },
+    )
+    async def grep_artifact(
+        artifact_id: str,
+        pattern: str,
+        max_matches: int = 20,
+        ignore_case: bool = False,
+        regex: bool = False,
+    ) -> str:
+        try:
+            matches = await store.grep(
+                artifact_id,
+                pattern,
+                max(min(int(max_matches), 200), 1),
+                ignore_case,
+                regex,
+            )
+        except re.error as e:
+            return f"Invalid pattern: {e}"
+        if matches is None:
+            return f"Artifact not found: {artifact_id}"
+        if not matches:
+            return f"No matches for {pattern!r} in {artifact_id}"
+        return "\n".join(f"{offset}: {line}" for offset, line in matches)
+
+    return registry
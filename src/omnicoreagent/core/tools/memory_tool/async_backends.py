@@ -0,0 +1,422 @@
+"""
+Asynchronous memory backends and the building blocks they share.
+
+``StorageMemoryBackend`` implements the memory tool's behaviour (modes,
+messages, line inserts) once on top of a few storage primitives, so each
+storage (in-memory, SQL, S3) only has to provide those primitives.
+"""
+
+from abc import abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Dict, List, Optional
+import asyncio
+import zlib
+
+from omnicoreagent.core.tools.memory_tool.base import (
+    AbstractMemoryBackend,
+    AsyncMemoryBackend,
+    memory_text,
+    normalize_memory_path,
+)
+
+ROOT_DISPLAY = "/memories"
+
+
+def parent_path(path: str) -> str:
+    """Parent directory key of a memory path (``""`` for the root)"""
+    return path.rpartition("/")[0]
+
+
+def insert_at_line(content: str, index: int, text: str) -> str:
+    """``content`` with ``text`` inserted as a line before line ``index`` (0-based)"""
+    position = 0
+    for _ in range(index):
+        newline = content.find("\n", position)
+        if newline == -1:
+            position = len(content)
+            break
+        position = newline + 1
+    head = content[:position]
+    if head and not head.endswith("\n"):
+        head += "\n"
+    return head + text + "\n" + content[position:]
+
+
+class ThreadedMemoryBackend(AsyncMemoryBackend):
+    """Runs a synchronous AbstractMemoryBackend in a worker thread."""
+
+    def __init__(self, backend: AbstractMemoryBackend):
+        self.backend = backend
+
+    async def view(self, path: Optional[str] = None) -> str:
+        return await asyncio.to_thread(self.backend.view, path)
+
+    async def create_update(
+        self, path: str, file_text: Any, mode: str = "create"
+    ) -> str:
+        return await asyncio.to_thread(
+            self.backend.create_update, path, file_text, mode
+        )
+
+    async def str_replace(self, path: str, old_str: str, new_str: str) -> str:
+        return await asyncio.to_thread(self.backend.str_replace, path, old_str, new_str)
+
+    async def insert(self, path: str, insert_line: int, insert_text: str) -> str:
+        return await asyncio.to_thread(
+            self.backend.insert, path, insert_line, insert_text
+        )
+
+    async def delete(self, path: str) -> str:
+        return await asyncio.to_thread(self.backend.delete, path)
+
+    async def rename(self, old_path: str, new_path: str) -> str:
+        return await asyncio.to_thread(self.backend.rename, old_path, new_path)
+
+    async def clear_all_memory(self) -> str:
+        return await asyncio.to_thread(self.backend.clear_all_memory)
+
+
+class StorageMemoryBackend(AsyncMemoryBackend):
+    """
+    Memory tool semantics over a path-keyed file store.
+
+    Paths are normalized keys such as ``notes/todo.md``; directories exist
+    implicitly while they contain files, and the root always exists.
+    Read-modify-write operations on one path are serialized within the
+    process.
+    """
+
+    def __init__(self, lock_stripes: int = 64):
+        self._locks = [asyncio.Lock() for _ in range(lock_stripes)]
+
+    def _lock(self, path: str) -> asyncio.Lock:
+        return self._locks[zlib.crc32(path.encode()) % len(self._locks)]
+
+    @staticmethod
+    def _display(path: str) -> str:
+        return f"{ROOT_DISPLAY}/{path}" if path else ROOT_DISPLAY
+
+    @abstractmethod
+    async def _kind(self, path: str) -> Optional[str]:
+        """``"file"``, ``"dir"`` or None if nothing exists at ``path``"""
+
+    @abstractmethod
+    async def _read(self, path: str) -> Optional[str]:
+        """File contents, or None if ``path`` is not a file"""
+
+    @abstractmethod
+    async def _write(self, path: str, content: str) -> None:
+        """Create or replace a file"""
+
+    @abstractmethod
+    async def _list(self, path: str) -> List[str]:
+        """Sorted names of the files and directories directly inside ``path``"""
+
+    @abstractmethod
+    async def _delete(self, path: str) -> None:
+        """Delete a file, or a directory and everything under it"""
+
+    @abstractmethod
+    async def _rename(self, old_path: str, new_path: str) -> None:
+        """Move a file, or a directory and everything under it"""
+
+    @abstractmethod
+    async def _clear(self) -> None:
+        """Delete every file"""
+
+    async def _append(self, path: str, content: str) -> None:
+        """Append ``content`` on a new line after the file's existing text"""
+        existing = await self._read(path) or ""
+        await self._write(path, existing.rstrip("\n") + "\n" + content)
+
+    async def _insert_line(self, path: str, index: int, text: str) -> None:
+        """Insert ``text`` as a line before line ``index`` (0-based)"""
+        await self._write(
+            path, insert_at_line(await self._read(path) or "", index, text)
+        )
+
+    async def _describe_root(self) -> str:
+        contents = await self._list("")
+        return "\n".join(contents) if contents else "(empty)"
+
+    async def view(self, path: Optional[str] = None) -> str:
+        try:
+            key = normalize_memory_path(path)
+        except ValueError as e:
+            return str(e)
+
+        kind = await self._kind(key) if key else "dir"
+        if kind == "dir":
+            contents = await self._list(key)
+            return f"Contents of directory: {self._display(key)}\n" + (
+                "\n".join(contents) if contents else "(empty)"
+            )
+        elif kind == "file":
+            content = await self._read(key)
+            return f"Contents of file {self._display(key)}:\n{content}"
+        else:
+            return (
+                f"Path not found: {path}\nBase directory: {ROOT_DISPLAY}\n"
+                f"Current contents:\n{await self._describe_root()}"
+            )
+
+    async def create_update(
+        self, path: str, file_text: Any, mode: str = "create"
+    ) -> str:
+        content = memory_text(file_text)
+        try:
+            key = normalize_memory_path(path)
+        except ValueError as e:
+            return str(e)
+        display = self._display(key)
+        if not key:
+            return f"Cannot write to the memory root: {display}"
+
+        async with self._lock(key):
+            kind = await self._kind(key)
+            if mode == "create":
+                if kind is not None:
+                    existing = await self._read(key) or ""
+                    preview = "\n".join(existing.splitlines()[:5])
+                    return (
+                        f"File already exists: {display}\n"
+                        f"--- Preview (first 5 lines) ---\n{preview}\n"
+                        "Use mode='append' or mode='overwrite'."
+                    )
+                await self._write(key, content)
+                return f"New file created: {display}"
+
+            elif mode == "append":
+                if kind != "file":
+                    return f"Cannot append: File not found at {display}\nUse mode='create'."
+                await self._append(key, content)
+                return f"Appended text to {display}"
+
+            elif mode == "overwrite":
+                if kind != "file":
+                    return f"Cannot overwrite: File not found at {display}\nUse mode='create'."
+                await self._write(key, content)
+                return f"File overwritten: {display}"
+
+            else:
+                return (
+                    f"Invalid mode '{mode}'. Allowed modes: create, append, overwrite."
+                )
+
+    async def str_replace(self, path: str, old_str: str, new_str: str) -> str:
+        try:
+            key = normalize_memory_path(path)
+        except ValueError as e:
+            return str(e)
+
+        async with self._lock(key):
+            content = await self._read(key) if key else None
+            if content is None:
+                return f"File not found: {path}"
+            if old_str not in content:
+                return f"String '{old_str}' not found in {self._display(key)}."
+            await self._write(key, content.replace(old_str, new_str))
+        return f"Replaced '{old_str}' with '{new_str}' in {self._display(key)}"
+
+    async def insert(self, path: str, insert_line: int, insert_text: str) -> str:
+        try:
+            key = normalize_memory_path(path)
+        except ValueError as e:
+            return str(e)
+
+        async with self._lock(key):
+            if not key or await self._kind(key) != "file":
+                return f"File not found: {path}"
+            await self._insert_line(key, max(0, insert_line - 1), insert_text)
+        return f"Inserted text at line {insert_line} in {self._display(key)}"
+
+    async def delete(self, path: str) -> str:
+        try:
+            key = normalize_memory_path(path)
+        except ValueError as e:
+            return str(e)
+        if not key:
+            return "Cannot delete the memory root; use memory_clear_all."
+
+        async with self._lock(key):
+            kind = await self._kind(key)
+            if kind is None:
+                return f"Path not found: {path}"
+            await self._delete(key)
+        if kind == "file":
+            return f"File deleted: {self._display(key)}"
+        return f"Directory deleted: {self._display(key)}"
+
+    async def rename(self, old_path: str, new_path: str) -> str:
+        try:
+            old_key = normalize_memory_path(old_path)
+            new_key = normalize_memory_path(new_path)
+        except ValueError as e:
+            return str(e)
+
+        if not old_key or await self._kind(old_key) is None:
+            return f"Path not found: {old_path}"
+        if not new_key or new_key == old_key or new_key.startswith(old_key + "/"):
+            return f"Cannot rename {self._display(old_key)} to {self._display(new_key)}"
+        if await self._kind(new_key) is not None:
+            return f"Destination already exists: {self._display(new_key)}"
+        async with self._lock(old_key):
+            await self._rename(old_key, new_key)
+        return f"Renamed {self._display(old_key)} → {self._display(new_key)}"
+
+    async def clear_all_memory(self) -> str:
+        try:
+            await self._clear()
+            return f"All memory cleared in {ROOT_DISPLAY}"
+        except Exception as e:
+            return f"Error clearing memory: {e}"
+
+
+class InMemoryMemoryBackend(StorageMemoryBackend):
+    """Memory files held in a dict; for tests and agents that need no persistence."""
+
+    def __init__(self):
+        super().__init__()
+        self._files: Dict[str, str] = {}
+
+    async def _kind(self, path: str) -> Optional[str]:
+        if path in self._files:
+            return "file"
+        prefix = path + "/"
+        if any(key.startswith(prefix) for key in self._files):
+            return "dir"
+        return None
+
+    async def _read(self, path: str) -> Optional[str]:
+        return self._files.get(path)
+
+    async def _write(self, path: str, content: str) -> None:
+        self._files[path] = content
+
+    async def _list(self, path: str) -> List[str]:
+        prefix = path + "/" if path else ""
+        return sorted(
+            {
+                key[len(prefix) :].split("/", 1)[0]
+                for key in self._files
+                if key.startswith(prefix)
+            }
+        )
+
+    async def _delete(self, path: str) -> None:
+        prefix = path + "/"
+        for key in [k for k in self._files if k == path or k.startswith(prefix)]:
+            del self._files[key]
+
+    async def _rename(self, old_path: str, new_path: str) -> None:
+        prefix = old_path + "/"
+        for key in [k for k in self._files if k == old_path or k.startswith(prefix)]:
+            self._files[new_path + key[len(old_path) :]] = self._files.pop(key)
+
+    async def _clear(self) -> None:
+        self._files.clear()
+
+
+class CachedMemoryBackend(AsyncMemoryBackend):
+    """
+    LRU cache of ``view`` results in front of any async backend.
+
+    Every write through this wrapper drops the cached views of the path, its
+    parent directories and (for deletes and renames) everything below it,
+    both before and after the write, and views read while a write is in
+    flight are not cached.
+    Writes made by other processes are not seen until the entry is evicted,
+    so share a backend between processes only without the cache.
+    """
+
+    def __init__(self, backend: AsyncMemoryBackend, max_entries: int = 256):
+        self.backend = backend
+        self.max_entries = max_entries
+        self._views: OrderedDict[str, str] = OrderedDict()
+        # Bumped on every invalidation; a view only caches its result if no
+        # write started or finished while it was reading.
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _invalidate(self, path: Optional[str], subtree: bool = False):
+        self._generation += 1
+        try:
+            key = normalize_memory_path(path)
+        except ValueError:
+            return
+        self._views.pop(key, None)
+        parent = key
+        while parent:
+            parent = parent_path(parent)
+            self._views.pop(parent, None)
+        if subtree:
+            prefix = key + "/" if key else ""
+            for cached in [k for k in self._views if k.startswith(prefix)]:
+                del self._views[cached]
+
+    async def _write_through(
+        self, write: Awaitable[str], *paths: str, subtree=False
+    ) -> str:
+        """Await ``write``, dropping the cached views of ``paths`` before and after"""
+        for path in paths:
+            self._invalidate(path, subtree)
+        try:
+            return await write
+        finally:
+            for path in paths:
+                self._invalidate(path, subtree)
+
+    async def view(self, path: Optional[str] = None) -> str:
+        try:
+            key = normalize_memory_path(path)
+        except ValueError as e:
+            return str(e)
+        cached = self._views.get(key)
+        if cached is not None:
+            self._views.move_to_end(key)
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        generation = self._generation
+        result = await self.backend.view(path)
+        if result.startswith("Contents of") and generation == self._generation:
+            self._views[key] = result
+            while len(self._views) > self.max_entries:
+                self._views.popitem(last=False)
+        return result
+
+    async def create_update(
+        self, path: str, file_text: Any, mode: str = "create"
+    ) -> str:
+        return await self._write_through(
+            self.backend.create_update(path, file_text, mode), path
+        )
+
+    async def str_replace(self, path: str, old_str: str, new_str: str) -> str:
+        return await self._write_through(
+            self.backend.str_replace(path, old_str, new_str), path
+        )
+
+    async def insert(self, path: str, insert_line: int, insert_text: str) -> str:
+        return await self._write_through(
+            self.backend.insert(path, insert_line, insert_text), path
+        )
+
+    async def delete(self, path: str) -> str:
+        return await self._write_through(self.backend.delete(path), path, subtree=True)
+
+    async def rename(self, old_path: str, new_path: str) -> str:
+        return await self._write_through(
+            self.backend.rename(old_path, new_path), old_path, new_path, subtree=True
+        )
+
+    async def clear_all_memory(self) -> str:
+        self._generation += 1
+        self._views.clear()
+        try:
+            return await self.backend.clear_all_memory()
+        finally:
+            self._generation += 1
+            self._views.clear()
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Any, Optional
+import json
+import urllib.parse
 
 
 class AbstractMemoryBackend(ABC):
@@ -45,3 +47,95 @@ class AbstractMemoryBackend(ABC):
     def clear_all_memory(self) -> str:
         """Clear all memory storage."""
         pass
+
+
+class AsyncMemoryBackend(ABC):
+    """
+    Asynchronous counterpart of AbstractMemoryBackend.
+
+    The MemoryTool drives every backend through this interface, so storage
+    I/O never blocks the event loop. Synchronous backends are adapted with
+    ``ThreadedMemoryBackend``.
+    """
+
+    @abstractmethod
+    async def view(self, path: Optional[str] = None) -> str:
+        """Show directory listing or file contents."""
+        pass
+
+    @abstractmethod
+    async def create_update(
+        self, path: str, file_text: str, mode: str = "create"
+    ) -> str:
+        """Create, append, or overwrite a file."""
+        pass
+
+    @abstractmethod
+    async def str_replace(self, path: str, old_str: str, new_str: str) -> str:
+        """Replace all occurrences of old_str with new_str in a file."""
+        pass
+
+    @abstractmethod
+    async def insert(self, path: str, insert_line: int, insert_text: str) -> str:
+        """Insert text at a specific line number in a file."""
+        pass
+
+    @abstractmethod
+    async def delete(self, path: str) -> str:
+        """Delete a file or directory."""
+        pass
+
+    @abstractmethod
+    async def rename(self, old_path: str, new_path: str) -> str:
+        """Rename or move a file/directory."""
+        pass
+
+    @abstractmethod
+    async def clear_all_memory(self) -> str:
+        """Clear all memory storage."""
+        pass
+
+
+def normalize_memory_path(path: Optional[str]) -> str:
+    """
+    Normalize a memory path to a relative key such as ``notes/todo.md``.
+
+    ``/memories/notes/todo.md``, ``memories/notes/todo.md`` and
+    ``notes/todo.md`` all name the same file; the root is ``""``.
+
+    Raises:
+        ValueError: If the path escapes the memory root
+    """
+    if not path or path.strip() == "":
+        return ""
+    decoded = urllib.parse.unquote(path).strip().replace("\\", "/").lstrip("/")
+    if decoded.startswith("memories/"):
+        decoded = decoded[len("memories/") :]
+    elif decoded == "memories":
+        decoded = ""
+
+    parts = []
+    for part in decoded.split("/"):
+        if part in ("", "."):
+            continue
+        if part == "..":
+            if not parts:
+                raise ValueError(
+                    f"Invalid path '{path}' → resolved outside base directory.\n"
+                    "Path traversal detected.\nAll paths must stay inside: /memories"
+                )
+            parts.pop()
+            continue
+        parts.append(part)
+    return "/".join(parts)
+
+
+def memory_text(file_text: Any) -> str:
+    """Text stored for a create/update request (lists are joined, dicts are JSON)"""
+    if isinstance(file_text, str):
+        return file_text
+    elif isinstance(file_text, list):
+        return "\n".join(str(item) for item in file_text)
+    elif isinstance(file_text, dict):
+        return json.dumps(file_text, indent=2)
+    return str(file_text)
@@ -0,0 +1,384 @@
+"""
+SQL memory backend (any SQLAlchemy URL).
+
+Files are rows of ``memory_files`` indexed by path and parent directory, and
+their text is stored as ordered rows of ``memory_chunks``. Appends add a
+chunk and line inserts split one chunk, so neither rewrites the file.
+"""
+
+from typing import List, NamedTuple, Optional
+import asyncio
+
+from omnicoreagent.core.tools.memory_tool.async_backends import (
+    StorageMemoryBackend,
+    parent_path,
+)
+
+# Distance between the sequence numbers of consecutive chunks, leaving room
+# for inserts between them before the file has to be renumbered.
+SEQ_GAP = 1024
+
+
+class Chunk(NamedTuple):
+    id: int
+    seq: int
+    lines: int
+    content: str
+
+
+class DatabaseMemoryBackend(StorageMemoryBackend):
+    """Memory files stored as chunked rows in a SQL database."""
+
+    def __init__(
+        self,
+        db_url: str,
+        table_prefix: str = "memory",
+        compact_after: int = 256,
+    ):
+        """
+        Initialize the DatabaseMemoryBackend.
+
+        Args:
+            db_url: SQLAlchemy database URL
+            table_prefix: Prefix of the files and chunks table names
+            compact_after: Chunks a file may grow to before an append stores
+                it as a single chunk again
+        """
+        super().__init__()
+        from sqlalchemy import (
+            Column,
+            DateTime,
+            Index,
+            Integer,
+            MetaData,
+            String,
+            Table,
+            Text,
+            create_engine,
+            func,
+        )
+
+        engine_kwargs = {"pool_pre_ping": True}
+        if db_url.startswith("sqlite") and (
+            ":memory:" in db_url or db_url.endswith("://")
+        ):
+            from sqlalchemy.pool import StaticPool
+
+            # One shared connection, or each worker thread sees its own database.
+            engine_kwargs = {
+                "poolclass": StaticPool,
+                "connect_args": {"check_same_thread": False},
+            }
+        self._engine = create_engine(db_url, **engine_kwargs)
+        self.compact_after = compact_after
+
+        metadata = MetaData()
+        self._files = Table(
+            f"{table_prefix}_files",
+            metadata,
+            Column("path", String(1024), primary_key=True),
+            Column("parent", String(1024), index=True, nullable=False),
+            Column("chunks", Integer, nullable=False, default=0),
+            Column(
+                "updated_at",
+                DateTime(timezone=True),
+                server_default=func.now(),
+                onupdate=func.now(),
+            ),
+        )
+        self._chunks = Table(
+            f"{table_prefix}_chunks",
+            metadata,
+            Column("id", Integer, primary_key=True, autoincrement=True),
+            Column("path", String(1024), nullable=False),
+            Column("seq", Integer, nullable=False),
+            Column("lines", Integer, nullable=False),
+            Column("content", Text, nullable=False),
+            Index(f"ix_{table_prefix}_chunks_path_seq", "path", "seq"),
+        )
+        metadata.create_all(self._engine)
+
+    def _subtree(self, column, path: str):
+        return (column == path) | column.startswith(path + "/", autoescape=True)
+
+    def _ordered_chunks(self, conn, path: str) -> List[Chunk]:
+        from sqlalchemy import select
+
+        rows = conn.execute(
+            select(
+                self._chunks.c.id,
+                self._chunks.c.seq,
+                self._chunks.c.lines,
+                self._chunks.c.content,
+            )
+            .where(self._chunks.c.path == path)
+            .order_by(self._chunks.c.seq)
+        )
+        return [Chunk(*row) for row in rows]
+
+    def _add_chunk(self, conn, path: str, seq: int, content: str):
+        conn.execute(
+            self._chunks.insert().values(
+                path=path, seq=seq, lines=content.count("\n"), content=content
+            )
+        )
+
+    def _set_chunk(self, conn, chunk_id: int, content: str):
+        conn.execute(
+            self._chunks.update()
+            .where(self._chunks.c.id == chunk_id)
+            .values(content=content, lines=content.count("\n"))
+        )
+
+    def _count_chunks(self, conn, path: str, delta: int):
+        conn.execute(
+            self._files.update()
+            .where(self._files.c.path == path)
+            .values(chunks=self._files.c.chunks + delta)
+        )
+
+    def _store(self, conn, path: str, content: str):
+        """Replace a file's chunks with a single chunk holding ``content``"""
+        from sqlalchemy import select
+
+        conn.execute(self._chunks.delete().where(self._chunks.c.path == path))
+        self._add_chunk(conn, path, SEQ_GAP, content)
+        exists = conn.execute(
+            select(self._files.c.path).where(self._files.c.path == path)
+        ).first()
+        if exists:
+            conn.execute(
+                self._files.update().where(self._files.c.path == path).values(chunks=1)
+            )
+        else:
+            conn.execute(
+                self._files.insert().values(
+                    path=path, parent=parent_path(path), chunks=1
+                )
+            )
+
+    def _kind_sync(self, path: str) -> Optional[str]:
+        from sqlalchemy import select
+
+        with self._engine.connect() as conn:
+            if conn.execute(
+                select(self._files.c.path).where(self._files.c.path == path)
+            ).first():
+                return "file"
+            if conn.execute(
+                select(self._files.c.path)
+                .where(self._files.c.path.startswith(path + "/", autoescape=True))
+                .limit(1)
+            ).first():
+                return "dir"
+        return None
+
+    def _read_sync(self, path: str) -> Optional[str]:
+        from sqlalchemy import select
+
+        with self._engine.connect() as conn:
+            if not conn.execute(
+                select(self._files.c.path).where(self._files.c.path == path)
+            ).first():
+                return None
+            return "".join(chunk.content for chunk in self._ordered_chunks(conn, path))
+
+    def _write_sync(self, path: str, content: str):
+        with self._engine.begin() as conn:
+            self._store(conn, path, content)
+
+    def _list_sync(self, path: str) -> List[str]:
+        from sqlalchemy import select
+
+        prefix = path + "/" if path else ""
+        with self._engine.connect() as conn:
+            names = set(
+                conn.scalars(
+                    select(self._files.c.path).where(self._files.c.parent == path)
+                )
+            )
+            nested = select(self._files.c.parent).distinct()
+            if path:
+                nested = nested.where(
+                    self._files.c.parent.startswith(prefix, autoescape=True)
+                )
+            else:
+                nested = nested.where(self._files.c.parent != "")
+            names.update(conn.scalars(nested))
+        return sorted({name[len(prefix) :].split("/", 1)[0] for name in names})
+
+    def _delete_sync(self, path: str):
+        with self._engine.begin() as conn:
+            conn.execute(
+                self._chunks.delete().where(self._subtree(self._chunks.c.path, path))
+            )
+            conn.execute(
+                self._files.delete().where(self._subtree(self._files.c.path, path))
+            )
+
+    def _rename_sync(self, old_path: str, new_path: str):
+        from sqlalchemy import select
+
+        with self._engine.begin() as conn:
+            paths = conn.scalars(
+                select(self._files.c.path).where(
+                    self._subtree(self._files.c.path, old_path)
+                )
+            ).all()
+            for path in paths:
+                moved = new_path + path[len(old_path) :]
+                conn.execute(
+                    self._files.update()
+                    .where(self._files.c.path == path)
+                    .values(path=moved, parent=parent_path(moved))
+                )
+                conn.execute(
+                    self._chunks.update()
+                    .where(self._chunks.c.path == path)
+                    .values(path=moved)
+                )
+
+    def _clear_sync(self):
+        with self._engine.begin() as conn:
+            conn.execute(self._chunks.delete())
+            conn.execute(self._files.delete())
+
+    def _append_sync(self, path: str, content: str):
+        from sqlalchemy import select
+
+        with self._engine.begin() as conn:
+            chunk_count = conn.execute(
+                select(self._files.c.chunks).where(self._files.c.path == path)
+            ).scalar_one()
+            if chunk_count >= self.compact_after:
+                existing = "".join(
+                    chunk.content for chunk in self._ordered_chunks(conn, path)
+                )
+                self._store(conn, path, existing.rstrip("\n") + "\n" + content)
+                return
+
+            # Strip trailing newlines from the end of the file; they normally
+            # sit in the last chunk alone.
+            removed = 0
+            last_seq = 0
+            while True:
+                last = conn.execute(
+                    select(
+                        self._chunks.c.id, self._chunks.c.seq, self._chunks.c.content
+                    )
+                    .where(self._chunks.c.path == path)
+                    .order_by(self._chunks.c.seq.desc())
+                    .limit(1)
+                ).first()
+                if last is None:
+                    break
+                last_seq = last.seq
+                stripped = last.content.rstrip("\n")
+                if stripped:
+                    if stripped != last.content:
+                        self._set_chunk(conn, last.id, stripped)
+                    break
+                conn.execute(self._chunks.delete().where(self._chunks.c.id == last.id))
+                removed += 1
+            self._add_chunk(conn, path, last_seq + SEQ_GAP, "\n" + content)
+            self._count_chunks(conn, path, 1 - removed)
+
+    def _insert_line_sync(self, path: str, index: int, text: str):
+        with self._engine.begin() as conn:
+            chunks = self._ordered_chunks(conn, path)
+            line = text + "\n"
+
+            # Find the chunk holding the index-th newline; line ``index``
+            # starts right after it.
+            before = 0
+            position = None
+            for i, chunk in enumerate(chunks):
+                if index == 0:
+                    position = (i, 0)
+                    break
+                if before + chunk.lines >= index:
+                    offset = -1
+                    for _ in range(index - before):
+                        offset = chunk.content.index("\n", offset + 1)
+                    position = (i, offset + 1)
+                    break
+                before += chunk.lines
+
+            if position is None:
+                # Past the last line: the text becomes the new last line.
+                last_text = next((c.content for c in reversed(chunks) if c.content), "")
+                if last_text and not last_text.endswith("\n"):
+                    line = "\n" + line
+                last_seq = chunks[-1].seq if chunks else 0
+                self._add_chunk(conn, path, last_seq + SEQ_GAP, line)
+                self._count_chunks(conn, path, 1)
+                return
+
+            i, offset = position
+            head, tail = chunks[i].content[:offset], chunks[i].content[offset:]
+            if not head:
+                # The line goes in front of chunk i.
+                new_rows, after = [line], i - 1
+            elif not tail:
+                new_rows, after = [line], i
+            else:
+                self._set_chunk(conn, chunks[i].id, head)
+                new_rows, after = [line, tail], i
+
+            low, high = self._seq_bounds(chunks, after)
+            if high - low <= len(new_rows):
+                chunks = self._renumber(conn, chunks)
+                low, high = self._seq_bounds(chunks, after)
+            step = (high - low) // (len(new_rows) + 1)
+            for n, content in enumerate(new_rows, start=1):
+                self._add_chunk(conn, path, low + n * step, content)
+            self._count_chunks(conn, path, len(new_rows))
+
+    @staticmethod
+    def _seq_bounds(chunks, after: int):
+        """Sequence numbers around the gap after chunk ``after`` (-1 for the start)"""
+        low = chunks[after].seq if after >= 0 else chunks[0].seq - SEQ_GAP
+        high = chunks[after + 1].seq if after + 1 < len(chunks) else low + SEQ_GAP
+        return low, high
+
+    def _renumber(self, conn, chunks):
+        """Space a file's chunks SEQ_GAP apart again"""
+        renumbered = []
+        for n, chunk in enumerate(chunks, start=1):
+            conn.execute(
+                self._chunks.update()
+                .where(self._chunks.c.id == chunk.id)
+                .values(seq=n * SEQ_GAP)
+            )
+            renumbered.append(chunk._replace(seq=n * SEQ_GAP))
+        return renumbered
+
+    async def _kind(self, path: str) -> Optional[str]:
+        return await asyncio.to_thread(self._kind_sync, path)
+
+    async def _read(self, path: str) -> Optional[str]:
+        return await asyncio.to_thread(self._read_sync, path)
+
+    async def _write(self, path: str, content: str) -> None:
+        await asyncio.to_thread(self._write_sync, path, content)
+
+    async def _list(self, path: str) -> List[str]:
+        return await asyncio.to_thread(self._list_sync, path)
+
+    async def _delete(self, path: str) -> None:
+        await asyncio.to_thread(self._delete_sync, path)
+
+    async def _rename(self, old_path: str, new_path: str) -> None:
+        await asyncio.to_thread(self._rename_sync, old_path, new_path)
+
+    async def _clear(self) -> None:
+        await asyncio.to_thread(self._clear_sync)
+
+    async def _append(self, path: str, content: str) -> None:
+        await asyncio.to_thread(self._append_sync, path, content)
+
+    async def _insert_line(self, path: str, index: int, text: str) -> None:
+        await asyncio.to_thread(self._insert_line_sync, path, index, text)
+
+    def close(self):
+        self._engine.dispose()
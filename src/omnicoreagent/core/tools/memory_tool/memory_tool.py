@@ -1,54 +1,124 @@
-import os
+from functools import lru_cache
+from typing import Union
+
+from decouple import config as decouple_config
+
 from omnicoreagent.core.tools.local_tools_registry import ToolRegistry
-from omnicoreagent.core.tools.memory_tool.base import AbstractMemoryBackend
+from omnicoreagent.core.tools.memory_tool.async_backends import (
+    CachedMemoryBackend,
+    InMemoryMemoryBackend,
+    ThreadedMemoryBackend,
+)
+from omnicoreagent.core.tools.memory_tool.base import (
+    AbstractMemoryBackend,
+    AsyncMemoryBackend,
+)
 from omnicoreagent.core.tools.memory_tool.local_storage import LocalMemoryBackend
-from pathlib import Path
+
+
+@lru_cache(maxsize=None)
+def get_memory_backend(name: str) -> AsyncMemoryBackend:
+    """
+    Process-wide backend for a ``memory_tool_backend`` name.
+
+    Backends are created once and shared by every agent using the same
+    name, so the view cache and database connections are shared too.
+
+    Environment:
+        MEMORY_TOOL_DB_URL: Database of the "db" backend (falls back to
+            DATABASE_URL, then a local SQLite file)
+        MEMORY_TOOL_S3_BUCKET, MEMORY_TOOL_S3_PREFIX, MEMORY_TOOL_S3_ENDPOINT_URL:
+            Location of the "s3" backend
+        MEMORY_TOOL_CACHE_SIZE: Views kept by the LRU cache (0 disables it)
+    """
+    if name == "local":
+        backend = ThreadedMemoryBackend(LocalMemoryBackend())
+    elif name == "in_memory":
+        backend = InMemoryMemoryBackend()
+    elif name == "db":
+        from omnicoreagent.core.tools.memory_tool.db_storage import (
+            DatabaseMemoryBackend,
+        )
+
+        db_url = (
+            decouple_config("MEMORY_TOOL_DB_URL", default=None)
+            or decouple_config("DATABASE_URL", default=None)
+            or "sqlite:///memories.db"
+        )
+        backend = DatabaseMemoryBackend(db_url)
+    elif name == "s3":
+        from omnicoreagent.core.tools.memory_tool.s3_storage import S3MemoryBackend
+
+        bucket = decouple_config("MEMORY_TOOL_S3_BUCKET", default=None)
+        if not bucket:
+            raise ValueError(
+                "MEMORY_TOOL_S3_BUCKET must be set to use the 's3' memory tool backend"
+            )
+        backend = S3MemoryBackend(
+            bucket,
+            prefix=decouple_config("MEMORY_TOOL_S3_PREFIX", default="memories/"),
+            endpoint_url=decouple_config("MEMORY_TOOL_S3_ENDPOINT_URL", default=None),
+        )
+    else:
+        raise ValueError(f"Unknown memory tool backend '{name}'")
+
+    cache_size = decouple_config("MEMORY_TOOL_CACHE_SIZE", default=256, cast=int)
+    if cache_size > 0:
+        backend = CachedMemoryBackend(backend, max_entries=cache_size)
+    return backend
 
 
 class MemoryTool:
     """
     Memory Tool that delegates all operations to a backend
-    implementing AbstractMemoryBackend.
+    implementing AsyncMemoryBackend.
+
+    ``backend`` may be a backend name ("local", "db", "s3", "in_memory"),
+    an AsyncMemoryBackend, or a synchronous AbstractMemoryBackend, which is
+    run in a worker thread.
     """
 
-    def __init__(self, backend: AbstractMemoryBackend):
+    def __init__(self, backend: Union[str, AsyncMemoryBackend, AbstractMemoryBackend]):
         if isinstance(backend, str):
-            if backend == "local":
-                backend = LocalMemoryBackend()
+            backend = get_memory_backend(backend)
+        elif isinstance(backend, AbstractMemoryBackend):
+            backend = ThreadedMemoryBackend(backend)
 
         self.backend = backend
 
-    def view(self, path: str | None = None) -> str:
+    async def view(self, path: str | None = None) -> str:
         if self.backend:
-            return self.backend.view(path)
+            return await self.backend.view(path)
 
-    def create_update(self, path: str, file_text: str, mode: str = "create") -> str:
+    async def create_update(
+        self, path: str, file_text: str, mode: str = "create"
+    ) -> str:
         if self.backend:
-            return self.backend.create_update(path, file_text, mode)
+            return await self.backend.create_update(path, file_text, mode)
 
-    def str_replace(self, path: str, old_str: str, new_str: str) -> str:
+    async def str_replace(self, path: str, old_str: str, new_str: str) -> str:
         if self.backend:
-            return self.backend.str_replace(path, old_str, new_str)
+            return await self.backend.str_replace(path, old_str, new_str)
 
-    def insert(self, path: str, insert_line: int, insert_text: str) -> str:
+    async def insert(self, path: str, insert_line: int, insert_text: str) -> str:
         if self.backend:
-            return self.backend.insert(path, insert_line, insert_text)
+            return await self.backend.insert(path, insert_line, insert_text)
 
-    def delete(self, path: str) -> str:
+    async def delete(self, path: str) -> str:
         if self.backend:
-            return self.backend.delete(path)
+            return await self.backend.delete(path)
 
-    def rename(self, old_path: str, new_path: str) -> str:
+    async def rename(self, old_path: str, new_path: str) -> str:
         if self.backend:
-            return self.backend.rename(old_path, new_path)
+            return await self.backend.rename(old_path, new_path)
 
-    def clear_all_memory(self) -> str:
+    async def clear_all_memory(self) -> str:
         if self.backend:
-            return self.backend.clear_all_memory()
+            return await self.backend.clear_all_memory()
 
 
 def build_tool_registry_memory_tool(
-    memory_tool_backend: str, registry: ToolRegistry
+    memory_tool_backend: Union[str, AsyncMemoryBackend], registry: ToolRegistry
 ) -> ToolRegistry:
     """
     Register memory tool commands in a ToolRegistry.
@@ -83,8 +153,8 @@ def build_tool_registry_memory_tool(
             "additionalProperties": False,
         },
     )
-    def memory_view(path: str) -> str:
-        return memory_tool.view(path)
+    async def memory_view(path: str) -> str:
+        return await memory_tool.view(path)
 
     @registry.register_tool(
         name="memory_create_update",
@@ -123,8 +193,10 @@ def build_tool_registry_memory_tool(
             "additionalProperties": False,
         },
     )
-    def memory_create_update(path: str, file_text: str, mode: str = "create") -> str:
-        return memory_tool.create_update(path, file_text, mode)
+    async def memory_create_update(
+        path: str, file_text: str, mode: str = "create"
+    ) -> str:
+        return await memory_tool.create_update(path, file_text, mode)
 
     @registry.register_tool(
         name="memory_str_replace",
@@ -149,8 +221,8 @@ def build_tool_registry_memory_tool(
             "additionalProperties": False,
         },
     )
-    def memory_str_replace(path: str, old_str: str, new_str: str) -> str:
-        return memory_tool.str_replace(path, old_str, new_str)
+    async def memory_str_replace(path: str, old_str: str, new_str: str) -> str:
+        return await memory_tool.str_replace(path, old_str, new_str)
 
     @registry.register_tool(
         name="memory_insert",
@@ -178,8 +250,8 @@ def build_tool_registry_memory_tool(
             "additionalProperties": False,
         },
     )
-    def memory_insert(path: str, insert_line: int, insert_text: str) -> str:
-        return memory_tool.insert(path, insert_line, insert_text)
+    async def memory_insert(path: str, insert_line: int, insert_text: str) -> str:
+        return await memory_tool.insert(path, insert_line, insert_text)
 
     @registry.register_tool(
         name="memory_delete",
@@ -202,8 +274,8 @@ def build_tool_registry_memory_tool(
             "additionalProperties": False,
         },
     )
-    def memory_delete(path: str) -> str:
-        return memory_tool.delete(path)
+    async def memory_delete(path: str) -> str:
+        return await memory_tool.delete(path)
 
     @registry.register_tool(
         name="memory_rename",
@@ -230,8 +302,8 @@ def build_tool_registry_memory_tool(
             "additionalProperties": False,
         },
     )
-    def memory_rename(old_path: str, new_path: str) -> str:
-        return memory_tool.rename(old_path, new_path)
+    async def memory_rename(old_path: str, new_path: str) -> str:
+        return await memory_tool.rename(old_path, new_path)
 
     @registry.register_tool(
         name="memory_clear_all",
@@ -239,7 +311,7 @@ def build_tool_registry_memory_tool(
         Clear all memory storage.
         """,
     )
-    def memory_clear_all() -> str:
-        return memory_tool.clear_all_memory()
+    async def memory_clear_all() -> str:
+        return await memory_tool.clear_all_memory()
 
     return registry
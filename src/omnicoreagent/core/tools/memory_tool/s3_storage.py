@@ -0,0 +1,155 @@
+"""
+S3 memory backend (AWS S3 or any S3-compatible store such as MinIO).
+
+Each memory file is one object under ``prefix``; directories are key
+prefixes. S3 cannot append to or edit an object in place, so appends and
+line inserts rewrite the object.
+"""
+
+from typing import List, Optional
+import asyncio
+
+from omnicoreagent.core.tools.memory_tool.async_backends import StorageMemoryBackend
+
+
+class S3MemoryBackend(StorageMemoryBackend):
+    """Memory files stored as objects in an S3 bucket."""
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "memories/",
+        endpoint_url: Optional[str] = None,
+        client=None,
+    ):
+        """
+        Initialize the S3MemoryBackend.
+
+        Args:
+            bucket: Bucket holding the memory files
+            prefix: Key prefix of the memory root
+            endpoint_url: Endpoint of an S3-compatible store (None for AWS)
+            client: boto3 S3 client to use instead of creating one
+        """
+        super().__init__()
+        if client is None:
+            import boto3
+
+            client = boto3.client("s3", endpoint_url=endpoint_url)
+        self._s3 = client
+        self.bucket = bucket
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+
+    def _key(self, path: str) -> str:
+        return self.prefix + path
+
+    def _is_missing(self, error: Exception) -> bool:
+        code = getattr(error, "response", {}).get("Error", {}).get("Code")
+        return code in ("404", "NoSuchKey", "NotFound")
+
+    def _iter_keys(self, prefix: str):
+        paginator = self._s3.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            for item in page.get("Contents", []):
+                yield item["Key"]
+
+    def _delete_keys(self, keys: List[str]):
+        for start in range(0, len(keys), 1000):
+            self._s3.delete_objects(
+                Bucket=self.bucket,
+                Delete={
+                    "Objects": [{"Key": key} for key in keys[start : start + 1000]],
+                    "Quiet": True,
+                },
+            )
+
+    def _is_file(self, path: str) -> bool:
+        try:
+            self._s3.head_object(Bucket=self.bucket, Key=self._key(path))
+            return True
+        except Exception as e:
+            if self._is_missing(e):
+                return False
+            raise
+
+    def _kind_sync(self, path: str) -> Optional[str]:
+        if self._is_file(path):
+            return "file"
+        response = self._s3.list_objects_v2(
+            Bucket=self.bucket, Prefix=self._key(path) + "/", MaxKeys=1
+        )
+        return "dir" if response.get("KeyCount", 0) else None
+
+    def _read_sync(self, path: str) -> Optional[str]:
+        try:
+            response = self._s3.get_object(Bucket=self.bucket, Key=self._key(path))
+        except Exception as e:
+            if self._is_missing(e):
+                return None
+            raise
+        return response["Body"].read().decode("utf-8")
+
+    def _write_sync(self, path: str, content: str):
+        self._s3.put_object(
+            Bucket=self.bucket,
+            Key=self._key(path),
+            Body=content.encode("utf-8"),
+            ContentType="text/plain; charset=utf-8",
+        )
+
+    def _list_sync(self, path: str) -> List[str]:
+        prefix = self._key(path) + "/" if path else self.prefix
+        names = set()
+        paginator = self._s3.get_paginator("list_objects_v2")
+        for page in paginator.paginate(
+            Bucket=self.bucket, Prefix=prefix, Delimiter="/"
+        ):
+            for item in page.get("Contents", []):
+                names.add(item["Key"][len(prefix) :])
+            for common in page.get("CommonPrefixes", []):
+                names.add(common["Prefix"][len(prefix) :].rstrip("/"))
+        names.discard("")
+        return sorted(names)
+
+    def _delete_sync(self, path: str):
+        keys = list(self._iter_keys(self._key(path) + "/"))
+        if self._is_file(path):
+            keys.append(self._key(path))
+        self._delete_keys(keys)
+
+    def _rename_sync(self, old_path: str, new_path: str):
+        old_key, new_key = self._key(old_path), self._key(new_path)
+        keys = list(self._iter_keys(old_key + "/"))
+        if self._is_file(old_path):
+            keys.append(old_key)
+        for key in keys:
+            self._s3.copy_object(
+                Bucket=self.bucket,
+                Key=new_key + key[len(old_key) :],
+                CopySource={"Bucket": self.bucket, "Key": key},
+            )
+        self._delete_keys(keys)
+
+    def _clear_sync(self):
+        self._delete_keys(list(self._iter_keys(self.prefix)))
+
+    async def _kind(self, path: str) -> Optional[str]:
+        return await asyncio.to_thread(self._kind_sync, path)
+
+    async def _read(self, path: str) -> Optional[str]:
+        return await asyncio.to_thread(self._read_sync, path)
+
+    async def _write(self, path: str, content: str) -> None:
+        await asyncio.to_thread(self._write_sync, path, content)
+
+    async def _list(self, path: str) -> List[str]:
+        return await asyncio.to_thread(self._list_sync, path)
+
+    async def _delete(self, path: str) -> None:
+        await asyncio.to_thread(self._delete_sync, path)
+
+    async def _rename(self, old_path: str, new_path: str) -> None:
+        await asyncio.to_thread(self._rename_sync, old_path, new_path)
+
+    async def _clear(self) -> None:
+        await asyncio.to_thread(self._clear_sync)
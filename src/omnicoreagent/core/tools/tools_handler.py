@@ -2,7 +2,8 @@ import json
 from abc import ABC, abstractmethod
 from collections.abc import Callable
 from typing import Any
-from omnicoreagent.core.utils import logger
+from omnicoreagent.core.utils import fingerprint, logger
+from omnicoreagent.core.tracing import tracer
 import asyncio
 
 
@@ -161,6 +162,14 @@ class ToolExecutor:
     def __init__(self, tool_handler: BaseToolHandler):
         self.tool_handler = tool_handler
 
+    async def _traced_call(self, tool_name: str, tool_args: dict[str, Any]) -> Any:
+        with tracer.span(
+            "tool.execute",
+            tool=tool_name,
+            handler=type(self.tool_handler).__name__,
+        ):
+            return await self.tool_handler.call(tool_name, tool_args)
+
     async def execute(
         self,
         agent_name: str,
@@ -175,15 +184,31 @@ class ToolExecutor:
         Executes one or more tools concurrently and always returns a single aggregated result object.
         Includes both successful and failed tool results under `tools_results`.
         Properly handles tool-level and global exceptions.
+
+        If an ``artifact_spiller`` is passed, outputs over its threshold are
+        stored as artifacts and replaced by a preview and artifact handle.
+        If an ``output_guard`` is passed (a coroutine function taking the
+        outputs and returning a notice or None for each), flagged outputs
+        are replaced by the notice before they are saved to history, so
+        memory, events and the next prompt never see the raw output.
+
+        Each result carries ``input_digest``/``output_digest`` fingerprints
+        of its args and final output for the loop detector.
         """
         aggregated_results = []
+        artifact_spiller = kwargs.get("artifact_spiller")
+        output_guard = kwargs.get("output_guard")
 
         try:
             split_tool_names = tool_name.split("_and_")
             tasks = []
 
+            traced = tracer.enabled
             for name, args in zip(split_tool_names, tool_args):
-                tasks.append(self.tool_handler.call(name, args))
+                if traced:
+                    tasks.append(self._traced_call(name, args))
+                else:
+                    tasks.append(self.tool_handler.call(name, args))
 
             results = await asyncio.gather(*tasks, return_exceptions=True)
 
@@ -227,6 +252,9 @@ class ToolExecutor:
                         None if result else f"Tool '{name}' returned empty output."
                     )
 
+                if artifact_spiller is not None:
+                    data = await artifact_spiller.spill(name, data)
+
                 aggregated_results.append(
                     {
                         "tool_name": name,
@@ -237,13 +265,32 @@ class ToolExecutor:
                     }
                 )
 
+            if output_guard is not None and aggregated_results:
+                notices = await output_guard(
+                    [
+                        result["data"] or result["message"] or ""
+                        for result in aggregated_results
+                    ]
+                )
+                for result, notice in zip(aggregated_results, notices):
+                    if notice is not None:
+                        result["data"] = notice
+
+            for result in aggregated_results:
+                output = (
+                    result["data"] if result["data"] is not None else result["message"]
+                )
+                result["input_digest"] = fingerprint(result["args"])
+                result["output_digest"] = fingerprint(
+                    output if output is not None else ""
+                )
                 await add_message_to_history(
                     role="tool",
-                    content=data if data is not None else message,
+                    content=output,
                     metadata={
                         "tool_call_id": tool_call_id,
-                        "tool": name,
-                        "args": args,
+                        "tool": result["tool_name"],
+                        "args": result["args"],
                         "agent_name": agent_name,
                     },
                     session_id=session_id,
@@ -0,0 +1,397 @@
+"""
+Spans for the agent hot path.
+
+The agent loop opens spans around its steps (``agent.run``,
+``agent.prepare_initial_messages``, ``memory.read``/``memory.write``,
+``llm.call``, ``agent.parse``, ``tool.resolve``, ``tool.execute``,
+``event.emit``, ``guardrail.check``).
+Finished spans are handed to the registered span processors:
+
+- HistogramAggregator: per-span-name latency histograms in the process
+- OpenTelemetryExporter: forwards spans to an OpenTelemetry tracer
+
+With no processor registered, ``tracer.span()`` returns a shared no-op span,
+so an untraced agent pays one attribute check and a method call per span.
+"""
+
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+import threading
+import time
+
+from omnicoreagent.core.utils import logger
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar(
+    "omnicoreagent_current_span", default=None
+)
+
+
+class SpanProcessor:
+    """Receives spans as they start and end"""
+
+    def on_start(self, span: "Span") -> None:
+        pass
+
+    def on_end(self, span: "Span") -> None:
+        pass
+
+
+class Span:
+    """
+    A timed operation, used as a context manager.
+
+    Durations use ``time.perf_counter_ns``; ``start_time_ns`` is the wall
+    clock start for exporters that need timestamps.
+    """
+
+    __slots__ = (
+        "name",
+        "attributes",
+        "parent",
+        "start_ns",
+        "end_ns",
+        "start_time_ns",
+        "error",
+        "exporter_data",
+        "_tracer",
+        "_token",
+    )
+
+    recording = True
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: Dict[str, Any]):
+        self._tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        self.parent: Optional[Span] = None
+        self.start_ns = 0
+        self.end_ns = 0
+        self.start_time_ns = 0
+        self.error: Optional[BaseException] = None
+        # Per-processor state, e.g. the matching OpenTelemetry span
+        self.exporter_data: Optional[Dict[Any, Any]] = None
+        self._token = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def __enter__(self) -> "Span":
+        self.parent = _current_span.get()
+        self._token = _current_span.set(self)
+        self.start_time_ns = time.time_ns()
+        for processor in self._tracer._processors:
+            try:
+                processor.on_start(self)
+            except Exception as e:
+                logger.debug(f"Span processor {processor!r} failed on start: {e}")
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.end_ns = time.perf_counter_ns()
+        self.error = exc
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            # Exited in a different context than it was entered in
+            _current_span.set(self.parent)
+        for processor in self._tracer._processors:
+            try:
+                processor.on_end(self)
+            except Exception as e:
+                logger.debug(f"Span processor {processor!r} failed on end: {e}")
+        return False
+
+    def __repr__(self):
+        return f"Span({self.name!r}, duration_ms={self.duration_ms:.3f})"
+
+
+class _NoopSpan:
+    """Span returned while tracing is disabled; every method does nothing"""
+
+    __slots__ = ()
+
+    recording = False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, **attributes: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """Creates spans and dispatches them to the registered processors"""
+
+    def __init__(self):
+        self._processors: Tuple[SpanProcessor, ...] = ()
+        self._lock = threading.Lock()
+        self.enabled = False
+
+    def span(self, name: str, **attributes: Any):
+        """
+        Span named ``name``, to be used as ``with tracer.span(...) as span:``.
+
+        Args:
+            name: Operation name, e.g. "llm.call"
+            **attributes: Initial span attributes
+
+        Returns:
+            A recording Span, or the no-op span while tracing is disabled
+        """
+        if not self.enabled:
+            return NOOP_SPAN
+        return Span(self, name, attributes)
+
+    def add_processor(self, processor: SpanProcessor) -> SpanProcessor:
+        """Register a processor; tracing is enabled while any is registered"""
+        with self._lock:
+            if processor not in self._processors:
+                self._processors = self._processors + (processor,)
+            self.enabled = True
+        return processor
+
+    def remove_processor(self, processor: SpanProcessor) -> None:
+        with self._lock:
+            self._processors = tuple(p for p in self._processors if p is not processor)
+            self.enabled = bool(self._processors)
+
+    def clear(self) -> None:
+        """Remove every processor and disable tracing"""
+        with self._lock:
+            self._processors = ()
+            self.enabled = False
+
+    @property
+    def processors(self) -> Tuple[SpanProcessor, ...]:
+        return self._processors
+
+
+tracer = Tracer()
+
+
+def get_current_span() -> Optional[Span]:
+    """Innermost span open in the current context, if tracing is enabled"""
+    return _current_span.get()
+
+
+# Upper bounds of the latency buckets in milliseconds
+DEFAULT_BUCKETS_MS = (
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    25.0,
+    50.0,
+    100.0,
+    250.0,
+    500.0,
+    1000.0,
+    2500.0,
+    5000.0,
+    10000.0,
+    30000.0,
+)
+
+
+class _Histogram:
+    __slots__ = ("counts", "count", "sum", "max", "errors")
+
+    def __init__(self, buckets: int):
+        # One more bucket for values above the last bound
+        self.counts = [0] * (buckets + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.errors = 0
+
+
+def bucket_percentile(
+    bounds: Tuple[float, ...],
+    counts: List[int],
+    total: int,
+    max_value: float,
+    q: float,
+) -> float:
+    """
+    Estimate the ``q`` quantile of a fixed-bucket histogram.
+
+    Args:
+        bounds: Sorted bucket upper bounds
+        counts: Observations per bucket, with one extra for values above the
+            last bound
+        total: Number of observations
+        max_value: Largest value observed
+        q: Quantile between 0 and 1
+
+    Returns:
+        The upper bound of the bucket the quantile falls in, capped at the
+        largest value observed
+    """
+    rank = q * total
+    seen = 0
+    for index, count in enumerate(counts):
+        seen += count
+        if seen >= rank and count:
+            if index < len(bounds):
+                return min(bounds[index], max_value)
+            return max_value
+    return max_value
+
+
+class HistogramAggregator(SpanProcessor):
+    """
+    Latency histograms per span name, kept in the process.
+
+    Each finished span adds its duration to the fixed buckets of its name, so
+    memory stays constant however many spans are recorded. Percentiles are
+    estimated as the upper bound of the bucket they fall in.
+    """
+
+    def __init__(self, buckets_ms: Tuple[float, ...] = DEFAULT_BUCKETS_MS):
+        self.buckets_ms = tuple(sorted(buckets_ms))
+        self._histograms: Dict[str, _Histogram] = {}
+        self._lock = threading.Lock()
+
+    def on_end(self, span: Span) -> None:
+        duration = span.duration_ms
+        index = bisect_left(self.buckets_ms, duration)
+        with self._lock:
+            histogram = self._histograms.get(span.name)
+            if histogram is None:
+                histogram = self._histograms[span.name] = _Histogram(
+                    len(self.buckets_ms)
+                )
+            histogram.counts[index] += 1
+            histogram.count += 1
+            histogram.sum += duration
+            if duration > histogram.max:
+                histogram.max = duration
+            if span.error is not None:
+                histogram.errors += 1
+
+    def _percentile(self, histogram: _Histogram, q: float) -> float:
+        return bucket_percentile(
+            self.buckets_ms, histogram.counts, histogram.count, histogram.max, q
+        )
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Count, total, mean, max and p50/p95/p99 in milliseconds per span name"""
+        with self._lock:
+            return {
+                name: {
+                    "count": h.count,
+                    "errors": h.errors,
+                    "sum_ms": h.sum,
+                    "mean_ms": h.sum / h.count if h.count else 0.0,
+                    "max_ms": h.max,
+                    "p50_ms": self._percentile(h, 0.5),
+                    "p95_ms": self._percentile(h, 0.95),
+                    "p99_ms": self._percentile(h, 0.99),
+                }
+                for name, h in self._histograms.items()
+            }
+
+    def buckets(self) -> Dict[str, List[Tuple[float, int]]]:
+        """Cumulative (upper bound in ms, count) pairs per span name"""
+        with self._lock:
+            result = {}
+            for name, h in self._histograms.items():
+                cumulative = 0
+                pairs = []
+                for bound, count in zip(self.buckets_ms + (float("inf"),), h.counts):
+                    cumulative += count
+                    pairs.append((bound, cumulative))
+                result[name] = pairs
+            return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+
+def _otel_value(value: Any) -> Any:
+    if isinstance(value, (str, bool, int, float)):
+        return value
+    return str(value)
+
+
+class OpenTelemetryExporter(SpanProcessor):
+    """
+    Forwards spans to OpenTelemetry.
+
+    Requires the ``opentelemetry-api`` package; spans go to the given tracer
+    provider or to the globally configured one. Agent spans opened inside an
+    application span become its children.
+    """
+
+    def __init__(
+        self,
+        tracer_provider: Any = None,
+        instrumentation_name: str = "omnicoreagent",
+    ):
+        try:
+            from opentelemetry import trace
+        except ImportError as e:
+            raise ImportError(
+                "OpenTelemetryExporter requires opentelemetry-api. "
+                "Install it with: pip install opentelemetry-api opentelemetry-sdk"
+            ) from e
+
+        self._trace = trace
+        self._otel_tracer = trace.get_tracer(
+            instrumentation_name, tracer_provider=tracer_provider
+        )
+
+    def on_start(self, span: Span) -> None:
+        context = None
+        parent = span.parent
+        if parent is not None and parent.exporter_data:
+            parent_otel = parent.exporter_data.get(self)
+            if parent_otel is not None:
+                context = self._trace.set_span_in_context(parent_otel)
+        otel_span = self._otel_tracer.start_span(
+            span.name,
+            context=context,
+            start_time=span.start_time_ns,
+        )
+        if span.exporter_data is None:
+            span.exporter_data = {}
+        span.exporter_data[self] = otel_span
+
+    def on_end(self, span: Span) -> None:
+        otel_span = span.exporter_data.pop(self, None) if span.exporter_data else None
+        if otel_span is None:
+            return
+        for key, value in span.attributes.items():
+            if value is not None:
+                otel_span.set_attribute(key, _otel_value(value))
+        if span.error is not None:
+            from opentelemetry.trace import Status, StatusCode
+
+            otel_span.record_exception(span.error)
+            otel_span.set_status(Status(StatusCode.ERROR, str(span.error)))
+        otel_span.end(end_time=span.start_time_ns + (span.end_ns - span.start_ns))
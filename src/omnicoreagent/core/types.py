@@ -21,7 +21,7 @@ class AgentConfig(BaseModel):
 
     memory_tool_backend: str | None = Field(
         default=None,
-        description="Backend for memory tool. Options: 'local', 's3', 'db'",
+        description="Backend for memory tool. Options: 'local', 's3', 'db', 'in_memory'",
     )
 
     enable_agent_skills: bool = Field(
@@ -29,18 +29,80 @@ class AgentConfig(BaseModel):
         description="Enable Agent Skills feature for specialized capabilities",
     )
 
+    max_sessions: int = Field(
+        default=1024,
+        gt=0,
+        description="Maximum number of per-session states kept in memory (LRU)",
+    )
+    session_ttl: float = Field(
+        default=0,
+        ge=0,
+        description="Seconds an idle session state is kept; 0 = no expiry",
+    )
+
+    usage_limit_scope: str = Field(
+        default="session",
+        description="Scope request/token limits apply to: 'session', 'agent' or 'tenant'",
+    )
+
+    max_parallel_sub_agents: int = Field(
+        default=4,
+        ge=0,
+        description="Sub-agent calls run at once per step; 0 = unlimited",
+    )
+    sub_agent_timeout: float = Field(
+        default=0,
+        ge=0,
+        description="Seconds a sub-agent call may run; 0 = no timeout",
+    )
+
+    artifact_store: str | None = Field(
+        default=None,
+        description="Store for large tool outputs. Options: 'in_memory', 'local', 'redis'; None inlines them",
+    )
+    artifact_threshold_chars: int = Field(
+        default=20000,
+        gt=0,
+        description="Tool outputs longer than this are stored as artifacts",
+    )
+    artifact_preview_chars: int = Field(
+        default=2000,
+        ge=0,
+        description="Characters of a stored output kept in the conversation",
+    )
+
     @field_validator("memory_tool_backend")
     @classmethod
     def validate_backend(cls, v):
         if v is None:
             return v
-        allowed = {"local", "s3", "db"}
+        allowed = {"local", "s3", "db", "in_memory"}
         if v not in allowed:
             raise ValueError(
                 f"Invalid memory_tool_backend '{v}'. Must be one of {allowed}."
             )
         return v
 
+    @field_validator("artifact_store")
+    @classmethod
+    def validate_artifact_store(cls, v):
+        if v is None:
+            return v
+        allowed = {"in_memory", "local", "redis"}
+        if v not in allowed:
+            raise ValueError(f"Invalid artifact_store '{v}'. Must be one of {allowed}.")
+        return v
+
+    @field_validator("usage_limit_scope")
+    @classmethod
+    def validate_usage_limit_scope(cls, v):
+        allowed = {"session", "agent", "tenant"}
+        if v not in allowed:
+            raise ValueError(
+                f"Invalid usage_limit_scope '{v}'. Must be one of {allowed}."
+            )
+        return v
+
     @field_validator("request_limit", "total_tokens_limit", mode="before")
     @classmethod
     def convert_none_to_zero(cls, v):
@@ -94,6 +156,129 @@ class Message(BaseModel):
         return values
 
 
+def _content_to_str(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    try:
+        return json.dumps(content, ensure_ascii=False)
+    except Exception:
+        return str(content)
+
+
+class AgentMessage:
+    """
+    Lightweight message for an agent's working memory.
+
+    The agent loop appends messages to ``SessionState.messages`` on every
+    step and sends the whole list to the LLM on every call, so this type
+    skips Pydantic validation and serializes itself once: ``to_dict`` builds
+    the provider dict on first use and reuses it until a field is
+    reassigned. Use ``Message`` where input has to be validated, and
+    ``AgentMessage.from_message`` / ``to_message`` to convert.
+    """
+
+    __slots__ = (
+        "role",
+        "content",
+        "tool_call_id",
+        "tool_calls",
+        "metadata",
+        "timestamp",
+        "_dict",
+    )
+
+    def __init__(
+        self,
+        role: str,
+        content: Any,
+        tool_call_id: Optional[str] = None,
+        tool_calls: Optional[str] = None,
+        metadata: Optional[ToolCallMetadata] = None,
+        timestamp: Optional[str] = None,
+    ):
+        set_field = object.__setattr__
+        set_field(self, "role", role)
+        set_field(self, "content", _content_to_str(content))
+        set_field(self, "tool_call_id", tool_call_id)
+        set_field(self, "tool_calls", tool_calls)
+        set_field(self, "metadata", metadata)
+        set_field(self, "timestamp", timestamp)
+        set_field(self, "_dict", None)
+
+    def __setattr__(self, name: str, value: Any):
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, "_dict", None)
+
+    def __repr__(self) -> str:
+        return f"AgentMessage(role={self.role!r}, content={self.content!r})"
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, AgentMessage):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    __hash__ = None
+
+    @classmethod
+    def from_message(cls, message: Any) -> "AgentMessage":
+        """Convert a Message, a message dict or an AgentMessage"""
+        if isinstance(message, AgentMessage):
+            return message
+        if isinstance(message, dict):
+            metadata = message.get("metadata")
+            if isinstance(metadata, dict):
+                metadata = ToolCallMetadata.model_validate(metadata)
+            return cls(
+                role=message["role"],
+                content=message.get("content", ""),
+                tool_call_id=message.get("tool_call_id"),
+                tool_calls=message.get("tool_calls"),
+                metadata=metadata,
+                timestamp=message.get("timestamp"),
+            )
+        return cls(
+            role=message.role,
+            content=message.content,
+            tool_call_id=message.tool_call_id,
+            tool_calls=message.tool_calls,
+            metadata=message.metadata,
+            timestamp=message.timestamp,
+        )
+
+    def to_message(self) -> Message:
+        """Validated Pydantic copy of this message"""
+        return Message(
+            role=self.role,
+            content=self.content,
+            tool_call_id=self.tool_call_id,
+            tool_calls=self.tool_calls,
+            metadata=self.metadata,
+            timestamp=self.timestamp,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Provider dict of this message (same fields as ``Message.model_dump(exclude_none=True)``)"""
+        cached = self._dict
+        if cached is None:
+            cached = {"role": self.role, "content": self.content}
+            if self.tool_call_id is not None:
+                cached["tool_call_id"] = self.tool_call_id
+            if self.tool_calls is not None:
+                cached["tool_calls"] = self.tool_calls
+            if self.metadata is not None:
+                cached["metadata"] = self.metadata.model_dump(exclude_none=True)
+            if self.timestamp is not None:
+                cached["timestamp"] = self.timestamp
+            object.__setattr__(self, "_dict", cached)
+        return dict(cached)
+
+    def model_dump(self, exclude_none: bool = False, **kwargs: Any) -> dict[str, Any]:
+        """``Message.model_dump`` compatible dict, for code written against Message"""
+        if exclude_none:
+            return self.to_dict()
+        return self.to_message().model_dump(**kwargs)
+
+
 class ParsedResponse(BaseModel):
     action: bool | None = None
     data: str | None = None
@@ -151,7 +336,8 @@ class LoopDetectorConfig(BaseModel):
 
 
 class SessionState(BaseModel):
-    messages: list[Message]
+    # AgentMessage instances, plus raw dicts for replayed tool-call exchanges
+    messages: list[Any]
     state: AgentState
     loop_detector: Any
     assistant_with_tool_calls: dict | None
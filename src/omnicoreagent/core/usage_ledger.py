@@ -0,0 +1,320 @@
+"""
+Usage ledger keyed by (tenant, agent, session).
+
+Every LLM call made by an agent is recorded here instead of in a single
+process-wide counter, so usage limits are enforced per tenant, agent or session
+and one tenant cannot exhaust another's budget.
+
+Recording is a plain in-process dict update; no lock is taken on the hot path.
+Deltas are accumulated and periodically flushed to a pluggable sink (memory,
+Redis or SQL) for durable, cross-process accounting.
+"""
+
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from omnicoreagent.core.metrics import format_labels
+from omnicoreagent.core.token_usage import Usage
+from omnicoreagent.core.utils import logger
+
+UsageKey = Tuple[str, str, str]
+"""(tenant_id, agent_name, session_id)"""
+
+DEFAULT_TENANT = "default"
+
+USAGE_SCOPES = ("session", "agent", "tenant")
+
+
+def make_usage_key(
+    tenant_id: Optional[str], agent_name: str, session_id: Optional[str]
+) -> UsageKey:
+    """Build a ledger key, filling in defaults for missing parts"""
+    return (tenant_id or DEFAULT_TENANT, agent_name, session_id or "")
+
+
+class UsageSink(ABC):
+    """Destination for flushed usage deltas."""
+
+    @abstractmethod
+    async def write(self, deltas: Dict[UsageKey, Usage]) -> None:
+        """Persist usage deltas accumulated since the previous flush"""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Release any resources held by the sink"""
+
+
+class InMemoryUsageSink(UsageSink):
+    """Keeps flushed totals in memory; useful for tests and single-process setups."""
+
+    def __init__(self):
+        self.totals: Dict[UsageKey, Usage] = {}
+
+    async def write(self, deltas: Dict[UsageKey, Usage]) -> None:
+        for key, delta in deltas.items():
+            self.totals.setdefault(key, Usage()).incr(delta)
+
+
+class RedisUsageSink(UsageSink):
+    """Accumulates usage in Redis hashes (one hash per ledger key)."""
+
+    def __init__(self, redis_url: str, key_prefix: str = "omnicoreagent:usage"):
+        import redis.asyncio as redis
+
+        self.key_prefix = key_prefix
+        self._client = redis.from_url(redis_url, decode_responses=True)
+
+    def _redis_key(self, key: UsageKey) -> str:
+        return ":".join((self.key_prefix, *key))
+
+    async def write(self, deltas: Dict[UsageKey, Usage]) -> None:
+        async with self._client.pipeline(transaction=False) as pipe:
+            for key, delta in deltas.items():
+                redis_key = self._redis_key(key)
+                pipe.hincrby(redis_key, "requests", delta.requests)
+                pipe.hincrby(redis_key, "request_tokens", delta.request_tokens or 0)
+                pipe.hincrby(redis_key, "response_tokens", delta.response_tokens or 0)
+                pipe.hincrby(redis_key, "total_tokens", delta.total_tokens or 0)
+            await pipe.execute()
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class SQLUsageSink(UsageSink):
+    """Appends usage deltas as rows of a SQL table (any SQLAlchemy URL)."""
+
+    def __init__(self, db_url: str, table_name: str = "usage_ledger"):
+        from sqlalchemy import (
+            Column,
+            DateTime,
+            Integer,
+            MetaData,
+            String,
+            Table,
+            create_engine,
+            func,
+        )
+
+        self._engine = create_engine(db_url, pool_pre_ping=True)
+        metadata = MetaData()
+        self._table = Table(
+            table_name,
+            metadata,
+            Column("id", Integer, primary_key=True, autoincrement=True),
+            Column("tenant_id", String(128), index=True, nullable=False),
+            Column("agent_name", String(128), index=True, nullable=False),
+            Column("session_id", String(128), index=True, nullable=False),
+            Column("requests", Integer, nullable=False, default=0),
+            Column("request_tokens", Integer, nullable=False, default=0),
+            Column("response_tokens", Integer, nullable=False, default=0),
+            Column("total_tokens", Integer, nullable=False, default=0),
+            Column("created_at", DateTime(timezone=True), server_default=func.now()),
+        )
+        metadata.create_all(self._engine)
+
+    def _insert(self, rows: List[Dict[str, Any]]) -> None:
+        with self._engine.begin() as conn:
+            conn.execute(self._table.insert(), rows)
+
+    async def write(self, deltas: Dict[UsageKey, Usage]) -> None:
+        rows = [
+            {
+                "tenant_id": tenant_id,
+                "agent_name": agent_name,
+                "session_id": session_id,
+                "requests": delta.requests,
+                "request_tokens": delta.request_tokens or 0,
+                "response_tokens": delta.response_tokens or 0,
+                "total_tokens": delta.total_tokens or 0,
+            }
+            for (tenant_id, agent_name, session_id), delta in deltas.items()
+        ]
+        if rows:
+            await asyncio.to_thread(self._insert, rows)
+
+    async def close(self) -> None:
+        self._engine.dispose()
+
+
+class UsageLedger:
+    """
+    Per-(tenant, agent, session) usage accounting.
+
+    Totals are kept at three scopes so limits can be checked in O(1):
+    per tenant, per (tenant, agent) and per (tenant, agent, session). Session
+    totals are bounded (least recently used are dropped first); tenant and
+    agent totals are small and kept for the life of the ledger.
+
+    Usage:
+        ledger = UsageLedger(sink=RedisUsageSink(url))
+        ledger.start()  # periodic flush
+        ledger.record(("acme", "support", "s1"), Usage(requests=1, total_tokens=42))
+        ledger.get_usage(("acme", "support", "s1"), scope="tenant")
+    """
+
+    def __init__(
+        self,
+        sink: Optional[UsageSink] = None,
+        flush_interval: float = 10.0,
+        max_sessions: int = 10000,
+    ):
+        """
+        Initialize the UsageLedger.
+
+        Args:
+            sink: Where deltas are flushed (defaults to keeping nothing beyond
+                the in-process totals)
+            flush_interval: Seconds between background flushes started by ``start``
+            max_sessions: Maximum number of per-session totals kept in memory
+        """
+        self.sink = sink
+        self.flush_interval = flush_interval
+        self.max_sessions = max_sessions
+
+        self._sessions: OrderedDict[UsageKey, Usage] = OrderedDict()
+        self._agents: Dict[Tuple[str, str], Usage] = {}
+        self._tenants: Dict[str, Usage] = {}
+        self._pending: Dict[UsageKey, Usage] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def record(self, key: UsageKey, usage: Usage) -> None:
+        """Add ``usage`` to every scope of ``key``"""
+        tenant_id, agent_name, _ = key
+
+        session_total = self._sessions.get(key)
+        if session_total is None:
+            session_total = self._sessions[key] = Usage()
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(key)
+        session_total.incr(usage)
+
+        self._agents.setdefault((tenant_id, agent_name), Usage()).incr(usage)
+        self._tenants.setdefault(tenant_id, Usage()).incr(usage)
+
+        if self.sink is not None:
+            self._pending.setdefault(key, Usage()).incr(usage)
+
+    def get_usage(self, key: UsageKey, scope: str = "session") -> Usage:
+        """
+        Get the accumulated usage for ``key`` at the given scope.
+
+        Args:
+            key: Ledger key
+            scope: One of ``"session"``, ``"agent"`` or ``"tenant"``
+
+        Returns:
+            The running total (an empty Usage if nothing was recorded yet)
+        """
+        tenant_id, agent_name, _ = key
+        if scope == "session":
+            total = self._sessions.get(key)
+        elif scope == "agent":
+            total = self._agents.get((tenant_id, agent_name))
+        elif scope == "tenant":
+            total = self._tenants.get(tenant_id)
+        else:
+            raise ValueError(
+                f"Invalid usage scope '{scope}'. Must be one of {USAGE_SCOPES}."
+            )
+        return total if total is not None else Usage()
+
+    def tenants(self) -> Dict[str, Usage]:
+        """Totals per tenant"""
+        return dict(self._tenants)
+
+    def agents(self) -> Dict[Tuple[str, str], Usage]:
+        """Totals per (tenant, agent)"""
+        return dict(self._agents)
+
+    def reset(self, tenant_id: Optional[str] = None) -> None:
+        """Forget in-process totals, for one tenant or for all of them"""
+        if tenant_id is None:
+            self._sessions.clear()
+            self._agents.clear()
+            self._tenants.clear()
+            return
+
+        for key in [k for k in self._sessions if k[0] == tenant_id]:
+            del self._sessions[key]
+        for key in [k for k in self._agents if k[0] == tenant_id]:
+            del self._agents[key]
+        self._tenants.pop(tenant_id, None)
+
+    async def flush(self) -> None:
+        """Write pending deltas to the sink"""
+        if self.sink is None or not self._pending:
+            return
+
+        pending, self._pending = self._pending, {}
+        try:
+            await self.sink.write(pending)
+        except Exception as e:
+            logger.error(f"Failed to flush usage ledger: {e}")
+            for key, delta in pending.items():
+                self._pending.setdefault(key, Usage()).incr(delta)
+
+    def start(self) -> None:
+        """Start flushing to the sink every ``flush_interval`` seconds"""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Stop the periodic flush and write anything still pending"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
+        if self.sink is not None:
+            await self.sink.close()
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def export_prometheus(self, prefix: str = "omnicoreagent") -> str:
+        """
+        Render per-tenant and per-agent totals in the Prometheus text format.
+
+        Session-level totals are not exported to keep label cardinality bounded.
+        """
+        metrics = (
+            ("requests", "LLM requests made"),
+            ("request_tokens", "Prompt tokens sent to the LLM"),
+            ("response_tokens", "Completion tokens received from the LLM"),
+            ("total_tokens", "Total tokens exchanged with the LLM"),
+        )
+        lines: List[str] = []
+        for field_name, help_text in metrics:
+            name = f"{prefix}_llm_{field_name}_total"
+            lines.append(f"# HELP {name} {help_text}.")
+            lines.append(f"# TYPE {name} counter")
+            for (tenant_id, agent_name), total in sorted(self._agents.items()):
+                value = getattr(total, field_name) or 0
+                labels = format_labels(tenant=tenant_id, agent=agent_name)
+                lines.append(f"{name}{{{labels}}} {value}")
+        lines.append(f"# HELP {prefix}_usage_ledger_timestamp_seconds Export time.")
+        lines.append(f"# TYPE {prefix}_usage_ledger_timestamp_seconds gauge")
+        lines.append(f"{prefix}_usage_ledger_timestamp_seconds {time.time():.3f}")
+        return "\n".join(lines) + "\n"
+
+
+_default_ledger: Optional[UsageLedger] = None
+
+
+def get_default_usage_ledger() -> UsageLedger:
+    """Ledger used by agents that were not given one explicitly"""
+    global _default_ledger
+    if _default_ledger is None:
+        _default_ledger = UsageLedger()
+    return _default_ledger
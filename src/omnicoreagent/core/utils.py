@@ -7,13 +7,10 @@ import subprocess
 import sys
 import uuid
 from collections import defaultdict, deque
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 from types import SimpleNamespace
-from rich.console import Console, Group
-from rich.panel import Panel
-from rich.pretty import Pretty
-from rich.text import Text
 from datetime import datetime, timezone
 from decouple import config as decouple_config
 import xml.etree.ElementTree as ET
@@ -23,7 +20,6 @@ from html import escape
 import ast
 import inspect
 
-console = Console()
 logger = logging.getLogger("omnicoreagent")
 logger.setLevel(logging.INFO)
 
@@ -35,7 +31,9 @@ console_handler = logging.StreamHandler(sys.stdout)
 console_handler.setLevel(logging.INFO)
 
 log_file = Path("omnicoreagent.log")
-file_handler = logging.FileHandler(log_file, mode="a")
+# delay=True: the log file is only created on the first emitted record,
+# not as a side effect of importing the package.
+file_handler = logging.FileHandler(log_file, mode="a", delay=True)
 file_handler.setLevel(logging.INFO)
 
 console_formatter = logging.Formatter(
@@ -55,7 +53,6 @@ logger.addHandler(console_handler)
 logger.addHandler(file_handler)
 
 console_handler.flush = sys.stdout.flush
-file_handler.flush = lambda: file_handler.stream.flush()
 import asyncio
 import inspect
 import traceback
@@ -161,6 +158,38 @@ def hash_text(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
 
+# Tool inputs and outputs longer than this are fingerprinted by their length
+# and their first and last halves of this many characters.
+FINGERPRINT_SAMPLE_CHARS = 64 * 1024
+
+
+def fingerprint(value: Any, sample_chars: int = FINGERPRINT_SAMPLE_CHARS) -> str:
+    """
+    Cheap digest of a tool input or output for loop detection.
+
+    Values up to ``sample_chars`` are hashed whole. Longer ones are hashed by
+    length, head and tail only, so a multi-MB output costs the same as a
+    128 KB one; two large outputs differing only in the middle count as the
+    same output, which errs on the side of reporting a loop.
+    """
+    if not isinstance(value, (str, bytes)):
+        value = str(value)
+    if len(value) > sample_chars:
+        half = sample_chars // 2
+        value = (
+            f"{len(value)}:".encode()
+            + _as_bytes(value[:half])
+            + _as_bytes(value[-half:])
+        )
+    return hashlib.blake2b(_as_bytes(value), digest_size=16).hexdigest()
+
+
+def _as_bytes(value: str | bytes) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    return value.encode("utf-8", "surrogatepass")
+
+
 class RobustLoopDetector:
     def __init__(
         self,
@@ -170,6 +199,7 @@ class RobustLoopDetector:
         max_pattern_length: int = 5,
         pattern_repetition_threshold: int = 4,
         debug: bool = True,
+        max_tools: int = 64,
     ):
         """
         Initialize a robust loop detector.
@@ -180,36 +210,75 @@ class RobustLoopDetector:
         - max_pattern_length: max pattern length for pattern detection
         - pattern_repetition_threshold: how many times a pattern must repeat to be considered a loop (default: 4)
         - debug: enable debug logging
+        - max_tools: number of distinct tools tracked; the least recently called are forgotten
+
+        Patterns are tracked incrementally: for every pattern length L the
+        detector counts how many of the latest calls in a row equal the call
+        L positions earlier, so recording a call and checking for a loop
+        cost O(max_pattern_length) regardless of history size.
         """
+        self.maxlen = maxlen
         self.global_interactions = deque(maxlen=maxlen)
-        self.tool_interactions: dict[str, deque] = defaultdict(
-            lambda: deque(maxlen=maxlen)
-        )
+        self.tool_interactions: dict[str, deque] = {}
+        self._pattern_runs: dict[str, list[int]] = {}
+        self._last_call: dict[str, int] = {}
+        self._calls = 0
         self.consecutive_threshold = max(1, consecutive_threshold)
         self.pattern_detection = pattern_detection
         self.max_pattern_length = max(1, max_pattern_length)
         self.pattern_repetition_threshold = max(4, pattern_repetition_threshold)
+        self.max_tools = max(1, max_tools)
 
         self._last_signature = None
         self._consecutive_count = 0
         self.debug = debug
 
     def record_tool_call(
-        self, tool_name: str, tool_input: str, tool_output: str
+        self,
+        tool_name: str,
+        tool_input: Any,
+        tool_output: Any,
+        input_digest: str | None = None,
+        output_digest: str | None = None,
     ) -> None:
-        """Record a new tool call interaction."""
+        """
+        Record a new tool call interaction.
+
+        ``input_digest``/``output_digest`` let the tool layer pass digests
+        it already has instead of having the values fingerprinted here.
+        """
         tool_name = tool_name or "unknown_tool"
-        tool_input = tool_input if tool_input is not None else ""
-        tool_output = tool_output if tool_output is not None else ""
+        if input_digest is None:
+            input_digest = fingerprint(tool_input if tool_input is not None else "")
+        if output_digest is None:
+            output_digest = fingerprint(tool_output if tool_output is not None else "")
 
-        signature = (
-            tool_name,
-            hash_text(tool_input),
-            hash_text(tool_output),
-        )
+        signature = (tool_name, input_digest, output_digest)
 
         self.global_interactions.append(signature)
-        self.tool_interactions[tool_name].append(signature)
+        history = self.tool_interactions.get(tool_name)
+        if history is None:
+            history = self.tool_interactions[tool_name] = deque(
+                maxlen=max(self.maxlen, self.max_pattern_length)
+            )
+            self._pattern_runs[tool_name] = [0] * (self.max_pattern_length + 1)
+            if len(self.tool_interactions) > self.max_tools:
+                evicted = min(
+                    (name for name in self._last_call if name != tool_name),
+                    key=self._last_call.__getitem__,
+                )
+                self.reset(evicted)
+        self._calls += 1
+        self._last_call[tool_name] = self._calls
+
+        runs = self._pattern_runs[tool_name]
+        size = len(history)
+        for pattern_len in range(1, self.max_pattern_length + 1):
+            if size >= pattern_len and history[-pattern_len] == signature:
+                runs[pattern_len] += 1
+            else:
+                runs[pattern_len] = 0
+        history.append(signature)
 
         if signature == self._last_signature:
             self._consecutive_count += 1
@@ -235,6 +304,8 @@ class RobustLoopDetector:
         """
         if tool_name and tool_name.strip():
             self.tool_interactions.pop(tool_name, None)
+            self._pattern_runs.pop(tool_name, None)
+            self._last_call.pop(tool_name, None)
 
             if self._last_signature and self._last_signature[0] == tool_name:
                 self._last_signature = None
@@ -242,6 +313,8 @@ class RobustLoopDetector:
         else:
             self.global_interactions.clear()
             self.tool_interactions.clear()
+            self._pattern_runs.clear()
+            self._last_call.clear()
             self._last_signature = None
             self._consecutive_count = 0
 
@@ -259,7 +332,7 @@ class RobustLoopDetector:
         if not tool_name:
             return False
 
-        tool_history = self.tool_interactions.get(tool_name, [])
+        tool_history = self.tool_interactions.get(tool_name)
         if not tool_history:
             return False
 
@@ -284,52 +357,31 @@ class RobustLoopDetector:
         """
         Detect repeating patterns for a tool.
 
-        A pattern is considered a loop only if it repeats pattern_repetition_threshold times.
-        For example, with threshold=2 and pattern_length=2:
-        - [A, B, A, B, A, B] is a loop (pattern [A,B] repeats 3 times >= 2)
-        - [A, B, A, B] is NOT a loop (pattern [A,B] repeats only 2 times, need 3+ for threshold 2)
+        A pattern is considered a loop only if it occurs pattern_repetition_threshold + 1
+        times in a row within the last maxlen calls of the tool. For example, with
+        threshold=4 and pattern_length=2, [A, B] * 5 is a loop and [A, B] * 4 is not.
+
+        The pattern of length L repeats k times in a row exactly when each of the
+        last (k - 1) * L calls equals the call L positions before it, which is the
+        run length kept by record_tool_call.
         """
 
         if not tool_name or not self.pattern_detection:
             return False
 
-        interactions = list(self.tool_interactions.get(tool_name, []))
-
-        min_required = 4
-        if len(interactions) < min_required:
+        runs = self._pattern_runs.get(tool_name)
+        if runs is None:
             return False
 
-        max_checkable_pattern = min(
-            self.max_pattern_length,
-            len(interactions) // (self.pattern_repetition_threshold + 1),
-        )
-
-        if max_checkable_pattern < 1:
-            return False
-
-        for pattern_len in range(1, max_checkable_pattern + 1):
-            required_length = pattern_len * (self.pattern_repetition_threshold + 1)
-
-            if len(interactions) < required_length:
-                continue
-
-            pattern = interactions[-pattern_len:]
-            is_loop = True
-
-            for i in range(1, self.pattern_repetition_threshold + 1):
-                start_idx = -(i + 1) * pattern_len
-                end_idx = -i * pattern_len if i > 0 else None
-                prev_pattern = interactions[start_idx:end_idx]
-
-                if len(prev_pattern) != pattern_len or prev_pattern != pattern:
-                    is_loop = False
-                    break
-
-            if is_loop:
+        repetitions = self.pattern_repetition_threshold + 1
+        for pattern_len in range(1, self.max_pattern_length + 1):
+            if pattern_len * repetitions > self.maxlen:
+                break
+            if runs[pattern_len] >= pattern_len * self.pattern_repetition_threshold:
                 if self.debug:
                     logger.info(
                         f"[LoopDetector] Tool '{tool_name}' has repeating pattern: "
-                        f"{pattern_len} steps repeated {self.pattern_repetition_threshold + 1} times."
+                        f"{pattern_len} steps repeated {repetitions} times."
                     )
                 return True
 
@@ -643,7 +695,20 @@ def strip_json_comments(text: str) -> str:
     return re.sub(pattern, replacer, text, flags=re.DOTALL | re.MULTILINE)
 
 
+@lru_cache(maxsize=None)
+def get_console():
+    """Return the shared rich console, importing rich on first use."""
+    from rich.console import Console
+
+    return Console()
+
+
 def show_tool_response(agent_name, tool_name, tool_args, observation):
+    from rich.console import Group
+    from rich.panel import Panel
+    from rich.pretty import Pretty
+    from rich.text import Text
+
     content = Group(
         Text(agent_name.upper(), style="bold magenta"),
         Text(f"→ Calling tool: {tool_name}", style="bold blue"),
@@ -654,10 +719,15 @@ def show_tool_response(agent_name, tool_name, tool_args, observation):
     )
 
     panel = Panel.fit(content, title="🔧 TOOL CALL LOG", border_style="bright_black")
-    console.print(panel)
+    get_console().print(panel)
 
 
 def show_sub_agent_call_result(agent_call_result):
+    from rich.console import Group
+    from rich.panel import Panel
+    from rich.pretty import Pretty
+    from rich.text import Text
+
     blocks = []
 
     parent_agent = agent_call_result.get("agent_name", "unknown_agent")
@@ -697,7 +767,7 @@ def show_sub_agent_call_result(agent_call_result):
         border_style="bright_black",
     )
 
-    console.print(panel)
+    get_console().print(panel)
 
 
 def normalize_tool_args(value: Any) -> Any:
@@ -761,6 +831,7 @@ def normalize_tool_args(value: Any) -> Any:
     return _normalize(value)
 
 
+@lru_cache(maxsize=1)
 def get_mac_address() -> str:
     """Get the MAC address of the client machine.
 
@@ -830,7 +901,15 @@ def build_xml_observations_block(tools_results):
     return "\n".join(lines)
 
 
-CLIENT_MAC_ADDRESS = get_mac_address()
+def __getattr__(name: str) -> Any:
+    # CLIENT_MAC_ADDRESS used to be computed at import time, which may shell
+    # out to `ip link show`; resolve it on first access instead.
+    if name == "CLIENT_MAC_ADDRESS":
+        return get_mac_address()
+    if name == "console":
+        return get_console()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 OPIK_AVAILABLE = False
 track = None
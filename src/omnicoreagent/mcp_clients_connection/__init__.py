@@ -8,17 +8,42 @@ This package provides MCP client functionality including:
 - Tool discovery and management
 - Server capabilities refresh
 - Notifications and sampling
+
+The ``mcp`` SDK is only imported when one of these names is first accessed.
 """
 
-from .client import MCPClient, Configuration
-from .resources import (
-    list_resources,
-    read_resource,
-    subscribe_resource,
-    unsubscribe_resource,
-)
-from .tools import list_tools
-from .prompts import get_prompt, get_prompt_with_react_agent, list_prompts
+from typing import TYPE_CHECKING
+
+from omnicoreagent.core.lazy_imports import lazy_module_attrs
+
+if TYPE_CHECKING:
+    from .client import MCPClient
+    from .configuration import Configuration
+    from .resources import (
+        list_resources,
+        read_resource,
+        subscribe_resource,
+        unsubscribe_resource,
+    )
+    from .resource_summaries import ResourceSummaryCache
+    from .tools import list_tools
+    from .prompts import get_prompt, get_prompt_with_react_agent, list_prompts
+
+_LAZY_IMPORTS = {
+    "MCPClient": ".client",
+    "Configuration": ".configuration",
+    "list_resources": ".resources",
+    "read_resource": ".resources",
+    "subscribe_resource": ".resources",
+    "unsubscribe_resource": ".resources",
+    "ResourceSummaryCache": ".resource_summaries",
+    "list_tools": ".tools",
+    "get_prompt": ".prompts",
+    "get_prompt_with_react_agent": ".prompts",
+    "list_prompts": ".prompts",
+}
+
+__getattr__, __dir__ = lazy_module_attrs(__name__, _LAZY_IMPORTS)
 
 __all__ = [
     "MCPClient",
@@ -27,6 +52,7 @@ __all__ = [
     "read_resource",
     "subscribe_resource",
     "unsubscribe_resource",
+    "ResourceSummaryCache",
     "list_tools",
     "get_prompt",
     "get_prompt_with_react_agent",
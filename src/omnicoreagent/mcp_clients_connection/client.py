@@ -2,24 +2,24 @@ import asyncio
 import json
 import os
 from contextlib import AsyncExitStack
-from dataclasses import dataclass, field
 from datetime import timedelta
 from pathlib import Path
 from typing import Any
 import anyio
-from dotenv import load_dotenv
-from decouple import config as decouple_config
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.sse import sse_client
 from mcp.client.stdio import stdio_client
 from mcp.client.streamable_http import streamablehttp_client
 
 from omnicoreagent.core.llm import LLMConnection
-from omnicoreagent.mcp_clients_connection.notifications import handle_notifications
+from omnicoreagent.mcp_clients_connection.notifications import NotificationHandler
 from omnicoreagent.mcp_clients_connection.refresh_server_capabilities import (
     refresh_capabilities,
 )
-from omnicoreagent.mcp_clients_connection.sampling import samplingCallback
+from omnicoreagent.mcp_clients_connection.sampling import (
+    samplingCallback,
+    sampling_options,
+)
 from omnicoreagent.core.utils import logger
 from http.server import BaseHTTPRequestHandler, HTTPServer
 from urllib.parse import parse_qs, urlparse
@@ -154,57 +154,32 @@ class CallbackServer:
         return self.callback_data["state"]
 
 
-@dataclass
-class Configuration:
-    """Manages configuration and environment variables for the MCP client."""
-
-    llm_api_key: str = field(init=False)
-    embedding_api_key: str = field(init=False)
-
-    def __post_init__(self) -> None:
-        """Initialize configuration with environment variables."""
-        self.load_env()
-        self.llm_api_key = decouple_config("LLM_API_KEY", default=None)
-
-        if not self.llm_api_key:
-            raise ValueError("LLM_API_KEY not found in environment variables")
-
-    @staticmethod
-    def load_env() -> None:
-        """Load environment variables from .env file."""
-        load_dotenv()
-
-    def load_config(self, file_path: str) -> dict:
-        """Load server configuration from JSON file."""
-        config_path = Path(file_path)
-        logger.info(f"Loading configuration from: {config_path.name}")
-
-        if not config_path.name.startswith("servers_config"):
-            raise ValueError("Config file name must start with 'servers_config'")
-
-        if config_path.is_absolute() or config_path.parent != Path("."):
-            if config_path.exists():
-                with open(config_path, encoding="utf-8") as f:
-                    return json.load(f)
-            else:
-                raise FileNotFoundError(f"Configuration file not found: {config_path}")
-
-        if config_path.exists():
-            with open(config_path, encoding="utf-8") as f:
-                return json.load(f)
-
-        raise FileNotFoundError(f"Configuration file not found: {config_path}")
-
-
 class MCPClient:
     def __init__(
         self,
         config: dict[str, Any],
         debug: bool = False,
         config_filename: str = "servers_config.json",
+        config_data: dict[str, Any] | None = None,
     ):
+        """
+        Initialize the MCP client.
+
+        Args:
+            config: Configuration object (see ``Configuration``)
+            debug: Enable debug logging
+            config_filename: servers_config JSON file to read when no ``config_data`` is given
+            config_data: Already-parsed servers configuration; when given, the
+                client never reads configuration from disk
+
+        Sampling requests from the servers are limited by the optional
+        ``LLM.sampling`` block of the configuration (``max_concurrency``,
+        ``token_budget``, ``request_budget``, ``max_tokens_per_request`` and
+        ``max_retries``).
+        """
         self.config = config
         self.config_filename = config_filename
+        self.config_data = config_data
         self.sessions = {}
         self._cleanup_lock = asyncio.Lock()
         self.available_tools = {}
@@ -217,7 +192,9 @@ class MCPClient:
         self.llm_connection = None
         if self.config and hasattr(self.config, "llm_api_key"):
             try:
-                self.llm_connection = LLMConnection(self.config, self.config_filename)
+                self.llm_connection = LLMConnection(
+                    self.config, self.config_filename, config_data=config_data
+                )
                 if self.llm_connection and self.llm_connection.llm_config:
                     logger.debug("LLM connection initialized successfully")
                 else:
@@ -228,13 +205,35 @@ class MCPClient:
             except Exception as e:
                 logger.warning(f"Failed to initialize LLM connection: {e}")
                 self.llm_connection = None
-        self.sampling_callback = samplingCallback()
+        self.sampling_callback = samplingCallback(
+            config_filename=config_filename,
+            config_data=config_data,
+            credentials=self.llm_connection.client.credentials
+            if self.llm_connection
+            else None,
+            **sampling_options(self._initial_config()),
+        )
         self.tasks = {}
         self.server_count = 0
 
-    async def connect_to_servers(self, config_filename: str = "servers_config.json"):
+    def _initial_config(self) -> dict | None:
+        """Configuration at start-up, or None if the config file does not exist"""
+        if self.config_data is not None:
+            return self.config_data
+        if not self.config_filename or not Path(self.config_filename).exists():
+            return None
+        with open(self.config_filename, encoding="utf-8") as f:
+            return json.load(f)
+
+    def load_server_config(self, config_filename: str | None = None) -> dict:
+        """Return the servers configuration, preferring the in-memory copy."""
+        if config_filename is None and self.config_data is not None:
+            return self.config_data
+        return self.config.load_config(config_filename or self.config_filename)
+
+    async def connect_to_servers(self, config_filename: str | None = None):
         """Connect to an MCP server"""
-        server_config = self.config.load_config(config_filename)
+        server_config = self.load_server_config(config_filename)
         servers = [
             {"name": name, "srv_config": srv_config}
             for name, srv_config in server_config["mcpServers"].items()
@@ -252,16 +251,16 @@ class MCPClient:
                 logger.info(f"Server connection result: {result}")
         except Exception as e:
             logger.info(f"start servers task error: {e}")
-        asyncio.create_task(
-            handle_notifications(
-                sessions=self.sessions,
-                debug=self.debug,
-                server_names=self.server_names,
-                available_tools=self.available_tools,
-                available_resources=self.available_resources,
-                available_prompts=self.available_prompts,
-                refresh_capabilities=refresh_capabilities,
-            )
+
+    async def _refresh_capabilities(self):
+        """Reload the tools, resources and prompts of the connected servers"""
+        await refresh_capabilities(
+            sessions=self.sessions,
+            server_names=self.server_names,
+            available_tools=self.available_tools,
+            available_resources=self.available_resources,
+            available_prompts=self.available_prompts,
+            debug=self.debug,
         )
 
     async def _connect_to_single_server(self, server, server_added_name):
@@ -364,16 +363,23 @@ class MCPClient:
 
                 read_stream, write_stream = transport
 
+            notification_handler = NotificationHandler(
+                server_added_name, self._refresh_capabilities
+            )
             session = await stack.enter_async_context(
                 ClientSession(
                     read_stream,
                     write_stream,
-                    sampling_callback=self.sampling_callback._sampling,
+                    sampling_callback=self.sampling_callback.for_server(
+                        server_added_name
+                    ),
                     read_timeout_seconds=timedelta(seconds=300),
+                    message_handler=notification_handler,
                 )
             )
             init_result = await session.initialize()
             server_name = init_result.serverInfo.name
+            notification_handler.server_name = server_name
             capabilities = init_result.capabilities
             if server_name in self.server_names:
                 error_message = (
@@ -399,14 +405,7 @@ class MCPClient:
                 logger.info(
                     f"Successfully connected to {server_name} via {transport_type}"
                 )
-            await refresh_capabilities(
-                sessions=self.sessions,
-                server_names=self.server_names,
-                available_tools=self.available_tools,
-                available_resources=self.available_resources,
-                available_prompts=self.available_prompts,
-                debug=self.debug,
-            )
+            await self._refresh_capabilities()
 
             return f"{server_name} connected succesfully"
         except Exception as e:
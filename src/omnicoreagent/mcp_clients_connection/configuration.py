@@ -0,0 +1,67 @@
+import json
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from dotenv import load_dotenv
+from decouple import config as decouple_config
+
+from omnicoreagent.core.utils import logger
+
+
+@lru_cache(maxsize=1)
+def _load_dotenv_once() -> None:
+    """Read the .env file once per process; later calls are no-ops."""
+    load_dotenv()
+
+
+@dataclass
+class Configuration:
+    """Manages configuration and environment variables for the MCP client."""
+
+    llm_api_key: str = field(init=False)
+    embedding_api_key: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Initialize configuration with environment variables."""
+        self.load_env()
+        self.llm_api_key = decouple_config("LLM_API_KEY", default=None)
+
+        if not self.llm_api_key:
+            raise ValueError("LLM_API_KEY not found in environment variables")
+
+    @staticmethod
+    def load_env() -> None:
+        """Load environment variables from .env file."""
+        _load_dotenv_once()
+
+    def load_config(self, file_path: str | dict[str, Any]) -> dict:
+        """Load server configuration.
+
+        Args:
+            file_path: Path to a ``servers_config*.json`` file, or an already
+                parsed configuration dict which is returned as-is without
+                touching the filesystem.
+        """
+        if isinstance(file_path, dict):
+            return file_path
+
+        config_path = Path(file_path)
+        logger.info(f"Loading configuration from: {config_path.name}")
+
+        if not config_path.name.startswith("servers_config"):
+            raise ValueError("Config file name must start with 'servers_config'")
+
+        if config_path.is_absolute() or config_path.parent != Path("."):
+            if config_path.exists():
+                with open(config_path, encoding="utf-8") as f:
+                    return json.load(f)
+            else:
+                raise FileNotFoundError(f"Configuration file not found: {config_path}")
+
+        if config_path.exists():
+            with open(config_path, encoding="utf-8") as f:
+                return json.load(f)
+
+        raise FileNotFoundError(f"Configuration file not found: {config_path}")
@@ -1,5 +1,5 @@
 import asyncio
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 from mcp.types import (
@@ -7,116 +7,106 @@ from mcp.types import (
     PromptListChangedNotification,
     ResourceListChangedNotification,
     ResourceUpdatedNotification,
+    ServerNotification,
     ToolListChangedNotification,
 )
 
 from omnicoreagent.core.utils import logger
+from omnicoreagent.mcp_clients_connection.resource_summaries import (
+    resource_summary_cache,
+)
+
+
+class NotificationHandler:
+    """
+    ``message_handler`` for a server's ``ClientSession``.
+
+    The session calls the handler from its receive loop, so capability
+    refreshes, which send requests on the same session, run as tasks.
+    """
+
+    def __init__(
+        self,
+        server_name: str,
+        refresh_capabilities: Callable[[], Awaitable[Any]] = None,
+    ):
+        """
+        Initialize the NotificationHandler.
+
+        Args:
+            server_name: Name the server's sessions and resources are kept
+                under; set it again once the server reports its own name
+            refresh_capabilities: Zero-argument coroutine function that
+                reloads the tools, resources and prompts of the connected
+                servers
+        """
+        self.server_name = server_name
+        self.refresh_capabilities = refresh_capabilities
+
+    def _refresh_capabilities_task(self):
+        server_name = self.server_name
+
+        async def refresh():
+            try:
+                logger.info(f"Starting capability refresh for {server_name}")
+                await self.refresh_capabilities()
+                logger.info(
+                    f"Successfully refreshed capabilities after notification from {server_name}"
+                )
+            except Exception as e:
+                logger.error(
+                    f"Failed to refresh capabilities after notification from {server_name}: {str(e)}"
+                )
 
+        if self.refresh_capabilities is None:
+            return
+        task = asyncio.create_task(refresh())
+        task.add_done_callback(
+            lambda t: logger.debug(
+                f"Capability refresh task completed for {server_name}"
+            )
+        )
+
+    async def __call__(self, message: Any) -> None:
+        server_name = self.server_name
+        if isinstance(message, Exception):
+            logger.warning(f"Error in session with {server_name}: {message}")
+            return
+        if not isinstance(message, ServerNotification):
+            return
+
+        logger.debug(f"Received notification from {server_name}: {message}")
+        try:
+            match message.root:
+                case ResourceUpdatedNotification(params=params):
+                    logger.info(f"Resource updated: {params.uri} from {server_name}")
+                    resource_summary_cache.invalidate(server_name, str(params.uri))
+                    self._refresh_capabilities_task()
+
+                case ResourceListChangedNotification():
+                    logger.info(f"Resource list changed from {server_name}")
+                    self._refresh_capabilities_task()
+
+                case ToolListChangedNotification():
+                    logger.info(f"Tool list changed from {server_name}")
+                    self._refresh_capabilities_task()
+
+                case PromptListChangedNotification():
+                    logger.info(f"Prompt list changed from {server_name}")
+                    self._refresh_capabilities_task()
+
+                case ProgressNotification(params=params):
+                    progress_percentage = (
+                        (params.progress / params.total * 100) if params.total else 0
+                    )
+                    logger.info(
+                        f"Progress from {server_name}: {params.progress}/{params.total} "
+                        f"({progress_percentage:.1f}%)"
+                    )
 
-async def handle_notifications(
-    sessions: dict[str, dict[str, Any]],
-    debug: bool = False,
-    server_names: list[str] = None,
-    available_tools: dict[str, Any] = None,
-    available_resources: dict[str, Any] = None,
-    available_prompts: dict[str, Any] = None,
-    refresh_capabilities: Callable[[], Any] = None,
-):
-    """Handle incoming notifications from the server."""
-    try:
-        for server_name in sessions:
-            async for message in sessions[server_name]["session"].incoming_messages:
-                logger.debug(f"Received notification from {server_name}: {message}")
-
-                async def refresh_capabilities_task():
-                    try:
-                        logger.info(f"Starting capability refresh for {server_name}")
-
-                        await refresh_capabilities(
-                            sessions=sessions,
-                            server_names=server_names,
-                            available_tools=available_tools,
-                            available_resources=available_resources,
-                            available_prompts=available_prompts,
-                            debug=debug,
-                        )
-                        logger.info(
-                            f"Successfully refreshed capabilities after notification from {server_name}"
-                        )
-                        for handler in logger.handlers:
-                            handler.flush()
-                    except Exception as e:
-                        logger.error(
-                            f"Failed to refresh capabilities after notification from {server_name}: {str(e)}"
-                        )
-                        for handler in logger.handlers:
-                            handler.flush()
-
-                try:
-                    match message.root:
-                        case ResourceUpdatedNotification(params=params):
-                            logger.info(
-                                f"Resource updated: {params.uri} from {server_name}"
-                            )
-                            task = asyncio.create_task(refresh_capabilities_task())
-                            task.add_done_callback(
-                                lambda t: logger.debug(
-                                    f"Capability refresh task completed for {server_name}"
-                                )
-                            )
-
-                        case ResourceListChangedNotification(params=params):
-                            logger.info(f"Resource list changed from {server_name}")
-                            task = asyncio.create_task(refresh_capabilities_task())
-                            task.add_done_callback(
-                                lambda t: logger.debug(
-                                    f"Capability refresh task completed for {server_name}"
-                                )
-                            )
-
-                        case ToolListChangedNotification(params=params):
-                            logger.info(f"Tool list changed from {server_name}")
-                            task = asyncio.create_task(refresh_capabilities_task())
-                            task.add_done_callback(
-                                lambda t: logger.debug(
-                                    f"Capability refresh task completed for {server_name}"
-                                )
-                            )
-
-                        case PromptListChangedNotification(params=params):
-                            logger.info(f"Prompt list changed from {server_name}")
-                            task = asyncio.create_task(refresh_capabilities_task())
-                            task.add_done_callback(
-                                lambda t: logger.debug(
-                                    f"Capability refresh task completed for {server_name}"
-                                )
-                            )
-
-                        case ProgressNotification(params=params):
-                            progress_percentage = (
-                                (params.progress / params.total * 100)
-                                if params.total > 0
-                                else 0
-                            )
-                            logger.info(
-                                f"Progress from {server_name}: {params.progress}/{params.total} "
-                                f"({progress_percentage:.1f}%)"
-                            )
-
-                        case _:
-                            logger.warning(
-                                f"Unhandled notification type from {server_name}: {type(message.root).__name__}"
-                            )
-                except Exception as e:
-                    logger.error(
-                        f"Error processing notification from {server_name}: {str(e)}"
+                case _:
+                    logger.debug(
+                        f"Unhandled notification type from {server_name}: {type(message.root).__name__}"
                     )
-                    continue
-
-    except AttributeError:
-        logger.warning(f"No notification received from {server_name}")
-    except Exception as e:
-        logger.error(f"Fatal error in notification handler: {str(e)}")
-    finally:
-        for handler in logger.handlers:
-            handler.flush()
+        except Exception as e:
+            logger.error(f"Error processing notification from {server_name}: {str(e)}")
@@ -0,0 +1,297 @@
+"""
+Chunked summarization of MCP resources and a cache for the summaries.
+
+Large resources are split into chunks of about ``chunk_tokens`` tokens, each
+chunk is summarized on its own (a few at a time), and the chunk summaries are
+merged batch by batch until one summary is left. Tokens are counted as
+whitespace-separated words, the same approximation the memory stores use for
+``token_budget``. Text with little whitespace, such as minified JSON, is also
+cut at ``CHARS_PER_TOKEN`` characters per token, so no chunk is longer than
+``chunk_tokens * CHARS_PER_TOKEN`` characters.
+"""
+
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterator
+from typing import Any, Dict, List, Optional, Set, Tuple
+import asyncio
+import hashlib
+import re
+
+SUMMARY_PROMPT = "Analyze the document content and provide a clear, concise summary that captures all essential information. Focus on key points, main concepts, and critical details that give the user a complete understanding without reading the entire document. Present your summary using bullet points for main ideas followed by a brief paragraph for context when needed. Include any technical terms, specifications, instructions, or warnings that are vital to proper understanding. Do not include phrases like 'here is your summary' or 'in summary' - deliver only the informative content directly."
+
+CHUNK_PROMPT = "You are reading one part of a longer document. Summarize this part so it can later be merged with the summaries of the other parts. Keep every key point, technical term, specification, instruction, number and warning; drop repetition and filler. Deliver only the summary content."
+
+MERGE_PROMPT = "The following are summaries of consecutive parts of one document. Merge them into a single summary of those parts, keeping every key point, technical term, specification, instruction, number and warning, and removing repetition. Deliver only the summary content."
+
+CHARS_PER_TOKEN = 8
+
+_TOKEN = re.compile(r"\S+\s*")
+
+
+def content_hash(text: str) -> str:
+    """Hex digest identifying a piece of content"""
+    return hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def count_tokens(text: str) -> int:
+    """Approximate token count of ``text``"""
+    return len(text.split())
+
+
+def iter_chunks(
+    text: str, chunk_tokens: int, chunk_chars: Optional[int] = None
+) -> Iterator[str]:
+    """
+    Split ``text`` into consecutive chunks of at most ``chunk_tokens`` tokens.
+
+    Chunks are also at most ``chunk_chars`` characters (by default
+    ``chunk_tokens * CHARS_PER_TOKEN``); a longer token is cut into pieces.
+    Whitespace is kept, so joining the chunks gives back the original text
+    (without leading whitespace).
+    """
+    if chunk_tokens < 1:
+        raise ValueError("chunk_tokens must be at least 1")
+    if chunk_chars is None:
+        chunk_chars = chunk_tokens * CHARS_PER_TOKEN
+    if chunk_chars < 1:
+        raise ValueError("chunk_chars must be at least 1")
+    start = None
+    count = 0
+    end = 0
+    for match in _TOKEN.finditer(text):
+        token_start, token_end = match.span()
+        if start is not None and token_end - start > chunk_chars:
+            yield text[start:end]
+            start, count = None, 0
+        while token_end - token_start > chunk_chars:
+            yield text[token_start : token_start + chunk_chars]
+            token_start += chunk_chars
+        if start is None:
+            start = token_start
+        count += 1
+        end = token_end
+        if count == chunk_tokens:
+            yield text[start:end]
+            start, count = None, 0
+    if start is not None:
+        yield text[start:end]
+
+
+def resource_text(resource_response: Any) -> str:
+    """Text of a ``read_resource`` result; binary parts are described, not decoded"""
+    contents = getattr(resource_response, "contents", None)
+    if contents is None:
+        return str(resource_response)
+    parts = []
+    for content in contents:
+        text = getattr(content, "text", None)
+        if text is not None:
+            parts.append(text)
+            continue
+        blob = getattr(content, "blob", None)
+        mime_type = getattr(content, "mimeType", None) or "unknown type"
+        size = len(blob) if blob else 0
+        parts.append(f"[binary content: {mime_type}, {size} base64 characters]")
+    return "\n\n".join(parts)
+
+
+class ResourceSummaryCache:
+    """
+    Summaries of MCP resources, keyed by content.
+
+    Whole-resource summaries are keyed by ``(uri, content hash)`` and chunk
+    summaries by the chunk's hash alone, so after a small edit only the
+    changed chunks are summarized again.
+
+    For subscribed resources the cache also remembers, per server, the hash
+    of the last content read. Until the server sends a
+    ``ResourceUpdatedNotification`` for the URI, a read is answered from the
+    cache without fetching the resource again. A read only records its hash
+    if no notification arrived between its fetch and the end of its
+    summary (see ``version``).
+    """
+
+    def __init__(self, max_summaries: int = 256, max_chunks: int = 4096):
+        """
+        Initialize the ResourceSummaryCache.
+
+        Args:
+            max_summaries: Whole-resource summaries kept
+            max_chunks: Chunk summaries kept
+        """
+        self.max_summaries = max_summaries
+        self.max_chunks = max_chunks
+        self._summaries: OrderedDict[Tuple[str, str], str] = OrderedDict()
+        self._chunks: OrderedDict[str, str] = OrderedDict()
+        self._latest: Dict[Tuple[str, str], str] = {}
+        self._subscribed: Set[Tuple[str, str]] = set()
+        self._versions: Dict[Tuple[str, str], int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _lookup(entries: OrderedDict, key) -> Optional[str]:
+        value = entries.get(key)
+        if value is not None:
+            entries.move_to_end(key)
+        return value
+
+    @staticmethod
+    def _store(entries: OrderedDict, key, value: str, limit: int):
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > limit:
+            entries.popitem(last=False)
+
+    def get(self, uri: str, digest: str) -> Optional[str]:
+        """Summary of ``uri`` with content hash ``digest``, if cached"""
+        summary = self._lookup(self._summaries, (uri, digest))
+        if summary is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return summary
+
+    def put(self, uri: str, digest: str, summary: str):
+        self._store(self._summaries, (uri, digest), summary, self.max_summaries)
+
+    def version(self, server: str, uri: str) -> int:
+        """Invalidation count of ``uri`` on ``server``; take it before fetching"""
+        return self._versions.get((server, uri), 0)
+
+    def mark_current(self, server: str, uri: str, digest: str, version: int):
+        """
+        Record ``digest`` as the latest content of a subscribed resource.
+
+        Ignored if the resource was invalidated since ``version`` was taken,
+        since the content read may already be out of date.
+        """
+        key = (server, uri)
+        if key in self._subscribed and self._versions.get(key, 0) == version:
+            self._latest[key] = digest
+
+    def current(self, server: str, uri: str) -> Optional[str]:
+        """Summary of a subscribed resource that has not changed since it was read"""
+        digest = self._latest.get((server, uri))
+        if digest is None:
+            return None
+        summary = self._lookup(self._summaries, (uri, digest))
+        if summary is not None:
+            self.hits += 1
+        return summary
+
+    def get_chunk(self, digest: str) -> Optional[str]:
+        return self._lookup(self._chunks, digest)
+
+    def put_chunk(self, digest: str, summary: str):
+        self._store(self._chunks, digest, summary, self.max_chunks)
+
+    def subscribe(self, server: str, uri: str):
+        """Trust cached summaries of ``uri`` until ``server`` sends an update"""
+        self._subscribed.add((server, uri))
+
+    def unsubscribe(self, server: str, uri: str):
+        key = (server, uri)
+        self.invalidate(server, uri)
+        self._subscribed.discard(key)
+
+    def invalidate(self, server: str, uri: str):
+        """Forget that the cached content of ``uri`` on ``server`` is current"""
+        key = (server, uri)
+        self._latest.pop(key, None)
+        if key in self._subscribed:
+            self._versions[key] = self._versions.get(key, 0) + 1
+
+    def clear(self):
+        self._summaries.clear()
+        self._chunks.clear()
+        self._latest.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "summaries": len(self._summaries),
+            "chunks": len(self._chunks),
+            "subscribed": len(self._subscribed),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+resource_summary_cache = ResourceSummaryCache()
+
+
+async def summarize_text(
+    text: str,
+    complete: Callable[[str, str], Awaitable[str]],
+    chunk_tokens: int = 2000,
+    max_concurrency: int = 4,
+    cache: Optional[ResourceSummaryCache] = None,
+    chunk_chars: Optional[int] = None,
+) -> str:
+    """
+    Summarize ``text`` with map-reduce over token chunks.
+
+    Args:
+        text: Content to summarize
+        complete: Sends a system prompt and user content to the LLM and
+            returns the response text
+        chunk_tokens: Tokens per chunk and per merge batch
+        max_concurrency: LLM calls in flight at once
+        cache: Cache for chunk summaries
+        chunk_chars: Characters per chunk (defaults to
+            ``chunk_tokens * CHARS_PER_TOKEN``)
+
+    Returns:
+        The summary
+    """
+    if chunk_chars is None:
+        chunk_chars = chunk_tokens * CHARS_PER_TOKEN
+    if count_tokens(text) <= chunk_tokens and len(text) <= chunk_chars:
+        return await complete(SUMMARY_PROMPT, text)
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def summarize_chunk(chunk: str) -> str:
+        digest = content_hash(chunk)
+        if cache is not None:
+            cached = cache.get_chunk(digest)
+            if cached is not None:
+                return cached
+        async with semaphore:
+            summary = await complete(CHUNK_PROMPT, chunk)
+        if cache is not None:
+            cache.put_chunk(digest, summary)
+        return summary
+
+    async def merge(batch: List[str]) -> str:
+        async with semaphore:
+            return await complete(MERGE_PROMPT, "\n\n---\n\n".join(batch))
+
+    summaries = await asyncio.gather(
+        *(
+            summarize_chunk(chunk)
+            for chunk in iter_chunks(text, chunk_tokens, chunk_chars)
+        )
+    )
+    while count_tokens("\n\n".join(summaries)) > chunk_tokens:
+        batches = _batches(summaries, chunk_tokens)
+        if len(batches) == len(summaries):
+            # Each summary fills a batch on its own; merging cannot shrink them.
+            break
+        summaries = await asyncio.gather(*(merge(batch) for batch in batches))
+    return await complete(SUMMARY_PROMPT, "\n\n".join(summaries))
+
+
+def _batches(summaries: List[str], chunk_tokens: int) -> List[List[str]]:
+    """Group consecutive summaries into batches of at most ``chunk_tokens``"""
+    batches: List[List[str]] = []
+    size = 0
+    for summary in summaries:
+        tokens = count_tokens(summary)
+        if batches and size + tokens <= chunk_tokens:
+            batches[-1].append(summary)
+            size += tokens
+        else:
+            batches.append([summary])
+            size = tokens
+    return batches
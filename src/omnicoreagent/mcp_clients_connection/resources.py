@@ -9,6 +9,13 @@ from omnicoreagent.core.token_usage import (
     usage,
 )
 from omnicoreagent.core.utils import logger
+from omnicoreagent.mcp_clients_connection.resource_summaries import (
+    ResourceSummaryCache,
+    content_hash,
+    resource_summary_cache,
+    resource_text,
+    summarize_text,
+)
 
 
 async def subscribe_resource(
@@ -21,6 +28,7 @@ async def subscribe_resource(
         logger.info(f"Subscribing to {uri} resource on {server_name}")
         if found and sessions[server_name]["connected"]:
             await sessions[server_name]["session"].subscribe_resource(uri)
+            resource_summary_cache.subscribe(server_name, uri)
             logger.info(f"Subscribed to {uri} resource on {server_name}")
         else:
             logger.info(f"{server_name} is not connected")
@@ -41,6 +49,7 @@ async def unsubscribe_resource(
     if found and sessions[server_name]["connected"]:
         try:
             await sessions[server_name]["session"].unsubscribe_resource(uri)
+            resource_summary_cache.unsubscribe(server_name, uri)
             logger.info(f"Unsubscribed from {uri} resource on {server_name}")
         except Exception as e:
             logger.info(f"exception to unsubscribe from resource: {e}")
@@ -81,6 +90,48 @@ async def find_resource_server(
     return "", False
 
 
+def _record_usage(
+    llm_response: Any,
+    usage_limits: UsageLimits,
+    request_limit: int | None,
+    debug: bool,
+):
+    """Add one LLM response to the session usage and enforce the token limit"""
+    request_usage = Usage(
+        requests=1,
+        request_tokens=llm_response.usage.prompt_tokens,
+        response_tokens=llm_response.usage.completion_tokens,
+        total_tokens=llm_response.usage.total_tokens,
+    )
+    usage.incr(request_usage)
+    usage_limits.check_tokens(usage)
+    remaining_tokens = usage_limits.remaining_tokens(usage)
+    used_tokens = usage.total_tokens
+    used_requests = usage.requests
+    remaining_requests = request_limit - used_requests if request_limit else None
+    session_stats.update(
+        {
+            "used_requests": used_requests,
+            "used_tokens": used_tokens,
+            "remaining_requests": remaining_requests,
+            "remaining_tokens": remaining_tokens,
+            "request_tokens": request_usage.request_tokens,
+            "response_tokens": request_usage.response_tokens,
+            "total_tokens": request_usage.total_tokens,
+        }
+    )
+    if debug:
+        logger.info(
+            f"API Call Stats - Requests: {used_requests}/{request_limit}, "
+            f"Tokens: {used_tokens}/{usage_limits.total_tokens_limit}, "
+            f"Request Tokens: {request_usage.request_tokens}, "
+            f"Response Tokens: {request_usage.response_tokens}, "
+            f"Total Tokens: {request_usage.total_tokens}, "
+            f"Remaining Requests: {remaining_requests}, "
+            f"Remaining Tokens: {remaining_tokens}"
+        )
+
+
 async def read_resource(
     uri: str,
     sessions: dict[str, dict[str, Any]],
@@ -89,74 +140,78 @@ async def read_resource(
     debug: bool = False,
     request_limit: int = None,
     total_tokens_limit: int = None,
+    chunk_tokens: int = 2000,
+    max_concurrency: int = 4,
+    cache: ResourceSummaryCache | None = resource_summary_cache,
 ):
-    """Read a resource"""
+    """
+    Read a resource and return an LLM summary of it.
+
+    Resources longer than ``chunk_tokens`` are summarized chunk by chunk with
+    up to ``max_concurrency`` LLM calls in flight, and the chunk summaries
+    are merged into one. Summaries are cached by URI and content hash; pass
+    ``cache=None`` to always summarize.
+    """
     if debug:
         logger.info(f"Reading resource: {uri}")
     usage_limits = UsageLimits(
         request_limit=request_limit, total_tokens_limit=total_tokens_limit
     )
-    usage_limits.check_before_request(usage=usage)
     server_name, found = await find_resource_server(uri, available_resources)
     if not found:
         error_message = f"Resource not found: {uri}"
         logger.error(error_message)
         return error_message
     logger.info(f"Resource found in {server_name}")
+
+    async def complete(system_prompt: str, content: str) -> str:
+        usage_limits.check_before_request(usage=usage)
+        llm_response = await llm_call(
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": content},
+            ]
+        )
+        if not llm_response:
+            raise RuntimeError("LLM returned no response")
+        if hasattr(llm_response, "usage"):
+            _record_usage(llm_response, usage_limits, request_limit, debug)
+        if hasattr(llm_response, "choices"):
+            return llm_response.choices[0].message.content
+        return llm_response.message
+
     try:
+        if cache is not None:
+            summary = cache.current(server_name, uri)
+            if summary is not None:
+                logger.info(f"Using cached summary of unchanged resource {uri}")
+                return summary
+            version = cache.version(server_name, uri)
+
+        usage_limits.check_before_request(usage=usage)
         resource_response = await sessions[server_name]["session"].read_resource(uri)
+        text = resource_text(resource_response)
+        digest = content_hash(text)
+        if cache is not None:
+            summary = cache.get(uri, digest)
+            if summary is not None:
+                logger.info(f"Using cached summary of {uri}")
+                cache.mark_current(server_name, uri, digest, version)
+                return summary
+
         if debug:
             logger.info("LLM processing resource")
-        llm_response = await llm_call(
-            messages=[
-                {
-                    "role": "system",
-                    "content": "Analyze the document content and provide a clear, concise summary that captures all essential information. Focus on key points, main concepts, and critical details that give the user a complete understanding without reading the entire document. Present your summary using bullet points for main ideas followed by a brief paragraph for context when needed. Include any technical terms, specifications, instructions, or warnings that are vital to proper understanding. Do not include phrases like 'here is your summary' or 'in summary' - deliver only the informative content directly.",
-                },
-                {"role": "user", "content": str(resource_response)},
-            ]
+        summary = await summarize_text(
+            text,
+            complete,
+            chunk_tokens=chunk_tokens,
+            max_concurrency=max_concurrency,
+            cache=cache,
         )
-        if llm_response:
-            if hasattr(llm_response, "usage"):
-                request_usage = Usage(
-                    requests=1,
-                    request_tokens=llm_response.usage.prompt_tokens,
-                    response_tokens=llm_response.usage.completion_tokens,
-                    total_tokens=llm_response.usage.total_tokens,
-                )
-                usage.incr(request_usage)
-                usage_limits.check_tokens(usage)
-                remaining_tokens = usage_limits.remaining_tokens(usage)
-                used_tokens = usage.total_tokens
-                used_requests = usage.requests
-                remaining_requests = request_limit - used_requests
-                session_stats.update(
-                    {
-                        "used_requests": used_requests,
-                        "used_tokens": used_tokens,
-                        "remaining_requests": remaining_requests,
-                        "remaining_tokens": remaining_tokens,
-                        "request_tokens": request_usage.request_tokens,
-                        "response_tokens": request_usage.response_tokens,
-                        "total_tokens": request_usage.total_tokens,
-                    }
-                )
-                if debug:
-                    logger.info(
-                        f"API Call Stats - Requests: {used_requests}/{request_limit}, "
-                        f"Tokens: {used_tokens}/{usage_limits.total_tokens_limit}, "
-                        f"Request Tokens: {request_usage.request_tokens}, "
-                        f"Response Tokens: {request_usage.response_tokens}, "
-                        f"Total Tokens: {request_usage.total_tokens}, "
-                        f"Remaining Requests: {remaining_requests}, "
-                        f"Remaining Tokens: {remaining_tokens}"
-                    )
-
-            if hasattr(llm_response, "choices"):
-                response_content = llm_response.choices[0].message.content
-            elif hasattr(llm_response, "message"):
-                response_content = llm_response.message
-        return response_content
+        if cache is not None:
+            cache.put(uri, digest, summary)
+            cache.mark_current(server_name, uri, digest, version)
+        return summary
     except UsageLimitExceeded as e:
         error_message = f"Usage limit error: {e}"
         logger.error(error_message)
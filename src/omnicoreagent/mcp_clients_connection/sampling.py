@@ -1,104 +1,153 @@
+import asyncio
 import json
+import os
+import random
+from dataclasses import asdict
 from pathlib import Path
 from typing import Any
 
-from dotenv import load_dotenv
-from decouple import config as decouple_config
-import litellm
 from mcp.client.session import ClientSession
 from mcp.shared.context import RequestContext
 from mcp.types import (
+    INTERNAL_ERROR,
+    INVALID_REQUEST,
     CreateMessageRequestParams,
     CreateMessageResult,
     ErrorData,
     TextContent,
 )
 
+from omnicoreagent.core.llm import is_retryable_error
+from omnicoreagent.core.llm_client import LLMClient
+from omnicoreagent.core.token_usage import Usage, UsageLimitExceeded, UsageLimits
 from omnicoreagent.core.types import ContextInclusion
+from omnicoreagent.core.usage_ledger import (
+    UsageLedger,
+    get_default_usage_ledger,
+    make_usage_key,
+)
 from omnicoreagent.core.utils import logger
 
-load_dotenv()
+SAMPLING_OPTIONS = frozenset(
+    {
+        "max_concurrency",
+        "token_budget",
+        "request_budget",
+        "max_tokens_per_request",
+        "max_retries",
+    }
+)
 
-api_key = decouple_config("LLM_API_KEY", default=None)
 
+def sampling_options(config: dict[str, Any] | None) -> dict[str, Any]:
+    """
+    Sampling limits from the ``LLM.sampling`` block of a servers config.
 
-class LLMConnection:
-    def __init__(self):
-        self.llm_config = None
+    Args:
+        config: Parsed servers configuration
 
-    async def llm_call(
-        self,
-        messages: list[dict[str, Any]],
-        provider,
-        model,
-        temperature,
-        max_tokens,
-        stop,
-    ):
-        try:
-            provider = provider.lower()
-
-            provider_model_map = {
-                "openai": f"openai/{model}",
-                "anthropic": f"anthropic/{model}",
-                "groq": f"groq/{model}",
-                "gemini": f"gemini/{model}",
-                "deepseek": f"deepseek/{model}",
-                "openrouter": f"openrouter/{model}",
-                "azureopenai": f"azure/{model}",
-                "ollama": f"ollama/{model}",
-            }
+    Returns:
+        Keyword arguments for ``samplingCallback``
 
-            full_model = provider_model_map.get(provider)
-
-            def to_dict(msg):
-                if hasattr(msg, "model_dump"):
-                    return msg.model_dump(exclude_none=True)
-                elif isinstance(msg, dict):
-                    return msg
-                elif hasattr(msg, "__dict__"):
-                    return {k: v for k, v in msg.__dict__.items() if v is not None}
-                else:
-                    return msg
-
-            messages_dicts = [to_dict(m) for m in messages]
-            response = await litellm.acompletion(
-                model=full_model,
-                messages=messages_dicts,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                stop=stop,
-            )
-            return response
-        except Exception as e:
-            logger.error(f"Error calling LLM for provider '{provider}': {e}")
-            return ErrorData(
-                code="INVALID_REQUEST",
-                message=f"Unsupported LLM provider: {provider}",
-            )
-        except Exception as e:
-            logger.error(f"Error calling LLM for provider '{provider}': {e}")
-            return ErrorData(
-                code="INTERNAL_ERROR", message=f"An error occurred: {str(e)}"
-            )
+    Raises:
+        ValueError: If the block holds an unknown option
+    """
+    options = ((config or {}).get("LLM") or {}).get("sampling") or {}
+    unknown = set(options) - SAMPLING_OPTIONS
+    if unknown:
+        raise ValueError(f"Unknown sampling options: {', '.join(sorted(unknown))}")
+    return dict(options)
 
 
 class samplingCallback:
-    def __init__(self):
-        self.llm_connection = LLMConnection()
+    """
+    Answers MCP sampling requests with the configured LLM.
+
+    Requests are accounted per server: each server gets its own concurrency
+    limit and token/request budget, and its usage is recorded in the usage
+    ledger under the agent name ``mcp_sampling:<server>``, next to the usage
+    of the agents themselves.
+    """
+
+    def __init__(
+        self,
+        config_filename: str = "servers_config.json",
+        config_data: dict[str, Any] | None = None,
+        credentials: dict[str, str] | None = None,
+        max_concurrency: int = 4,
+        token_budget: int | None = None,
+        request_budget: int | None = None,
+        max_tokens_per_request: int | None = None,
+        max_retries: int = 2,
+        usage_ledger: UsageLedger | None = None,
+        tenant_id: str | None = None,
+    ):
+        """
+        Initialize the sampling callback.
+
+        Args:
+            config_filename: servers_config JSON file holding the LLM section
+            config_data: Already-parsed configuration; when given, sampling
+                requests never read the config file
+            credentials: API key and endpoint passed to LiteLLM with each
+                sampling request
+            max_concurrency: Sampling requests in flight per server
+            token_budget: Total tokens each server may use (None for no limit)
+            request_budget: Total requests each server may make (None for no limit)
+            max_tokens_per_request: Upper bound applied to a request's maxTokens
+            max_retries: Retries of rate-limit, timeout and connection errors
+            usage_ledger: Ledger sampling usage is recorded in (defaults to
+                the process-wide ledger)
+            tenant_id: Tenant sampling usage is accounted to
+        """
+        self.config_filename = config_filename
+        self.config_data = config_data
+        self.credentials = credentials or {}
+        self.max_concurrency = max_concurrency
+        self.token_budget = token_budget
+        self.request_budget = request_budget
+        self.max_tokens_per_request = max_tokens_per_request
+        self.max_retries = max_retries
+        self.usage_ledger = usage_ledger or get_default_usage_ledger()
+        self.tenant_id = tenant_id
+
+        self._config_mtime: float | None = None
+        self._config: dict[str, Any] | None = None
+        self._models: tuple[list[str], str] | None = None
+        self._clients: dict[str, LLMClient] = {}
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._in_flight: dict[str, int] = {}
+        self._rejected: dict[str, int] = {}
+
+    def _load_config(self) -> dict[str, Any]:
+        """Parsed configuration, read again only when the file changes"""
+        if self.config_data is not None:
+            if self._config is not self.config_data:
+                self._config = self.config_data
+                self._models = None
+                self._clients.clear()
+            return self._config
+
+        path = Path(self.config_filename)
+        mtime = os.stat(path).st_mtime
+        if self._config is None or mtime != self._config_mtime:
+            with open(path, encoding="utf-8") as f:
+                self._config = json.load(f)
+            self._config_mtime = mtime
+            self._models = None
+            self._clients.clear()
+        return self._config
 
     async def load_model(self):
-        config_path = Path("servers_config.json")
-        with open(config_path, encoding="utf-8") as f:
-            config = json.load(f)
-            llm_config = config.get("LLM", {})
-            available_models = []
+        self._load_config()
+        if self._models is None:
+            llm_config = self._config.get("LLM", {})
             models = llm_config.get("model", [])
             if not isinstance(models, list):
                 models = [models]
-            available_models.extend(models)
             provider = llm_config.get("provider").lower()
-        return available_models, provider
+            self._models = (list(models), provider)
+        return self._models
 
     async def _select_model(self, preferences, available_models: list[str]) -> str:
         """Select the best model based on preferences and available models."""
@@ -117,11 +166,22 @@ class samplingCallback:
             return max(available_models, key=lambda x: len(x))
         elif preferences.speedPriority and preferences.speedPriority > 0.7:
             return min(available_models, key=lambda x: len(x))
-        elif preferences.costPriority and preferences.cosPriority > 0.7:
+        elif preferences.costPriority and preferences.costPriority > 0.7:
             return min(available_models, key=lambda x: len(x))
 
         return available_models[0]
 
+    def _client(self, model: str) -> LLMClient:
+        """Pooled LLM client for ``model``, built once per configuration"""
+        client = self._clients.get(model)
+        if client is None:
+            llm_config = self._config.get("LLM", {})
+            client = self._clients[model] = LLMClient.from_config(
+                {**llm_config, "model": model},
+                api_key=self.credentials.get("api_key") or llm_config.get("api_key"),
+            )
+        return client
+
     async def _get_context(
         self,
         include_context: ContextInclusion | None,
@@ -146,19 +206,70 @@ class samplingCallback:
 
         return "\n".join(context_parts)
 
+    def for_server(self, server_name: str):
+        """Sampling callback for one server's ClientSession"""
+
+        async def sampling(
+            context: RequestContext["ClientSession", Any],
+            params: CreateMessageRequestParams,
+        ) -> CreateMessageResult | ErrorData:
+            return await self._sampling(context, params, server_name=server_name)
+
+        return sampling
+
+    def _usage_key(self, server_name: str):
+        return make_usage_key(self.tenant_id, f"mcp_sampling:{server_name}", "")
+
+    def server_usage(self, server_name: str) -> Usage:
+        """Usage recorded for a server's sampling requests"""
+        return self.usage_ledger.get_usage(self._usage_key(server_name), "agent")
+
+    def _check_budget(self, server_name: str):
+        usage = self.server_usage(server_name)
+        UsageLimits(request_limit=self.request_budget).check_before_request(usage)
+        if self.token_budget is not None and (usage.total_tokens or 0) >= (
+            self.token_budget
+        ):
+            raise UsageLimitExceeded(
+                f"Sampling token budget of {self.token_budget} used up by "
+                f"{server_name}. Current tokens: {usage.total_tokens}"
+            )
+
+    async def _complete(self, client: LLMClient, messages, **overrides):
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await client.acompletion(messages, **overrides)
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable_error(e):
+                    raise
+                delay = min(2**attempt, 30) * random.uniform(0.5, 1.0)
+                logger.warning(
+                    f"Retryable sampling error on attempt {attempt + 1}: {e}; "
+                    f"retrying in {delay:.2f} seconds"
+                )
+                await asyncio.sleep(delay)
+
     async def _sampling(
         self,
         context: RequestContext["ClientSession", Any],
         params: CreateMessageRequestParams,
+        server_name: str = "default",
     ) -> CreateMessageResult | ErrorData:
         """Enhanced sampling callback with support for advanced features."""
         try:
             if not params.messages or not isinstance(params.maxTokens, int):
                 return ErrorData(
-                    code="INVALID_REQUEST",
+                    code=INVALID_REQUEST,
                     message="Missing required fields: messages or max_tokens",
                 )
 
+            try:
+                self._check_budget(server_name)
+            except UsageLimitExceeded as e:
+                self._rejected[server_name] = self._rejected.get(server_name, 0) + 1
+                logger.warning(f"Rejected sampling request from {server_name}: {e}")
+                return ErrorData(code=INVALID_REQUEST, message=str(e))
+
             available_models, provider = await self.load_model()
 
             model = await self._select_model(params.modelPreferences, available_models)
@@ -182,14 +293,38 @@ class samplingCallback:
                 ]
             )
 
-            response = await self.llm_connection.llm_call(
-                provider=provider,
-                messages=messages,
-                model=model,
-                temperature=params.temperature,
-                max_tokens=params.maxTokens,
-                stop=params.stopSequences,
-            )
+            max_tokens = params.maxTokens
+            if self.max_tokens_per_request is not None:
+                max_tokens = min(max_tokens, self.max_tokens_per_request)
+
+            semaphore = self._semaphores.get(server_name)
+            if semaphore is None:
+                semaphore = self._semaphores[server_name] = asyncio.Semaphore(
+                    self.max_concurrency
+                )
+            async with semaphore:
+                self._in_flight[server_name] = self._in_flight.get(server_name, 0) + 1
+                try:
+                    response = await self._complete(
+                        self._client(model),
+                        messages,
+                        temperature=params.temperature,
+                        max_tokens=max_tokens,
+                        stop=params.stopSequences,
+                    )
+                finally:
+                    self._in_flight[server_name] -= 1
+
+            if getattr(response, "usage", None) is not None:
+                self.usage_ledger.record(
+                    self._usage_key(server_name),
+                    Usage(
+                        requests=1,
+                        request_tokens=response.usage.prompt_tokens,
+                        response_tokens=response.usage.completion_tokens,
+                        total_tokens=response.usage.total_tokens,
+                    ),
+                )
             completion = response.choices[0].message.content
             stop_reason = response.choices[0].finish_reason
 
@@ -206,5 +341,17 @@ class samplingCallback:
         except Exception as e:
             logger.error(f"Error in sampling callback: {str(e)}")
             return ErrorData(
-                code="INTERNAL_ERROR", message=f"An error occurred: {str(e)}"
+                code=INTERNAL_ERROR, message=f"An error occurred: {str(e)}"
             )
+
+    def stats(self) -> dict[str, Any]:
+        """Sampling usage, in-flight requests and rejections per server"""
+        servers = set(self._semaphores) | set(self._rejected)
+        return {
+            server_name: {
+                "in_flight": self._in_flight.get(server_name, 0),
+                "rejected": self._rejected.get(server_name, 0),
+                "usage": asdict(self.server_usage(server_name)),
+            }
+            for server_name in sorted(servers)
+        }
@@ -4,17 +4,36 @@ OmniCoreAgent Package
 This package provides the high-level OmniCoreAgent interface and background agent functionality.
 """
 
-from .agent import OmniCoreAgent
-from .background_agent import (
-    BackgroundOmniCoreAgent,
-    BackgroundAgentManager,
-    TaskRegistry,
-    APSchedulerBackend,
-    BackgroundTaskScheduler,
-)
+from typing import TYPE_CHECKING
+
+from omnicoreagent.core.lazy_imports import lazy_module_attrs
+
+if TYPE_CHECKING:
+    from .agent import OmniCoreAgent
+    from .agent_pool import AgentPool
+    from .background_agent import (
+        BackgroundOmniCoreAgent,
+        BackgroundAgentManager,
+        TaskRegistry,
+        APSchedulerBackend,
+        BackgroundTaskScheduler,
+    )
+
+_LAZY_IMPORTS = {
+    "OmniCoreAgent": ".agent",
+    "AgentPool": ".agent_pool",
+    "BackgroundOmniCoreAgent": ".background_agent",
+    "BackgroundAgentManager": ".background_agent",
+    "TaskRegistry": ".background_agent",
+    "APSchedulerBackend": ".background_agent",
+    "BackgroundTaskScheduler": ".background_agent",
+}
+
+__getattr__, __dir__ = lazy_module_attrs(__name__, _LAZY_IMPORTS)
 
 __all__ = [
     "OmniCoreAgent",
+    "AgentPool",
     "BackgroundOmniCoreAgent",
     "BackgroundAgentManager",
     "TaskRegistry",
@@ -1,10 +1,11 @@
+import copy
 import uuid
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
 from omnicoreagent.core.agents.react_agent import ReactAgent
 from omnicoreagent.core.types import AgentConfig as ReactAgentConfig
-from omnicoreagent.mcp_clients_connection.client import Configuration, MCPClient
+from omnicoreagent.mcp_clients_connection.configuration import Configuration
 from omnicoreagent.core.llm import LLMConnection
 from omnicoreagent.core.memory_store.memory_router import MemoryRouter
 from omnicoreagent.omni_agent.config import (
@@ -18,7 +19,10 @@ from omnicoreagent.omni_agent.prompts.react_suffix import SYSTEM_SUFFIX
 from omnicoreagent.core.events.event_router import EventRouter
 from omnicoreagent.core.tools.advance_tools.advanced_tools_use import AdvanceToolsUse
 from omnicoreagent.core.utils import logger
+from omnicoreagent.core.tracing import tracer
+from omnicoreagent.core.metrics import LatencyHistogram
 from omnicoreagent.core.token_usage import Usage
+from omnicoreagent.core.usage_ledger import UsageLedger, get_default_usage_ledger
 from omnicoreagent.core.guardrails import (
     PromptInjectionGuard,
     DetectionConfig,
@@ -46,6 +50,9 @@ class OmniCoreAgent:
         memory_router: Optional[MemoryRouter] = None,
         event_router: Optional[EventRouter] = None,
         debug: bool = False,
+        persist_config: bool = False,
+        tenant_id: Optional[str] = None,
+        usage_ledger: Optional[UsageLedger] = None,
     ):
         """
         Initialize the OmniCoreAgent with user-friendly configuration.
@@ -62,6 +69,12 @@ class OmniCoreAgent:
             memory_router: Optional memory router (MemoryRouter)
             event_router: Optional event router (EventRouter)
             debug: Enable debug logging
+            persist_config: Also write the internal config to
+                ``.omnicoreagent_config/`` (useful for debugging). The agent
+                itself always uses the in-memory config.
+            tenant_id: Default tenant that usage is accounted to (optional)
+            usage_ledger: Ledger recording per-(tenant, agent, session) usage
+                (defaults to the process-wide ledger)
         """
         self.name = name
         self.system_instruction = system_instruction
@@ -72,7 +85,13 @@ class OmniCoreAgent:
         self.agent_config = agent_config
 
         self.debug = debug
+        self.persist_config = persist_config
+        self.tenant_id = tenant_id
+        self.usage_ledger = usage_ledger or get_default_usage_ledger()
+        self._config_file_path: Optional[Path] = None
         self._cumulative_usage = Usage()
+        # Duration of each completed run, for latency percentiles
+        self.run_latency = LatencyHistogram()
 
         self.memory_router = memory_router or MemoryRouter(
             memory_store_type="in_memory"
@@ -83,6 +102,8 @@ class OmniCoreAgent:
         self.agent = None
         self.mcp_client = None
         self.llm_connection = None
+        self._system_prompt: Optional[str] = None
+        self._is_clone = False
 
         self.internal_config = self._create_internal_config()
 
@@ -105,7 +126,8 @@ class OmniCoreAgent:
             agent_config=agent_config_with_name,
         )
 
-        self._save_config_hidden(internal_config)
+        if self.persist_config:
+            self._save_config_hidden(internal_config)
 
         return internal_config
 
@@ -141,29 +163,47 @@ class OmniCoreAgent:
             self.name.replace(" ", "_").replace("/", "_").replace("\\", "_")
         )
         hidden_config_path = hidden_dir / f"servers_config_{safe_agent_name}.json"
+        if "api_key" in config.get("LLM", {}):
+            config = {
+                **config,
+                "LLM": {k: v for k, v in config["LLM"].items() if k != "api_key"},
+            }
         self.config_transformer.save_config(config, str(hidden_config_path))
 
         self._config_file_path = hidden_config_path
 
+    @property
+    def _config_filename(self) -> Optional[str]:
+        """Path of the persisted config file, if ``persist_config`` is enabled"""
+        return str(self._config_file_path) if self._config_file_path else None
+
     def _create_agent(self):
         """Create the appropriate agent based on configuration"""
         shared_config = Configuration()
 
         if self.mcp_tools:
+            from omnicoreagent.mcp_clients_connection.client import MCPClient
+
             self.mcp_client = MCPClient(
                 config=shared_config,
                 debug=self.debug,
-                config_filename=str(self._config_file_path),
+                config_filename=self._config_filename,
+                config_data=self.internal_config,
             )
+            self.mcp_client.sampling_callback.usage_ledger = self.usage_ledger
+            self.mcp_client.sampling_callback.tenant_id = self.tenant_id
             self.llm_connection = self.mcp_client.llm_connection
         else:
             self.mcp_client = None
             self.llm_connection = LLMConnection(
-                shared_config, config_filename=str(self._config_file_path)
+                shared_config,
+                config_filename=self._config_filename,
+                config_data=self.internal_config,
             )
 
         agent_config_dict = self.internal_config["AgentConfig"]
         agent_settings = ReactAgentConfig(**agent_config_dict)
+        self._agent_settings = agent_settings
 
         if self.memory_router:
             self.memory_router.set_memory_config(
@@ -171,7 +211,11 @@ class OmniCoreAgent:
                 value=agent_settings.memory_config["value"],
             )
 
-        self.agent = ReactAgent(config=agent_settings)
+        self.agent = ReactAgent(
+            config=agent_settings,
+            usage_ledger=self.usage_ledger,
+            output_guard=self._output_guard(),
+        )
         if self.local_tools:
             if self.agent.enable_advanced_tool_use:
                 advance_tools_manager = AdvanceToolsUse()
@@ -179,36 +223,135 @@ class OmniCoreAgent:
                     local_tools=self.local_tools
                 )
 
+    def _output_guard(self) -> Optional[PromptInjectionGuard]:
+        """The guardrail, if it is configured to also scan tool outputs"""
+        if self.guardrail and self.guardrail.config.scan_tool_outputs:
+            return self.guardrail
+        return None
+
+    def _get_system_prompt(self) -> str:
+        """Build the system prompt once; it only depends on the instruction"""
+        if self._system_prompt is None:
+            self._system_prompt = self.prompt_builder.build(
+                system_instruction=self.system_instruction
+            )
+        return self._system_prompt
+
+    def clone(
+        self,
+        name: Optional[str] = None,
+        memory_router: Optional[MemoryRouter] = None,
+        event_router: Optional[EventRouter] = None,
+        tenant_id: Optional[str] = None,
+    ) -> "OmniCoreAgent":
+        """
+        Create a lightweight copy of this agent for serving another tenant.
+
+        The clone shares the immutable, expensive parts of this agent (internal
+        config, LLM connection, MCP client and its tools, local tools, skills
+        metadata, guardrail and system prompt) and gets its own ReAct agent,
+        session state and usage metrics. No config transformation, env loading,
+        skills scan or tool indexing is repeated.
+
+        Args:
+            name: Name of the clone (defaults to this agent's name). Memory and
+                events are keyed by agent name, so distinct names keep tenants
+                apart when they share a store.
+            memory_router: Memory router for the clone (defaults to this agent's)
+            event_router: Event router for the clone (defaults to this agent's)
+            tenant_id: Tenant the clone's usage is accounted to (defaults to
+                this agent's)
+
+        Returns:
+            A new OmniCoreAgent that is ready to ``run``
+        """
+        clone = copy.copy(self)
+        clone.name = name or self.name
+        clone.memory_router = memory_router or self.memory_router
+        clone.event_router = event_router or self.event_router
+        clone._system_prompt = self._get_system_prompt()
+        clone.tenant_id = tenant_id or self.tenant_id
+        clone._cumulative_usage = Usage()
+        clone.run_latency = LatencyHistogram()
+        clone._config_file_path = None
+        clone._is_clone = True
+
+        agent_settings = self._agent_settings
+        if clone.name != self.name:
+            agent_settings = agent_settings.model_copy(
+                update={"agent_name": clone.name}
+            )
+            clone.internal_config = {
+                **self.internal_config,
+                "AgentConfig": {
+                    **self.internal_config["AgentConfig"],
+                    "agent_name": clone.name,
+                },
+            }
+        if memory_router:
+            memory_router.set_memory_config(
+                mode=agent_settings.memory_config["mode"],
+                value=agent_settings.memory_config["value"],
+            )
+
+        clone.agent = ReactAgent(
+            config=agent_settings,
+            skill_manager=self.agent.skill_manager,
+            usage_ledger=self.usage_ledger,
+            output_guard=self._output_guard(),
+        )
+        # Sub-agents are shared, so their connections are tracked (and
+        # cleaned up) by the source agent.
+        clone.agent._connected_sub_agents = self.agent._connected_sub_agents
+        clone.agent._sub_agent_connect_locks = self.agent._sub_agent_connect_locks
+        return clone
+
     def generate_session_id(self) -> str:
         """Generate a new session ID for the session"""
         return f"omni_core_agent_{self.name}_{uuid.uuid4().hex[:8]}"
 
     async def connect_mcp_servers(self):
         """Connect to MCP servers if MCP tools are configured"""
+        if self._is_clone:
+            # The MCP client belongs to the agent this one was cloned from.
+            return
         if self.mcp_client and self.mcp_tools:
-            await self.mcp_client.connect_to_servers(self.mcp_client.config_filename)
-            if self.agent.enable_advanced_tool_use:
-                mcp_tools = self.mcp_client.available_tools if self.mcp_client else {}
-                advance_tools_manager = AdvanceToolsUse()
-
-                advance_tools_manager.load_and_process_tools(
-                    mcp_tools=mcp_tools,
-                    local_tools=self.local_tools,
-                )
+            await self.mcp_client.connect_to_servers()
+            self.index_mcp_tools()
+
+    def index_mcp_tools(self):
+        """Index the connected MCP tools for advanced tool use, if enabled"""
+        if self.agent.enable_advanced_tool_use:
+            mcp_tools = self.mcp_client.available_tools if self.mcp_client else {}
+            advance_tools_manager = AdvanceToolsUse()
+
+            advance_tools_manager.load_and_process_tools(
+                mcp_tools=mcp_tools,
+                local_tools=self.local_tools,
+            )
 
-    async def run(self, query: str, session_id: Optional[str] = None) -> Dict[str, Any]:
+    async def run(
+        self,
+        query: str,
+        session_id: Optional[str] = None,
+        tenant_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """
         Run the agent with a query and optional session ID.
 
         Args:
             query: The user query
             session_id: Optional session ID for session continuity
+            tenant_id: Optional tenant to account usage to (defaults to the
+                agent's tenant_id)
 
         Returns:
             Dict containing response and session_id
         """
         if self.guardrail:
-            result = self.guardrail.check(query)
+            with tracer.span("guardrail.check", target="query") as span:
+                result = await self.guardrail.check_async(query)
+                span.set_attribute("safe", result.is_safe)
             if not result.is_safe:
                 logger.warning(f"Query blocked by guardrail: {result.message}")
                 return {
@@ -221,9 +364,7 @@ class OmniCoreAgent:
         if not session_id:
             session_id = self.generate_session_id()
 
-        omni_agent_prompt = self.prompt_builder.build(
-            system_instruction=self.system_instruction
-        )
+        omni_agent_prompt = self._get_system_prompt()
 
         extra_kwargs = {
             "sessions": self.mcp_client.sessions if self.mcp_client else {},
@@ -231,6 +372,7 @@ class OmniCoreAgent:
             "local_tools": self.local_tools,
             "session_id": session_id,
             "sub_agents": self.sub_agents,
+            "tenant_id": tenant_id or self.tenant_id,
         }
 
         response = await self.agent._run(
@@ -246,6 +388,7 @@ class OmniCoreAgent:
 
         if isinstance(response, dict) and "usage" in response:
             self._cumulative_usage.incr(response["usage"])
+            self.run_latency.observe(response["usage"].total_time or 0.0)
             return {
                 "response": response["answer"],
                 "session_id": session_id,
@@ -260,20 +403,21 @@ class OmniCoreAgent:
         Get the cumulative metrics for the lifecycle of the agent.
 
         Returns:
-            Dict containing total requests, tokens, and time.
+            Dict containing total runs, requests, tokens and time, and the
+            mean and p50/p95/p99 run time in seconds.
         """
-        average_time = (
-            self._cumulative_usage.total_time / self._cumulative_usage.requests
-            if self._cumulative_usage.requests > 0
-            else 0
-        )
+        latency = self.run_latency.summary()
         return {
+            "total_runs": latency["count"],
             "total_requests": self._cumulative_usage.requests,
             "total_request_tokens": self._cumulative_usage.request_tokens,
             "total_response_tokens": self._cumulative_usage.response_tokens,
             "total_tokens": self._cumulative_usage.total_tokens,
             "total_time": self._cumulative_usage.total_time,
-            "average_time": average_time,
+            "average_time": latency["mean"],
+            "p50_time": latency["p50"],
+            "p95_time": latency["p95"],
+            "p99_time": latency["p99"],
         }
 
     async def list_all_available_tools(self):
@@ -359,15 +503,23 @@ class OmniCoreAgent:
 
     async def cleanup(self):
         """Clean up resources"""
+        if self._is_clone:
+            return
         if self.mcp_client:
             await self.mcp_client.cleanup()
+        await self.agent.cleanup_sub_agents()
+        if self.guardrail:
+            self.guardrail.close()
 
         await self._cleanup_config()
 
     async def _cleanup_config(self):
         """Clean up the agent-specific config file"""
         try:
-            if hasattr(self, "_config_file_path") and self._config_file_path.exists():
+            if not self._config_file_path:
+                return
+
+            if self._config_file_path.exists():
                 self._config_file_path.unlink()
 
             hidden_dir = Path(".omnicoreagent_config")
@@ -378,8 +530,12 @@ class OmniCoreAgent:
 
     async def cleanup_mcp_servers(self):
         """Clean up MCP servers without removing the agent and the config"""
+        if self._is_clone:
+            return
         if self.mcp_client:
             await self.mcp_client.cleanup()
+        await self.agent.cleanup_sub_agents()
+
 
 class OmniAgent(OmniCoreAgent):
     """
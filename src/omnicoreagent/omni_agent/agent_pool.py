@@ -0,0 +1,119 @@
+"""
+Agent pool for serving many tenants from one prepared agent template.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from omnicoreagent.omni_agent.agent import OmniCoreAgent
+from omnicoreagent.core.memory_store.memory_router import MemoryRouter
+from omnicoreagent.core.events.event_router import EventRouter
+from omnicoreagent.core.utils import logger
+
+
+class AgentPool:
+    """
+    Bounded pool of per-tenant agents cloned from a single template.
+
+    The template is built once (config transformation, LLM setup, skills
+    discovery, tool indexing, MCP connections). Every key gets a cheap clone
+    of it with its own session state and metrics. The least recently used
+    clone is dropped once ``max_size`` is exceeded. The key is also the
+    clone's tenant ID, so usage is accounted and limited per key.
+
+    Usage:
+        template = OmniCoreAgent(name="support", ...)
+        await template.connect_mcp_servers()
+        pool = AgentPool(template, max_size=256)
+        result = await pool.run("tenant-a", "Hello", session_id)
+    """
+
+    def __init__(
+        self,
+        template: OmniCoreAgent,
+        max_size: int = 128,
+        memory_router_factory: Optional[Callable[[str], MemoryRouter]] = None,
+        event_router_factory: Optional[Callable[[str], EventRouter]] = None,
+    ):
+        """
+        Initialize the AgentPool.
+
+        Args:
+            template: Fully constructed agent whose resources are shared
+            max_size: Maximum number of clones kept in the pool
+            memory_router_factory: Optional callable returning a memory router
+                for a key (defaults to sharing the template's router)
+            event_router_factory: Optional callable returning an event router
+                for a key (defaults to sharing the template's router)
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+
+        self.template = template
+        self.max_size = max_size
+        self.memory_router_factory = memory_router_factory
+        self.event_router_factory = event_router_factory
+        self._agents: "OrderedDict[str, OmniCoreAgent]" = OrderedDict()
+
+    @classmethod
+    def from_config(cls, max_size: int = 128, **agent_kwargs: Any) -> "AgentPool":
+        """Build the template agent from ``OmniCoreAgent`` kwargs and wrap it"""
+        return cls(OmniCoreAgent(**agent_kwargs), max_size=max_size)
+
+    def agent_name_for(self, key: str) -> str:
+        """Name of the clone serving ``key``"""
+        return f"{self.template.name}_{key}"
+
+    def get(self, key: str) -> OmniCoreAgent:
+        """
+        Get the agent for ``key``, cloning the template on first use.
+
+        Args:
+            key: Tenant or user identifier
+
+        Returns:
+            The OmniCoreAgent serving this key
+        """
+        agent = self._agents.get(key)
+        if agent is not None:
+            self._agents.move_to_end(key)
+            return agent
+
+        agent = self.template.clone(
+            name=self.agent_name_for(key),
+            memory_router=(
+                self.memory_router_factory(key) if self.memory_router_factory else None
+            ),
+            event_router=(
+                self.event_router_factory(key) if self.event_router_factory else None
+            ),
+            tenant_id=key,
+        )
+        self._agents[key] = agent
+
+        if len(self._agents) > self.max_size:
+            evicted_key, _ = self._agents.popitem(last=False)
+            logger.debug(f"AgentPool evicted agent for key: {evicted_key}")
+
+        return agent
+
+    async def run(
+        self, key: str, query: str, session_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Run ``query`` on the agent for ``key``"""
+        return await self.get(key).run(query, session_id)
+
+    def remove(self, key: str) -> bool:
+        """Drop the agent for ``key`` from the pool"""
+        return self._agents.pop(key, None) is not None
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._agents
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    async def cleanup(self):
+        """Drop all clones and clean up the template's resources"""
+        self._agents.clear()
+        await self.template.cleanup()
@@ -3,13 +3,43 @@ Background Agent System for Self-Flying Automation.
 
 This module provides a comprehensive system for creating and managing
 background agents that can execute tasks automatically.
+
+APScheduler and the agent stack are imported lazily on first access.
 """
 
-from .background_agents import BackgroundOmniCoreAgent
-from .background_agent_manager import BackgroundAgentManager
-from .task_registry import TaskRegistry
-from .scheduler_backend import APSchedulerBackend
-from .base import BackgroundTaskScheduler
+from typing import TYPE_CHECKING
+
+from omnicoreagent.core.lazy_imports import lazy_module_attrs
+
+if TYPE_CHECKING:
+    from .background_agents import BackgroundOmniCoreAgent
+    from .background_agent_manager import BackgroundAgentManager
+    from .task_registry import TaskRegistry
+    from .scheduler_backend import APSchedulerBackend
+    from .base import BackgroundTaskScheduler
+    from .distributed_scheduler import (
+        DistributedSchedulerBackend,
+        JobStore,
+        SQLJobStore,
+    )
+    from .execution_pool import AgentExecutionPool
+    from .mcp_lifecycle import MCPLifecycle, MCPLifecycleManager
+
+_LAZY_IMPORTS = {
+    "BackgroundOmniCoreAgent": ".background_agents",
+    "BackgroundAgentManager": ".background_agent_manager",
+    "TaskRegistry": ".task_registry",
+    "APSchedulerBackend": ".scheduler_backend",
+    "BackgroundTaskScheduler": ".base",
+    "DistributedSchedulerBackend": ".distributed_scheduler",
+    "JobStore": ".distributed_scheduler",
+    "SQLJobStore": ".distributed_scheduler",
+    "AgentExecutionPool": ".execution_pool",
+    "MCPLifecycle": ".mcp_lifecycle",
+    "MCPLifecycleManager": ".mcp_lifecycle",
+}
+
+__getattr__, __dir__ = lazy_module_attrs(__name__, _LAZY_IMPORTS)
 
 __all__ = [
     "BackgroundOmniCoreAgent",
@@ -17,4 +47,10 @@ __all__ = [
     "TaskRegistry",
     "APSchedulerBackend",
     "BackgroundTaskScheduler",
+    "DistributedSchedulerBackend",
+    "JobStore",
+    "SQLJobStore",
+    "AgentExecutionPool",
+    "MCPLifecycle",
+    "MCPLifecycleManager",
 ]
@@ -14,8 +14,21 @@ from omnicoreagent.omni_agent.background_agent.task_registry import TaskRegistry
 from omnicoreagent.omni_agent.background_agent.scheduler_backend import (
     APSchedulerBackend,
 )
+from omnicoreagent.omni_agent.background_agent.base import BackgroundTaskScheduler
+from omnicoreagent.omni_agent.background_agent.execution_pool import (
+    AgentExecutionPool,
+)
+from omnicoreagent.omni_agent.background_agent.mcp_lifecycle import (
+    MCPLifecycleManager,
+)
 from omnicoreagent.core.memory_store.memory_router import MemoryRouter
 from omnicoreagent.core.events.event_router import EventRouter
+from omnicoreagent.core.metrics import (
+    MetricsRegistry,
+    format_histogram_family,
+    format_metric_family,
+    get_default_metrics_registry,
+)
 from omnicoreagent.core.utils import logger
 
 
@@ -26,6 +39,11 @@ class BackgroundAgentManager:
         self,
         memory_router: Optional[MemoryRouter] = None,
         event_router: Optional[EventRouter] = None,
+        scheduler: Optional[BackgroundTaskScheduler] = None,
+        max_concurrency: int = 10,
+        per_agent_concurrency: int = 1,
+        process_workers: Optional[int] = None,
+        mcp_check_interval: float = 5.0,
     ):
         """
         Initialize BackgroundAgentManager.
@@ -33,12 +51,29 @@ class BackgroundAgentManager:
         Args:
             memory_router: Optional shared memory router for all agents
             event_router: Optional shared event router for all agents
+            scheduler: Optional scheduler backend (defaults to an in-process
+                APSchedulerBackend; use DistributedSchedulerBackend to share
+                schedules between replicas)
+            max_concurrency: Maximum agent runs in flight at once
+            per_agent_concurrency: Maximum runs in flight for one agent
+            process_workers: Worker processes for agents with process_isolation
+            mcp_check_interval: Seconds between checks for idle MCP connections
+                to reclaim and upcoming runs to connect ahead of
         """
         self.memory_router = memory_router or MemoryRouter(memory_store_type="memory")
         self.event_router = event_router or EventRouter(event_store_type="memory")
 
         self.task_registry = TaskRegistry()
-        self.scheduler = APSchedulerBackend()
+        self.scheduler = scheduler or APSchedulerBackend()
+        self.execution_pool = AgentExecutionPool(
+            max_concurrency=max_concurrency,
+            per_agent_concurrency=per_agent_concurrency,
+            process_workers=process_workers,
+        )
+        self.mcp_lifecycle = MCPLifecycleManager(
+            next_run_time=self._next_run_timestamp,
+            check_interval=mcp_check_interval,
+        )
 
         self.agents: Dict[str, BackgroundOmniCoreAgent] = {}
         self.agent_configs: Dict[str, Dict[str, Any]] = {}
@@ -79,9 +114,9 @@ class BackgroundAgentManager:
                 event_router=self.event_router,
                 task_registry=self.task_registry,
             )
-            mcp_tools = config.get("mcp_tools", False)
-            if mcp_tools:
-                await agent.connect_mcp_servers()
+            agent.execution_pool = self.execution_pool
+            agent.mcp_lifecycle_manager = self.mcp_lifecycle
+            await self.mcp_lifecycle.register(agent)
 
             self.agents[agent_id] = agent
             self.agent_configs[agent_id] = config.copy()
@@ -180,7 +215,6 @@ class BackgroundAgentManager:
                 agent_id=agent_id,
                 interval=agent.interval,
                 task_fn=agent.run_task,
-                max_instances=1,
             )
             logger.info(f"Scheduled agent {agent_id} with interval {agent.interval}s")
 
@@ -188,6 +222,11 @@ class BackgroundAgentManager:
             logger.error(f"Failed to schedule agent {agent_id}: {e}")
             raise
 
+    def _next_run_timestamp(self, agent_id: str) -> Optional[float]:
+        """Next scheduled run of an agent as epoch seconds"""
+        next_run = self.scheduler.get_next_run_time(agent_id)
+        return datetime.fromisoformat(next_run).timestamp() if next_run else None
+
     async def start(self):
         """Start the manager and all agents."""
         try:
@@ -196,6 +235,7 @@ class BackgroundAgentManager:
                 return
 
             self.scheduler.start()
+            self.mcp_lifecycle.start()
 
             for agent_id, agent in self.agents.items():
                 await self._schedule_agent(agent_id, agent)
@@ -215,6 +255,8 @@ class BackgroundAgentManager:
                 return
 
             self.scheduler.shutdown()
+            self.execution_pool.close()
+            await self.mcp_lifecycle.stop()
 
             for agent_id, agent in self.agents.items():
                 try:
@@ -259,7 +301,7 @@ class BackgroundAgentManager:
         paused_count = 0
 
         for agent_id in self.agents:
-            status = self.get_agent_status(agent_id)
+            status = await self.get_agent_status(agent_id)
             if status:
                 agent_statuses[agent_id] = status
                 if status.get("is_running"):
@@ -279,6 +321,8 @@ class BackgroundAgentManager:
             "memory_router": self.memory_router.get_memory_store_info(),
             "event_router": self.event_router.get_event_store_info(),
             "scheduler_running": self.scheduler.is_running(),
+            "execution": self.execution_pool.stats(),
+            "mcp_connections": self.mcp_lifecycle.stats(),
         }
 
     async def list_agents(self) -> List[str]:
@@ -286,12 +330,15 @@ class BackgroundAgentManager:
         return list(self.agents.keys())
 
     async def pause_agent(self, agent_id: str):
-        """Pause an agent (remove from scheduler)."""
+        """Pause an agent; its schedule is kept for resume_agent."""
         if agent_id not in self.agents:
             raise ValueError(f"Agent {agent_id} not found")
 
         try:
-            self.scheduler.remove_task(agent_id)
+            if not self.scheduler.is_task_scheduled(agent_id):
+                logger.warning(f"Agent {agent_id} is not scheduled")
+                return
+            self.scheduler.pause_job(agent_id)
             logger.info(f"Paused agent {agent_id}")
 
         except Exception as e:
@@ -299,13 +346,15 @@ class BackgroundAgentManager:
             raise
 
     async def resume_agent(self, agent_id: str):
-        """Resume an agent (add back to scheduler)."""
+        """Resume a paused agent, or schedule it if it has no schedule."""
         if agent_id not in self.agents:
             raise ValueError(f"Agent {agent_id} not found")
 
         try:
-            agent = self.agents[agent_id]
-            await self._schedule_agent(agent_id, agent)
+            if self.scheduler.is_task_scheduled(agent_id):
+                self.scheduler.resume_job(agent_id)
+            else:
+                await self._schedule_agent(agent_id, self.agents[agent_id])
             logger.info(f"Resumed agent {agent_id}")
 
         except Exception as e:
@@ -313,13 +362,17 @@ class BackgroundAgentManager:
             raise
 
     async def stop_agent(self, agent_id: str):
-        """Stop a specific agent: unschedule and cleanup its resources."""
+        """
+        Stop a specific agent in this process and cleanup its resources.
+
+        With a shared scheduler the schedule is kept, so other replicas keep
+        running the agent.
+        """
         if agent_id not in self.agents:
             raise ValueError(f"Agent {agent_id} not found")
 
         try:
-            if self.scheduler.is_task_scheduled(agent_id):
-                self.scheduler.remove_task(agent_id)
+            self.scheduler.detach_task(agent_id)
 
             agent = self.agents[agent_id]
             asyncio.create_task(agent.cleanup())
@@ -336,12 +389,13 @@ class BackgroundAgentManager:
 
         try:
             if not self.is_running:
-                self.start()
+                await self.start()
 
             agent = self.agents[agent_id]
-            if self.scheduler.is_task_scheduled(agent_id):
-                self.scheduler.remove_task(agent_id)
+            await self.mcp_lifecycle.register(agent)
+            # Re-registering keeps a stored schedule instead of resetting it
             await self._schedule_agent(agent_id, agent)
+            self.scheduler.resume_job(agent_id)
             logger.info(f"Started (scheduled) agent {agent_id}")
 
         except Exception as e:
@@ -360,7 +414,7 @@ class BackgroundAgentManager:
             self.agent_configs[agent_id].update(new_config)
 
             if self.is_running:
-                self.scheduler.remove_task(agent_id)
+                # Replaces the schedule only if the interval changed
                 await self._schedule_agent(agent_id, agent)
 
             logger.info(f"Updated configuration for agent {agent_id}")
@@ -370,13 +424,17 @@ class BackgroundAgentManager:
             raise
 
     async def delete_agent(self, agent_id: str):
-        """Delete an agent."""
+        """
+        Delete an agent from this manager.
+
+        With a shared scheduler only the local handler is detached; call
+        ``scheduler.remove_task`` to delete the schedule for every replica.
+        """
         if agent_id not in self.agents:
             raise ValueError(f"Agent {agent_id} not found")
 
         try:
-            if self.is_running:
-                self.scheduler.remove_task(agent_id)
+            self.scheduler.detach_task(agent_id)
 
             if self.task_registry.exists(agent_id):
                 self.task_registry.remove(agent_id)
@@ -463,6 +521,7 @@ class BackgroundAgentManager:
             "last_run": agent.last_run.isoformat() if agent.last_run else None,
             "is_running": agent.is_running,
             "interval": agent.interval,
+            "run_seconds": agent.run_latency.summary(),
             "max_retries": agent.max_retries,
             "retry_delay": agent.retry_delay,
             "has_task": agent.has_task(),
@@ -478,3 +537,107 @@ class BackgroundAgentManager:
                 metrics[agent_id] = agent_metrics
 
         return metrics
+
+    def register_metrics(
+        self, registry: Optional[MetricsRegistry] = None
+    ) -> MetricsRegistry:
+        """
+        Export this manager's agents, run queue and MCP connections with a
+        metrics registry.
+
+        The values are read when the registry is scraped; nothing is recorded
+        per run. Use one manager per registry, since the series carry no
+        manager label.
+
+        Args:
+            registry: Registry to export with (defaults to the process-wide one)
+
+        Returns:
+            The registry
+        """
+        registry = registry or get_default_metrics_registry()
+        registry.register_collector(self.export_prometheus)
+        return registry
+
+    def export_prometheus(self, prefix: str = "omnicoreagent") -> str:
+        """Render agent, scheduler and MCP pool metrics in the Prometheus text format."""
+        agents = sorted(self.agents.items())
+        pool = self.execution_pool.stats()
+        mcp = self.mcp_lifecycle.stats()
+        families = (
+            (
+                "background_agent_runs_total",
+                "counter",
+                "Completed background agent runs.",
+                [({"agent": agent_id}, agent.run_count) for agent_id, agent in agents],
+            ),
+            (
+                "background_agent_errors_total",
+                "counter",
+                "Failed background agent runs.",
+                [
+                    ({"agent": agent_id}, agent.error_count)
+                    for agent_id, agent in agents
+                ],
+            ),
+            (
+                "scheduler_queue_depth",
+                "gauge",
+                "Agent runs waiting for an execution slot.",
+                [
+                    ({"priority": priority}, depth)
+                    for priority, depth in pool["queue_depth_by_priority"].items()
+                ]
+                or [({"priority": 0}, 0)],
+            ),
+            (
+                "scheduler_running_runs",
+                "gauge",
+                "Agent runs in flight.",
+                [({}, pool["running"])],
+            ),
+            (
+                "scheduler_runs_total",
+                "counter",
+                "Agent runs finished by the execution pool.",
+                [
+                    ({"status": "ok"}, pool["completed"]),
+                    ({"status": "error"}, pool["failed"]),
+                ],
+            ),
+            (
+                "mcp_pool_connections",
+                "gauge",
+                "MCP connection slots by state.",
+                [
+                    ({"state": "connected"}, mcp["connected"]),
+                    (
+                        {"state": "disconnected"},
+                        mcp["connections"] - mcp["connected"],
+                    ),
+                ],
+            ),
+            (
+                "mcp_pool_active_runs",
+                "gauge",
+                "Runs using a pooled MCP connection.",
+                [({}, sum(slot["active_runs"] for slot in mcp["slots"]))],
+            ),
+            (
+                "mcp_pool_starts_total",
+                "counter",
+                "Runs that found their MCP connection open (warm) or had to open it (cold).",
+                [
+                    ({"kind": "warm"}, mcp["warm_starts"]),
+                    ({"kind": "cold"}, mcp["cold_starts"]),
+                ],
+            ),
+        )
+        return format_histogram_family(
+            f"{prefix}_background_agent_run_seconds",
+            "Duration of background agent runs.",
+            [({"agent": agent_id}, agent.run_latency) for agent_id, agent in agents],
+        ) + "".join(
+            format_metric_family(f"{prefix}_{name}", kind, documentation, samples)
+            for name, kind, documentation, samples in families
+        )
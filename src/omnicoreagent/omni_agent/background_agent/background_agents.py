@@ -9,6 +9,7 @@ from datetime import datetime
 
 from omnicoreagent.omni_agent.agent import OmniCoreAgent
 
+from omnicoreagent.core.memory_store.in_memory import InMemoryStore
 from omnicoreagent.core.memory_store.memory_router import MemoryRouter
 
 from omnicoreagent.core.utils import logger
@@ -22,6 +23,53 @@ from omnicoreagent.core.events.base import (
     BackgroundAgentStatusPayload,
 )
 from omnicoreagent.omni_agent.background_agent.task_registry import TaskRegistry
+from omnicoreagent.omni_agent.background_agent.execution_pool import (
+    AgentExecutionPool,
+)
+from omnicoreagent.omni_agent.background_agent.mcp_lifecycle import (
+    MCPLifecycle,
+    MCPLifecycleManager,
+)
+from omnicoreagent.omni_agent.workflow.utils import backoff_delay
+
+_PROCESS_CONFIG_KEYS = (
+    "agent_id",
+    "system_instruction",
+    "model_config",
+    "mcp_tools",
+    "local_tools",
+    "agent_config",
+    "debug",
+)
+
+
+def _run_in_worker_process(
+    config: Dict[str, Any], memory_store_type: str, query: str, session_id: str
+) -> Dict[str, Any]:
+    """Run one attempt of a background task in a fresh agent (worker process)."""
+
+    async def run_once():
+        agent = OmniCoreAgent(
+            name=config["agent_id"],
+            system_instruction=config.get(
+                "system_instruction",
+                "You are a background agent that executes tasks automatically.",
+            ),
+            model_config=config.get("model_config", {}),
+            mcp_tools=config.get("mcp_tools", []),
+            local_tools=config.get("local_tools"),
+            agent_config=config.get("agent_config", {}),
+            memory_router=MemoryRouter(memory_store_type),
+            debug=config.get("debug", False),
+        )
+        try:
+            if agent.mcp_tools:
+                await agent.connect_mcp_servers()
+            return await agent.run(query=query, session_id=session_id)
+        finally:
+            await agent.cleanup()
+
+    return asyncio.run(run_once())
 
 
 class BackgroundOmniCoreAgent(OmniCoreAgent):
@@ -67,14 +115,39 @@ class BackgroundOmniCoreAgent(OmniCoreAgent):
         self.interval = config.get("interval", 3600)
         self.max_retries = config.get("max_retries", 3)
         self.retry_delay = config.get("retry_delay", 60)
+        self.max_retry_delay = config.get("max_retry_delay", 600)
+        self.priority = config.get("priority", 0)
+        self.process_isolation = config.get("process_isolation", False)
+        self._process_config = {
+            key: config[key] for key in _PROCESS_CONFIG_KEYS if key in config
+        }
+        self._process_config["agent_id"] = self.agent_id
+        self.execution_pool: Optional[AgentExecutionPool] = None
+
+        self.mcp_lifecycle = MCPLifecycle(config.get("mcp_lifecycle", "warm"))
+        self.mcp_idle_timeout = config.get("mcp_idle_timeout", 60.0)
+        self.mcp_prefetch_seconds = config.get("mcp_prefetch_seconds", 30.0)
+        self.mcp_lifecycle_manager: Optional[MCPLifecycleManager] = None
 
         if task_registry is None:
             raise ValueError("TaskRegistry is required for BackgroundOmniCoreAgent")
         self.task_registry = task_registry
 
+        if self.process_isolation and isinstance(
+            self.memory_router.memory_store, InMemoryStore
+        ):
+            # Worker processes build their own memory store, so an in-process
+            # store would hand every attempt an empty history.
+            raise ValueError(
+                f"Agent {self.agent_id} uses process_isolation, which needs a "
+                "shared memory store (redis, database or mongodb)"
+            )
+
         self.session_id = f"background_{self.agent_id}_{uuid.uuid4().hex[:8]}"
 
         self.is_running = False
+        self.retry_pending = False
+        self._retry_wakeup: Optional[asyncio.Event] = None
         self.last_run = None
         self.run_count = 0
         self.error_count = 0
@@ -145,6 +218,13 @@ class BackgroundOmniCoreAgent(OmniCoreAgent):
 
     async def run_task(self, **kwargs):
         """Execute the background task."""
+        if self.retry_pending and self._retry_wakeup is not None:
+            logger.info(
+                f"Agent {self.agent_id} is waiting to retry, retrying now instead"
+            )
+            self._retry_wakeup.set()
+            return
+
         if self.is_running:
             logger.warning(
                 f"Agent {self.agent_id} is already running, skipping execution"
@@ -268,19 +348,25 @@ class BackgroundOmniCoreAgent(OmniCoreAgent):
             self.is_running = False
 
     async def _execute_with_retries(self, **kwargs):
-        """Execute task with retry logic."""
+        """Execute task with retry logic.
+
+        Each attempt takes a slot in the execution pool, if one is set, and
+        gives it back before backing off for the next attempt.
+        """
         last_error = None
 
         for attempt in range(self.max_retries + 1):
             try:
                 task_query = kwargs.get("query") or self.get_task_query()
 
-                result = await self.run(
-                    query=task_query,
-                    session_id=self.session_id,
-                )
+                if self.execution_pool is None:
+                    return await self._run_attempt(task_query)
 
-                return result
+                return await self.execution_pool.run(
+                    self.agent_id,
+                    lambda: self._run_attempt(task_query),
+                    priority=self.priority,
+                )
 
             except Exception as e:
                 last_error = e
@@ -289,23 +375,69 @@ class BackgroundOmniCoreAgent(OmniCoreAgent):
                 )
 
                 if attempt < self.max_retries:
-                    await asyncio.sleep(self.retry_delay)
+                    await self._wait_to_retry(
+                        backoff_delay(
+                            attempt + 1, self.retry_delay, self.max_retry_delay
+                        )
+                    )
                 else:
                     break
 
         raise last_error
 
+    async def _wait_to_retry(self, delay: float):
+        """Wait before a retry without counting as running.
+
+        A scheduled firing that arrives in the meantime starts the retry at
+        once instead of being skipped.
+        """
+        self._retry_wakeup = asyncio.Event()
+        self.retry_pending = True
+        self.is_running = False
+        try:
+            await asyncio.wait_for(self._retry_wakeup.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self.retry_pending = False
+            self._retry_wakeup = None
+            self.is_running = True
+
+    async def _run_attempt(self, query: str):
+        """Run the task once, in this process or in a worker process."""
+        if not self.process_isolation:
+            if self.mcp_lifecycle_manager is None:
+                return await self.run(query=query, session_id=self.session_id)
+            async with self.mcp_lifecycle_manager.acquire(self.agent_id):
+                return await self.run(query=query, session_id=self.session_id)
+
+        if self.execution_pool is None:
+            raise ValueError(
+                f"Agent {self.agent_id} uses process_isolation but has no execution pool"
+            )
+        return await self.execution_pool.run_in_process(
+            _run_in_worker_process,
+            self._process_config,
+            self.memory_router.memory_store_type,
+            query,
+            self.session_id,
+        )
+
     def get_status(self) -> Dict[str, Any]:
         """Get current status of the background agent."""
         return {
             "agent_id": self.agent_id,
             "session_id": self.session_id,
             "is_running": self.is_running,
+            "retry_pending": self.retry_pending,
             "last_run": self.last_run.isoformat() if self.last_run else None,
             "run_count": self.run_count,
             "error_count": self.error_count,
             "interval": self.interval,
             "max_retries": self.max_retries,
+            "priority": self.priority,
+            "process_isolation": self.process_isolation,
+            "mcp_lifecycle": self.mcp_lifecycle.value,
             "available_tools": self._get_available_tools(),
             "event_router": self.get_event_store_info(),
             "memory_router": self.memory_router.get_memory_store_info()
@@ -337,6 +469,10 @@ class BackgroundOmniCoreAgent(OmniCoreAgent):
                 self.max_retries = new_config["max_retries"]
             if "retry_delay" in new_config:
                 self.retry_delay = new_config["retry_delay"]
+            if "max_retry_delay" in new_config:
+                self.max_retry_delay = new_config["max_retry_delay"]
+            if "priority" in new_config:
+                self.priority = new_config["priority"]
 
             logger.info(f"Updated configuration for agent {self.agent_id}")
 
@@ -352,7 +488,18 @@ class BackgroundOmniCoreAgent(OmniCoreAgent):
             if self.is_running:
                 logger.info(f"Stopping running task for agent {self.agent_id}")
 
-            await super().cleanup()
+            manager = self.mcp_lifecycle_manager
+            if manager is not None and manager.is_managed(self.agent_id):
+                # The lifecycle manager owns the MCP client, which may be
+                # shared with other agents.
+                await manager.unregister(self.agent_id)
+                client, self.mcp_client = self.mcp_client, None
+                try:
+                    await super().cleanup()
+                finally:
+                    self.mcp_client = client
+            else:
+                await super().cleanup()
 
             logger.info(f"Cleaned up background agent {self.agent_id}")
 
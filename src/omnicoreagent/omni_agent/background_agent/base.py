@@ -3,7 +3,18 @@ Base scheduler interface for background agent system.
 """
 
 from abc import ABC, abstractmethod
-from typing import Callable
+from typing import Any, Callable, Dict
+
+# Options some callers pass to schedule_task that configure the scheduler
+# itself; they must not reach the task function or be stored as its kwargs
+SCHEDULER_OPTIONS = frozenset(
+    {"max_instances", "coalesce", "misfire_grace_time", "replace_existing"}
+)
+
+
+def task_kwargs(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Keyword arguments for the task function, without scheduler options"""
+    return {key: value for key, value in kwargs.items() if key not in SCHEDULER_OPTIONS}
 
 
 class BackgroundTaskScheduler(ABC):
@@ -19,6 +30,24 @@ class BackgroundTaskScheduler(ABC):
         """Remove a scheduled task."""
         pass
 
+    def detach_task(self, agent_id: str):
+        """
+        Stop running a task in this process.
+
+        In-process schedulers hold the only copy of the schedule, so this is
+        the same as ``remove_task``. Shared schedulers keep the schedule for
+        the other replicas.
+        """
+        self.remove_task(agent_id)
+
+    def pause_job(self, agent_id: str):
+        """Pause a scheduled task, keeping its schedule."""
+        raise NotImplementedError(f"{type(self).__name__} does not support pausing")
+
+    def resume_job(self, agent_id: str):
+        """Resume a paused task."""
+        raise NotImplementedError(f"{type(self).__name__} does not support pausing")
+
     @abstractmethod
     def start(self):
         """Start the scheduler."""
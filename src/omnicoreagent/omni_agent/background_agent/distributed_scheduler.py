@@ -0,0 +1,580 @@
+"""
+Distributed scheduler backend for running background agents on several replicas.
+
+Schedules live in a shared job store instead of process memory, so they
+survive restarts, and every firing is claimed with an atomic compare-and-set
+on the job row so that exactly one replica runs it.
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Union
+import asyncio
+import json
+import math
+import os
+import socket
+import time
+import uuid
+
+from omnicoreagent.core.utils import logger
+from .base import BackgroundTaskScheduler, task_kwargs
+
+
+def trigger_spec(interval: Union[int, float, str]) -> str:
+    """Serialize an interval in seconds or a crontab expression for storage"""
+    if isinstance(interval, bool):
+        raise ValueError(f"Invalid interval type: {type(interval)}")
+    if isinstance(interval, (int, float)):
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        return f"interval:{interval}"
+    if isinstance(interval, str):
+        _cron_trigger(interval)
+        return f"cron:{interval}"
+    raise ValueError(f"Invalid interval type: {type(interval)}")
+
+
+def _cron_trigger(expression: str):
+    from apscheduler.triggers.cron import CronTrigger
+
+    return CronTrigger.from_crontab(expression, timezone=timezone.utc)
+
+
+def next_fire_time(spec: str, after: float) -> float:
+    """First fire time of ``spec`` strictly after the ``after`` timestamp"""
+    kind, _, value = spec.partition(":")
+    if kind == "interval":
+        return after + float(value)
+    start = datetime.fromtimestamp(after + 1e-6, tz=timezone.utc)
+    fire_time = _cron_trigger(value).get_next_fire_time(None, start)
+    if fire_time is None:
+        return math.inf
+    return fire_time.timestamp()
+
+
+class JobStore(ABC):
+    """
+    Durable storage for scheduled jobs shared by all scheduler replicas.
+
+    A job is a dict with ``job_id``, ``trigger`` (see ``trigger_spec``),
+    ``kwargs``, ``next_run_at`` (epoch seconds), ``paused``, ``version``,
+    ``lease_owner`` and ``lease_expires``. ``claim`` must be atomic across
+    processes: it succeeds for exactly one caller per job version.
+    """
+
+    @abstractmethod
+    def add(
+        self, job_id: str, trigger: str, kwargs: Dict[str, Any], next_run_at: float
+    ):
+        """Create a job, or update it if it exists.
+
+        The stored ``next_run_at`` is kept when the trigger is unchanged, so a
+        restarted replica re-registering its jobs does not reset the schedule.
+        """
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job, or None"""
+
+    @abstractmethod
+    def remove(self, job_id: str) -> bool:
+        """Delete a job; returns whether it existed"""
+
+    @abstractmethod
+    def due(
+        self, now: float, job_ids: Iterable[str], limit: int
+    ) -> List[Dict[str, Any]]:
+        """Unpaused, unleased jobs among ``job_ids`` whose next run is at or before ``now``"""
+
+    @abstractmethod
+    def claim(
+        self,
+        job_id: str,
+        version: int,
+        next_run_at: float,
+        now: float,
+        owner: Optional[str],
+        lease_expires: Optional[float],
+    ) -> bool:
+        """Advance a job to ``next_run_at`` if it is still at ``version`` and unleased.
+
+        Pass ``owner`` and ``lease_expires`` to take a lease for running the
+        firing, or None for both to only skip it.
+        """
+
+    @abstractmethod
+    def release(self, job_id: str, owner: str):
+        """Drop ``owner``'s lease on a job"""
+
+    @abstractmethod
+    def renew(self, job_ids: Iterable[str], owner: str, lease_expires: float):
+        """Extend ``owner``'s leases on jobs that are still running"""
+
+    @abstractmethod
+    def set_paused(self, job_id: str, paused: bool):
+        """Pause or resume a job"""
+
+    def close(self):
+        """Release connections"""
+
+
+class SQLJobStore(JobStore):
+    """Job store in a SQL table (any SQLAlchemy URL; SQLite works for one host)."""
+
+    def __init__(self, db_url: str, table_name: str = "background_jobs"):
+        from sqlalchemy import (
+            Boolean,
+            Column,
+            Float,
+            Integer,
+            MetaData,
+            String,
+            Table,
+            Text,
+            create_engine,
+        )
+
+        self._engine = create_engine(db_url, pool_pre_ping=True)
+        metadata = MetaData()
+        self._table = Table(
+            table_name,
+            metadata,
+            Column("job_id", String(255), primary_key=True),
+            Column("trigger", String(255), nullable=False),
+            Column("kwargs", Text, nullable=False, default="{}"),
+            Column("next_run_at", Float, index=True, nullable=False),
+            Column("paused", Boolean, nullable=False, default=False),
+            Column("version", Integer, nullable=False, default=0),
+            Column("lease_owner", String(255), nullable=True),
+            Column("lease_expires", Float, nullable=True),
+        )
+        metadata.create_all(self._engine)
+
+    @staticmethod
+    def _to_job(row) -> Dict[str, Any]:
+        job = dict(row._mapping)
+        job["kwargs"] = json.loads(job["kwargs"])
+        return job
+
+    def add(
+        self, job_id: str, trigger: str, kwargs: Dict[str, Any], next_run_at: float
+    ):
+        from sqlalchemy.exc import IntegrityError
+
+        table = self._table
+        values = {"trigger": trigger, "kwargs": json.dumps(kwargs, default=str)}
+        with self._engine.begin() as conn:
+            current = conn.execute(
+                table.select().where(table.c.job_id == job_id)
+            ).first()
+            if current is None:
+                try:
+                    with conn.begin_nested():
+                        conn.execute(
+                            table.insert().values(
+                                job_id=job_id,
+                                next_run_at=next_run_at,
+                                paused=False,
+                                version=0,
+                                **values,
+                            )
+                        )
+                    return
+                except IntegrityError:
+                    current = conn.execute(
+                        table.select().where(table.c.job_id == job_id)
+                    ).first()
+            if current.trigger != trigger:
+                values["next_run_at"] = next_run_at
+                values["version"] = current.version + 1
+            conn.execute(
+                table.update().where(table.c.job_id == job_id).values(**values)
+            )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        table = self._table
+        with self._engine.connect() as conn:
+            row = conn.execute(table.select().where(table.c.job_id == job_id)).first()
+        return self._to_job(row) if row is not None else None
+
+    def remove(self, job_id: str) -> bool:
+        table = self._table
+        with self._engine.begin() as conn:
+            result = conn.execute(table.delete().where(table.c.job_id == job_id))
+        return result.rowcount > 0
+
+    def _unleased(self, now: float):
+        from sqlalchemy import or_
+
+        table = self._table
+        return or_(table.c.lease_expires.is_(None), table.c.lease_expires <= now)
+
+    def due(
+        self, now: float, job_ids: Iterable[str], limit: int
+    ) -> List[Dict[str, Any]]:
+        job_ids = list(job_ids)
+        if not job_ids or limit <= 0:
+            return []
+        table = self._table
+        query = (
+            table.select()
+            .where(
+                table.c.job_id.in_(job_ids),
+                table.c.next_run_at <= now,
+                table.c.paused.is_(False),
+                self._unleased(now),
+            )
+            .order_by(table.c.next_run_at)
+            .limit(limit)
+        )
+        with self._engine.connect() as conn:
+            return [self._to_job(row) for row in conn.execute(query)]
+
+    def claim(
+        self,
+        job_id: str,
+        version: int,
+        next_run_at: float,
+        now: float,
+        owner: Optional[str],
+        lease_expires: Optional[float],
+    ) -> bool:
+        table = self._table
+        statement = (
+            table.update()
+            .where(
+                table.c.job_id == job_id,
+                table.c.version == version,
+                self._unleased(now),
+            )
+            .values(
+                version=table.c.version + 1,
+                next_run_at=next_run_at,
+                lease_owner=owner,
+                lease_expires=lease_expires,
+            )
+        )
+        with self._engine.begin() as conn:
+            return conn.execute(statement).rowcount == 1
+
+    def release(self, job_id: str, owner: str):
+        table = self._table
+        with self._engine.begin() as conn:
+            conn.execute(
+                table.update()
+                .where(table.c.job_id == job_id, table.c.lease_owner == owner)
+                .values(lease_owner=None, lease_expires=None)
+            )
+
+    def renew(self, job_ids: Iterable[str], owner: str, lease_expires: float):
+        job_ids = list(job_ids)
+        if not job_ids:
+            return
+        table = self._table
+        with self._engine.begin() as conn:
+            conn.execute(
+                table.update()
+                .where(table.c.job_id.in_(job_ids), table.c.lease_owner == owner)
+                .values(lease_expires=lease_expires)
+            )
+
+    def set_paused(self, job_id: str, paused: bool):
+        table = self._table
+        with self._engine.begin() as conn:
+            conn.execute(
+                table.update().where(table.c.job_id == job_id).values(paused=paused)
+            )
+
+    def close(self):
+        self._engine.dispose()
+
+
+class DistributedSchedulerBackend(BackgroundTaskScheduler):
+    """
+    Scheduler backend whose jobs live in a shared ``JobStore``.
+
+    Every replica polls the store for due jobs it has a task function for and
+    claims each firing with ``JobStore.claim``; only the replica whose claim
+    succeeds runs it. The claim also takes a lease on the job, which is renewed
+    while the task runs and released when it finishes, so a job never runs on
+    two replicas at once. A replica that dies mid-run stops renewing, and the
+    job becomes claimable again once its lease expires.
+
+    Task functions cannot be stored, so each replica must call
+    ``schedule_task`` for the jobs it is able to run (the manager does this
+    when it creates its agents). Re-registering keeps the stored schedule.
+
+    Misfires (firings found more than ``misfire_grace_time`` seconds late, for
+    example after every replica was down) are skipped. With ``coalesce`` a late
+    job runs once and resumes from the next future fire time; without it each
+    missed firing inside the grace time is run in turn.
+    """
+
+    def __init__(
+        self,
+        job_store: Union[JobStore, str],
+        max_concurrency: int = 4,
+        poll_interval: float = 1.0,
+        lease_seconds: float = 300.0,
+        misfire_grace_time: Optional[float] = 60.0,
+        coalesce: bool = True,
+        owner_id: Optional[str] = None,
+    ):
+        """
+        Initialize the DistributedSchedulerBackend.
+
+        Args:
+            job_store: JobStore instance, or a SQLAlchemy URL for a SQLJobStore
+            max_concurrency: Maximum tasks this replica runs at once
+            poll_interval: Seconds between polls of the job store
+            lease_seconds: How long a claim is held without renewal
+            misfire_grace_time: Seconds a firing may be late and still run
+                (None to always run)
+            coalesce: Run a late job once instead of once per missed firing
+            owner_id: Identifier of this replica in leases
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.job_store = (
+            SQLJobStore(job_store) if isinstance(job_store, str) else job_store
+        )
+        self.max_concurrency = max_concurrency
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.misfire_grace_time = misfire_grace_time
+        self.coalesce = coalesce
+        self.owner_id = (
+            owner_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        )
+
+        self._handlers: Dict[str, Callable] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._poll_task: Optional[asyncio.Task] = None
+        self._running = False
+        self.stats = {"runs": 0, "skipped": 0, "errors": 0, "lost_claims": 0}
+
+    def schedule_task(
+        self, agent_id: str, interval: Union[int, str], task_fn: Callable, **kwargs
+    ):
+        """Schedule a task to run at specified intervals.
+
+        Args:
+            agent_id: Unique identifier for the agent
+            interval: Interval in seconds (int) or cron expression (str)
+            task_fn: Function to execute
+            **kwargs: Additional arguments for the task function (JSON-serializable)
+        """
+        if not asyncio.iscoroutinefunction(task_fn):
+            raise ValueError("task_fn must be an async function")
+        try:
+            spec = trigger_spec(interval)
+            self.job_store.add(
+                agent_id, spec, task_kwargs(kwargs), next_fire_time(spec, time.time())
+            )
+            self._handlers[agent_id] = task_fn
+            logger.info(
+                f"Scheduled task for agent {agent_id} with interval: {interval}"
+            )
+        except Exception as e:
+            logger.error(f"Failed to schedule task for agent {agent_id}: {e}")
+            raise
+
+    def remove_task(self, agent_id: str):
+        """Remove a scheduled task from the shared store."""
+        try:
+            self._handlers.pop(agent_id, None)
+            if self.job_store.remove(agent_id):
+                logger.info(f"Removed scheduled task for agent: {agent_id}")
+            else:
+                logger.warning(f"No scheduled task found for agent: {agent_id}")
+        except Exception as e:
+            logger.error(f"Failed to remove task for agent {agent_id}: {e}")
+            raise
+
+    def detach_task(self, agent_id: str):
+        """Stop running a task on this replica; the shared schedule is kept."""
+        if self._handlers.pop(agent_id, None) is not None:
+            logger.info(f"Detached task for agent {agent_id} from {self.owner_id}")
+
+    def start(self):
+        """Start polling the job store. Must be called from a running event loop."""
+        if not self._running:
+            self._poll_task = asyncio.get_running_loop().create_task(self._poll_loop())
+            self._running = True
+            logger.info(f"Distributed scheduler {self.owner_id} started")
+
+    def shutdown(self):
+        """Stop polling; tasks already running finish and release their leases."""
+        if self._running:
+            if self._poll_task is not None:
+                self._poll_task.cancel()
+                self._poll_task = None
+            self._running = False
+            logger.info(f"Distributed scheduler {self.owner_id} shutdown")
+
+    def is_running(self) -> bool:
+        """Check if the scheduler is running."""
+        return self._running
+
+    def is_task_scheduled(self, agent_id: str) -> bool:
+        """Check if a task is scheduled for the given agent ID."""
+        try:
+            return self.job_store.get(agent_id) is not None
+        except Exception as e:
+            logger.error(
+                f"Failed to check if task is scheduled for agent {agent_id}: {e}"
+            )
+            return False
+
+    def get_next_run_time(self, agent_id: str) -> Optional[str]:
+        """Get the next run time for a scheduled task."""
+        try:
+            job = self.job_store.get(agent_id)
+            if job and not job["paused"] and math.isfinite(job["next_run_at"]):
+                return datetime.fromtimestamp(
+                    job["next_run_at"], tz=timezone.utc
+                ).isoformat()
+            return None
+        except Exception as e:
+            logger.error(f"Failed to get next run time for agent {agent_id}: {e}")
+            return None
+
+    def get_job_status(self, agent_id: str) -> Dict[str, Any]:
+        """Get the status of a scheduled job."""
+        job = self.job_store.get(agent_id)
+        if job:
+            return {
+                "id": job["job_id"],
+                "next_run_time": self.get_next_run_time(agent_id),
+                "trigger": job["trigger"],
+                "active": not job["paused"],
+                "lease_owner": job["lease_owner"],
+                "running_here": agent_id in self._inflight,
+            }
+        return {}
+
+    def pause_job(self, agent_id: str):
+        """Pause a scheduled job on every replica."""
+        try:
+            self.job_store.set_paused(agent_id, True)
+            logger.info(f"Paused job for agent: {agent_id}")
+        except Exception as e:
+            logger.error(f"Failed to pause job for agent {agent_id}: {e}")
+            raise
+
+    def resume_job(self, agent_id: str):
+        """Resume a paused job on every replica."""
+        try:
+            self.job_store.set_paused(agent_id, False)
+            logger.info(f"Resumed job for agent: {agent_id}")
+        except Exception as e:
+            logger.error(f"Failed to resume job for agent {agent_id}: {e}")
+            raise
+
+    async def run_pending(self, now: Optional[float] = None) -> List[str]:
+        """
+        Claim and start the due jobs this replica has capacity for.
+
+        Args:
+            now: Current time as epoch seconds (defaults to ``time.time()``)
+
+        Returns:
+            IDs of the jobs started by this call
+        """
+        now = time.time() if now is None else now
+        if self._inflight:
+            await asyncio.to_thread(
+                self.job_store.renew,
+                list(self._inflight),
+                self.owner_id,
+                now + self.lease_seconds,
+            )
+
+        capacity = self.max_concurrency - len(self._inflight)
+        candidates = set(self._handlers) - set(self._inflight)
+        if capacity <= 0 or not candidates:
+            return []
+
+        due = await asyncio.to_thread(self.job_store.due, now, candidates, capacity)
+        started = []
+        for job in due:
+            if await self._claim(job, now):
+                started.append(job["job_id"])
+        return started
+
+    async def _claim(self, job: Dict[str, Any], now: float) -> bool:
+        job_id = job["job_id"]
+        scheduled = job["next_run_at"]
+        late = now - scheduled
+        run = self.misfire_grace_time is None or late <= self.misfire_grace_time
+        if run:
+            next_run_at = next_fire_time(
+                job["trigger"], now if self.coalesce else scheduled
+            )
+        elif self.coalesce:
+            next_run_at = next_fire_time(job["trigger"], now)
+        else:
+            # Skip ahead to the first missed firing still inside the grace time.
+            next_run_at = next_fire_time(job["trigger"], now - self.misfire_grace_time)
+
+        claimed = await asyncio.to_thread(
+            self.job_store.claim,
+            job_id,
+            job["version"],
+            next_run_at,
+            now,
+            self.owner_id if run else None,
+            now + self.lease_seconds if run else None,
+        )
+        if not claimed:
+            self.stats["lost_claims"] += 1
+            return False
+        if not run:
+            self.stats["skipped"] += 1
+            logger.warning(
+                f"Skipped misfired run of {job_id} scheduled at {scheduled} ({late:.1f}s late)"
+            )
+            return False
+
+        handler = self._handlers.get(job_id)
+        if handler is None:
+            await asyncio.to_thread(self.job_store.release, job_id, self.owner_id)
+            return False
+        self._inflight[job_id] = asyncio.create_task(
+            self._execute(job_id, handler, job["kwargs"])
+        )
+        return True
+
+    async def _execute(self, job_id: str, handler: Callable, kwargs: Dict[str, Any]):
+        try:
+            await handler(**kwargs)
+            self.stats["runs"] += 1
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"Scheduled task for agent {job_id} failed: {e}")
+        finally:
+            try:
+                await asyncio.to_thread(self.job_store.release, job_id, self.owner_id)
+            except Exception as e:
+                logger.error(f"Failed to release lease on {job_id}: {e}")
+            self._inflight.pop(job_id, None)
+
+    async def wait_idle(self):
+        """Wait for the tasks this replica is running to finish."""
+        while self._inflight:
+            await asyncio.gather(*self._inflight.values(), return_exceptions=True)
+
+    def running_jobs(self) -> Set[str]:
+        """IDs of the jobs currently running on this replica"""
+        return set(self._inflight)
+
+    async def _poll_loop(self):
+        while True:
+            try:
+                await self.run_pending()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Distributed scheduler poll failed: {e}")
+            await asyncio.sleep(self.poll_interval)
@@ -0,0 +1,189 @@
+"""
+Bounded, fair execution of background agent runs.
+"""
+
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+import asyncio
+import time
+
+from omnicoreagent.core.utils import logger
+
+
+class AgentExecutionPool:
+    """
+    Runs agent work under a global and a per-agent concurrency cap.
+
+    Work waiting for a slot is queued by priority (lower runs first). Within
+    a priority, agents take turns, so one agent with many queued runs cannot
+    starve the others. This turns a burst of firings, such as every agent
+    scheduled on the hour, into a steady stream of at most
+    ``max_concurrency`` runs.
+
+    Work can also be sent to a pool of worker processes with
+    ``run_in_process`` for isolation from the scheduler's process.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 10,
+        per_agent_concurrency: int = 1,
+        process_workers: Optional[int] = None,
+        latency_window: int = 1000,
+    ):
+        """
+        Initialize the AgentExecutionPool.
+
+        Args:
+            max_concurrency: Maximum runs in flight across all agents
+            per_agent_concurrency: Maximum runs in flight for one agent
+            process_workers: Size of the worker process pool (None for CPU count)
+            latency_window: Number of recent runs kept for latency metrics
+        """
+        if max_concurrency < 1 or per_agent_concurrency < 1:
+            raise ValueError("Concurrency limits must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.per_agent_concurrency = per_agent_concurrency
+        self.process_workers = process_workers
+
+        self._queues: Dict[int, OrderedDict[str, Deque[Tuple]]] = {}
+        self._active: Counter = Counter()
+        self._running = 0
+        self._tasks: set = set()
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+
+        self._wait_times: Deque[float] = deque(maxlen=latency_window)
+        self._run_times: Deque[float] = deque(maxlen=latency_window)
+        self.completed = 0
+        self.failed = 0
+
+    async def run(
+        self,
+        agent_id: str,
+        work: Callable[[], Awaitable[Any]],
+        priority: int = 0,
+    ) -> Any:
+        """
+        Run ``work`` once a slot is free and return its result.
+
+        Args:
+            agent_id: Agent the work belongs to (for the per-agent cap and fairness)
+            work: Zero-argument callable returning an awaitable
+            priority: Queue priority; lower values run first
+
+        Returns:
+            The result of ``work``; its exception is raised here
+        """
+        future = asyncio.get_running_loop().create_future()
+        agents = self._queues.setdefault(priority, OrderedDict())
+        agents.setdefault(agent_id, deque()).append((work, future, time.monotonic()))
+        self._dispatch()
+        return await future
+
+    async def run_in_process(self, fn: Callable, *args) -> Any:
+        """Run a picklable function in the worker process pool"""
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.process_workers)
+        return await asyncio.get_running_loop().run_in_executor(
+            self._process_pool, fn, *args
+        )
+
+    def _next_item(self) -> Optional[Tuple[str, Tuple]]:
+        for priority in sorted(self._queues):
+            agents = self._queues[priority]
+            for agent_id in list(agents):
+                if self._active[agent_id] >= self.per_agent_concurrency:
+                    continue
+                pending = agents[agent_id]
+                item = pending.popleft()
+                if pending:
+                    agents.move_to_end(agent_id)
+                else:
+                    del agents[agent_id]
+                if not agents:
+                    del self._queues[priority]
+                return agent_id, item
+        return None
+
+    def _dispatch(self):
+        while self._running < self.max_concurrency:
+            next_item = self._next_item()
+            if next_item is None:
+                return
+            agent_id, (work, future, queued_at) = next_item
+            if future.cancelled():
+                continue
+            self._running += 1
+            self._active[agent_id] += 1
+            self._wait_times.append(time.monotonic() - queued_at)
+            task = asyncio.create_task(self._execute(agent_id, work, future))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _execute(self, agent_id: str, work: Callable, future: asyncio.Future):
+        started = time.monotonic()
+        try:
+            result = await work()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            self.failed += 1
+            if not future.done():
+                future.set_exception(e)
+        else:
+            self.completed += 1
+            if not future.done():
+                future.set_result(result)
+        finally:
+            self._run_times.append(time.monotonic() - started)
+            self._running -= 1
+            self._active[agent_id] -= 1
+            if not self._active[agent_id]:
+                del self._active[agent_id]
+            self._dispatch()
+
+    def queue_depth(self) -> int:
+        """Number of runs waiting for a slot"""
+        return sum(
+            len(pending)
+            for agents in self._queues.values()
+            for pending in agents.values()
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, slot usage and latency metrics"""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "per_agent_concurrency": self.per_agent_concurrency,
+            "running": self._running,
+            "running_by_agent": dict(self._active),
+            "queue_depth": self.queue_depth(),
+            "queue_depth_by_priority": {
+                priority: sum(len(pending) for pending in agents.values())
+                for priority, agents in sorted(self._queues.items())
+            },
+            "completed": self.completed,
+            "failed": self.failed,
+            "queue_wait_seconds": _summarize(self._wait_times),
+            "run_seconds": _summarize(self._run_times),
+        }
+
+    def close(self):
+        """Shut down the worker process pool, if one was started."""
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+            logger.info("Agent execution process pool shut down")
+
+
+def _summarize(samples: Deque[float]) -> Dict[str, float]:
+    if not samples:
+        return {"avg": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+    return {
+        "avg": round(sum(ordered) / len(ordered), 4),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+        "max": round(ordered[-1], 4),
+    }
@@ -0,0 +1,302 @@
+"""
+MCP connection lifecycle for background agents.
+
+Background agents usually run for a few seconds every few minutes or hours,
+so keeping their MCP servers (often stdio subprocesses) connected the whole
+time wastes memory and file descriptors. ``MCPLifecycleManager`` connects
+them around runs according to each agent's policy and reclaims idle
+connections.
+"""
+
+from contextlib import asynccontextmanager
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+import asyncio
+import json
+import time
+
+from omnicoreagent.core.utils import logger
+
+
+class MCPLifecycle(str, Enum):
+    """How a background agent's MCP connections are kept between runs"""
+
+    WARM = "warm"
+    ON_DEMAND = "on_demand"
+    SHARED = "shared"
+
+
+class _ConnectionSlot:
+    """One MCP client and the agents that use it."""
+
+    def __init__(
+        self,
+        client: Any,
+        policy: MCPLifecycle,
+        idle_timeout: float,
+        prefetch_seconds: float,
+    ):
+        self.client = client
+        self.policy = policy
+        self.idle_timeout = idle_timeout
+        self.prefetch_seconds = prefetch_seconds
+        self.agents: Dict[str, Any] = {}
+        self.connected = False
+        self.active = 0
+        self.last_used = time.time()
+        self.lock = asyncio.Lock()
+        self.warm_starts = 0
+        self.cold_starts = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "policy": self.policy.value,
+            "agents": sorted(self.agents),
+            "connected": self.connected,
+            "active_runs": self.active,
+            "idle_seconds": round(time.time() - self.last_used, 3)
+            if self.connected and not self.active
+            else 0.0,
+            "warm_starts": self.warm_starts,
+            "cold_starts": self.cold_starts,
+        }
+
+
+class MCPLifecycleManager:
+    """
+    Connects background agents' MCP servers according to their lifecycle policy.
+
+    Each agent picks a policy with the ``mcp_lifecycle`` config key:
+
+    - ``warm``: connect when the agent is created and stay connected (the
+      previous behaviour).
+    - ``on_demand``: connect just before a run, or ``mcp_prefetch_seconds``
+      before the agent's next scheduled run, and disconnect once the
+      connection has been idle for ``mcp_idle_timeout`` seconds (0 disconnects
+      right after each run).
+    - ``shared``: like ``on_demand``, but agents with identical ``mcp_tools``
+      configuration share one MCP client, so N agents cost one set of server
+      processes. The client also answers the servers' sampling requests, so
+      only agents with the same model config, tenant and usage ledger share
+      it; sampling stays billed to the right tenant.
+
+    A run that finds its connection already open counts as a warm start, one
+    that has to connect first as a cold start.
+    """
+
+    def __init__(
+        self,
+        next_run_time: Optional[Callable[[str], Optional[float]]] = None,
+        check_interval: float = 5.0,
+    ):
+        """
+        Initialize the MCPLifecycleManager.
+
+        Args:
+            next_run_time: Returns an agent's next scheduled run as epoch
+                seconds (or None), used to prefetch connections
+            check_interval: Seconds between idle/prefetch checks
+        """
+        self.next_run_time = next_run_time
+        self.check_interval = check_interval
+        self._slots: Dict[str, _ConnectionSlot] = {}
+        self._agent_slots: Dict[str, str] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.prefetches = 0
+        self.reclaimed = 0
+
+    @staticmethod
+    def _slot_key(agent: Any, policy: MCPLifecycle) -> str:
+        if policy == MCPLifecycle.SHARED:
+            internal_config = getattr(agent, "internal_config", None) or {}
+            identity = {
+                "mcp_tools": agent.mcp_tools,
+                "llm": internal_config.get("LLM"),
+                "tenant_id": getattr(agent, "tenant_id", None),
+                "usage_ledger": id(getattr(agent, "usage_ledger", None)),
+            }
+            return "shared:" + json.dumps(identity, sort_keys=True, default=str)
+        return f"agent:{agent.agent_id}"
+
+    async def register(self, agent: Any):
+        """Start managing an agent's MCP connections (no-op without MCP tools)."""
+        if (
+            not agent.mcp_tools
+            or agent.mcp_client is None
+            or agent.agent_id in self._agent_slots
+        ):
+            return
+        policy = MCPLifecycle(getattr(agent, "mcp_lifecycle", MCPLifecycle.WARM))
+        key = self._slot_key(agent, policy)
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = _ConnectionSlot(
+                agent.mcp_client,
+                policy,
+                idle_timeout=getattr(agent, "mcp_idle_timeout", 60.0),
+                prefetch_seconds=getattr(agent, "mcp_prefetch_seconds", 30.0),
+            )
+            self._slots[key] = slot
+        else:
+            agent.mcp_client = slot.client
+            if slot.connected:
+                self._index_tools(agent)
+        slot.agents[agent.agent_id] = agent
+        self._agent_slots[agent.agent_id] = key
+
+        if policy == MCPLifecycle.WARM:
+            async with slot.lock:
+                await self._connect(slot, agent)
+
+    async def unregister(self, agent_id: str):
+        """Stop managing an agent; its connection is closed once no agent uses it."""
+        key = self._agent_slots.pop(agent_id, None)
+        if key is None:
+            return
+        slot = self._slots[key]
+        slot.agents.pop(agent_id, None)
+        if not slot.agents:
+            del self._slots[key]
+            async with slot.lock:
+                await self._disconnect(slot)
+
+    def is_managed(self, agent_id: str) -> bool:
+        """Whether an agent's connections are managed here"""
+        return agent_id in self._agent_slots
+
+    @asynccontextmanager
+    async def acquire(self, agent_id: str):
+        """Keep the agent's MCP servers connected for the duration of a run."""
+        key = self._agent_slots.get(agent_id)
+        if key is None:
+            yield
+            return
+        slot = self._slots[key]
+        async with slot.lock:
+            if slot.connected:
+                slot.warm_starts += 1
+            else:
+                slot.cold_starts += 1
+                await self._connect(slot, slot.agents[agent_id])
+            slot.active += 1
+        try:
+            yield
+        finally:
+            slot.active -= 1
+            slot.last_used = time.time()
+            if (
+                slot.policy != MCPLifecycle.WARM
+                and slot.idle_timeout <= 0
+                and not slot.active
+            ):
+                async with slot.lock:
+                    if not slot.active:
+                        await self._disconnect(slot)
+
+    async def _connect(self, slot: _ConnectionSlot, agent: Any):
+        if slot.connected:
+            return
+        await agent.connect_mcp_servers()
+        slot.connected = True
+        slot.last_used = time.time()
+        for other in slot.agents.values():
+            if other is not agent:
+                self._index_tools(other)
+
+    @staticmethod
+    def _index_tools(agent: Any):
+        """Let an agent that joined a shared connection index its tools"""
+        index = getattr(agent, "index_mcp_tools", None)
+        if index is None:
+            return
+        try:
+            index()
+        except Exception as e:
+            logger.warning(f"Failed to index MCP tools for {agent.agent_id}: {e}")
+
+    async def _disconnect(self, slot: _ConnectionSlot):
+        if not slot.connected:
+            return
+        slot.connected = False
+        try:
+            await slot.client.cleanup()
+        except Exception as e:
+            logger.warning(f"Failed to close MCP connections: {e}")
+
+    async def check(self, now: Optional[float] = None):
+        """Reclaim idle connections and prefetch connections for upcoming runs."""
+        now = time.time() if now is None else now
+        for slot in list(self._slots.values()):
+            if slot.policy == MCPLifecycle.WARM or slot.active:
+                continue
+            if slot.connected:
+                if now - slot.last_used >= slot.idle_timeout:
+                    async with slot.lock:
+                        if slot.connected and not slot.active:
+                            await self._disconnect(slot)
+                            self.reclaimed += 1
+                            logger.info(
+                                f"Reclaimed idle MCP connections of {sorted(slot.agents)}"
+                            )
+                continue
+
+            next_run = self._next_run(slot)
+            if next_run is not None and next_run - now <= slot.prefetch_seconds:
+                async with slot.lock:
+                    if not slot.connected and slot.agents:
+                        await self._connect(slot, next(iter(slot.agents.values())))
+                        slot.last_used = max(now, next_run)
+                        self.prefetches += 1
+
+    def _next_run(self, slot: _ConnectionSlot) -> Optional[float]:
+        if self.next_run_time is None:
+            return None
+        times = [
+            run_time
+            for run_time in map(self.next_run_time, slot.agents)
+            if run_time is not None
+        ]
+        return min(times) if times else None
+
+    def start(self):
+        """Start the periodic idle/prefetch check. Needs a running event loop."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._check_loop())
+
+    async def stop(self):
+        """Stop the periodic check."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def close(self):
+        """Stop the check and close every managed connection."""
+        await self.stop()
+        for slot in list(self._slots.values()):
+            async with slot.lock:
+                await self._disconnect(slot)
+
+    async def _check_loop(self):
+        while True:
+            await asyncio.sleep(self.check_interval)
+            try:
+                await self.check()
+            except Exception as e:
+                logger.error(f"MCP lifecycle check failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Connection counts, warm/cold starts and per-slot details"""
+        slots: List[_ConnectionSlot] = list(self._slots.values())
+        return {
+            "connections": len(slots),
+            "connected": sum(slot.connected for slot in slots),
+            "warm_starts": sum(slot.warm_starts for slot in slots),
+            "cold_starts": sum(slot.cold_starts for slot in slots),
+            "prefetches": self.prefetches,
+            "reclaimed": self.reclaimed,
+            "slots": [slot.to_dict() for slot in slots],
+        }
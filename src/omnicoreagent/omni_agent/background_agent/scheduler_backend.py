@@ -8,7 +8,7 @@ from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.cron import CronTrigger
 from typing import Any, Callable, Dict, Union, Optional
 from omnicoreagent.core.utils import logger
-from .base import BackgroundTaskScheduler
+from .base import BackgroundTaskScheduler, task_kwargs
 
 
 class APSchedulerBackend(BackgroundTaskScheduler):
@@ -44,7 +44,7 @@ class APSchedulerBackend(BackgroundTaskScheduler):
                 trigger=trigger,
                 id=agent_id,
                 replace_existing=True,
-                kwargs=kwargs,
+                kwargs=task_kwargs(kwargs),
                 max_instances=1,
                 coalesce=True,
             )
@@ -28,6 +28,9 @@ class ModelConfig:
     max_context_length: Optional[int] = 100000
     top_p: Optional[float] = 0.7
     top_k: Optional[Union[int, str]] = "N/A"
+    api_key: Optional[str] = None
+    api_base: Optional[str] = None
+    sampling: Optional[Dict[str, Any]] = None
 
 
 @dataclass
@@ -66,6 +69,14 @@ class AgentConfig:
         default_factory=lambda: {"mode": "token_budget", "value": 30000}
     )
     memory_tool_backend: str = None
+    max_sessions: int = 1024
+    session_ttl: float = 0
+    usage_limit_scope: str = "session"
+    max_parallel_sub_agents: int = 4
+    sub_agent_timeout: float = 0
+    artifact_store: str = None
+    artifact_threshold_chars: int = 20000
+    artifact_preview_chars: int = 2000
     guardrail_config: Optional[Dict[str, Any]] = None
 
 
@@ -186,6 +197,9 @@ class ConfigTransformer:
         if config.max_context_length is not None and config.max_context_length <= 0:
             raise ValueError("max_context_length must be positive")
 
+        if config.sampling is not None and not isinstance(config.sampling, dict):
+            raise ValueError("sampling must be a dictionary")
+
     def _validate_tools_config(self, tools: List[MCPToolConfig]):
         """Validate MCP tools configuration"""
         if not tools:
@@ -221,7 +235,7 @@ class ConfigTransformer:
 
     def _transform_model_config(self, config: ModelConfig) -> Dict[str, Any]:
         """Transform model config to internal LLM format"""
-        return {
+        llm_config = {
             "provider": self.supported_providers[config.provider],
             "model": config.model,
             "temperature": config.temperature,
@@ -230,6 +244,13 @@ class ConfigTransformer:
             "top_p": config.top_p,
             "top_k": config.top_k,
         }
+        if config.api_key:
+            llm_config["api_key"] = config.api_key
+        if config.api_base:
+            llm_config["api_base"] = config.api_base
+        if config.sampling:
+            llm_config["sampling"] = dict(config.sampling)
+        return llm_config
 
     def _transform_tools_config(self, tools: List[MCPToolConfig]) -> Dict[str, Any]:
         """Transform tools config to internal mcpServers format"""
@@ -1,6 +1,7 @@
 from .parallel_agent import ParallelAgent
 from .sequential_agent import SequentialAgent
 from .router_agent import RouterAgent
+from .graph_agent import GraphAgent
 
 
-__all__ = ["ParallelAgent", "SequentialAgent", "RouterAgent"]
+__all__ = ["ParallelAgent", "SequentialAgent", "RouterAgent", "GraphAgent"]
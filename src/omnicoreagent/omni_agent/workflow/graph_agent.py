@@ -0,0 +1,499 @@
+from omnicoreagent.omni_agent.agent import OmniCoreAgent
+from omnicoreagent.core.utils import logger
+from omnicoreagent.omni_agent.workflow.utils import (
+    backoff_delay,
+    cleanup_agents,
+    connect_agents,
+)
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+import asyncio
+import inspect
+import json
+import uuid
+
+
+NodeRunner = Union[OmniCoreAgent, Callable[[Dict[str, Any]], Any]]
+
+
+@dataclass
+class GraphNode:
+    """A step of a GraphAgent: an agent or a (sync or async) callable."""
+
+    name: str
+    runner: NodeRunner
+    max_retries: Optional[int] = None
+    timeout: Optional[float] = None
+    output_type: Optional[type] = None
+
+
+@dataclass
+class GraphEdge:
+    """Data flow from ``source`` to ``target``, optionally conditional."""
+
+    source: str
+    target: str
+    key: str
+    condition: Optional[Callable[[Any], bool]] = None
+
+
+@dataclass
+class _RunState:
+    outputs: Dict[str, Any] = field(default_factory=dict)
+    skipped: set = field(default_factory=set)
+    inactive_edges: set = field(default_factory=set)
+
+
+class GraphCheckpointStore(ABC):
+    """Persists finished node outputs so an interrupted run can resume."""
+
+    @abstractmethod
+    async def load(self, run_id: str) -> Dict[str, Any]:
+        """Outputs of the nodes that finished in earlier attempts of ``run_id``"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def save(self, run_id: str, node: str, output: Any) -> None:
+        """Record the output of a finished node"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def clear(self, run_id: str) -> None:
+        """Forget a run once it has completed"""
+        raise NotImplementedError
+
+
+class InMemoryCheckpointStore(GraphCheckpointStore):
+    """Keeps checkpoints for the life of the process."""
+
+    def __init__(self):
+        self._runs: Dict[str, Dict[str, Any]] = {}
+
+    async def load(self, run_id: str) -> Dict[str, Any]:
+        return dict(self._runs.get(run_id, {}))
+
+    async def save(self, run_id: str, node: str, output: Any) -> None:
+        self._runs.setdefault(run_id, {})[node] = output
+
+    async def clear(self, run_id: str) -> None:
+        self._runs.pop(run_id, None)
+
+
+class FileCheckpointStore(GraphCheckpointStore):
+    """Keeps checkpoints as one JSON file per run; outputs must be JSON-serializable."""
+
+    def __init__(self, directory: Union[str, Path] = ".omnicoreagent_graph_runs"):
+        self.directory = Path(directory)
+
+    def _path(self, run_id: str) -> Path:
+        return self.directory / f"{run_id}.json"
+
+    def _read(self, run_id: str) -> Dict[str, Any]:
+        path = self._path(run_id)
+        if not path.exists():
+            return {}
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def _write(self, run_id: str, node: str, output: Any) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        outputs = self._read(run_id)
+        outputs[node] = output
+        tmp_path = self._path(run_id).with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(outputs), encoding="utf-8")
+        tmp_path.replace(self._path(run_id))
+
+    async def load(self, run_id: str) -> Dict[str, Any]:
+        return await asyncio.to_thread(self._read, run_id)
+
+    async def save(self, run_id: str, node: str, output: Any) -> None:
+        await asyncio.to_thread(self._write, run_id, node, output)
+
+    async def clear(self, run_id: str) -> None:
+        await asyncio.to_thread(self._path(run_id).unlink, missing_ok=True)
+
+
+class GraphAgent:
+    """
+    Runs OmniCoreAgents and callables as a DAG, passing outputs along edges.
+
+    A node starts as soon as every incoming edge is resolved, so independent
+    branches run concurrently (at most ``max_concurrency`` nodes at a time).
+    An edge with a ``condition`` only carries data when the condition holds
+    for the source's output; a node whose incoming edges are all inactive is
+    skipped, and so are the edges leaving it.
+
+    Agent nodes receive the task followed by the outputs of their upstream
+    nodes as the query, and output their ``response`` string. Callable nodes
+    receive a dict with the task under ``"task"`` and each upstream output
+    under its edge key, and output whatever they return.
+
+    Finished node outputs are checkpointed per ``run_id``; running again with
+    the run ID of a failed run resumes it without redoing finished nodes.
+
+    Usage:
+        graph = GraphAgent(max_concurrency=4)
+        graph.add_node("research", research_agent)
+        graph.add_node("stats", compute_stats)
+        graph.add_node("writer", writer_agent)
+        graph.add_edge("research", "writer")
+        graph.add_edge("stats", "writer")
+        result = await graph("Write a market report")
+    """
+
+    DEFAULT_TASK = "Please follow your system instructions and process accordingly."
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        max_retries: int = 3,
+        checkpoint_store: Optional[GraphCheckpointStore] = None,
+        retry_backoff: float = 0.5,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if max_retries < 1:
+            raise ValueError("max_retries must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.checkpoint_store = checkpoint_store or InMemoryCheckpointStore()
+        self.nodes: Dict[str, GraphNode] = {}
+        self.edges: List[GraphEdge] = []
+        self._initialized = False
+
+    def add_node(
+        self,
+        name: str,
+        runner: NodeRunner,
+        max_retries: Optional[int] = None,
+        timeout: Optional[float] = None,
+        output_type: Optional[type] = None,
+    ) -> "GraphAgent":
+        """
+        Add a node to the graph.
+
+        Args:
+            name: Unique node name
+            runner: OmniCoreAgent, or callable taking the inputs dict
+            max_retries: Attempts before the node fails (defaults to the graph's)
+            timeout: Seconds allowed per attempt
+            output_type: If given, outputs that are not instances of it fail the node
+
+        Returns:
+            The graph, for chaining
+        """
+        if name in self.nodes:
+            raise ValueError(f"Node '{name}' already exists")
+        if not isinstance(runner, OmniCoreAgent) and not callable(runner):
+            raise TypeError(f"Node '{name}' must be an OmniCoreAgent or a callable")
+        if max_retries is not None and max_retries < 1:
+            raise ValueError(f"Node '{name}' max_retries must be at least 1")
+        self.nodes[name] = GraphNode(name, runner, max_retries, timeout, output_type)
+        return self
+
+    def add_edge(
+        self,
+        source: str,
+        target: str,
+        condition: Optional[Callable[[Any], bool]] = None,
+        key: Optional[str] = None,
+    ) -> "GraphAgent":
+        """
+        Route the output of ``source`` into ``target``.
+
+        Args:
+            source: Upstream node name
+            target: Downstream node name
+            condition: Optional predicate on the source output; the edge is
+                inactive when it returns False
+            key: Name of the output in the target's inputs (defaults to ``source``)
+
+        Returns:
+            The graph, for chaining
+        """
+        for name in (source, target):
+            if name not in self.nodes:
+                raise ValueError(f"Unknown node '{name}'")
+        self.edges.append(GraphEdge(source, target, key or source, condition))
+        try:
+            self._topological_order()
+        except ValueError:
+            self.edges.pop()
+            raise
+        return self
+
+    def _topological_order(self) -> List[str]:
+        indegree = {name: 0 for name in self.nodes}
+        for edge in self.edges:
+            indegree[edge.target] += 1
+        ready = [name for name, degree in indegree.items() if degree == 0]
+        order = []
+        while ready:
+            name = ready.pop()
+            order.append(name)
+            for edge in self.edges:
+                if edge.source == name:
+                    indegree[edge.target] -= 1
+                    if indegree[edge.target] == 0:
+                        ready.append(edge.target)
+        if len(order) != len(self.nodes):
+            raise ValueError("GraphAgent edges must not form a cycle")
+        return order
+
+    async def initialize(self):
+        """Connect MCP servers for all agent nodes."""
+        if self._initialized:
+            return
+        logger.info("GraphAgent: Initializing MCP servers for agent nodes")
+        await connect_agents(self._agents(), self.max_concurrency)
+        self._initialized = True
+
+    def _agents(self) -> List[OmniCoreAgent]:
+        return [
+            node.runner
+            for node in self.nodes.values()
+            if isinstance(node.runner, OmniCoreAgent)
+        ]
+
+    async def run(
+        self,
+        initial_task: Optional[str] = None,
+        session_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+    ) -> dict:
+        """
+        Run the graph.
+
+        Args:
+            initial_task: Task given to every node
+            session_id: Session shared by all agent nodes
+            run_id: Pass the ``run_id`` of a failed run to resume it
+
+        Returns:
+            Dict with ``response`` (the output of the single sink node, or a
+            dict of sink outputs), ``outputs`` per node, ``skipped`` nodes,
+            ``run_id`` and ``session_id``. A failed run also has
+            ``failed_node`` and ``error``.
+        """
+        if not self._initialized:
+            raise RuntimeError(
+                "GraphAgent must be initialized Call `await <your_instance>.initialize()` before using it"
+            )
+        if not self.nodes:
+            raise ValueError("GraphAgent requires at least one node")
+
+        task = initial_task or self.DEFAULT_TASK
+        session_id = session_id or str(uuid.uuid4())
+        run_id = run_id or str(uuid.uuid4())
+
+        state = _RunState(outputs=await self.checkpoint_store.load(run_id))
+        if state.outputs:
+            logger.info(
+                f"GraphAgent: resuming run {run_id}, {len(state.outputs)} nodes already done"
+            )
+        order = self._topological_order()
+        for name in state.outputs:
+            self._resolve_outgoing(name, state)
+        self._propagate_skips(state, order)
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        running: Dict[asyncio.Task, str] = {}
+        failure: Optional[tuple] = None
+
+        while True:
+            for name in self._ready_nodes(state, running):
+                inputs = self._node_inputs(name, task, state)
+                running[
+                    asyncio.create_task(
+                        self._run_node(self.nodes[name], inputs, session_id, semaphore)
+                    )
+                ] = name
+
+            if not running:
+                break
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for finished in done:
+                name = running.pop(finished)
+                try:
+                    output = finished.result()
+                except Exception as exc:
+                    failure = failure or (name, exc)
+                    continue
+                state.outputs[name] = output
+                await self.checkpoint_store.save(run_id, name, output)
+                self._resolve_outgoing(name, state)
+                self._propagate_skips(state, order)
+
+            if failure is not None:
+                for pending in running:
+                    pending.cancel()
+                await asyncio.gather(*running, return_exceptions=True)
+                break
+
+        result = {
+            "response": self._sink_response(state),
+            "outputs": state.outputs,
+            "skipped": sorted(state.skipped),
+            "run_id": run_id,
+            "session_id": session_id,
+        }
+        if failure is not None:
+            failed_node, exc = failure
+            logger.error(f"GraphAgent: node {failed_node} failed, run {run_id} stopped")
+            result.update({"failed_node": failed_node, "error": str(exc)})
+        else:
+            await self.checkpoint_store.clear(run_id)
+        return result
+
+    def _incoming(self, name: str) -> List[GraphEdge]:
+        return [edge for edge in self.edges if edge.target == name]
+
+    def _resolve_outgoing(self, name: str, state: _RunState):
+        """Decide which edges leaving a finished or skipped node carry data"""
+        for edge in self.edges:
+            if edge.source != name:
+                continue
+            if name in state.skipped:
+                state.inactive_edges.add(id(edge))
+            elif edge.condition is not None:
+                try:
+                    active = bool(edge.condition(state.outputs[name]))
+                except Exception as exc:
+                    logger.warning(
+                        f"GraphAgent: condition on {edge.source}->{edge.target} failed: {exc}"
+                    )
+                    active = False
+                if not active:
+                    state.inactive_edges.add(id(edge))
+
+    def _propagate_skips(self, state: _RunState, order: List[str]):
+        """Skip every unresolved node whose incoming edges are all inactive"""
+        for name in order:
+            if not self._is_resolved(name, state) and self._is_skipped(name, state):
+                state.skipped.add(name)
+                self._resolve_outgoing(name, state)
+
+    def _is_resolved(self, name: str, state: _RunState) -> bool:
+        return name in state.outputs or name in state.skipped
+
+    def _is_skipped(self, name: str, state: _RunState) -> bool:
+        incoming = self._incoming(name)
+        return (
+            bool(incoming)
+            and all(self._is_resolved(edge.source, state) for edge in incoming)
+            and all(id(edge) in state.inactive_edges for edge in incoming)
+        )
+
+    def _ready_nodes(self, state: _RunState, running: Dict[asyncio.Task, str]):
+        in_flight = set(running.values())
+        return [
+            name
+            for name in self.nodes
+            if not self._is_resolved(name, state)
+            and name not in in_flight
+            and all(
+                self._is_resolved(edge.source, state) for edge in self._incoming(name)
+            )
+        ]
+
+    def _node_inputs(self, name: str, task: str, state: _RunState) -> Dict[str, Any]:
+        inputs: Dict[str, Any] = {"task": task}
+        for edge in self._incoming(name):
+            if id(edge) not in state.inactive_edges:
+                inputs[edge.key] = state.outputs[edge.source]
+        return inputs
+
+    async def _run_node(
+        self,
+        node: GraphNode,
+        inputs: Dict[str, Any],
+        session_id: str,
+        semaphore: asyncio.Semaphore,
+    ) -> Any:
+        """
+        Run a node with retries and per-attempt timeout.
+
+        The concurrency slot is held per attempt, not across the backoff
+        between attempts, so a failing node does not block other nodes.
+        """
+        max_retries = self.max_retries if node.max_retries is None else node.max_retries
+        for attempt in range(1, max_retries + 1):
+            try:
+                async with semaphore:
+                    output = await asyncio.wait_for(
+                        self._call_runner(node, inputs, session_id), node.timeout
+                    )
+                if node.output_type is not None and not isinstance(
+                    output, node.output_type
+                ):
+                    raise TypeError(
+                        f"Node '{node.name}' returned {type(output).__name__}, "
+                        f"expected {node.output_type.__name__}"
+                    )
+                return output
+            except Exception as exc:
+                logger.warning(
+                    f"{node.name}: Attempt {attempt}/{max_retries} failed: {exc!r}"
+                )
+                if attempt >= max_retries:
+                    logger.error(f"{node.name}: Max retries reached")
+                    raise
+            await asyncio.sleep(backoff_delay(attempt, self.retry_backoff))
+
+    @staticmethod
+    async def _call_runner(
+        node: GraphNode, inputs: Dict[str, Any], session_id: str
+    ) -> Any:
+        if isinstance(node.runner, OmniCoreAgent):
+            output = await node.runner.run(
+                query=GraphAgent._build_query(inputs), session_id=session_id
+            )
+            return output.get("response", "")
+        output = node.runner(inputs)
+        if inspect.isawaitable(output):
+            output = await output
+        return output
+
+    @staticmethod
+    def _build_query(inputs: Dict[str, Any]) -> str:
+        """Task followed by one section per upstream output."""
+        sections = [inputs["task"]]
+        for key, value in inputs.items():
+            if key == "task":
+                continue
+            if not isinstance(value, str):
+                value = json.dumps(value, default=str)
+            sections.append(f"<{key}>\n{value}\n</{key}>")
+        return "\n\n".join(sections)
+
+    def _sink_response(self, state: _RunState) -> Any:
+        sources = {edge.source for edge in self.edges}
+        sinks = [
+            name for name in self.nodes if name not in sources and name in state.outputs
+        ]
+        if len(sinks) == 1:
+            return state.outputs[sinks[0]]
+        return {name: state.outputs[name] for name in sinks}
+
+    async def __call__(
+        self,
+        initial_task: Optional[str] = None,
+        session_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+    ):
+        auto_init = not self._initialized
+        try:
+            if auto_init:
+                await self.initialize()
+            return await self.run(
+                initial_task=initial_task, session_id=session_id, run_id=run_id
+            )
+        finally:
+            if auto_init:
+                await self.shutdown()
+
+    async def shutdown(self):
+        await cleanup_agents(self._agents(), self.max_concurrency)
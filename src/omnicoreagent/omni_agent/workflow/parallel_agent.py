@@ -1,20 +1,46 @@
 from omnicoreagent.omni_agent.agent import OmniCoreAgent
 from typing import List, Optional, Dict
 from omnicoreagent.core.utils import logger
+from omnicoreagent.omni_agent.workflow.utils import (
+    backoff_delay,
+    cleanup_agents,
+    connect_agents,
+)
 import asyncio
 import uuid
 
 
 class ParallelAgent:
-    """Runs a list of OmniCoreAgents in parallel, each with its own optional task, sharing a session ID if provided."""
+    """Runs a list of OmniCoreAgents in parallel, each with its own optional task, sharing a session ID if provided.
+
+    ``max_concurrency`` caps how many sub-agents run (and connect MCP servers)
+    at once, e.g. to stay within provider rate limits; None means no limit.
+    Failed attempts are retried after an exponential, jittered backoff
+    starting at ``retry_backoff`` seconds.
+    """
 
     DEFAULT_TASK = "Please follow your system instructions and process accordingly."
 
-    def __init__(self, sub_agents: List[OmniCoreAgent], max_retries: int = 3):
+    def __init__(
+        self,
+        sub_agents: List[OmniCoreAgent],
+        max_retries: int = 3,
+        max_concurrency: Optional[int] = None,
+        retry_backoff: float = 0.5,
+    ):
         if not sub_agents:
             raise ValueError("ParallelAgent requires at least one sub-agent")
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if max_retries < 1:
+            raise ValueError("max_retries must be at least 1")
         self.sub_agents = sub_agents
         self.max_retries = max_retries
+        self.max_concurrency = max_concurrency
+        self.retry_backoff = retry_backoff
+        self._semaphore = (
+            asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        )
         self._initialized = False
 
     async def initialize(self):
@@ -22,13 +48,7 @@ class ParallelAgent:
         if self._initialized:
             return
         logger.info("RouterAgent: Initializing MCP servers for router and sub-agents")
-        for agent in self.sub_agents:
-            if getattr(agent, "mcp_tools", None):
-                try:
-                    await agent.connect_mcp_servers()
-                    logger.info(f"{agent.name}: MCP servers connected")
-                except Exception as exc:
-                    logger.warning(f"{agent.name}: MCP connection failed: {exc}")
+        await connect_agents(self.sub_agents, self.max_concurrency)
         self._initialized = True
 
     async def run(
@@ -57,6 +77,19 @@ class ParallelAgent:
         results = await asyncio.gather(*tasks)
         return {res["agent_name"]: res for res in results}
 
+    async def _run_attempt(
+        self, agent_service: OmniCoreAgent, query: str, session_id: str
+    ) -> dict:
+        """Run one attempt, holding a concurrency slot only while it runs."""
+        if self._semaphore is None:
+            return await asyncio.shield(
+                agent_service.run(query=query, session_id=session_id)
+            )
+        async with self._semaphore:
+            return await asyncio.shield(
+                agent_service.run(query=query, session_id=session_id)
+            )
+
     async def _run_single_agent(
         self, agent_service: OmniCoreAgent, query: str, session_id: str, idx: int
     ) -> dict:
@@ -67,9 +100,7 @@ class ParallelAgent:
 
         while retry_count < self.max_retries:
             try:
-                final_output = await asyncio.shield(
-                    agent_service.run(query=query, session_id=session_id)
-                )
+                final_output = await self._run_attempt(agent_service, query, session_id)
                 break
 
             except Exception as exc:
@@ -86,6 +117,7 @@ class ParallelAgent:
                         "error": str(exc),
                     }
                     break
+                await asyncio.sleep(backoff_delay(retry_count, self.retry_backoff))
 
         return {**final_output}
 
@@ -104,10 +136,4 @@ class ParallelAgent:
                 await self.shutdown()
 
     async def shutdown(self):
-        for agent in self.sub_agents:
-            if getattr(agent, "mcp_tools", None):
-                try:
-                    await agent.cleanup()
-                    logger.info(f"{agent.name}: MCP cleanup successful")
-                except Exception as exc:
-                    logger.warning(f"{agent.name}: MCP cleanup failed: {exc}")
+        await cleanup_agents(self.sub_agents, self.max_concurrency)
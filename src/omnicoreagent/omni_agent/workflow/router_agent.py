@@ -1,5 +1,12 @@
 from omnicoreagent.omni_agent.agent import OmniCoreAgent
 from omnicoreagent.core.utils import logger
+from omnicoreagent.omni_agent.workflow.routing import FastRouter, RoutingDecision
+from omnicoreagent.omni_agent.workflow.utils import (
+    backoff_delay,
+    cleanup_agents,
+    gather_limited,
+)
+from dataclasses import asdict
 from typing import List, Optional, Dict
 import asyncio
 import uuid
@@ -11,8 +18,16 @@ class RouterAgent:
     Routes a task to the most suitable sub-agent using XML-based LLM decisions.
     - Accepts developer model_config, agent_config, memory_router, event_router.
     - Builds an internal RouterAgent OmniCoreAgent with those configs.
-    - Eagerly connects MCP servers at startup.
-    - Routes user task and executes chosen agent.
+    - Eagerly connects MCP servers and summarizes each sub-agent's
+      capabilities at startup, for all sub-agents concurrently (at most
+      ``max_concurrency`` at a time; None means no limit).
+    - Routes user task and executes chosen agent, retrying failures after an
+      exponential, jittered backoff starting at ``retry_backoff`` seconds.
+    - With ``fast_routing``, tasks are first routed locally (cached decisions,
+      then BM25 over the capability summaries, ignoring stopwords); the LLM
+      router is asked when the best agent matches fewer than two task
+      keywords or the local confidence is below ``routing_confidence``, and its
+      decisions are fed back to the local router.
     """
 
     DEFAULT_TASK = "Please follow your system instructions and process accordingly."
@@ -26,6 +41,11 @@ class RouterAgent:
         event_router=None,
         debug: bool = False,
         max_retries: int = 3,
+        max_concurrency: Optional[int] = None,
+        retry_backoff: float = 0.5,
+        fast_routing: bool = True,
+        routing_confidence: float = 0.5,
+        routing_cache_size: int = 1024,
     ):
         if not sub_agents:
             raise ValueError("RouterAgent requires at least one sub-agent")
@@ -34,6 +54,12 @@ class RouterAgent:
             getattr(a, "name", f"Agent_{i + 1}"): a for i, a in enumerate(sub_agents)
         }
         self.max_retries = max_retries
+        self.max_concurrency = max_concurrency
+        self.retry_backoff = retry_backoff
+        self.fast_routing = fast_routing
+        self.routing_confidence = routing_confidence
+        self.routing_cache_size = routing_cache_size
+        self.fast_router: Optional[FastRouter] = None
         self.agent_registry: dict = {}
         self.model_config = model_config
         self.agent_config = agent_config
@@ -50,7 +76,8 @@ class RouterAgent:
         if self._initialized:
             return
         logger.info("RouterAgent: Initializing MCP servers for router and sub-agents")
-        for agent in list(self.sub_agents.values()):
+
+        async def prepare(agent):
             if getattr(agent, "mcp_tools", None):
                 try:
                     await agent.connect_mcp_servers()
@@ -59,6 +86,24 @@ class RouterAgent:
                     logger.warning(f"{agent.name}: MCP connection failed: {exc}")
             await self.create_agent_capabilities_registry(agent=agent)
 
+        await gather_limited(
+            [lambda agent=agent: prepare(agent) for agent in self.sub_agents.values()],
+            self.max_concurrency,
+        )
+        # Summaries finish in any order; keep the prompt stable.
+        self.agent_registry = {
+            name: self.agent_registry[name]
+            for name in self.sub_agents
+            if name in self.agent_registry
+        }
+
+        if self.fast_routing:
+            self.fast_router = FastRouter(
+                self.agent_registry,
+                confidence_threshold=self.routing_confidence,
+                cache_size=self.routing_cache_size,
+            )
+
         if not self.router_agent:
             system_instruction = self._build_router_system_instruction()
             self.router_agent = OmniCoreAgent(
@@ -157,6 +202,18 @@ class RouterAgent:
 
         logger.info(f"RouterAgent: Routing task -> {task}")
 
+        decision = self.fast_router.route(task) if self.fast_router else None
+        if decision is not None:
+            logger.info(
+                f"RouterAgent: {decision.method} route -> {decision.agent_name} "
+                f"(confidence {decision.confidence})"
+            )
+            output = await self._run_single_agent(
+                self.sub_agents[decision.agent_name], task, session_id
+            )
+            output["routing"] = asdict(decision)
+            return output
+
         retry_count = 0
         chosen_agent = None
         query = task
@@ -197,7 +254,11 @@ class RouterAgent:
                 "response": task,
             }
 
-        return await self._run_single_agent(chosen_agent, query, session_id)
+        if self.fast_router:
+            self.fast_router.record(task, agent_name)
+        output = await self._run_single_agent(chosen_agent, query, session_id)
+        output["routing"] = asdict(RoutingDecision(agent_name, 1.0, "llm"))
+        return output
 
     async def _run_single_agent(
         self, agent: OmniCoreAgent, query: str, session_id: str
@@ -234,6 +295,7 @@ class RouterAgent:
                     }
                     logger.error(f"{agent_name}: Max retries reached with error {exc}")
                     break
+                await asyncio.sleep(backoff_delay(retry_count, self.retry_backoff))
 
         return final_output
 
@@ -293,10 +355,6 @@ class RouterAgent:
                 await self.shutdown()
 
     async def shutdown(self):
-        for agent in list(self.sub_agents.values()) + [self.router_agent]:
-            if getattr(agent, "mcp_tools", None):
-                try:
-                    await agent.cleanup()
-                    logger.info(f"{agent.name}: MCP cleanup successful")
-                except Exception as exc:
-                    logger.warning(f"{agent.name}: MCP cleanup failed: {exc}")
+        await cleanup_agents(
+            list(self.sub_agents.values()) + [self.router_agent], self.max_concurrency
+        )
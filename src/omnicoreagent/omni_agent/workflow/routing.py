@@ -0,0 +1,192 @@
+"""
+Local fast path for RouterAgent routing decisions.
+"""
+
+from omnicoreagent.core.tools.advance_tools.advanced_tools_use import (
+    RetrievalConfig,
+    tokenize,
+)
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Tuple
+import math
+
+
+# Function words and filler that say nothing about which agent should answer
+STOPWORDS = frozenset(
+    """
+    a about above after again against all am an and any are as at be because
+    been before being below between both but by can could did do does doing
+    down during each few for from further had has have having he her here hers
+    him his how i if in into is it its itself just me more most my myself no
+    nor not now of off on once only or other our ours out over own please same
+    she should so some such than that the their theirs them then there these
+    they this those through to too under until up very was we were what when
+    where which while who whom why will with would you your yours
+    """.split()
+)
+
+
+def _stem(token: str) -> str:
+    """Crude suffix stripping so "refunds", "refunded" and "refund" match"""
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        token = token[:-1]
+    for suffix in ("ing", "ed"):
+        if len(token) > len(suffix) + 2 and token.endswith(suffix):
+            token = token[: -len(suffix)]
+            break
+    if len(token) > 3 and token.endswith("e"):
+        token = token[:-1]
+    return token
+
+
+def routing_terms(text: str) -> List[str]:
+    """Tokens used for routing: lowercase words without stopwords, stemmed"""
+    return [_stem(token) for token in tokenize(text) if token not in STOPWORDS]
+
+
+@dataclass
+class RoutingDecision:
+    """Agent chosen for a task and how it was chosen."""
+
+    agent_name: str
+    confidence: float
+    method: str
+
+
+class FastRouter:
+    """
+    Keyword router over agent capability summaries, with a decision cache.
+
+    Each agent is a BM25 document built from its name, its capability summary
+    and the queries previously routed to it. A task is answered locally when
+    it was routed before (``method="cache"``) or when the best agent matches
+    at least ``min_matched_terms`` distinct task terms, scores at least
+    ``min_score`` and clearly beats the runner-up (``method="bm25"``). Otherwise ``route`` returns None
+    and the caller should ask the LLM and ``record`` its decision, which
+    teaches the fast path for similar queries.
+
+    Confidence is the relative margin between the two best BM25 scores,
+    ``(best - second) / best``, so it is 1.0 when only one agent matches at all
+    and close to 0 when two agents match equally well.
+    """
+
+    def __init__(
+        self,
+        agent_registry: Dict[str, str],
+        confidence_threshold: float = 0.5,
+        cache_size: int = 1024,
+        max_learned_queries: int = 50,
+        min_score: float = 1.0,
+        min_matched_terms: int = 2,
+    ):
+        """
+        Initialize the FastRouter.
+
+        Args:
+            agent_registry: Agent name to capability summary
+            confidence_threshold: Minimum confidence for a local BM25 decision
+            cache_size: Number of exact routing decisions kept
+            max_learned_queries: Queries recorded per agent for its document
+            min_score: Minimum BM25 score of the best agent for a local decision
+            min_matched_terms: Minimum distinct task terms the best agent must
+                match for a local decision
+        """
+        self.confidence_threshold = confidence_threshold
+        self.min_score = min_score
+        self.min_matched_terms = min_matched_terms
+        self.cache_size = cache_size
+        self.config = RetrievalConfig()
+        self._base_tokens: Dict[str, List[str]] = {
+            name: routing_terms(name.replace("_", " ")) + routing_terms(summary)
+            for name, summary in agent_registry.items()
+        }
+        self._learned: Dict[str, Deque[List[str]]] = {
+            name: deque(maxlen=max_learned_queries) for name in agent_registry
+        }
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        self._index: Optional[Tuple[Dict[str, Counter], Dict[str, int], float]] = None
+        self._idf: Dict[str, float] = {}
+
+    @staticmethod
+    def _cache_key(task: str) -> str:
+        return " ".join(tokenize(task))
+
+    def _build_index(self):
+        term_frequencies: Dict[str, Counter] = {}
+        lengths: Dict[str, int] = {}
+        doc_freq: Counter = Counter()
+        for name, tokens in self._base_tokens.items():
+            all_tokens = list(tokens)
+            for query_tokens in self._learned[name]:
+                all_tokens.extend(query_tokens)
+            term_frequencies[name] = Counter(all_tokens)
+            lengths[name] = len(all_tokens)
+            doc_freq.update(set(all_tokens))
+
+        n_docs = len(term_frequencies)
+        self._idf = {
+            term: math.log((n_docs - df + 0.5) / (df + 0.5) + 1)
+            for term, df in doc_freq.items()
+        }
+        avgdl = sum(lengths.values()) / n_docs if n_docs else 0.0
+        self._index = (term_frequencies, lengths, avgdl)
+
+    def scores(self, task: str) -> Dict[str, float]:
+        """BM25 score of every agent for ``task``"""
+        if self._index is None:
+            self._build_index()
+        term_frequencies, lengths, avgdl = self._index
+        k1, b = self.config.k1, self.config.b
+
+        query_terms = [term for term in routing_terms(task) if term in self._idf]
+        scores = {}
+        for name, frequencies in term_frequencies.items():
+            norm = k1 * (1 - b + b * (lengths[name] / avgdl if avgdl else 1))
+            score = 0.0
+            for term in query_terms:
+                tf = frequencies.get(term, 0)
+                if tf:
+                    score += self._idf[term] * tf * (k1 + 1) / (tf + norm)
+            scores[name] = score
+        return scores
+
+    def route(self, task: str) -> Optional[RoutingDecision]:
+        """
+        Route ``task`` locally if possible.
+
+        Returns:
+            The decision, or None when the LLM should decide
+        """
+        key = self._cache_key(task)
+        cached = self._cache.get(key) if key else None
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return RoutingDecision(cached, 1.0, "cache")
+
+        ranked = sorted(self.scores(task).items(), key=lambda item: -item[1])
+        if not ranked or ranked[0][1] <= 0 or ranked[0][1] < self.min_score:
+            return None
+        best_name, best = ranked[0]
+        frequencies = self._index[0][best_name]
+        matched = {term for term in routing_terms(task) if frequencies.get(term)}
+        if len(matched) < self.min_matched_terms:
+            return None
+        second = ranked[1][1] if len(ranked) > 1 else 0.0
+        confidence = (best - second) / best
+        if confidence < self.confidence_threshold:
+            return None
+        return RoutingDecision(best_name, round(confidence, 3), "bm25")
+
+    def record(self, task: str, agent_name: str):
+        """Remember a routing decision made by the LLM"""
+        key = self._cache_key(task)
+        if agent_name not in self._learned or not key:
+            return
+        self._cache[key] = agent_name
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+        self._learned[agent_name].append(routing_terms(task))
+        self._index = None
@@ -1,6 +1,12 @@
 from omnicoreagent.omni_agent.agent import OmniCoreAgent
 from typing import List, Optional
 from omnicoreagent.core.utils import logger
+from omnicoreagent.omni_agent.workflow.utils import (
+    backoff_delay,
+    cleanup_agents,
+    connect_agents,
+)
+import asyncio
 import uuid
 
 
@@ -9,11 +15,20 @@ class SequentialAgent:
 
     DEFAULT_TASK = "Please follow your system instructions and process accordingly."
 
-    def __init__(self, sub_agents: List[OmniCoreAgent], max_retries: int = 3):
+    def __init__(
+        self,
+        sub_agents: List[OmniCoreAgent],
+        max_retries: int = 3,
+        max_concurrency: Optional[int] = None,
+        retry_backoff: float = 0.5,
+    ):
         if not sub_agents:
             raise ValueError("SequentialAgent requires at least one sub-agent")
         self.sub_agents = sub_agents
         self.max_retries = max_retries
+        # Only bounds concurrent MCP connects; the agents themselves run in order.
+        self.max_concurrency = max_concurrency
+        self.retry_backoff = retry_backoff
         self._initialized = False
 
     async def initialize(self):
@@ -21,13 +36,7 @@ class SequentialAgent:
         if self._initialized:
             return
         logger.info("RouterAgent: Initializing MCP servers for router and sub-agents")
-        for agent in self.sub_agents:
-            if getattr(agent, "mcp_tools", None):
-                try:
-                    await agent.connect_mcp_servers()
-                    logger.info(f"{agent.name}: MCP servers connected")
-                except Exception as exc:
-                    logger.warning(f"{agent.name}: MCP connection failed: {exc}")
+        await connect_agents(self.sub_agents, self.max_concurrency)
         self._initialized = True
 
     async def run(self, initial_task: str = None, session_id: str = None) -> dict:
@@ -72,6 +81,7 @@ class SequentialAgent:
                             "failed_agent": agent_name,
                             "error": str(exc),
                         }
+                    await asyncio.sleep(backoff_delay(retry_count, self.retry_backoff))
 
             current_input = self._extract_output(final_output)
 
@@ -95,10 +105,4 @@ class SequentialAgent:
                 await self.shutdown()
 
     async def shutdown(self):
-        for agent in self.sub_agents:
-            if getattr(agent, "mcp_tools", None):
-                try:
-                    await agent.cleanup()
-                    logger.info(f"{agent.name}: MCP cleanup successful")
-                except Exception as exc:
-                    logger.warning(f"{agent.name}: MCP cleanup failed: {exc}")
+        await cleanup_agents(self.sub_agents, self.max_concurrency)
@@ -0,0 +1,81 @@
+"""
+Helpers shared by the workflow agents.
+"""
+
+from omnicoreagent.core.utils import logger
+from typing import Any, Awaitable, Callable, Iterable, List, Optional
+import asyncio
+import random
+
+
+async def gather_limited(
+    factories: Iterable[Callable[[], Awaitable[Any]]],
+    max_concurrency: Optional[int] = None,
+) -> List[Any]:
+    """
+    Run coroutine factories concurrently, at most ``max_concurrency`` at a time.
+
+    Args:
+        factories: Zero-argument callables returning awaitables
+        max_concurrency: Limit on awaitables in flight (None for no limit)
+
+    Returns:
+        Results in the order of ``factories``
+    """
+    if not max_concurrency:
+        return await asyncio.gather(*(factory() for factory in factories))
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def limited(factory):
+        async with semaphore:
+            return await factory()
+
+    return await asyncio.gather(*(limited(factory) for factory in factories))
+
+
+def backoff_delay(attempt: int, base: float = 0.5, max_delay: float = 10.0) -> float:
+    """Exponential backoff with full jitter for the given (1-based) attempt"""
+    if base <= 0:
+        return 0.0
+    return random.uniform(0, min(max_delay, base * 2 ** (attempt - 1)))
+
+
+async def connect_agents(agents: Iterable[Any], max_concurrency: Optional[int] = None):
+    """Connect the MCP servers of all agents that have any, concurrently."""
+
+    async def connect(agent):
+        try:
+            await agent.connect_mcp_servers()
+            logger.info(f"{agent.name}: MCP servers connected")
+        except Exception as exc:
+            logger.warning(f"{agent.name}: MCP connection failed: {exc}")
+
+    await gather_limited(
+        [
+            lambda agent=agent: connect(agent)
+            for agent in agents
+            if getattr(agent, "mcp_tools", None)
+        ],
+        max_concurrency,
+    )
+
+
+async def cleanup_agents(agents: Iterable[Any], max_concurrency: Optional[int] = None):
+    """Clean up the MCP servers of all agents that have any, concurrently."""
+
+    async def cleanup(agent):
+        try:
+            await agent.cleanup()
+            logger.info(f"{agent.name}: MCP cleanup successful")
+        except Exception as exc:
+            logger.warning(f"{agent.name}: MCP cleanup failed: {exc}")
+
+    await gather_limited(
+        [
+            lambda agent=agent: cleanup(agent)
+            for agent in agents
+            if getattr(agent, "mcp_tools", None)
+        ],
+        max_concurrency,
+    )
@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture
+def isolated_cwd(tmp_path, monkeypatch):
+    """Run each test in an empty directory with an API key configured."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("LLM_API_KEY", "test-key")
+    return tmp_path
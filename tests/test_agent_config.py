@@ -0,0 +1,67 @@
+"""
+Tests for in-memory agent configuration.
+"""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from omnicoreagent.omni_agent.agent import OmniCoreAgent
+from omnicoreagent.mcp_clients_connection.configuration import Configuration
+from omnicoreagent.mcp_clients_connection.sampling import samplingCallback
+
+MODEL_CONFIG = {"provider": "openai", "model": "gpt-4o-mini"}
+
+
+pytestmark = pytest.mark.usefixtures("isolated_cwd")
+
+
+class TestInMemoryConfiguration:
+    """Tests for configuration flowing as in-memory objects."""
+
+    def test_agent_does_not_write_config_by_default(self, isolated_cwd):
+        """Test that creating an agent leaves the filesystem untouched."""
+        agent = OmniCoreAgent(
+            name="memory_agent",
+            system_instruction="You are helpful.",
+            model_config=MODEL_CONFIG,
+        )
+
+        assert not (isolated_cwd / ".omnicoreagent_config").exists()
+        assert agent.llm_connection.llm_config["model"] == "openai/gpt-4o-mini"
+
+    def test_persist_config_writes_and_cleans_up(self, isolated_cwd):
+        """Test that persist_config keeps the previous file-backed behaviour."""
+        agent = OmniCoreAgent(
+            name="persisted agent",
+            system_instruction="You are helpful.",
+            model_config=MODEL_CONFIG,
+            persist_config=True,
+        )
+        config_file = (
+            isolated_cwd
+            / ".omnicoreagent_config"
+            / "servers_config_persisted_agent.json"
+        )
+        assert config_file.exists()
+
+        asyncio.run(agent.cleanup())
+        assert not config_file.exists()
+
+    def test_load_config_accepts_dict(self):
+        """Test that Configuration.load_config returns dicts unchanged."""
+        data = {"LLM": {"provider": "openai", "model": "gpt-4o"}}
+        assert Configuration().load_config(data) is data
+
+    def test_sampling_uses_in_memory_config(self):
+        """Test that sampling model selection does not read servers_config.json."""
+        callback = samplingCallback(
+            config_data={"LLM": {"provider": "OpenAI", "model": "gpt-4o"}}
+        )
+
+        models, provider = asyncio.run(callback.load_model())
+
+        assert models == ["gpt-4o"]
+        assert provider == "openai"
+        assert not Path("servers_config.json").exists()
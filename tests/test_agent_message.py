@@ -0,0 +1,75 @@
+"""
+Tests for the slotted AgentMessage used in agent working memory.
+"""
+
+import pytest
+
+from omnicoreagent.core.llm_client import LLMClient
+from omnicoreagent.core.types import AgentMessage, Message, ToolCallMetadata
+
+
+class TestAgentMessage:
+    """Tests for AgentMessage construction and serialization."""
+
+    def test_matches_message_serialization(self):
+        """Test that to_dict gives the same dict as Message.model_dump(exclude_none=True)."""
+        fields = {
+            "role": "assistant",
+            "content": {"answer": 42},
+            "metadata": {"agent_name": "support", "has_tool_calls": False},
+        }
+
+        message = AgentMessage.from_message(fields)
+
+        assert isinstance(message.metadata, ToolCallMetadata)
+        assert message.content == '{"answer": 42}'
+        assert message.to_dict() == Message.model_validate(fields).model_dump(
+            exclude_none=True
+        )
+
+    def test_dict_is_cached_until_a_field_changes(self):
+        """Test that serialization happens once and is redone after an assignment."""
+        message = AgentMessage(role="user", content="hello")
+
+        first = message.to_dict()
+        first["content"] = "mutated by caller"
+        assert message.to_dict() == {"role": "user", "content": "hello"}
+        assert message._dict is not None
+
+        message.content = "edited"
+        assert message._dict is None
+        assert message.to_dict()["content"] == "edited"
+
+    def test_has_no_instance_dict(self):
+        """Test that instances use slots only."""
+        message = AgentMessage(role="user", content="hello")
+
+        assert not hasattr(message, "__dict__")
+        with pytest.raises(AttributeError):
+            message.extra = "nope"
+
+    def test_round_trips_through_message(self):
+        """Test conversion to and from the validated Pydantic model."""
+        message = AgentMessage(role="tool", content="ok", tool_call_id="call-1")
+
+        validated = message.to_message()
+
+        assert isinstance(validated, Message)
+        assert AgentMessage.from_message(validated) == message
+
+    def test_request_params_mixes_message_types(self):
+        """Test that AgentMessage, Message and raw dicts serialize side by side."""
+        client = LLMClient(provider="openai", model="gpt-4o-mini", api_key="key")
+        messages = [
+            AgentMessage(role="system", content="be brief"),
+            Message(role="user", content="hi"),
+            {"role": "assistant", "content": "hello", "tool_calls": []},
+        ]
+
+        params = client.request_params(messages)
+
+        assert params["messages"] == [
+            {"role": "system", "content": "be brief"},
+            {"role": "user", "content": "hi"},
+            {"role": "assistant", "content": "hello", "tool_calls": []},
+        ]
@@ -0,0 +1,112 @@
+"""
+Tests for agent cloning and the AgentPool.
+"""
+
+import asyncio
+
+import pytest
+
+from omnicoreagent.omni_agent.agent import OmniCoreAgent
+from omnicoreagent.omni_agent.agent_pool import AgentPool
+from omnicoreagent.core.memory_store.memory_router import MemoryRouter
+
+MODEL_CONFIG = {"provider": "openai", "model": "gpt-4o-mini"}
+
+
+pytestmark = pytest.mark.usefixtures("isolated_cwd")
+
+
+@pytest.fixture
+def template():
+    return OmniCoreAgent(
+        name="template",
+        system_instruction="You are helpful.",
+        model_config=MODEL_CONFIG,
+    )
+
+
+class TestClone:
+    """Tests for OmniCoreAgent.clone."""
+
+    def test_clone_shares_expensive_parts(self, template):
+        """Test that a clone reuses the LLM connection and config."""
+        clone = template.clone(name="tenant")
+
+        assert clone.llm_connection is template.llm_connection
+        assert clone.guardrail is template.guardrail
+        assert clone._get_system_prompt() == template._get_system_prompt()
+
+    def test_clone_isolates_session_state(self, template):
+        """Test that a clone gets its own ReAct agent and metrics."""
+        clone = template.clone(name="tenant")
+
+        assert clone.agent is not template.agent
+        assert clone.agent._session_states is not template.agent._session_states
+        assert clone._cumulative_usage is not template._cumulative_usage
+        assert clone.agent.agent_name == "tenant"
+        assert clone.internal_config["AgentConfig"]["agent_name"] == "tenant"
+        assert template.internal_config["AgentConfig"]["agent_name"] == "template"
+
+    def test_clone_reuses_skill_manager(self, tmp_path):
+        """Test that cloning does not rescan the skills directory."""
+        agent = OmniCoreAgent(
+            name="skills",
+            system_instruction="You are helpful.",
+            model_config=MODEL_CONFIG,
+            agent_config={
+                "max_steps": 10,
+                "tool_call_timeout": 30,
+                "enable_agent_skills": True,
+            },
+        )
+        clone = agent.clone(name="skills_clone")
+
+        assert clone.agent.skill_manager is agent.agent.skill_manager
+
+    def test_clone_cleanup_leaves_template_untouched(self, template):
+        """Test that cleaning up a clone does not release shared resources."""
+        template.mcp_client = object()
+        clone = template.clone()
+
+        asyncio.run(clone.cleanup())
+
+
+class TestAgentPool:
+    """Tests for AgentPool."""
+
+    def test_get_returns_same_agent_per_key(self, template):
+        """Test that repeated lookups reuse the pooled clone."""
+        pool = AgentPool(template)
+
+        assert pool.get("a") is pool.get("a")
+        assert pool.get("a") is not pool.get("b")
+        assert pool.get("a").name == "template_a"
+
+    def test_pool_is_bounded_lru(self, template):
+        """Test that the least recently used clone is evicted."""
+        pool = AgentPool(template, max_size=2)
+        pool.get("a")
+        pool.get("b")
+        pool.get("a")
+        pool.get("c")
+
+        assert len(pool) == 2
+        assert "a" in pool
+        assert "b" not in pool
+
+    def test_memory_router_factory(self, template):
+        """Test that per-key memory routers can be supplied."""
+        routers = {}
+
+        def factory(key):
+            routers[key] = MemoryRouter(memory_store_type="in_memory")
+            return routers[key]
+
+        pool = AgentPool(template, memory_router_factory=factory)
+
+        assert pool.get("a").memory_router is routers["a"]
+
+    def test_invalid_max_size(self, template):
+        """Test that max_size must be positive."""
+        with pytest.raises(ValueError):
+            AgentPool(template, max_size=0)
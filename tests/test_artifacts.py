@@ -0,0 +1,214 @@
+"""
+Tests for spilling large tool outputs to an artifact store.
+"""
+
+import json
+import threading
+
+import pytest
+
+from omnicoreagent.core.tools import artifacts as artifacts_module
+from omnicoreagent.core.tools.artifacts import (
+    MAX_GREP_PATTERN_CHARS,
+    InMemoryArtifactStore,
+    LocalArtifactStore,
+    ToolOutputSpiller,
+    build_tool_registry_artifact_tools,
+)
+from omnicoreagent.core.tools.local_tools_registry import ToolRegistry
+from omnicoreagent.core.tools.tools_handler import LocalToolHandler, ToolExecutor
+from omnicoreagent.core.utils import fingerprint
+
+
+@pytest.fixture(params=["in_memory", "local"])
+def store(request, tmp_path):
+    if request.param == "local":
+        return LocalArtifactStore(tmp_path / "artifacts")
+    return InMemoryArtifactStore()
+
+
+LOG = "".join(
+    f"line {i}: {'ok' if i % 100 else 'ERROR disk full'}\n" for i in range(1000)
+)
+
+
+class TestArtifactStores:
+    """Tests for storing, paging and searching artifacts."""
+
+    @pytest.mark.asyncio
+    async def test_put_is_content_addressed(self, store):
+        """Test that the same content gets the same id and is stored once."""
+        first = await store.put(LOG.encode())
+        second = await store.put(LOG.encode())
+
+        assert first == second
+        assert await store.size(first) == len(LOG)
+
+    @pytest.mark.asyncio
+    async def test_read_pages(self, store):
+        """Test reading byte ranges, past the end and of missing artifacts."""
+        artifact_id = await store.put(LOG.encode())
+
+        assert await store.read(artifact_id, 0, 14) == "line 0: ERROR "
+        assert await store.read(artifact_id, len(LOG) - 8, 100) == "999: ok\n"
+        assert await store.read("art_" + "0" * 32) is None
+
+    @pytest.mark.asyncio
+    async def test_grep_returns_lines_and_offsets(self, store):
+        """Test that grep returns each matching line once with its offset."""
+        artifact_id = await store.put(LOG.encode())
+
+        matches = await store.grep(artifact_id, r"ERROR \w+", max_matches=3)
+
+        assert [line for _, line in matches] == [
+            "line 0: ERROR disk full",
+            "line 100: ERROR disk full",
+            "line 200: ERROR disk full",
+        ]
+        offset = matches[1][0]
+        assert await store.read(artifact_id, offset, 8) == "line 100"
+        assert await store.grep(artifact_id, "error", ignore_case=True)
+
+    @pytest.mark.asyncio
+    async def test_grep_runs_off_the_event_loop(self, store, monkeypatch):
+        """Test that the pattern is matched in a worker thread."""
+        artifact_id = await store.put(LOG.encode())
+        threads = []
+        grep_bytes = artifacts_module.grep_bytes
+
+        def recording_grep(*args):
+            threads.append(threading.get_ident())
+            return grep_bytes(*args)
+
+        monkeypatch.setattr(artifacts_module, "grep_bytes", recording_grep)
+
+        assert await store.grep(artifact_id, "ERROR")
+        assert threads and threads[0] != threading.get_ident()
+
+    @pytest.mark.asyncio
+    async def test_in_memory_store_is_bounded(self):
+        """Test that the least recently used artifacts are dropped past max_bytes."""
+        store = InMemoryArtifactStore(max_bytes=25)
+        a = await store.put(b"a" * 10)
+        b = await store.put(b"b" * 10)
+        await store.read(a)
+        await store.put(b"c" * 10)
+
+        assert await store.size(a) == 10
+        assert await store.size(b) is None
+
+
+class TestToolOutputSpiller:
+    """Tests for replacing large outputs with a preview and handle."""
+
+    @pytest.mark.asyncio
+    async def test_small_outputs_are_unchanged(self):
+        """Test that outputs under the threshold are returned as they are."""
+        spiller = ToolOutputSpiller(InMemoryArtifactStore(), threshold_chars=100)
+        data = {"rows": [1, 2, 3]}
+
+        assert await spiller.spill("query", data) is data
+
+    @pytest.mark.asyncio
+    async def test_large_outputs_are_stored(self):
+        """Test that a large dict is stored as JSON and replaced by a preview."""
+        store = InMemoryArtifactStore()
+        spiller = ToolOutputSpiller(store, threshold_chars=100, preview_chars=20)
+        data = {"rows": list(range(100))}
+
+        result = await spiller.spill("query", data)
+
+        text = json.dumps(data)
+        assert result.startswith(text[:20] + "\n[Output truncated")
+        artifact_id = result.split("artifact ")[1].split(".")[0]
+        assert await store.read(artifact_id, 0, len(text)) == text
+
+    @pytest.mark.asyncio
+    async def test_artifact_tool_outputs_are_not_stored(self):
+        """Test that pages read from an artifact are never spilled again."""
+        spiller = ToolOutputSpiller(InMemoryArtifactStore(), threshold_chars=10)
+
+        assert await spiller.spill("read_artifact", "x" * 50) == "x" * 50
+
+
+class TestGrepTool:
+    """Tests for the grep_artifact tool."""
+
+    async def grep(self, **arguments):
+        store = InMemoryArtifactStore()
+        registry = ToolRegistry()
+        build_tool_registry_artifact_tools(store, registry)
+
+        artifact_id = await store.put(LOG.encode())
+        return await registry.execute_tool(
+            "grep_artifact", {"artifact_id": artifact_id, **arguments}
+        )
+
+    @pytest.mark.asyncio
+    async def test_pattern_is_literal_unless_regex(self):
+        """Test that patterns are escaped unless regex is requested."""
+        assert (await self.grep(pattern=r"ERROR \w+")).startswith("No matches")
+        assert (await self.grep(pattern="line 100: ERROR (disk")).startswith(
+            "No matches"
+        )
+        assert (await self.grep(pattern=r"100: ERROR \w+", regex=True)).endswith(
+            "line 100: ERROR disk full"
+        )
+
+    @pytest.mark.asyncio
+    async def test_long_and_invalid_patterns_are_rejected(self):
+        """Test that oversized and malformed patterns return an error."""
+        long_pattern = "x" * (MAX_GREP_PATTERN_CHARS + 1)
+
+        assert (await self.grep(pattern=long_pattern)).startswith("Invalid pattern")
+        assert (await self.grep(pattern="(", regex=True)).startswith("Invalid pattern")
+
+
+class TestToolExecutorSpilling:
+    """Tests for spilling in the tool executor and the artifact tools."""
+
+    @pytest.mark.asyncio
+    async def test_history_and_results_carry_the_preview(self):
+        """Test that history and the observation get the preview, and the tools reach the rest."""
+        store = InMemoryArtifactStore()
+        registry = ToolRegistry()
+        build_tool_registry_artifact_tools(store, registry)
+
+        @registry.register_tool(name="fetch_logs", description="Fetch logs")
+        def fetch_logs() -> str:
+            return LOG
+
+        history = []
+
+        async def add_message_to_history(role, content, metadata, session_id=None):
+            history.append(content)
+
+        executor = ToolExecutor(LocalToolHandler(registry))
+        output = await executor.execute(
+            agent_name="agent",
+            tool_name="fetch_logs",
+            tool_args=[{}],
+            tool_call_id="call-1",
+            add_message_to_history=add_message_to_history,
+            artifact_spiller=ToolOutputSpiller(
+                store, threshold_chars=1000, preview_chars=100
+            ),
+        )
+        result = json.loads(output)["tools_results"][0]
+        data = result["data"]
+        artifact_id = data.split("artifact ")[1].split(".")[0]
+        page = await registry.execute_tool(
+            "read_artifact", {"artifact_id": artifact_id, "offset": 100}
+        )
+        found = await registry.execute_tool(
+            "grep_artifact", {"artifact_id": artifact_id, "pattern": "line 900:"}
+        )
+
+        assert history == [data]
+        assert len(data) < 400
+        assert result["output_digest"] == fingerprint(data)
+        assert page.startswith(
+            f"[{data.split('artifact ')[1].split('.')[0]} bytes 100-"
+        )
+        assert LOG[100:200] in page
+        assert found.endswith("line 900: ERROR disk full")
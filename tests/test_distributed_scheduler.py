@@ -0,0 +1,321 @@
+"""
+Tests for the distributed scheduler backend and its SQL job store.
+"""
+
+import asyncio
+
+import pytest
+
+from omnicoreagent.core.events.event_router import EventRouter
+from omnicoreagent.core.memory_store.memory_router import MemoryRouter
+from omnicoreagent.omni_agent.background_agent import BackgroundAgentManager
+from omnicoreagent.omni_agent.background_agent.distributed_scheduler import (
+    DistributedSchedulerBackend,
+    SQLJobStore,
+    next_fire_time,
+    trigger_spec,
+)
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'jobs.db'}"
+
+
+def make_replica(db_url: str, **kwargs) -> DistributedSchedulerBackend:
+    return DistributedSchedulerBackend(SQLJobStore(db_url), **kwargs)
+
+
+def schedule(replica, calls, agent_id="agent", interval=60, delay=0.0):
+    async def task(**kwargs):
+        calls.append((replica.owner_id, kwargs))
+        await asyncio.sleep(delay)
+
+    replica.schedule_task(agent_id, interval, task, query="report")
+
+
+def due_at(replica, agent_id="agent") -> float:
+    return replica.job_store.get(agent_id)["next_run_at"]
+
+
+class TestTriggers:
+    """Tests for trigger serialization."""
+
+    def test_interval_and_cron(self):
+        """Test that intervals add seconds and cron finds the next match."""
+        assert next_fire_time(trigger_spec(60), 1000.0) == 1060.0
+        # 2024-01-01 00:00:00 UTC, next */5 minute after it is 00:05.
+        assert next_fire_time(trigger_spec("*/5 * * * *"), 1704067200.0) == (
+            1704067200.0 + 300
+        )
+
+    @pytest.mark.parametrize("interval", [0, True, None, "not a cron"])
+    def test_invalid_interval(self, interval):
+        """Test that invalid intervals are rejected."""
+        with pytest.raises(ValueError):
+            trigger_spec(interval)
+
+
+class TestExactlyOnce:
+    """Tests for claiming firings across replicas."""
+
+    def test_each_firing_runs_on_one_replica(self, db_url):
+        """Test that replicas sharing a store run each firing once."""
+        calls = []
+        replicas = [make_replica(db_url, owner_id=f"r{i}") for i in range(3)]
+        for replica in replicas:
+            schedule(replica, calls)
+
+        async def main():
+            now = due_at(replicas[0])
+            for firing in range(4):
+                await asyncio.gather(
+                    *(replica.run_pending(now + 60 * firing) for replica in replicas)
+                )
+                for replica in replicas:
+                    await replica.wait_idle()
+
+        asyncio.run(main())
+
+        assert len(calls) == 4
+        assert calls[0][1] == {"query": "report"}
+
+    def test_running_job_is_not_claimed_again(self, db_url):
+        """Test that a job still running holds its lease past its next firing."""
+        calls = []
+        first, second = make_replica(db_url), make_replica(db_url)
+        schedule(first, calls, interval=1, delay=0.05)
+        schedule(second, calls, interval=1)
+
+        async def main():
+            now = due_at(first)
+            assert await first.run_pending(now) == ["agent"]
+            assert await second.run_pending(now + 5) == []
+            await first.wait_idle()
+            assert await second.run_pending(now + 5) == ["agent"]
+            await second.wait_idle()
+
+        asyncio.run(main())
+
+        assert [owner for owner, _ in calls] == [first.owner_id, second.owner_id]
+
+    def test_expired_lease_can_be_taken_over(self, db_url):
+        """Test that a job leased by a dead replica runs again after the lease."""
+        store = SQLJobStore(db_url)
+        store.add("agent", trigger_spec(60), {}, 100.0)
+        job = store.get("agent")
+        assert store.claim("agent", job["version"], 160.0, 100.0, "dead", 200.0)
+
+        calls = []
+        survivor = make_replica(db_url, misfire_grace_time=None)
+        schedule(survivor, calls)
+
+        async def main():
+            assert await survivor.run_pending(165.0) == []
+            assert await survivor.run_pending(205.0) == ["agent"]
+            await survivor.wait_idle()
+
+        asyncio.run(main())
+
+        assert len(calls) == 1
+
+    def test_concurrency_limit(self, db_url):
+        """Test that a replica claims no more jobs than it can run."""
+        calls = []
+        busy = make_replica(db_url, max_concurrency=2)
+        idle = make_replica(db_url, max_concurrency=2)
+        for replica in (busy, idle):
+            for i in range(3):
+                schedule(replica, calls, agent_id=f"agent{i}", delay=0.01)
+
+        async def main():
+            now = max(due_at(busy, f"agent{i}") for i in range(3))
+            assert len(await busy.run_pending(now)) == 2
+            assert len(await idle.run_pending(now)) == 1
+            await busy.wait_idle()
+            await idle.wait_idle()
+
+        asyncio.run(main())
+
+        assert len(calls) == 3
+
+
+class TestPersistence:
+    """Tests for schedules surviving restarts."""
+
+    def test_reregistering_keeps_schedule(self, db_url):
+        """Test that a restarted replica keeps the stored next run time."""
+        calls = []
+        before = make_replica(db_url)
+        schedule(before, calls)
+        stored = due_at(before)
+
+        after = make_replica(db_url)
+        schedule(after, calls)
+
+        assert due_at(after) == stored
+        assert after.is_task_scheduled("agent")
+
+    def test_changed_interval_reschedules(self, db_url):
+        """Test that registering a new interval replaces the schedule."""
+        calls = []
+        replica = make_replica(db_url)
+        schedule(replica, calls, interval=3600)
+        schedule(replica, calls, interval=60)
+
+        assert replica.get_job_status("agent")["trigger"] == "interval:60"
+
+    def test_pause_and_remove(self, db_url):
+        """Test that paused jobs are not run and removed jobs are gone."""
+        calls = []
+        replica = make_replica(db_url)
+        schedule(replica, calls)
+        replica.pause_job("agent")
+
+        assert asyncio.run(replica.run_pending(due_at(replica))) == []
+        assert replica.get_next_run_time("agent") is None
+
+        replica.remove_task("agent")
+        assert not replica.is_task_scheduled("agent")
+
+
+class TestMisfires:
+    """Tests for late firings."""
+
+    def test_coalesce_runs_once(self, db_url):
+        """Test that a late job runs once and resumes in the future."""
+        calls = []
+        replica = make_replica(db_url, misfire_grace_time=None)
+        schedule(replica, calls)
+        now = due_at(replica) + 600
+
+        async def main():
+            await replica.run_pending(now)
+            await replica.wait_idle()
+            assert await replica.run_pending(now) == []
+
+        asyncio.run(main())
+
+        assert len(calls) == 1
+        assert due_at(replica) == now + 60
+
+    def test_without_coalesce_runs_each_firing(self, db_url):
+        """Test that coalesce=False runs every missed firing."""
+        calls = []
+        replica = make_replica(db_url, misfire_grace_time=None, coalesce=False)
+        schedule(replica, calls)
+        now = due_at(replica) + 150
+
+        async def main():
+            while await replica.run_pending(now):
+                await replica.wait_idle()
+
+        asyncio.run(main())
+
+        assert len(calls) == 3
+
+    def test_firing_past_grace_time_is_skipped(self, db_url):
+        """Test that firings later than misfire_grace_time are skipped."""
+        calls = []
+        replica = make_replica(db_url, misfire_grace_time=30)
+        schedule(replica, calls)
+        now = due_at(replica) + 600
+
+        assert asyncio.run(replica.run_pending(now)) == []
+        assert calls == []
+        assert replica.stats["skipped"] == 1
+        assert due_at(replica) == now + 60
+
+
+class TestPollLoop:
+    """Tests for the background poll loop."""
+
+    def test_started_scheduler_runs_jobs(self, db_url):
+        """Test that a started scheduler fires jobs on its own."""
+        calls = []
+        replica = make_replica(db_url, poll_interval=0.01)
+        schedule(replica, calls, interval=0.05)
+
+        async def main():
+            replica.start()
+            await asyncio.sleep(0.2)
+            replica.shutdown()
+            await replica.wait_idle()
+
+        asyncio.run(main())
+
+        assert calls
+        assert not replica.is_running()
+
+    def test_manager_accepts_scheduler(self, db_url):
+        """Test that BackgroundAgentManager uses an injected scheduler."""
+        replica = make_replica(db_url)
+        manager = BackgroundAgentManager(
+            MemoryRouter("in_memory"), EventRouter("in_memory"), scheduler=replica
+        )
+
+        assert manager.scheduler is replica
+
+
+class TestManagerWithSharedSchedule:
+    """Tests for manager operations against a schedule shared by replicas."""
+
+    def run_manager(self, db_url, monkeypatch, tmp_path, operations):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("LLM_API_KEY", "test-key")
+        replica = make_replica(db_url)
+        manager = BackgroundAgentManager(
+            MemoryRouter("in_memory"), EventRouter("in_memory"), scheduler=replica
+        )
+
+        async def main():
+            await manager.create_agent(
+                {
+                    "agent_id": "agent",
+                    "model_config": {"provider": "openai", "model": "gpt-4o-mini"},
+                    "interval": 60,
+                    "task_config": {"query": "report"},
+                }
+            )
+            await operations(manager)
+            await manager.shutdown()
+
+        asyncio.run(main())
+        return replica
+
+    def test_scheduler_options_are_not_stored(self, db_url, monkeypatch, tmp_path):
+        """Test that only task kwargs are persisted with the job."""
+
+        async def noop(manager):
+            pass
+
+        replica = self.run_manager(db_url, monkeypatch, tmp_path, noop)
+
+        assert replica.job_store.get("agent")["kwargs"] == {}
+
+    def test_pause_keeps_shared_job(self, db_url, monkeypatch, tmp_path):
+        """Test that pausing pauses the shared job instead of deleting it."""
+
+        async def pause(manager):
+            await manager.pause_agent("agent")
+
+        replica = self.run_manager(db_url, monkeypatch, tmp_path, pause)
+
+        job = replica.job_store.get("agent")
+        assert job is not None and job["paused"]
+
+    def test_stop_and_delete_detach_locally(self, db_url, monkeypatch, tmp_path):
+        """Test that stopping and deleting leave the schedule for other replicas."""
+
+        async def stop_then_delete(manager):
+            stored = manager.scheduler.job_store.get("agent")["next_run_at"]
+            await manager.stop_agent("agent")
+            assert "agent" not in manager.scheduler._handlers
+            await manager.start_agent("agent")
+            assert manager.scheduler.job_store.get("agent")["next_run_at"] == stored
+            await manager.delete_agent("agent")
+
+        replica = self.run_manager(db_url, monkeypatch, tmp_path, stop_then_delete)
+
+        assert replica.is_task_scheduled("agent")
+        assert "agent" not in replica._handlers
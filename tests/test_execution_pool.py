@@ -0,0 +1,248 @@
+"""
+Tests for the background agent execution pool.
+"""
+
+import asyncio
+
+import pytest
+
+from omnicoreagent.core.events.event_router import EventRouter
+from omnicoreagent.core.memory_store.memory_router import MemoryRouter
+from omnicoreagent.omni_agent.background_agent import (
+    AgentExecutionPool,
+    BackgroundAgentManager,
+    BackgroundOmniCoreAgent,
+    TaskRegistry,
+)
+from omnicoreagent.omni_agent.workflow import utils as workflow_utils
+
+
+pytestmark = pytest.mark.usefixtures("isolated_cwd")
+
+
+def recorder(log, name, delay=0.01):
+    async def work():
+        log.append(name)
+        await asyncio.sleep(delay)
+        return name
+
+    return work
+
+
+def make_agent(agent_id, **config) -> BackgroundOmniCoreAgent:
+    registry = TaskRegistry()
+    registry.register(agent_id, {"query": "check status"})
+    return BackgroundOmniCoreAgent(
+        config={
+            "agent_id": agent_id,
+            "model_config": {"provider": "openai", "model": "gpt-4o-mini"},
+            **config,
+        },
+        task_registry=registry,
+        memory_router=MemoryRouter("in_memory"),
+        event_router=EventRouter("in_memory"),
+    )
+
+
+class TestLimits:
+    """Tests for the global and per-agent caps."""
+
+    def test_global_cap(self):
+        """Test that no more than max_concurrency runs are in flight."""
+        pool = AgentExecutionPool(max_concurrency=2, per_agent_concurrency=5)
+        active = {"now": 0, "peak": 0}
+
+        async def work():
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+            await asyncio.sleep(0.01)
+            active["now"] -= 1
+
+        async def main():
+            await asyncio.gather(*(pool.run(f"a{i}", work) for i in range(6)))
+
+        asyncio.run(main())
+
+        assert active["peak"] == 2
+        assert pool.stats()["completed"] == 6
+
+    def test_per_agent_cap(self):
+        """Test that one agent's backlog does not take every slot."""
+        pool = AgentExecutionPool(max_concurrency=4, per_agent_concurrency=1)
+        log = []
+
+        async def main():
+            noisy = [pool.run("noisy", recorder(log, "noisy")) for _ in range(3)]
+            quiet = pool.run("quiet", recorder(log, "quiet"))
+            await asyncio.gather(*noisy, quiet)
+
+        asyncio.run(main())
+
+        assert log[:2] == ["noisy", "quiet"]
+
+    def test_exception_propagates_and_frees_slot(self):
+        """Test that a failing run raises to its caller and frees its slot."""
+        pool = AgentExecutionPool(max_concurrency=1)
+
+        async def boom():
+            raise RuntimeError("boom")
+
+        async def main():
+            with pytest.raises(RuntimeError):
+                await pool.run("a", boom)
+            return await pool.run("a", recorder([], "ok"))
+
+        assert asyncio.run(main()) == "ok"
+        assert pool.stats()["failed"] == 1
+        assert pool.stats()["running"] == 0
+
+
+class TestQueueOrder:
+    """Tests for priority and fairness."""
+
+    def test_round_robin_across_agents(self):
+        """Test that queued agents take turns."""
+        pool = AgentExecutionPool(max_concurrency=1, per_agent_concurrency=1)
+        log = []
+
+        async def main():
+            blocker = asyncio.create_task(pool.run("blocker", recorder(log, "x")))
+            await asyncio.sleep(0)
+            runs = [pool.run("a", recorder(log, "a")) for _ in range(3)]
+            runs += [pool.run("b", recorder(log, "b")) for _ in range(3)]
+            await asyncio.gather(blocker, *runs)
+
+        asyncio.run(main())
+
+        assert log == ["x", "a", "b", "a", "b", "a", "b"]
+
+    def test_priority(self):
+        """Test that lower priority values run first."""
+        pool = AgentExecutionPool(max_concurrency=1)
+        log = []
+
+        async def main():
+            blocker = asyncio.create_task(pool.run("blocker", recorder(log, "x")))
+            await asyncio.sleep(0)
+            low = asyncio.create_task(pool.run("low", recorder(log, "low"), priority=5))
+            high = asyncio.create_task(pool.run("high", recorder(log, "high")))
+            await asyncio.sleep(0)
+            queued = pool.stats()
+            await asyncio.gather(blocker, low, high)
+            return queued
+
+        stats = asyncio.run(main())
+
+        assert log == ["x", "high", "low"]
+        assert stats["queue_depth_by_priority"] == {0: 1, 5: 1}
+
+
+class TestProcessPool:
+    """Tests for running work in worker processes."""
+
+    def test_run_in_process(self):
+        """Test that picklable functions run in the worker pool."""
+        pool = AgentExecutionPool(process_workers=1)
+        try:
+            assert asyncio.run(pool.run_in_process(pow, 2, 10)) == 1024
+        finally:
+            pool.close()
+
+
+class TestBackgroundAgent:
+    """Tests for background agents running through the pool."""
+
+    def test_retry_delay_releases_slot(self, monkeypatch):
+        """Test that another agent runs while a failed agent waits to retry."""
+        monkeypatch.setattr(workflow_utils.random, "uniform", lambda low, high: high)
+        pool = AgentExecutionPool(max_concurrency=1)
+        flaky = make_agent("flaky", max_retries=1, retry_delay=0.05)
+        steady = make_agent("steady")
+        log = []
+
+        async def flaky_run(query, session_id=None):
+            log.append("flaky")
+            if log.count("flaky") == 1:
+                raise ConnectionError("try again")
+            return {"response": "ok"}
+
+        async def steady_run(query, session_id=None):
+            log.append("steady")
+            return {"response": "ok"}
+
+        monkeypatch.setattr(flaky, "run", flaky_run)
+        monkeypatch.setattr(steady, "run", steady_run)
+        for agent in (flaky, steady):
+            agent.execution_pool = pool
+
+        async def main():
+            first = asyncio.create_task(flaky.run_task())
+            await asyncio.sleep(0.01)
+            await steady.run_task()
+            await first
+
+        asyncio.run(main())
+
+        assert log == ["flaky", "steady", "flaky"]
+
+    def test_retry_backs_off_exponentially(self, monkeypatch):
+        """Test that retry waits double from retry_delay up to max_retry_delay."""
+        monkeypatch.setattr(workflow_utils.random, "uniform", lambda low, high: high)
+        agent = make_agent("flaky", max_retries=3, retry_delay=1, max_retry_delay=3)
+        waits = []
+
+        async def failing_run(query, session_id=None):
+            raise ConnectionError("down")
+
+        async def record_wait(delay):
+            waits.append(delay)
+
+        monkeypatch.setattr(agent, "run", failing_run)
+        monkeypatch.setattr(agent, "_wait_to_retry", record_wait)
+
+        with pytest.raises(ConnectionError):
+            asyncio.run(agent.run_task())
+
+        assert waits == [1, 2, 3]
+
+    def test_firing_during_backoff_retries_now(self, monkeypatch):
+        """Test that a firing during the retry wait starts the retry at once."""
+        agent = make_agent("flaky", max_retries=1, retry_delay=60)
+        calls = []
+
+        async def flaky_run(query, session_id=None):
+            calls.append(query)
+            if len(calls) == 1:
+                raise ConnectionError("try again")
+            return {"response": "ok"}
+
+        monkeypatch.setattr(agent, "run", flaky_run)
+
+        async def main():
+            first = asyncio.create_task(agent.run_task())
+            while not agent.retry_pending:
+                await asyncio.sleep(0)
+            assert not agent.is_running
+            assert agent.get_status()["retry_pending"]
+            await agent.run_task()
+            return await asyncio.wait_for(first, 1)
+
+        assert asyncio.run(main()) == {"response": "ok"}
+        assert len(calls) == 2
+        assert not agent.is_running and not agent.retry_pending
+
+    def test_process_isolation_needs_shared_memory(self):
+        """Test that process isolation on an in-memory store is rejected."""
+        with pytest.raises(ValueError, match="shared memory store"):
+            make_agent("isolated", process_isolation=True)
+
+    def test_manager_status_reports_execution(self):
+        """Test that get_manager_status includes the pool metrics."""
+        manager = BackgroundAgentManager(
+            MemoryRouter("in_memory"), EventRouter("in_memory"), max_concurrency=3
+        )
+
+        status = asyncio.run(manager.get_manager_status())
+
+        assert status["execution"]["max_concurrency"] == 3
+        assert status["execution"]["queue_depth"] == 0
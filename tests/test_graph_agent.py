@@ -0,0 +1,237 @@
+"""
+Tests for the GraphAgent DAG workflow.
+"""
+
+import asyncio
+
+import pytest
+
+from omnicoreagent.omni_agent.agent import OmniCoreAgent
+from omnicoreagent.omni_agent.workflow.graph_agent import (
+    FileCheckpointStore,
+    GraphAgent,
+    InMemoryCheckpointStore,
+)
+
+
+pytestmark = pytest.mark.usefixtures("isolated_cwd")
+
+
+def run_graph(graph: GraphAgent, task: str = "task", **kwargs) -> dict:
+    return asyncio.run(graph(task, **kwargs))
+
+
+class TestGraphExecution:
+    """Tests for data flow and scheduling."""
+
+    def test_fan_out_fan_in(self):
+        """Test that a join node receives every upstream output."""
+        graph = GraphAgent()
+        graph.add_node("a", lambda inputs: 1)
+        graph.add_node("b", lambda inputs: 2)
+        graph.add_node("c", lambda inputs: inputs["a"] + inputs["b"])
+        graph.add_edge("a", "c").add_edge("b", "c")
+
+        result = run_graph(graph)
+
+        assert result["response"] == 3
+        assert result["outputs"] == {"a": 1, "b": 2, "c": 3}
+
+    def test_independent_branches_overlap(self):
+        """Test that independent nodes run concurrently."""
+
+        async def slow(inputs):
+            await asyncio.sleep(0.05)
+            return "done"
+
+        graph = GraphAgent()
+        for name in ("a", "b", "c", "d"):
+            graph.add_node(name, slow)
+
+        async def main():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            await graph()
+            return loop.time() - start
+
+        assert asyncio.run(main()) < 0.15
+
+    def test_max_concurrency(self):
+        """Test that no more than max_concurrency nodes run at once."""
+        active = {"now": 0, "peak": 0}
+
+        async def tracked(inputs):
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+            await asyncio.sleep(0.01)
+            active["now"] -= 1
+
+        graph = GraphAgent(max_concurrency=2)
+        for i in range(6):
+            graph.add_node(f"n{i}", tracked)
+
+        run_graph(graph)
+
+        assert active["peak"] == 2
+
+    def test_conditional_edges_skip_branch(self):
+        """Test that a node whose incoming edges are all inactive is skipped."""
+        graph = GraphAgent()
+        graph.add_node("classify", lambda inputs: "billing")
+        graph.add_node("billing", lambda inputs: "refund issued")
+        graph.add_node("tech", lambda inputs: "rebooted")
+        graph.add_node("tech_followup", lambda inputs: "survey sent")
+        graph.add_edge("classify", "billing", condition=lambda out: out == "billing")
+        graph.add_edge("classify", "tech", condition=lambda out: out == "tech")
+        graph.add_edge("tech", "tech_followup")
+
+        result = run_graph(graph)
+
+        assert result["skipped"] == ["tech", "tech_followup"]
+        assert result["response"] == "refund issued"
+
+    def test_edge_key(self):
+        """Test that an edge key renames the output in the target's inputs."""
+        graph = GraphAgent()
+        graph.add_node("a", lambda inputs: "x")
+        graph.add_node("b", lambda inputs: sorted(inputs))
+        graph.add_edge("a", "b", key="source_text")
+
+        assert run_graph(graph)["response"] == ["source_text", "task"]
+
+    def test_cycle_rejected(self):
+        """Test that an edge closing a cycle is rejected and not kept."""
+        graph = GraphAgent()
+        graph.add_node("a", lambda inputs: 1)
+        graph.add_node("b", lambda inputs: 2)
+        graph.add_edge("a", "b")
+
+        with pytest.raises(ValueError):
+            graph.add_edge("b", "a")
+        assert len(graph.edges) == 1
+
+    def test_agent_node_gets_upstream_outputs(self, monkeypatch):
+        """Test that agent nodes get upstream outputs in their query."""
+        agent = OmniCoreAgent(
+            name="writer",
+            system_instruction="You write.",
+            model_config={"provider": "openai", "model": "gpt-4o-mini"},
+        )
+        queries = []
+
+        async def fake_run(query, session_id=None, tenant_id=None):
+            queries.append(query)
+            return {"response": "report", "session_id": session_id}
+
+        monkeypatch.setattr(agent, "run", fake_run)
+        graph = GraphAgent()
+        graph.add_node("facts", lambda inputs: {"revenue": 10})
+        graph.add_node("writer", agent)
+        graph.add_edge("facts", "writer")
+
+        result = run_graph(graph, "Write it")
+
+        assert result["response"] == "report"
+        assert queries == ['Write it\n\n<facts>\n{"revenue": 10}\n</facts>']
+
+
+class TestGraphFailures:
+    """Tests for retries, timeouts and resuming."""
+
+    def test_retry_then_succeed(self):
+        """Test that a node is retried up to max_retries attempts."""
+        attempts = []
+
+        def flaky(inputs):
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise ConnectionError("try again")
+            return "ok"
+
+        graph = GraphAgent(retry_backoff=0)
+        graph.add_node("flaky", flaky, max_retries=3)
+
+        assert run_graph(graph)["response"] == "ok"
+        assert len(attempts) == 3
+
+    def test_max_retries_must_be_positive(self):
+        """Test that zero retries is rejected instead of silently skipping the node."""
+        with pytest.raises(ValueError):
+            GraphAgent(max_retries=0)
+        with pytest.raises(ValueError):
+            GraphAgent().add_node("n", lambda inputs: "ok", max_retries=0)
+
+    def test_backoff_releases_concurrency_slot(self):
+        """Test that a node waiting to retry does not hold a concurrency slot."""
+        order = []
+
+        def flaky(inputs):
+            order.append("flaky")
+            if order.count("flaky") < 2:
+                raise ConnectionError("try again")
+            return "ok"
+
+        def steady(inputs):
+            order.append("steady")
+            return "ok"
+
+        graph = GraphAgent(max_concurrency=1, retry_backoff=0.2)
+        graph.add_node("flaky", flaky, max_retries=2)
+        graph.add_node("steady", steady)
+
+        run_graph(graph)
+
+        assert order == ["flaky", "steady", "flaky"]
+
+    def test_timeout_fails_node(self):
+        """Test that an attempt exceeding its timeout fails the node."""
+
+        async def hang(inputs):
+            await asyncio.sleep(1)
+
+        graph = GraphAgent()
+        graph.add_node("hang", hang, max_retries=1, timeout=0.01)
+
+        result = run_graph(graph)
+
+        assert result["failed_node"] == "hang"
+
+    def test_output_type_checked(self):
+        """Test that outputs of the wrong type fail the node."""
+        graph = GraphAgent()
+        graph.add_node("count", lambda inputs: "three", max_retries=1, output_type=int)
+
+        assert "expected int" in run_graph(graph)["error"]
+
+    @pytest.mark.parametrize(
+        "store_cls", [InMemoryCheckpointStore, FileCheckpointStore]
+    )
+    def test_resume_skips_finished_nodes(self, store_cls):
+        """Test that resuming a failed run does not redo finished nodes."""
+        calls = []
+        broken = {"value": True}
+
+        def expensive(inputs):
+            calls.append("expensive")
+            return "data"
+
+        def fragile(inputs):
+            if broken["value"]:
+                raise RuntimeError("downstream outage")
+            return inputs["expensive"].upper()
+
+        store = store_cls()
+        graph = GraphAgent(max_retries=1, checkpoint_store=store)
+        graph.add_node("expensive", expensive)
+        graph.add_node("fragile", fragile)
+        graph.add_edge("expensive", "fragile")
+
+        failed = run_graph(graph)
+        assert failed["failed_node"] == "fragile"
+
+        broken["value"] = False
+        resumed = run_graph(graph, run_id=failed["run_id"])
+
+        assert resumed["response"] == "DATA"
+        assert calls == ["expensive"]
+        assert asyncio.run(store.load(failed["run_id"])) == {}
@@ -0,0 +1,108 @@
+"""
+Import-time regression guards.
+
+Importing the package must stay cheap: heavy optional dependencies are only
+loaded when the feature that needs them is used, and importing must not touch
+the filesystem or shell out.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+HEAVY_MODULES = [
+    "litellm",
+    "redis",
+    "sqlalchemy",
+    "motor",
+    "pymongo",
+    "apscheduler",
+    "rich",
+    "opik",
+    "mcp",
+    "fastapi",
+]
+
+
+def _run_import(code: str, cwd) -> dict:
+    """Run ``code`` in a fresh interpreter and return the JSON it prints."""
+    script = textwrap.dedent(
+        f"""
+        import json, sys, time
+        start = time.perf_counter()
+        {code}
+        elapsed = time.perf_counter() - start
+        heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]
+        print(json.dumps({{"elapsed": elapsed, "heavy": heavy}}))
+        """
+    )
+    env = {**os.environ, "OPIK_API_KEY": "", "OPIK_WORKSPACE": ""}
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+class TestImportTime:
+    """Tests for lazy package imports and deferred side effects."""
+
+    def test_package_import_loads_no_heavy_dependencies(self, tmp_path):
+        """Test that `import omnicoreagent` loads none of the heavy backends."""
+        result = _run_import("import omnicoreagent", tmp_path)
+        assert result["heavy"] == []
+        assert result["elapsed"] < 1.0
+
+    def test_package_import_has_no_filesystem_side_effects(self, tmp_path):
+        """Test that importing does not create the log file in the CWD."""
+        _run_import("import omnicoreagent", tmp_path)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_agent_import_skips_optional_backends(self, tmp_path):
+        """Test that importing OmniCoreAgent does not load LLM, MCP or store drivers."""
+        result = _run_import("from omnicoreagent import OmniCoreAgent", tmp_path)
+        assert result["heavy"] == []
+
+    @pytest.mark.parametrize(
+        "name",
+        ["OmniCoreAgent", "MemoryRouter", "EventRouter", "ToolRegistry", "logger"],
+    )
+    def test_lazy_attributes_resolve(self, name):
+        """Test that lazily exported names still resolve and are listed."""
+        import omnicoreagent
+
+        assert getattr(omnicoreagent, name) is not None
+        assert name in dir(omnicoreagent)
+
+    def test_unknown_attribute_raises(self):
+        """Test that unknown attributes raise AttributeError."""
+        import omnicoreagent
+
+        with pytest.raises(AttributeError):
+            omnicoreagent.DoesNotExist
+
+    def test_configuration_import_skips_mcp(self, tmp_path):
+        """Test that the MCP server Configuration does not load the mcp SDK."""
+        result = _run_import(
+            "import omnicoreagent; omnicoreagent.Configuration", tmp_path
+        )
+        assert result["heavy"] == []
+
+    def test_memory_router_loads_only_selected_backend(self, tmp_path):
+        """Test that an in-memory MemoryRouter does not import other drivers."""
+        result = _run_import(
+            "from omnicoreagent import MemoryRouter; "
+            "MemoryRouter(memory_store_type='in_memory')",
+            tmp_path,
+        )
+        assert "redis" not in result["heavy"]
+        assert "sqlalchemy" not in result["heavy"]
+        assert "motor" not in result["heavy"]
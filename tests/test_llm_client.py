@@ -0,0 +1,256 @@
+"""
+Tests for LLMClient credentials, request building and connection pooling.
+"""
+
+import asyncio
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from omnicoreagent.core import llm_client as llm_client_module
+from omnicoreagent.core.llm import LLMConnection
+from omnicoreagent.core.llm_client import (
+    LLMClient,
+    MessageCache,
+    close_http_clients,
+    shared_http_client,
+)
+from omnicoreagent.core.types import Message, ToolCallMetadata
+from omnicoreagent.omni_agent.config.transformer import ConfigTransformer
+
+
+class FakeLiteLLM:
+    def __init__(self):
+        self.calls = []
+
+    async def acompletion(self, **params):
+        self.calls.append(params)
+        return SimpleNamespace(params=params)
+
+    def completion(self, **params):
+        self.calls.append(params)
+        return SimpleNamespace(params=params)
+
+
+@pytest.fixture
+def fake_litellm(monkeypatch):
+    fake = FakeLiteLLM()
+    monkeypatch.setattr(llm_client_module, "get_litellm", lambda: fake)
+    return fake
+
+
+def make_connection(llm_api_key: str, **llm_config) -> LLMConnection:
+    config = SimpleNamespace(llm_api_key=llm_api_key)
+    return LLMConnection(config, config_data={"LLM": llm_config})
+
+
+class TestConfiguration:
+    """Tests for building clients from the LLM configuration."""
+
+    def test_provider_prefix_and_template(self):
+        """Test that the model gets its provider prefix and unset values are dropped."""
+        client = LLMClient.from_config(
+            {"provider": "anthropic", "model": "claude", "temperature": 0.2},
+            api_key="key",
+        )
+
+        params = client.request_params([{"role": "user", "content": "hi"}])
+
+        assert params == {
+            "model": "anthropic/claude",
+            "temperature": 0.2,
+            "api_key": "key",
+            "messages": [{"role": "user", "content": "hi"}],
+        }
+
+    def test_azure_and_ollama_endpoints(self):
+        """Test that endpoint settings become per-client credentials."""
+        azure = LLMClient.from_config(
+            {
+                "provider": "azureopenai",
+                "model": "gpt",
+                "azure_endpoint": "https://example.openai.azure.com",
+                "azure_api_version": "2024-02-01",
+                "azure_deployment": "prod",
+            },
+            api_key="azure-key",
+        )
+        ollama = LLMClient.from_config(
+            {"provider": "ollama", "model": "llama", "ollama_host": "http://gpu:11434"}
+        )
+
+        assert azure.model == "azure/prod"
+        assert azure.credentials == {
+            "api_key": "azure-key",
+            "api_base": "https://example.openai.azure.com",
+            "api_version": "2024-02-01",
+        }
+        assert ollama.credentials == {"api_base": "http://gpu:11434"}
+
+    def test_tools_and_openrouter_stop(self):
+        """Test that tools enable tool choice and OpenRouter stops only without tools."""
+        client = LLMClient("openrouter", "openrouter/model")
+        tools = [{"type": "function", "function": {"name": "lookup"}}]
+
+        assert client.request_params([])["stop"] == ["\n\nObservation:"]
+        with_tools = client.request_params([], tools)
+        assert with_tools["tool_choice"] == "auto"
+        assert "stop" not in with_tools
+
+    def test_model_config_credentials(self):
+        """Test that api_key and api_base in model_config reach the LLM section."""
+        internal = ConfigTransformer().transform_config(
+            model_config={
+                "provider": "openai",
+                "model": "gpt-4o-mini",
+                "api_key": "agent-key",
+                "api_base": "http://proxy:4000",
+            },
+            mcp_tools=[],
+        )
+
+        connection = make_connection("global-key", **internal["LLM"])
+
+        assert connection.client.credentials == {
+            "api_key": "agent-key",
+            "api_base": "http://proxy:4000",
+        }
+
+
+class TestCredentials:
+    """Tests for per-connection credentials."""
+
+    def test_connections_keep_their_own_keys(self, fake_litellm, monkeypatch):
+        """Test that two connections send their own keys and leave os.environ alone."""
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+        first = make_connection("key-a", provider="anthropic", model="claude")
+        second = make_connection("key-b", provider="anthropic", model="claude")
+
+        async def main():
+            await first.llm_call([{"role": "user", "content": "a"}])
+            await second.llm_call([{"role": "user", "content": "b"}])
+
+        asyncio.run(main())
+        second.llm_call_sync([{"role": "user", "content": "c"}])
+
+        assert [call["api_key"] for call in fake_litellm.calls] == [
+            "key-a",
+            "key-b",
+            "key-b",
+        ]
+        assert "ANTHROPIC_API_KEY" not in os.environ
+
+    def test_failed_call_returns_none(self, monkeypatch):
+        """Test that LLM errors are logged and turned into None."""
+
+        class FailingLiteLLM:
+            async def acompletion(self, **params):
+                raise RuntimeError("bad request")
+
+        monkeypatch.setattr(llm_client_module, "get_litellm", FailingLiteLLM)
+        connection = make_connection("key", provider="groq", model="llama")
+
+        assert asyncio.run(connection.llm_call([])) is None
+
+
+class TestMessageCache:
+    """Tests for cached message serialization."""
+
+    def test_unchanged_message_is_serialized_once(self):
+        """Test that a message re-sent unchanged is served from the cache."""
+        cache = MessageCache()
+        message = Message(role="user", content="hello")
+
+        first = cache.to_dict(message)
+        first["content"] = "mutated by the caller"
+        second = cache.to_dict(message)
+
+        assert second == {"role": "user", "content": "hello"}
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_reassigned_field_is_reserialized(self):
+        """Test that changing a message's field invalidates its entry."""
+        cache = MessageCache()
+        message = Message(role="user", content="hello")
+        cache.to_dict(message)
+
+        message.content = "changed"
+
+        assert cache.to_dict(message)["content"] == "changed"
+        assert cache.misses == 2
+
+    def test_nested_field_edited_in_place_is_reserialized(self):
+        """Test that mutating nested metadata invalidates the entry."""
+        cache = MessageCache()
+        message = Message(
+            role="assistant", content="calling", metadata=ToolCallMetadata()
+        )
+        cache.to_dict(message)
+
+        message.metadata.agent_name = "researcher"
+
+        assert cache.to_dict(message)["metadata"]["agent_name"] == "researcher"
+        assert cache.misses == 2
+
+    def test_cache_is_bounded(self):
+        """Test that the oldest entries are evicted past maxsize."""
+        cache = MessageCache(maxsize=2)
+        messages = [Message(role="user", content=str(i)) for i in range(3)]
+        for message in messages:
+            cache.to_dict(message)
+
+        cache.to_dict(messages[0])
+
+        assert cache.misses == 4
+
+
+class TestConnectionPooling:
+    """Tests for shared HTTP clients."""
+
+    def test_clients_share_one_pool_per_endpoint(self, fake_litellm):
+        """Test that OpenAI clients for one endpoint reuse one httpx client."""
+        first = LLMClient("openai", "openai/gpt-4o-mini", api_key="key-a")
+        second = LLMClient("openai", "openai/gpt-4o-mini", api_key="key-b")
+        proxied = LLMClient(
+            "openai", "openai/gpt-4o-mini", api_key="key-c", api_base="http://proxy"
+        )
+
+        async def main():
+            for client in (first, second, first, proxied):
+                await client.acompletion([{"role": "user", "content": "hi"}])
+            await close_http_clients()
+
+        asyncio.run(main())
+
+        sdk_clients = [call["client"] for call in fake_litellm.calls]
+        assert sdk_clients[0] is sdk_clients[2]
+        assert sdk_clients[0].api_key == "key-a"
+        assert sdk_clients[1].api_key == "key-b"
+        assert sdk_clients[0]._client is sdk_clients[1]._client
+        assert sdk_clients[3]._client is not sdk_clients[0]._client
+
+    def test_async_pools_are_per_event_loop(self):
+        """Test that each event loop gets its own async client."""
+
+        async def get_client():
+            return shared_http_client("openai", None, asynchronous=True)
+
+        first = asyncio.run(get_client())
+        second = asyncio.run(get_client())
+
+        assert first is not second
+
+    def test_close_http_clients(self):
+        """Test that closing the pools closes the clients."""
+
+        async def main():
+            client = shared_http_client("openai", None, asynchronous=True)
+            await close_http_clients()
+            return client, shared_http_client("openai", None, asynchronous=True)
+
+        closed, fresh = asyncio.run(main())
+
+        assert closed.is_closed
+        assert fresh is not closed
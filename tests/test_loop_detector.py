@@ -0,0 +1,93 @@
+"""
+Tests for the incremental tool-call loop detector.
+"""
+
+from omnicoreagent.core.utils import (
+    FINGERPRINT_SAMPLE_CHARS,
+    RobustLoopDetector,
+    fingerprint,
+)
+
+
+def record(detector, calls, tool_name="search"):
+    for tool_input in calls:
+        detector.record_tool_call(tool_name, tool_input, f"result for {tool_input}")
+
+
+class TestFingerprint:
+    """Tests for fingerprinting tool inputs and outputs."""
+
+    def test_small_values_are_hashed_whole(self):
+        """Test that any difference in a small value changes the fingerprint."""
+        assert fingerprint("abc") == fingerprint("abc")
+        assert fingerprint("abc") != fingerprint("abd")
+        assert fingerprint({"q": 1}) == fingerprint(str({"q": 1}))
+
+    def test_large_values_are_sampled(self):
+        """Test that large values are fingerprinted by length, head and tail."""
+        size = FINGERPRINT_SAMPLE_CHARS * 4
+        output = "a" * size
+        middle_edit = output[: size // 2] + "b" + output[size // 2 + 1 :]
+
+        assert fingerprint(output) == fingerprint(middle_edit)
+        assert fingerprint(output) != fingerprint(output + "a")
+        assert fingerprint(output) != fingerprint("b" + output[1:])
+
+
+class TestLoopDetection:
+    """Tests for consecutive and repeating-pattern loops."""
+
+    def test_consecutive_identical_calls(self):
+        """Test that identical calls are a loop at consecutive_threshold."""
+        detector = RobustLoopDetector(consecutive_threshold=3, debug=False)
+
+        record(detector, ["q", "q"])
+        assert not detector.is_looping("search")
+        record(detector, ["q"])
+
+        assert detector.get_loop_type("search") == ["consecutive_calls"]
+
+    def test_repeating_pattern_needs_threshold_plus_one_repeats(self):
+        """Test that [A, B] is a loop after five repeats with threshold 4."""
+        detector = RobustLoopDetector(pattern_repetition_threshold=4, debug=False)
+
+        record(detector, ["a", "b"] * 4)
+        assert not detector.is_looping("search")
+        record(detector, ["a", "b"])
+
+        assert detector.get_loop_type("search") == ["repeating_pattern"]
+
+    def test_broken_pattern_and_reset(self):
+        """Test that a different call breaks the pattern and reset clears it."""
+        detector = RobustLoopDetector(debug=False)
+
+        record(detector, ["a", "b"] * 4 + ["c"] + ["a", "b"] * 2)
+        assert not detector.is_looping("search")
+
+        record(detector, ["a", "b"] * 5)
+        assert detector.is_looping()
+        detector.reset("search")
+        assert not detector.is_looping()
+
+    def test_supplied_digests_skip_hashing(self):
+        """Test that digests from the tool layer are used as the signature."""
+        detector = RobustLoopDetector(consecutive_threshold=2, debug=False)
+
+        for _ in range(2):
+            detector.record_tool_call(
+                "fetch", None, None, input_digest="in-1", output_digest="out-1"
+            )
+
+        assert detector.tool_interactions["fetch"][-1] == ("fetch", "in-1", "out-1")
+        assert detector.is_looping("fetch")
+
+    def test_tracked_tools_are_capped(self):
+        """Test that the least recently called tool is forgotten past max_tools."""
+        detector = RobustLoopDetector(max_tools=2, debug=False)
+
+        record(detector, ["a"], tool_name="one")
+        record(detector, ["a"], tool_name="two")
+        record(detector, ["a"], tool_name="one")
+        record(detector, ["a"], tool_name="three")
+
+        assert set(detector.tool_interactions) == {"one", "three"}
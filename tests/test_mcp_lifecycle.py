@@ -0,0 +1,161 @@
+"""
+Tests for the background agents' MCP connection lifecycle.
+"""
+
+import asyncio
+
+from omnicoreagent.omni_agent.background_agent.mcp_lifecycle import (
+    MCPLifecycleManager,
+)
+
+
+class FakeClient:
+    def __init__(self):
+        self.connects = 0
+        self.cleanups = 0
+
+    async def cleanup(self):
+        self.cleanups += 1
+
+
+class FakeAgent:
+    def __init__(
+        self, agent_id, policy="warm", idle_timeout=60.0, tools=None, tenant_id=None
+    ):
+        self.agent_id = agent_id
+        self.tenant_id = tenant_id
+        self.indexed = 0
+        self.mcp_tools = tools or [{"name": "fs", "command": "mcp-fs"}]
+        self.mcp_client = FakeClient()
+        self.mcp_lifecycle = policy
+        self.mcp_idle_timeout = idle_timeout
+        self.mcp_prefetch_seconds = 30.0
+
+    async def connect_mcp_servers(self):
+        self.mcp_client.connects += 1
+        self.index_mcp_tools()
+
+    def index_mcp_tools(self):
+        self.indexed += 1
+
+
+def run_once(manager, agent_id):
+    async def main():
+        async with manager.acquire(agent_id):
+            pass
+
+    asyncio.run(main())
+
+
+class TestPolicies:
+    """Tests for warm, on-demand and shared agents."""
+
+    def test_warm_connects_once(self):
+        """Test that warm agents connect at registration and stay connected."""
+        manager = MCPLifecycleManager()
+        agent = FakeAgent("warm")
+        asyncio.run(manager.register(agent))
+        run_once(manager, "warm")
+        asyncio.run(manager.check(now=10**10))
+
+        assert agent.mcp_client.connects == 1
+        assert agent.mcp_client.cleanups == 0
+        assert manager.stats()["warm_starts"] == 1
+
+    def test_on_demand_connects_per_run(self):
+        """Test that on-demand agents with no idle time disconnect after runs."""
+        manager = MCPLifecycleManager()
+        agent = FakeAgent("cold", policy="on_demand", idle_timeout=0)
+        asyncio.run(manager.register(agent))
+        assert agent.mcp_client.connects == 0
+
+        run_once(manager, "cold")
+        run_once(manager, "cold")
+
+        assert agent.mcp_client.connects == 2
+        assert agent.mcp_client.cleanups == 2
+        assert manager.stats()["cold_starts"] == 2
+
+    def test_idle_connection_is_reclaimed(self):
+        """Test that check() closes connections idle past the timeout."""
+        manager = MCPLifecycleManager()
+        agent = FakeAgent("cold", policy="on_demand", idle_timeout=30)
+        asyncio.run(manager.register(agent))
+        run_once(manager, "cold")
+        run_once(manager, "cold")
+        last_used = manager._slots["agent:cold"].last_used
+
+        asyncio.run(manager.check(now=last_used + 10))
+        assert agent.mcp_client.cleanups == 0
+
+        asyncio.run(manager.check(now=last_used + 31))
+        stats = manager.stats()
+        assert agent.mcp_client.cleanups == 1
+        assert (stats["cold_starts"], stats["warm_starts"]) == (1, 1)
+        assert stats["reclaimed"] == 1
+
+    def test_shared_agents_use_one_client(self):
+        """Test that shared agents with the same tools share one connection."""
+        manager = MCPLifecycleManager()
+        first = FakeAgent("first", policy="shared")
+        second = FakeAgent("second", policy="shared")
+        other = FakeAgent("other", policy="shared", tools=[{"name": "web"}])
+        for agent in (first, second, other):
+            asyncio.run(manager.register(agent))
+
+        run_once(manager, "first")
+        run_once(manager, "second")
+
+        assert second.mcp_client is first.mcp_client
+        assert first.mcp_client.connects == 1
+        assert manager.stats()["connections"] == 2
+
+        asyncio.run(manager.unregister("first"))
+        assert first.mcp_client.cleanups == 0
+        asyncio.run(manager.unregister("second"))
+        assert first.mcp_client.cleanups == 1
+
+    def test_shared_agents_of_other_tenants_do_not_share(self):
+        """Test that sampling accounting keeps tenants on separate clients."""
+        manager = MCPLifecycleManager()
+        acme = FakeAgent("acme", policy="shared", tenant_id="acme")
+        globex = FakeAgent("globex", policy="shared", tenant_id="globex")
+        for agent in (acme, globex):
+            asyncio.run(manager.register(agent))
+
+        assert acme.mcp_client is not globex.mcp_client
+        assert manager.stats()["connections"] == 2
+
+    def test_every_sharing_agent_indexes_tools(self):
+        """Test that agents joining a shared connection index its tools."""
+        manager = MCPLifecycleManager()
+        first = FakeAgent("first", policy="shared")
+        second = FakeAgent("second", policy="shared")
+        asyncio.run(manager.register(first))
+        asyncio.run(manager.register(second))
+        run_once(manager, "first")
+
+        late = FakeAgent("late", policy="shared")
+        asyncio.run(manager.register(late))
+
+        assert (first.indexed, second.indexed, late.indexed) == (1, 1, 1)
+
+
+class TestPrefetch:
+    """Tests for connecting ahead of scheduled runs."""
+
+    def test_prefetch_before_next_run(self):
+        """Test that check() connects within the prefetch lead of the next run."""
+        manager = MCPLifecycleManager(next_run_time=lambda agent_id: 1000.0)
+        agent = FakeAgent("cold", policy="on_demand")
+        asyncio.run(manager.register(agent))
+
+        asyncio.run(manager.check(now=900.0))
+        assert agent.mcp_client.connects == 0
+
+        asyncio.run(manager.check(now=980.0))
+        assert agent.mcp_client.connects == 1
+        assert manager.stats()["prefetches"] == 1
+
+        run_once(manager, "cold")
+        assert manager.stats()["warm_starts"] == 1
@@ -0,0 +1,240 @@
+"""
+Tests for the async memory tool backends and the view cache.
+"""
+
+import asyncio
+
+import pytest
+
+from omnicoreagent.core.tools.memory_tool.async_backends import (
+    CachedMemoryBackend,
+    InMemoryMemoryBackend,
+    ThreadedMemoryBackend,
+)
+from omnicoreagent.core.tools.memory_tool.db_storage import DatabaseMemoryBackend
+from omnicoreagent.core.tools.memory_tool.local_storage import LocalMemoryBackend
+from omnicoreagent.core.tools.memory_tool.memory_tool import MemoryTool
+
+
+@pytest.fixture(params=["in_memory", "db"])
+def backend(request, tmp_path):
+    if request.param == "db":
+        return DatabaseMemoryBackend(f"sqlite:///{tmp_path / 'memories.db'}")
+    return InMemoryMemoryBackend()
+
+
+async def read(backend, path: str) -> str:
+    return (await backend.view(path)).split("\n", 1)[1]
+
+
+class TestStorageSemantics:
+    """Tests for the memory tool operations on every storage backend."""
+
+    @pytest.mark.asyncio
+    async def test_create_append_and_overwrite(self, backend):
+        """Test the three create_update modes and their errors."""
+        assert (await backend.create_update("/memories/notes.md", "one\n")).startswith(
+            "New file created"
+        )
+        assert (await backend.create_update("notes.md", "again")).startswith(
+            "File already exists"
+        )
+        await backend.create_update("notes.md", "two", mode="append")
+        assert await read(backend, "notes.md") == "one\ntwo"
+
+        await backend.create_update("notes.md", "fresh", mode="overwrite")
+        assert await read(backend, "notes.md") == "fresh"
+        assert (await backend.create_update("other.md", "x", mode="append")).startswith(
+            "Cannot append"
+        )
+
+    @pytest.mark.asyncio
+    async def test_directories_are_listed_and_deleted(self, backend):
+        """Test listing nested paths and deleting a whole directory."""
+        await backend.create_update("plans/2024/q1.md", "a")
+        await backend.create_update("plans/todo.md", "b")
+        await backend.create_update("readme.md", "c")
+
+        assert await read(backend, "/memories") == "plans\nreadme.md"
+        assert await read(backend, "plans") == "2024\ntodo.md"
+        assert (await backend.delete("plans")).startswith("Directory deleted")
+        assert await read(backend, "/memories") == "readme.md"
+        assert (await backend.view("plans")).startswith("Path not found")
+
+    @pytest.mark.asyncio
+    async def test_rename_moves_a_directory(self, backend):
+        """Test that renaming a directory moves every file under it."""
+        await backend.create_update("draft/a.md", "a")
+        await backend.create_update("draft/sub/b.md", "b")
+
+        await backend.rename("draft", "final")
+
+        assert await read(backend, "final/sub/b.md") == "b"
+        assert (await backend.view("draft")).startswith("Path not found")
+
+    @pytest.mark.asyncio
+    async def test_str_replace_and_insert(self, backend):
+        """Test that replacements and line inserts match the local backend."""
+        await backend.create_update("f.md", "alpha\nbeta\ngamma")
+
+        await backend.str_replace("f.md", "beta", "BETA")
+        await backend.insert("f.md", 1, "first")
+        await backend.insert("f.md", 3, "middle")
+        await backend.insert("f.md", 99, "last")
+
+        assert (
+            await read(backend, "f.md") == "first\nalpha\nmiddle\nBETA\ngamma\nlast\n"
+        )
+        assert "not found" in await backend.str_replace("f.md", "zeta", "x")
+
+    @pytest.mark.asyncio
+    async def test_path_traversal_is_rejected(self, backend):
+        """Test that paths outside the memory root are refused."""
+        assert "Path traversal" in await backend.view("/memories/../../etc/passwd")
+        assert "Path traversal" in await backend.create_update("../x.md", "x")
+
+    @pytest.mark.asyncio
+    async def test_clear_all_memory(self, backend):
+        """Test that clearing removes every file."""
+        await backend.create_update("a/b.md", "b")
+        await backend.clear_all_memory()
+
+        assert await read(backend, "/memories") == "(empty)"
+
+
+class TestChunkedStorage:
+    """Tests for appends and inserts that touch only the changed chunks."""
+
+    @pytest.mark.asyncio
+    async def test_appends_add_chunks(self, tmp_path):
+        """Test that an append adds a chunk instead of rewriting the file."""
+        backend = DatabaseMemoryBackend(f"sqlite:///{tmp_path / 'm.db'}")
+        await backend.create_update("log.md", "start\n\n")
+        for i in range(5):
+            await backend.create_update("log.md", f"step {i}", mode="append")
+
+        with backend._engine.connect() as conn:
+            chunks = backend._ordered_chunks(conn, "log.md")
+
+        assert len(chunks) == 6
+        assert chunks[0].content == "start"
+        assert await read(backend, "log.md") == "start\n" + "\n".join(
+            f"step {i}" for i in range(5)
+        )
+
+    @pytest.mark.asyncio
+    async def test_many_inserts_at_one_line(self, tmp_path):
+        """Test that repeated inserts into the same gap renumber correctly."""
+        backend = DatabaseMemoryBackend(f"sqlite:///{tmp_path / 'm.db'}")
+        reference = InMemoryMemoryBackend()
+        for target in (backend, reference):
+            await target.create_update("f.md", "a\nb\nc")
+            for i in range(30):
+                await target.insert("f.md", 2, f"x{i}")
+
+        assert await read(backend, "f.md") == await read(reference, "f.md")
+
+    @pytest.mark.asyncio
+    async def test_appends_are_compacted(self, tmp_path):
+        """Test that a file is stored as one chunk again after compact_after appends."""
+        backend = DatabaseMemoryBackend(
+            f"sqlite:///{tmp_path / 'm.db'}", compact_after=4
+        )
+        await backend.create_update("log.md", "0")
+        for i in range(1, 6):
+            await backend.create_update("log.md", str(i), mode="append")
+
+        with backend._engine.connect() as conn:
+            chunks = backend._ordered_chunks(conn, "log.md")
+
+        assert len(chunks) == 2
+        assert await read(backend, "log.md") == "\n".join(str(i) for i in range(6))
+
+
+class TestViewCache:
+    """Tests for the LRU view cache."""
+
+    @pytest.mark.asyncio
+    async def test_writes_invalidate_file_and_parents(self):
+        """Test that cached views are dropped when the path or a child changes."""
+        inner = InMemoryMemoryBackend()
+        cached = CachedMemoryBackend(inner)
+        await cached.create_update("dir/a.md", "a")
+
+        await cached.view("dir/a.md")
+        await cached.view("dir")
+        assert await read(cached, "dir/a.md") == "a"
+        assert cached.hits == 1
+
+        await cached.create_update("dir/a.md", "b", mode="overwrite")
+        await cached.create_update("dir/c.md", "c")
+
+        assert await read(cached, "dir/a.md") == "b"
+        assert await read(cached, "dir") == "a.md\nc.md"
+
+    @pytest.mark.asyncio
+    async def test_delete_invalidates_children(self):
+        """Test that deleting a directory drops cached views of its files."""
+        cached = CachedMemoryBackend(InMemoryMemoryBackend())
+        await cached.create_update("dir/a.md", "a")
+        await cached.view("dir/a.md")
+
+        await cached.delete("dir")
+
+        assert (await cached.view("dir/a.md")).startswith("Path not found")
+
+    @pytest.mark.asyncio
+    async def test_view_during_write_is_not_cached(self):
+        """Test that a view racing a slow write does not cache the old content."""
+
+        class SlowWriteBackend(InMemoryMemoryBackend):
+            async def _write(self, path, content):
+                await asyncio.sleep(0.02)
+                await super()._write(path, content)
+
+        cached = CachedMemoryBackend(SlowWriteBackend())
+        await cached.create_update("notes.md", "old")
+
+        write = asyncio.create_task(
+            cached.create_update("notes.md", "new", mode="overwrite")
+        )
+        await asyncio.sleep(0.005)
+        during = await cached.view("notes.md")
+        await write
+        after = await cached.view("notes.md")
+
+        assert during.endswith("old")
+        assert after.endswith("new")
+
+
+class TestMemoryTool:
+    """Tests for resolving the backend of the MemoryTool."""
+
+    @pytest.mark.asyncio
+    async def test_sync_backend_runs_in_a_thread(self, tmp_path):
+        """Test that a synchronous backend is wrapped and awaited."""
+        tool = MemoryTool(LocalMemoryBackend(base_dir=tmp_path / "memories"))
+
+        assert isinstance(tool.backend, ThreadedMemoryBackend)
+        await tool.create_update("notes.md", "hello")
+        assert (await tool.view("notes.md")).endswith("hello")
+
+
+@pytest.mark.asyncio
+async def test_s3_backend():
+    """Test the S3 backend against moto's S3 stand-in."""
+    moto = pytest.importorskip("moto")
+    boto3 = pytest.importorskip("boto3")
+    from omnicoreagent.core.tools.memory_tool.s3_storage import S3MemoryBackend
+
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="agent-memory")
+        backend = S3MemoryBackend("agent-memory", client=client)
+
+        await backend.create_update("plans/todo.md", "a\nc")
+        await backend.insert("plans/todo.md", 2, "b")
+        await backend.rename("plans", "done")
+
+        assert await read(backend, "/memories") == "done"
+        assert await read(backend, "done/todo.md") == "a\nb\nc"
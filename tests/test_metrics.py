@@ -0,0 +1,248 @@
+"""
+Tests for the metrics registry, span metrics and the Prometheus endpoint.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from omnicoreagent.core.events.event_router import EventRouter
+from omnicoreagent.core.memory_store.memory_router import MemoryRouter
+from omnicoreagent.core.metrics import (
+    LatencyHistogram,
+    MetricsRegistry,
+    disable_metrics,
+    enable_metrics,
+    metrics_asgi_app,
+)
+from omnicoreagent.core.tools.local_tools_registry import ToolRegistry
+from omnicoreagent.core.tools.tools_handler import LocalToolHandler, ToolExecutor
+from omnicoreagent.core.tracing import tracer
+from omnicoreagent.core.usage_ledger import UsageLedger
+from omnicoreagent.omni_agent.agent import OmniCoreAgent
+from omnicoreagent.omni_agent.background_agent import BackgroundAgentManager
+
+
+pytestmark = pytest.mark.usefixtures("isolated_cwd")
+
+
+@pytest.fixture
+def registry():
+    registry = MetricsRegistry()
+    yield registry
+    disable_metrics(registry)
+    tracer.clear()
+
+
+class FakeLLM:
+    """LLM connection that answers immediately and reports token usage."""
+
+    async def llm_call(self, messages):
+        return SimpleNamespace(
+            usage=SimpleNamespace(
+                prompt_tokens=10, completion_tokens=5, total_tokens=15
+            ),
+            choices=[
+                SimpleNamespace(
+                    message=SimpleNamespace(
+                        content="<thought>ok</thought><final_answer>done</final_answer>"
+                    )
+                )
+            ],
+        )
+
+
+def scrape(app, method="GET"):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": "/"}
+    asyncio.run(app(scope, receive, send))
+    start, body = sent
+    return start["status"], dict(start["headers"]), body["body"].decode()
+
+
+class TestRegistry:
+    """Tests for metric registration and the Prometheus text format."""
+
+    def test_counters_gauges_and_histograms(self):
+        """Test that every metric kind is rendered with its labels."""
+        registry = MetricsRegistry(prefix="app")
+        registry.counter("calls_total", "Calls.", ("tool",)).inc(tool="search")
+        registry.counter("calls_total", "Calls.", ("tool",)).inc(2, tool="search")
+        registry.gauge("queue_depth", "Queued runs.").set(4)
+        histogram = registry.histogram(
+            "call_seconds", "Call time.", ("tool",), buckets=(0.1, 1.0)
+        )
+        histogram.observe(0.05, tool='say "hi"')
+        histogram.observe(0.5, tool='say "hi"')
+
+        text = registry.export_prometheus()
+
+        assert "# TYPE app_calls_total counter" in text
+        assert 'app_calls_total{tool="search"} 3' in text
+        assert "app_queue_depth 4" in text
+        assert "# TYPE app_call_seconds histogram" in text
+        assert 'app_call_seconds_bucket{tool="say \\"hi\\"",le="0.1"} 1' in text
+        assert 'app_call_seconds_bucket{tool="say \\"hi\\"",le="+Inf"} 2' in text
+        assert 'app_call_seconds_count{tool="say \\"hi\\""} 2' in text
+
+    def test_mismatched_metrics_and_labels_are_rejected(self):
+        """Test that a name cannot be reused with another kind or label set."""
+        registry = MetricsRegistry()
+        counter = registry.counter("runs_total", "Runs.", ("agent",))
+
+        with pytest.raises(ValueError):
+            registry.gauge("runs_total", "Runs.", ("agent",))
+        with pytest.raises(ValueError):
+            counter.inc(tool="x")
+        with pytest.raises(ValueError):
+            counter.inc(-1, agent="a")
+
+    def test_latency_histogram_percentiles(self):
+        """Test bucket-based percentiles capped at the largest value seen."""
+        histogram = LatencyHistogram(bounds=(0.01, 0.1, 1.0))
+        for value in [0.005] * 90 + [0.5] * 9 + [3.0]:
+            histogram.observe(value)
+
+        summary = histogram.summary()
+
+        assert summary["count"] == 100
+        assert summary["p50"] == 0.01
+        assert summary["p95"] == 1.0
+        assert summary["p99"] == 1.0
+        assert summary["max"] == 3.0
+        assert histogram.percentile(1.0) == 3.0
+
+    def test_collectors_are_rendered_and_failures_skipped(self):
+        """Test that collector output is appended and a failing one is skipped."""
+        registry = MetricsRegistry()
+
+        def broken(prefix):
+            raise RuntimeError("down")
+
+        registry.register_collector(lambda prefix: f"{prefix}_up 1\n")
+        registry.register_collector(broken)
+
+        assert registry.export_prometheus() == "omnicoreagent_up 1\n"
+
+
+class TestSpanMetrics:
+    """Tests for the span-to-histogram processor."""
+
+    def test_tool_and_memory_spans(self, registry):
+        """Test per-tool latency inherits the agent name from the run span."""
+        enable_metrics(registry, usage_ledger=UsageLedger())
+        tools = ToolRegistry()
+
+        @tools.register_tool(name="add", description="Add")
+        def add(a: int, b: int) -> int:
+            return a + b
+
+        router = MemoryRouter("in_memory")
+
+        async def scenario():
+            executor = ToolExecutor(LocalToolHandler(tools))
+            with tracer.span("agent.run", agent="calc"):
+                await executor.execute(
+                    agent_name="calc",
+                    tool_name="add",
+                    tool_args=[{"a": 1, "b": 2}],
+                    tool_call_id="call-1",
+                    add_message_to_history=router.store_message,
+                    session_id="s1",
+                )
+
+        asyncio.run(scenario())
+
+        tool = registry.get("tool_call_seconds")
+        assert tool.summary(agent="calc", tool="add", status="ok")["count"] == 1
+        memory = registry.get("memory_store_operation_seconds")
+        assert (
+            memory.summary(store="in_memory", operation="write", status="ok")["count"]
+            == 1
+        )
+        runs = registry.get("agent_run_seconds")
+        assert runs.summary(agent="calc", status="ok")["count"] == 1
+
+    def test_enable_metrics_is_idempotent(self, registry):
+        """Test that enabling twice registers one processor and one collector."""
+        ledger = UsageLedger()
+        enable_metrics(registry, usage_ledger=ledger)
+        enable_metrics(registry, usage_ledger=ledger)
+
+        assert len(tracer.processors) == 1
+        assert registry.export_prometheus().count("usage_ledger_timestamp") == 3
+
+
+class TestAgentMetrics:
+    """Tests for agent and manager metrics."""
+
+    def test_agent_run_metrics_and_endpoint(self, registry):
+        """Test run latency, token counters and the average per run."""
+        ledger = UsageLedger()
+        enable_metrics(registry, usage_ledger=ledger)
+        agent = OmniCoreAgent(
+            name="support",
+            system_instruction="You are helpful.",
+            model_config={"provider": "openai", "model": "gpt-4o-mini"},
+            usage_ledger=ledger,
+        )
+        agent.llm_connection = FakeLLM()
+
+        async def scenario():
+            await agent.run("hello", session_id="s1")
+            await agent.run("again", session_id="s1")
+            return await agent.get_metrics()
+
+        metrics = asyncio.run(scenario())
+
+        assert metrics["total_runs"] == 2
+        assert metrics["total_requests"] == 2
+        assert metrics["average_time"] == pytest.approx(metrics["total_time"] / 2)
+        assert metrics["p50_time"] <= metrics["p99_time"]
+
+        status, headers, body = scrape(metrics_asgi_app(registry))
+        assert status == 200
+        assert headers[b"content-type"].startswith(b"text/plain; version=0.0.4")
+        assert (
+            'omnicoreagent_agent_run_seconds_count{agent="support",status="ok"} 2'
+            in body
+        )
+        assert (
+            'omnicoreagent_llm_call_seconds_count{agent="support",status="ok"} 2'
+            in body
+        )
+        assert (
+            'omnicoreagent_llm_total_tokens_total{tenant="default",agent="support"} 30'
+            in body
+        )
+
+    def test_endpoint_rejects_other_methods(self, registry):
+        """Test that only GET and HEAD are served."""
+        status, headers, body = scrape(metrics_asgi_app(registry), method="POST")
+
+        assert status == 405
+        assert headers[b"allow"] == b"GET, HEAD"
+        assert scrape(metrics_asgi_app(registry), method="HEAD")[2] == ""
+
+    def test_manager_gauges(self, registry):
+        """Test that a manager exports queue depth and MCP pool gauges."""
+        manager = BackgroundAgentManager(
+            MemoryRouter("in_memory"), EventRouter("in_memory")
+        )
+        manager.register_metrics(registry)
+
+        text = registry.export_prometheus()
+
+        assert 'omnicoreagent_scheduler_queue_depth{priority="0"} 0' in text
+        assert "omnicoreagent_scheduler_running_runs 0" in text
+        assert 'omnicoreagent_mcp_pool_connections{state="connected"} 0' in text
+        assert 'omnicoreagent_mcp_pool_starts_total{kind="cold"} 0' in text
+        assert "# TYPE omnicoreagent_background_agent_run_seconds histogram" in text
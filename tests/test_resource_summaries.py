@@ -0,0 +1,288 @@
+"""
+Tests for chunked resource summarization and the summary cache.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from mcp.server.lowlevel import Server
+from mcp.server.lowlevel.helper_types import ReadResourceContents
+from mcp.shared.memory import create_connected_server_and_client_session
+from mcp.types import ReadResourceResult, Resource, TextResourceContents, Tool
+
+from omnicoreagent.mcp_clients_connection.notifications import NotificationHandler
+from omnicoreagent.mcp_clients_connection.resource_summaries import (
+    CHUNK_PROMPT,
+    MERGE_PROMPT,
+    SUMMARY_PROMPT,
+    ResourceSummaryCache,
+    iter_chunks,
+    resource_summary_cache,
+)
+from omnicoreagent.mcp_clients_connection.resources import (
+    read_resource,
+    subscribe_resource,
+)
+
+URI = "file:///kb/handbook.md"
+
+
+class FakeSession:
+    def __init__(self, text: str):
+        self.text = text
+        self.reads = 0
+
+    async def read_resource(self, uri):
+        self.reads += 1
+        return ReadResourceResult(
+            contents=[TextResourceContents(uri=uri, text=self.text)]
+        )
+
+    async def subscribe_resource(self, uri):
+        pass
+
+
+class FakeLLM:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.prompts = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def __call__(self, messages):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        system, content = messages[0]["content"], messages[1]["content"]
+        self.prompts.append(system)
+        reply = f"summary of {len(content.split())} words"
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=reply))]
+        )
+
+
+def knowledge_base_server(state: dict) -> Server:
+    """MCP server with one resource and an ``edit`` tool that updates it."""
+    server = Server("kb")
+
+    @server.list_resources()
+    async def list_resources():
+        return [Resource(uri=URI, name="handbook")]
+
+    @server.read_resource()
+    async def read(uri):
+        state["reads"] += 1
+        return [ReadResourceContents(content=state["text"], mime_type="text/plain")]
+
+    @server.subscribe_resource()
+    async def subscribe(uri):
+        pass
+
+    @server.list_tools()
+    async def list_tools():
+        return [Tool(name="edit", inputSchema={"type": "object"})]
+
+    @server.call_tool()
+    async def call_tool(name, arguments):
+        state["text"] = arguments["text"]
+        await server.request_context.session.send_resource_updated(URI)
+        return []
+
+    return server
+
+
+def words(count: int, prefix: str = "word") -> str:
+    return " ".join(f"{prefix}{i}" for i in range(count))
+
+
+def read(session, llm, cache, server="kb", **kwargs):
+    return asyncio.run(
+        read_resource(
+            URI,
+            {server: {"session": session, "connected": True}},
+            {server: [SimpleNamespace(uri=URI)]},
+            llm,
+            cache=cache,
+            **kwargs,
+        )
+    )
+
+
+def subscribe(session, server="kb"):
+    asyncio.run(
+        subscribe_resource(
+            {server: {"session": session, "connected": True}},
+            URI,
+            {server: [SimpleNamespace(uri=URI)]},
+        )
+    )
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_cache():
+    yield
+    resource_summary_cache.clear()
+    for server in ("kb", "mirror"):
+        resource_summary_cache.unsubscribe(server, URI)
+
+
+class TestChunking:
+    """Tests for splitting text into token chunks."""
+
+    def test_chunks_preserve_text(self):
+        """Test that chunks hold at most chunk_tokens words and rejoin losslessly."""
+        text = "alpha beta\n\ngamma  delta epsilon\tzeta eta"
+
+        chunks = list(iter_chunks(text, 3))
+
+        assert "".join(chunks) == text
+        assert [len(chunk.split()) for chunk in chunks] == [3, 3, 1]
+
+    def test_text_without_whitespace_is_cut_by_length(self):
+        """Test that long tokens are split so no chunk exceeds chunk_chars."""
+        text = "short words " + "x" * 100 + " tail"
+
+        chunks = list(iter_chunks(text, 5, chunk_chars=30))
+
+        assert "".join(chunks) == text
+        assert max(len(chunk) for chunk in chunks) == 30
+        assert chunks[0] == "short words "
+
+
+class TestMapReduce:
+    """Tests for summarizing large resources."""
+
+    def test_small_resource_takes_one_call(self):
+        """Test that a resource under chunk_tokens is summarized directly."""
+        llm = FakeLLM()
+
+        summary = read(FakeSession(words(10)), llm, ResourceSummaryCache())
+
+        assert summary == "summary of 10 words"
+        assert llm.prompts == [SUMMARY_PROMPT]
+
+    def test_large_resource_is_chunked_and_merged(self):
+        """Test that chunks are summarized concurrently, then merged to one summary."""
+        llm = FakeLLM(delay=0.01)
+
+        read(
+            FakeSession(words(100)),
+            llm,
+            ResourceSummaryCache(),
+            chunk_tokens=10,
+            max_concurrency=3,
+        )
+
+        assert llm.prompts.count(CHUNK_PROMPT) == 10
+        assert MERGE_PROMPT in llm.prompts
+        assert llm.prompts[-1] == SUMMARY_PROMPT
+        assert llm.peak == 3
+
+    def test_minified_resource_is_chunked(self):
+        """Test that a resource with no whitespace is not sent in one call."""
+        llm = FakeLLM()
+        text = '{"rows":[' + ",".join(['{"id":1}'] * 200) + "]}"
+
+        read(FakeSession(text), llm, ResourceSummaryCache(), chunk_tokens=10)
+
+        assert llm.prompts.count(CHUNK_PROMPT) == -(-len(text) // 80)
+
+    def test_edit_only_resummarizes_changed_chunks(self):
+        """Test that unchanged chunks are served from the chunk cache."""
+        cache = ResourceSummaryCache()
+        session = FakeSession(words(40))
+        read(session, FakeLLM(), cache, chunk_tokens=10)
+
+        session.text = words(30) + " " + words(10, prefix="edited")
+        llm = FakeLLM()
+        read(session, llm, cache, chunk_tokens=10)
+
+        assert llm.prompts.count(CHUNK_PROMPT) == 1
+
+
+class TestSummaryCache:
+    """Tests for caching and invalidating resource summaries."""
+
+    def test_same_content_is_not_resummarized(self):
+        """Test that rereading unchanged content skips the LLM."""
+        cache = ResourceSummaryCache()
+        session = FakeSession(words(10))
+        read(session, FakeLLM(), cache)
+
+        llm = FakeLLM()
+        read(session, llm, cache)
+        session.text = words(12)
+        changed = read(session, llm, cache)
+
+        assert llm.prompts == [SUMMARY_PROMPT]
+        assert changed == "summary of 12 words"
+        assert session.reads == 3
+
+    def test_subscribed_resource_is_not_refetched_until_updated(self):
+        """Test that an update notification invalidates a subscribed resource."""
+        state = {"text": words(10), "reads": 0}
+        server = knowledge_base_server(state)
+        available = {"kb": [SimpleNamespace(uri=URI)]}
+
+        async def scenario():
+            async with create_connected_server_and_client_session(
+                server, message_handler=NotificationHandler("kb")
+            ) as session:
+                sessions = {"kb": {"session": session, "connected": True}}
+
+                async def read_summary():
+                    return await read_resource(
+                        URI,
+                        sessions,
+                        available,
+                        FakeLLM(),
+                        cache=resource_summary_cache,
+                    )
+
+                await subscribe_resource(sessions, URI, available)
+                await read_summary()
+                await read_summary()
+                reads_before_update = state["reads"]
+
+                await session.call_tool("edit", {"text": words(20)})
+                return reads_before_update, await read_summary()
+
+        reads_before_update, summary = asyncio.run(scenario())
+
+        assert reads_before_update == 1
+        assert summary == "summary of 20 words"
+        assert state["reads"] == 2
+
+    def test_update_during_summary_is_not_lost(self):
+        """Test that a notification arriving mid-summary forces a refetch."""
+        session = FakeSession(words(10))
+        subscribe(session)
+
+        class NotifiedLLM(FakeLLM):
+            async def __call__(self, messages):
+                resource_summary_cache.invalidate("kb", URI)
+                return await super().__call__(messages)
+
+        read(session, NotifiedLLM(), resource_summary_cache)
+        read(session, FakeLLM(), resource_summary_cache)
+
+        assert session.reads == 2
+
+    def test_subscriptions_are_per_server(self):
+        """Test that servers exposing the same URI do not share cache state."""
+        primary = FakeSession(words(10))
+        mirror = FakeSession(words(12))
+        subscribe(primary)
+        read(primary, FakeLLM(), resource_summary_cache)
+
+        summary = read(mirror, FakeLLM(), resource_summary_cache, server="mirror")
+        resource_summary_cache.unsubscribe("mirror", URI)
+        read(primary, FakeLLM(), resource_summary_cache)
+
+        assert summary == "summary of 12 words"
+        assert mirror.reads == 1
+        assert primary.reads == 1
@@ -0,0 +1,168 @@
+"""
+Tests for RouterAgent's local fast-path routing.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from omnicoreagent.omni_agent.workflow.router_agent import RouterAgent
+from omnicoreagent.omni_agent.workflow.routing import FastRouter
+
+REGISTRY = {
+    "BillingAgent": "Handles invoices, refunds, payments, charges and subscription billing.",
+    "TechSupport": "Troubleshoots login problems, crashes, errors and device setup.",
+    "SalesAgent": "Answers pricing questions, product demos and plan upgrades.",
+}
+
+
+pytestmark = pytest.mark.usefixtures("isolated_cwd")
+
+
+class FakeAgent:
+    """Duck-typed sub-agent that echoes its name."""
+
+    def __init__(self, name):
+        self.name = name
+        self.mcp_tools = None
+        self.system_instruction = REGISTRY[name]
+        self.llm_connection = SimpleNamespace(llm_call=self.llm_call)
+
+    async def list_all_available_tools(self):
+        return []
+
+    async def llm_call(self, messages):
+        return SimpleNamespace(
+            choices=[
+                SimpleNamespace(message=SimpleNamespace(content=REGISTRY[self.name]))
+            ]
+        )
+
+    async def run(self, query, session_id=None):
+        return {"response": f"{self.name} handled: {query}"}
+
+
+class TestFastRouter:
+    """Tests for FastRouter decisions."""
+
+    def test_confident_keyword_match(self):
+        """Test that an unambiguous task is routed locally."""
+        router = FastRouter(REGISTRY)
+
+        decision = router.route("I want a refund for a double charge on my invoice")
+
+        assert decision.agent_name == "BillingAgent"
+        assert decision.method == "bm25"
+
+    def test_ambiguous_task_falls_back(self):
+        """Test that a task with no clear winner is left to the LLM."""
+        router = FastRouter(REGISTRY)
+
+        assert router.route("hello there") is None
+        assert router.route("refund after the app crashes") is None
+
+    @pytest.mark.parametrize(
+        "task",
+        [
+            "what is the capital of france",
+            "is it going to rain in the city of london",
+            "what is the status of the thing",
+        ],
+    )
+    def test_unrelated_task_falls_back(self, task):
+        """Test that overlap on stopwords alone never routes locally."""
+        registry = {
+            "billing_agent": "What the customer is charged: it handles invoices "
+            "and refunds for the account of the user.",
+            "weather_agent": "Gives the weather forecast for a city.",
+        }
+        router = FastRouter(registry)
+
+        assert router.route(task) is None
+
+    def test_single_matched_term_falls_back(self):
+        """Test that one shared keyword is not enough for a local decision."""
+        router = FastRouter(REGISTRY)
+
+        assert router.route("how do refunds work at your company") is None
+        assert router.route("refund the double charge").agent_name == "BillingAgent"
+
+    def test_recorded_decision_is_cached(self):
+        """Test that an LLM decision is reused for the same task."""
+        router = FastRouter(REGISTRY)
+        router.record("Hello,  there", "SalesAgent")
+
+        decision = router.route("hello there")
+
+        assert decision.agent_name == "SalesAgent"
+        assert decision.method == "cache"
+
+    def test_recorded_decisions_teach_keywords(self):
+        """Test that recorded queries make similar queries routable."""
+        router = FastRouter(REGISTRY)
+        assert router.route("my kubernetes cluster is down") is None
+
+        router.record("kubernetes cluster unreachable", "TechSupport")
+
+        assert router.route("my kubernetes cluster is down").agent_name == "TechSupport"
+
+    def test_cache_is_bounded(self):
+        """Test that the decision cache keeps at most cache_size entries."""
+        router = FastRouter(REGISTRY, cache_size=2)
+        for task in ("one", "two", "three"):
+            router.record(task, "SalesAgent")
+
+        assert len(router._cache) == 2
+
+
+class TestRouterAgentRouting:
+    """Tests for the tiered routing in RouterAgent.run."""
+
+    def make_router(self, monkeypatch, **kwargs):
+        router = RouterAgent(
+            sub_agents=[FakeAgent(name) for name in REGISTRY],
+            model_config={"provider": "openai", "model": "gpt-4o-mini"},
+            agent_config={"max_steps": 5, "tool_call_timeout": 5},
+            **kwargs,
+        )
+        llm_calls = []
+
+        async def fake_route_with_llm(task, session_id):
+            llm_calls.append(task)
+            return "<routing><agent>SalesAgent</agent><task>hi</task></routing>"
+
+        monkeypatch.setattr(router, "_route_with_llm", fake_route_with_llm)
+        asyncio.run(router.initialize())
+        return router, llm_calls
+
+    def test_fast_path_skips_llm(self, monkeypatch):
+        """Test that a confident local match does not call the LLM router."""
+        router, llm_calls = self.make_router(monkeypatch)
+
+        result = asyncio.run(router.run("Please refund the duplicate payment"))
+
+        assert llm_calls == []
+        assert result["routing"]["method"] == "bm25"
+        assert result["response"].startswith("BillingAgent")
+
+    def test_llm_fallback_is_learned(self, monkeypatch):
+        """Test that an LLM decision is reused for the next identical task."""
+        router, llm_calls = self.make_router(monkeypatch)
+
+        first = asyncio.run(router.run("hi"))
+        second = asyncio.run(router.run("hi"))
+
+        assert len(llm_calls) == 1
+        assert first["routing"]["method"] == "llm"
+        assert second["routing"]["method"] == "cache"
+        assert second["response"].startswith("SalesAgent")
+
+    def test_fast_routing_can_be_disabled(self, monkeypatch):
+        """Test that fast_routing=False always asks the LLM."""
+        router, llm_calls = self.make_router(monkeypatch, fast_routing=False)
+
+        asyncio.run(router.run("Please refund the duplicate payment"))
+        asyncio.run(router.run("Please refund the duplicate payment"))
+
+        assert len(llm_calls) == 2
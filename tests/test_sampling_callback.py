@@ -0,0 +1,233 @@
+"""
+Tests for the MCP sampling callback: config caching, limits and accounting.
+"""
+
+import asyncio
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+from mcp.types import (
+    CreateMessageRequestParams,
+    CreateMessageResult,
+    ErrorData,
+    SamplingMessage,
+    TextContent,
+)
+
+from omnicoreagent.core import llm_client as llm_client_module
+from omnicoreagent.core.usage_ledger import UsageLedger
+from omnicoreagent.mcp_clients_connection import sampling as sampling_module
+from omnicoreagent.mcp_clients_connection.sampling import samplingCallback
+
+
+class FakeLiteLLM:
+    def __init__(self, delay: float = 0.0, failures: int = 0):
+        self.delay = delay
+        self.failures = failures
+        self.calls = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def acompletion(self, **params):
+        self.calls.append(params)
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("429 Too Many Requests: rate limit reached")
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        return SimpleNamespace(
+            choices=[
+                SimpleNamespace(
+                    message=SimpleNamespace(content="sampled"), finish_reason="stop"
+                )
+            ],
+            usage=SimpleNamespace(
+                prompt_tokens=30, completion_tokens=10, total_tokens=40
+            ),
+        )
+
+
+@pytest.fixture
+def fake_litellm(monkeypatch):
+    fake = FakeLiteLLM()
+    monkeypatch.setattr(llm_client_module, "get_litellm", lambda: fake)
+    return fake
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "servers_config.json"
+    path.write_text(json.dumps({"LLM": {"provider": "groq", "model": "llama"}}))
+    return path
+
+
+def request(max_tokens: int = 100) -> CreateMessageRequestParams:
+    return CreateMessageRequestParams(
+        messages=[
+            SamplingMessage(role="user", content=TextContent(type="text", text="hi"))
+        ],
+        maxTokens=max_tokens,
+    )
+
+
+def make_callback(config_file, **kwargs) -> samplingCallback:
+    kwargs.setdefault("usage_ledger", UsageLedger())
+    return samplingCallback(
+        config_filename=str(config_file), credentials={"api_key": "key"}, **kwargs
+    )
+
+
+class TestConfigCache:
+    """Tests for caching the parsed configuration and LLM clients."""
+
+    def test_config_is_reread_only_when_modified(self, config_file, fake_litellm):
+        """Test that the config file is parsed once until its mtime changes."""
+        callback = make_callback(config_file)
+        sample = callback.for_server("kb")
+
+        async def main():
+            await sample(None, request())
+            await sample(None, request())
+
+        asyncio.run(main())
+        config_file.write_text(
+            json.dumps({"LLM": {"provider": "groq", "model": "mixtral"}})
+        )
+        stat = os.stat(config_file)
+        os.utime(config_file, (stat.st_atime, stat.st_mtime + 10))
+        result = asyncio.run(sample(None, request()))
+
+        assert [call["model"] for call in fake_litellm.calls] == [
+            "groq/llama",
+            "groq/llama",
+            "groq/mixtral",
+        ]
+        assert result.model == "mixtral"
+
+    def test_client_is_reused_with_credentials(self, config_file, fake_litellm):
+        """Test that requests share one LLMClient carrying the configured key."""
+        callback = make_callback(config_file)
+
+        async def main():
+            await callback._sampling(None, request())
+            first = callback._clients["llama"]
+            await callback._sampling(None, request())
+            return first, callback._clients["llama"]
+
+        first, second = asyncio.run(main())
+
+        assert first is second
+        assert fake_litellm.calls[0]["api_key"] == "key"
+
+
+class TestLimits:
+    """Tests for per-server concurrency and budgets."""
+
+    def test_concurrency_is_limited_per_server(self, config_file, monkeypatch):
+        """Test that one server cannot have more than max_concurrency requests in flight."""
+        fake = FakeLiteLLM(delay=0.02)
+        monkeypatch.setattr(llm_client_module, "get_litellm", lambda: fake)
+        callback = make_callback(config_file, max_concurrency=2)
+        busy = callback.for_server("busy")
+
+        async def main():
+            results = await asyncio.gather(*(busy(None, request()) for _ in range(6)))
+            return results
+
+        results = asyncio.run(main())
+
+        assert all(isinstance(result, CreateMessageResult) for result in results)
+        assert fake.peak == 2
+
+    def test_token_budget_and_max_tokens(self, config_file, fake_litellm):
+        """Test that a server is cut off at its budget and maxTokens is capped."""
+        ledger = UsageLedger()
+        callback = make_callback(
+            config_file,
+            token_budget=80,
+            max_tokens_per_request=50,
+            usage_ledger=ledger,
+            tenant_id="acme",
+        )
+        chatty = callback.for_server("chatty")
+
+        async def main():
+            return [await chatty(None, request(max_tokens=500)) for _ in range(3)]
+
+        results = asyncio.run(main())
+        other = asyncio.run(callback.for_server("quiet")(None, request()))
+
+        assert [type(result) for result in results] == [
+            CreateMessageResult,
+            CreateMessageResult,
+            ErrorData,
+        ]
+        assert isinstance(other, CreateMessageResult)
+        assert fake_litellm.calls[0]["max_tokens"] == 50
+        assert ledger.agents()[("acme", "mcp_sampling:chatty")].total_tokens == 80
+        assert callback.stats()["chatty"]["rejected"] == 1
+
+    def test_rate_limit_errors_are_retried(self, config_file, monkeypatch):
+        """Test that transient provider errors are retried."""
+        fake = FakeLiteLLM(failures=1)
+        monkeypatch.setattr(llm_client_module, "get_litellm", lambda: fake)
+        monkeypatch.setattr(sampling_module.random, "uniform", lambda a, b: 0.0)
+        callback = make_callback(config_file)
+
+        result = asyncio.run(callback._sampling(None, request()))
+
+        assert isinstance(result, CreateMessageResult)
+        assert len(fake.calls) == 2
+
+
+@pytest.mark.usefixtures("isolated_cwd")
+class TestAgentConfiguration:
+    """Tests for configuring sampling limits through OmniCoreAgent."""
+
+    def make_agent(self, sampling):
+        from omnicoreagent.omni_agent.agent import OmniCoreAgent
+
+        return OmniCoreAgent(
+            name="researcher",
+            system_instruction="You are helpful.",
+            model_config={
+                "provider": "openai",
+                "model": "gpt-4o-mini",
+                "sampling": sampling,
+            },
+            mcp_tools=[{"name": "kb", "command": "kb-server"}],
+            usage_ledger=UsageLedger(),
+        )
+
+    def test_model_config_sampling_limits_reach_callback(self, fake_litellm):
+        """Test that the sampling block of model_config limits each server."""
+        agent = self.make_agent(
+            {"token_budget": 80, "max_tokens_per_request": 50, "max_concurrency": 1}
+        )
+        callback = agent.mcp_client.sampling_callback
+        sample = callback.for_server("kb")
+
+        async def main():
+            return [await sample(None, request(max_tokens=500)) for _ in range(3)]
+
+        results = asyncio.run(main())
+
+        assert callback.max_concurrency == 1
+        assert [type(result) for result in results] == [
+            CreateMessageResult,
+            CreateMessageResult,
+            ErrorData,
+        ]
+        assert fake_litellm.calls[0]["max_tokens"] == 50
+        assert callback.stats()["kb"]["rejected"] == 1
+
+    def test_unknown_sampling_option_is_rejected(self):
+        """Test that a misspelt sampling option fails at construction."""
+        with pytest.raises(ValueError, match="token_budjet"):
+            self.make_agent({"token_budjet": 80})
@@ -0,0 +1,145 @@
+"""
+Tests for per-session locking and eviction of BaseReactAgent session state.
+"""
+
+import asyncio
+
+import pytest
+
+from omnicoreagent.core.agents.react_agent import ReactAgent
+from omnicoreagent.core.types import AgentConfig
+
+
+def make_agent(**overrides) -> ReactAgent:
+    config = {
+        "agent_name": "session_agent",
+        "max_steps": 5,
+        "tool_call_timeout": 5,
+        **overrides,
+    }
+    return ReactAgent(config=AgentConfig(**config))
+
+
+async def run_query(agent: ReactAgent, session_id: str):
+    return await agent.run(
+        system_prompt="system",
+        query="hello",
+        llm_connection=None,
+        add_message_to_history=None,
+        message_history=None,
+        session_id=session_id,
+    )
+
+
+def instrument(agent: ReactAgent, monkeypatch) -> dict:
+    """Replace the ReAct loop with a sleep that records overlapping runs."""
+    stats = {"active": {}, "max_overlap": {}, "order": []}
+
+    async def fake_run_session(**kwargs):
+        session_id = kwargs["session_id"]
+        agent._get_session_state(session_id=session_id, debug=False)
+        active = stats["active"].get(session_id, 0) + 1
+        stats["active"][session_id] = active
+        stats["max_overlap"][session_id] = max(
+            stats["max_overlap"].get(session_id, 0), active
+        )
+        await asyncio.sleep(0.01)
+        stats["active"][session_id] -= 1
+        stats["order"].append(session_id)
+        return {"answer": session_id}
+
+    monkeypatch.setattr(agent, "_run_session", fake_run_session)
+    return stats
+
+
+class TestSessionLocking:
+    """Tests for the per-session concurrency contract."""
+
+    def test_same_session_runs_are_serialized(self, monkeypatch):
+        """Test that concurrent runs on one session never overlap."""
+        agent = make_agent()
+        stats = instrument(agent, monkeypatch)
+
+        async def main():
+            await asyncio.gather(*(run_query(agent, "s1") for _ in range(5)))
+
+        asyncio.run(main())
+
+        assert stats["max_overlap"]["s1"] == 1
+        assert stats["order"] == ["s1"] * 5
+
+    def test_different_sessions_run_concurrently(self, monkeypatch):
+        """Test that distinct sessions are not serialized against each other."""
+        agent = make_agent()
+        instrument(agent, monkeypatch)
+
+        async def main():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            await asyncio.gather(*(run_query(agent, f"s{i}") for i in range(10)))
+            return loop.time() - start
+
+        assert asyncio.run(main()) < 0.08
+
+    def test_locks_released_after_eviction(self, monkeypatch):
+        """Test that finished sessions do not leak locks once evicted."""
+        agent = make_agent(max_sessions=2)
+        instrument(agent, monkeypatch)
+
+        async def main():
+            for i in range(5):
+                await run_query(agent, f"s{i}")
+
+        asyncio.run(main())
+
+        assert len(agent._session_states) == 2
+        assert len(agent._session_locks) <= 2
+        assert not agent._session_active_runs
+
+
+class TestSessionEviction:
+    """Tests for LRU and TTL eviction of session states."""
+
+    def test_lru_eviction(self):
+        """Test that the least recently used session is evicted first."""
+        agent = make_agent(max_sessions=2)
+        agent._get_session_state("a", debug=False)
+        agent._get_session_state("b", debug=False)
+        agent._get_session_state("a", debug=False)
+        agent._get_session_state("c", debug=False)
+
+        keys = [session_id for session_id, _ in agent._session_states]
+        assert keys == ["a", "c"]
+
+    def test_ttl_eviction(self, monkeypatch):
+        """Test that idle sessions older than session_ttl are dropped."""
+        agent = make_agent(session_ttl=10)
+        now = [100.0]
+        monkeypatch.setattr(
+            "omnicoreagent.core.agents.base.time.monotonic", lambda: now[0]
+        )
+
+        agent._get_session_state("old", debug=False)
+        now[0] += 11
+        agent._get_session_state("new", debug=False)
+
+        keys = [session_id for session_id, _ in agent._session_states]
+        assert keys == ["new"]
+
+    def test_active_session_not_evicted(self):
+        """Test that a session with a run in progress is never evicted."""
+        agent = make_agent(max_sessions=1)
+
+        async def main():
+            async with agent.session_lock("busy"):
+                agent._get_session_state("busy", debug=False)
+                agent._get_session_state("other", debug=False)
+                return [session_id for session_id, _ in agent._session_states]
+
+        assert "busy" in asyncio.run(main())
+
+    @pytest.mark.parametrize("field", ["max_sessions", "session_ttl"])
+    def test_config_validation(self, field):
+        """Test that invalid limits are rejected by AgentConfig."""
+        with pytest.raises(ValueError):
+            make_agent(**{field: -1})
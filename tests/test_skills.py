@@ -2,14 +2,17 @@
 Tests for Agent Skills module.
 """
 
+import asyncio
 import sys
 import json
 import tempfile
+import threading
 from pathlib import Path
 
 import pytest
 from unittest.mock import MagicMock, patch
 
+from omnicoreagent.core.skills.cache import SkillCatalogCache, SkillFileCache
 from omnicoreagent.core.skills.models import SkillMetadata
 from omnicoreagent.core.skills.manager import SkillManager
 from omnicoreagent.core.skills.tools import build_skill_tools
@@ -321,3 +324,141 @@ print(json.dumps({"args": sys.argv[1:]}))
                 mock_run.assert_called_once()
                 actual_cmd = mock_run.call_args[0][0]
                 assert actual_cmd == expected_cmd
+
+
+class TestSkillCaches:
+    """Tests for the skill catalog, file and XML context caches."""
+
+    def setup_method(self):
+        """Create a temporary skills directory and private caches."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.skills_root = Path(self.temp_dir) / "skills"
+        self.skills_root.mkdir()
+        self.catalog = SkillCatalogCache()
+        self.parsed = []
+
+    def _create_skill(self, name: str, description: str = "Test skill"):
+        skill_dir = self.skills_root / name
+        skill_dir.mkdir(exist_ok=True)
+        (skill_dir / "SKILL.md").write_text(
+            f"---\nname: {name}\ndescription: {description}\n---\n# {name}\n"
+        )
+        return skill_dir
+
+    def _manager(self) -> SkillManager:
+        manager = SkillManager(self.skills_root, catalog_cache=self.catalog)
+        load = manager._load_skill_metadata
+
+        def counting_load(skill_dir):
+            self.parsed.append(skill_dir.name)
+            return load(skill_dir)
+
+        manager._load_skill_metadata = counting_load
+        return manager
+
+    def test_catalog_is_shared_between_managers(self):
+        """Test that a second manager reuses the parsed skills."""
+        self._create_skill("skill-one")
+        self._create_skill("skill-two")
+
+        self._manager().discover_skills()
+        skills = self._manager().discover_skills()
+
+        assert {s.name for s in skills} == {"skill-one", "skill-two"}
+        assert sorted(self.parsed) == ["skill-one", "skill-two"]
+        assert self.catalog.hits == 1
+
+    def test_only_changed_skills_are_reparsed(self):
+        """Test that editing one SKILL.md reparses only that skill."""
+        self._create_skill("skill-one")
+        self._create_skill("skill-two")
+        manager = self._manager()
+        manager.discover_skills()
+        self.parsed.clear()
+
+        self._create_skill("skill-two", "Edited description")
+        manager.discover_skills()
+
+        assert self.parsed == ["skill-two"]
+        assert manager.get_skill("skill-two").description == "Edited description"
+
+    def test_refresh_reloads_and_resets_context(self):
+        """Test that refresh detects new skills and rebuilds the XML context."""
+        self._create_skill("skill-one")
+        manager = self._manager()
+        manager.discover_skills()
+        xml = manager.get_skills_context_xml()
+
+        assert manager.get_skills_context_xml() is xml
+        assert manager.refresh() is False
+
+        self._create_skill("skill-two")
+
+        assert manager.refresh() is True
+        assert "<name>skill-two</name>" in manager.get_skills_context_xml()
+
+    def test_watching_picks_up_new_skills(self):
+        """Test that polling reloads the catalog in the background."""
+        manager = self._manager()
+        manager.discover_skills()
+
+        async def main():
+            manager.start_watching(interval=0.01)
+            self._create_skill("late-skill")
+            for _ in range(100):
+                if manager.get_skill("late-skill"):
+                    break
+                await asyncio.sleep(0.01)
+            await manager.stop_watching()
+
+        asyncio.run(main())
+
+        assert manager.get_skill("late-skill") is not None
+
+    def test_watcher_replaces_catalog_on_the_event_loop(self):
+        """Test that the watch thread only scans and the loop swaps the catalog."""
+        self._create_skill("skill-one")
+        manager = self._manager()
+        manager.discover_skills()
+        before = manager.skills
+        install_threads = []
+        install = manager._install
+
+        def recording_install(signature, skills):
+            install_threads.append(threading.get_ident())
+            install(signature, skills)
+
+        manager._install = recording_install
+
+        async def main():
+            manager.start_watching(interval=0.01)
+            self._create_skill("skill-two")
+            for _ in range(100):
+                if manager.get_skill("skill-two"):
+                    break
+                await asyncio.sleep(0.01)
+            await manager.stop_watching()
+
+        asyncio.run(main())
+
+        assert install_threads == [threading.get_ident()]
+        assert list(before) == ["skill-one"]
+        assert manager.skills is not before
+
+    def test_file_cache_revalidates_and_bounds_size(self):
+        """Test that edited files are reread and the cache stays within max_bytes."""
+        cache = SkillFileCache(max_bytes=25)
+        first = Path(self.temp_dir) / "first.txt"
+        second = Path(self.temp_dir) / "second.txt"
+        first.write_text("x" * 10)
+        second.write_text("y" * 20)
+
+        assert cache.read(first) == "x" * 10
+        assert cache.read(first) == "x" * 10
+        first.write_text("z" * 12)
+        assert cache.read(first) == "z" * 12
+        cache.read(second)
+
+        assert cache.hits == 1
+        assert cache.stats()["entries"] == 1
+        assert cache.stats()["bytes"] == 20
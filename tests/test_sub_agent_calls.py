@@ -0,0 +1,155 @@
+"""
+Tests for sub-agent fan-out in BaseReactAgent.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from omnicoreagent.core.agents.react_agent import ReactAgent
+from omnicoreagent.core.token_usage import Usage
+from omnicoreagent.core.types import AgentConfig
+
+
+class FakeSubAgent:
+    def __init__(self, name, delay=0.0, mcp_tools=None, tracker=None):
+        self.name = name
+        self.system_instruction = f"{name} does things."
+        self.mcp_tools = mcp_tools
+        self.mcp_client = SimpleNamespace(sessions={})
+        self.delay = delay
+        self.tracker = tracker if tracker is not None else {"now": 0, "peak": 0}
+        self.connects = 0
+        self.cleanups = 0
+
+    async def connect_mcp_servers(self):
+        self.connects += 1
+        self.mcp_client.sessions["server"] = object()
+
+    async def cleanup_mcp_servers(self):
+        self.cleanups += 1
+        self.mcp_client.sessions.clear()
+
+    async def run(self, query: str, session_id: str = None):
+        self.tracker["now"] += 1
+        self.tracker["peak"] = max(self.tracker["peak"], self.tracker["now"])
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.tracker["now"] -= 1
+        return {"response": f"{self.name}: {query}"}
+
+
+def make_agent(**overrides) -> ReactAgent:
+    return ReactAgent(
+        AgentConfig(agent_name="parent", max_steps=5, tool_call_timeout=5, **overrides)
+    )
+
+
+def call_sub_agents(agent, calls, sub_agents):
+    session_state = SimpleNamespace(messages=[])
+
+    async def add_message_to_history(**kwargs):
+        pass
+
+    asyncio.run(
+        agent.execute_sub_agent_calls(
+            response="<agent_calls/>",
+            agent_calls=calls,
+            sub_agents=sub_agents,
+            session_id="s1",
+            session_state=session_state,
+            add_message_to_history=add_message_to_history,
+            run_usage=Usage(),
+        )
+    )
+    return session_state.messages[-1].content
+
+
+def calls_for(*names):
+    return [{"agent": name, "parameters": {"query": "go"}} for name in names]
+
+
+class TestFanOut:
+    """Tests for concurrency limits and timeouts."""
+
+    def test_max_parallel_sub_agents(self):
+        """Test that no more than max_parallel_sub_agents calls run at once."""
+        tracker = {"now": 0, "peak": 0}
+        sub_agents = [
+            FakeSubAgent(f"a{i}", delay=0.01, tracker=tracker) for i in range(6)
+        ]
+
+        observation = call_sub_agents(
+            make_agent(max_parallel_sub_agents=2),
+            calls_for(*(a.name for a in sub_agents)),
+            sub_agents,
+        )
+
+        assert tracker["peak"] == 2
+        assert "a5: go" in observation
+
+    def test_timeout_reports_error(self):
+        """Test that a slow sub-agent is cancelled and reported as an error."""
+        slow = FakeSubAgent("slow", delay=1)
+        fast = FakeSubAgent("fast")
+
+        observation = call_sub_agents(
+            make_agent(sub_agent_timeout=0.05), calls_for("slow", "fast"), [slow, fast]
+        )
+
+        assert "timed out" in observation
+        assert "fast: go" in observation
+        assert slow.tracker["now"] == 0
+
+
+class TestConnectionReuse:
+    """Tests for keeping sub-agent MCP connections between calls."""
+
+    def test_connects_once_and_cleans_up_later(self):
+        """Test that MCP servers are connected on first use and kept."""
+        agent = make_agent()
+        sub_agent = FakeSubAgent("tools", mcp_tools=[{"name": "fs"}])
+
+        call_sub_agents(agent, calls_for("tools", "tools"), [sub_agent])
+        call_sub_agents(agent, calls_for("tools"), [sub_agent])
+
+        assert (sub_agent.connects, sub_agent.cleanups) == (1, 0)
+
+        asyncio.run(agent.cleanup_sub_agents())
+        assert sub_agent.cleanups == 1
+
+    def test_already_connected_sub_agent_is_left_alone(self):
+        """Test that sub-agents connected by the caller are not torn down."""
+        agent = make_agent()
+        sub_agent = FakeSubAgent("tools", mcp_tools=[{"name": "fs"}])
+        sub_agent.mcp_client.sessions["server"] = object()
+
+        call_sub_agents(agent, calls_for("tools"), [sub_agent])
+        asyncio.run(agent.cleanup_sub_agents())
+
+        assert (sub_agent.connects, sub_agent.cleanups) == (0, 0)
+
+
+class TestRegistryCache:
+    """Tests for the cached sub-agent registry text."""
+
+    def test_registry_is_cached_until_agents_change(self, monkeypatch):
+        """Test that the registry is rebuilt only when sub-agents change."""
+        agent = make_agent()
+        sub_agents = [FakeSubAgent("a"), FakeSubAgent("b")]
+        builds = []
+        build = agent._build_sub_agents_registry
+        monkeypatch.setattr(
+            agent,
+            "_build_sub_agents_registry",
+            lambda agents: builds.append(1) or build(agents),
+        )
+
+        first = asyncio.run(agent.sub_agents_registry(sub_agents))
+        second = asyncio.run(agent.sub_agents_registry(list(sub_agents)))
+        sub_agents[0].system_instruction = "a now does other things."
+        third = asyncio.run(agent.sub_agents_registry(sub_agents))
+
+        assert first == second
+        assert "other things" in third
+        assert len(builds) == 2
@@ -0,0 +1,190 @@
+"""
+Tests for hot-path spans, the histogram aggregator and the OpenTelemetry exporter.
+"""
+
+import asyncio
+
+import pytest
+
+from omnicoreagent.core.memory_store.memory_router import MemoryRouter
+from omnicoreagent.core.tools.local_tools_registry import ToolRegistry
+from omnicoreagent.core.tools.tools_handler import LocalToolHandler, ToolExecutor
+from omnicoreagent.core.tracing import (
+    NOOP_SPAN,
+    HistogramAggregator,
+    OpenTelemetryExporter,
+    SpanProcessor,
+    get_current_span,
+    tracer,
+)
+
+
+class Recorder(SpanProcessor):
+    def __init__(self):
+        self.spans = []
+
+    def on_end(self, span):
+        self.spans.append(span)
+
+
+@pytest.fixture
+def recorder():
+    recorder = tracer.add_processor(Recorder())
+    yield recorder
+    tracer.clear()
+
+
+class TestTracer:
+    """Tests for span creation, nesting and the disabled fast path."""
+
+    def test_disabled_tracer_returns_the_noop_span(self):
+        """Test that no span is created while no processor is registered."""
+        assert not tracer.enabled
+        with tracer.span("llm.call", agent="a") as span:
+            span.set_attribute("tokens", 3)
+            assert get_current_span() is None
+
+        assert span is NOOP_SPAN
+        assert not span.recording
+
+    def test_spans_nest_and_record_errors(self, recorder):
+        """Test parent links, attributes and that errors propagate and are recorded."""
+        with tracer.span("agent.run", agent="a") as run:
+            with tracer.span("llm.call") as call:
+                call.set_attributes(total_tokens=12)
+            with pytest.raises(ValueError):
+                with tracer.span("tool.execute"):
+                    raise ValueError("boom")
+
+        names = [span.name for span in recorder.spans]
+        assert names == ["llm.call", "tool.execute", "agent.run"]
+        assert call.parent is run
+        assert call.attributes == {"total_tokens": 12}
+        assert isinstance(recorder.spans[1].error, ValueError)
+        assert run.duration_ms >= call.duration_ms
+        assert get_current_span() is None
+
+    def test_removing_the_last_processor_disables_tracing(self):
+        """Test that tracing is enabled only while a processor is registered."""
+        processor = tracer.add_processor(Recorder())
+        assert tracer.enabled
+        tracer.remove_processor(processor)
+
+        assert not tracer.enabled
+        assert tracer.span("x") is NOOP_SPAN
+
+
+class TestHistogramAggregator:
+    """Tests for the in-process latency histograms."""
+
+    def test_summary_and_percentiles(self):
+        """Test counts, totals and bucket-based percentiles per span name."""
+        aggregator = HistogramAggregator(buckets_ms=(1.0, 10.0, 100.0))
+        for duration in [0.5] * 90 + [50.0] * 10:
+            span = tracer_span("memory.read", duration)
+            aggregator.on_end(span)
+
+        summary = aggregator.summary()["memory.read"]
+
+        assert summary["count"] == 100
+        assert summary["sum_ms"] == pytest.approx(545.0)
+        assert summary["p50_ms"] == 1.0
+        assert summary["p95_ms"] == 50.0
+        assert aggregator.buckets()["memory.read"][-1] == (float("inf"), 100)
+
+
+def tracer_span(name, duration_ms):
+    recorder = Recorder()
+    tracer.add_processor(recorder)
+    try:
+        with tracer.span(name) as span:
+            pass
+    finally:
+        tracer.remove_processor(recorder)
+    span.end_ns = span.start_ns + int(duration_ms * 1e6)
+    return span
+
+
+class TestInstrumentation:
+    """Tests for the spans opened by the tool executor and memory router."""
+
+    def test_tool_and_memory_spans(self, recorder):
+        """Test that each tool runs in its own span and each history write is recorded."""
+        registry = ToolRegistry()
+
+        @registry.register_tool(name="add", description="Add")
+        def add(a: int, b: int) -> int:
+            return a + b
+
+        router = MemoryRouter("in_memory")
+
+        async def scenario():
+            executor = ToolExecutor(LocalToolHandler(registry))
+            with tracer.span("agent.run"):
+                await executor.execute(
+                    agent_name="agent",
+                    tool_name="add_and_add",
+                    tool_args=[{"a": 1, "b": 2}, {"a": 3, "b": 4}],
+                    tool_call_id="call-1",
+                    add_message_to_history=router.store_message,
+                    session_id="s1",
+                )
+
+        asyncio.run(scenario())
+
+        names = [span.name for span in recorder.spans]
+        assert names.count("tool.execute") == 2
+        assert names.count("memory.write") == 2
+        assert all(span.parent.name == "agent.run" for span in recorder.spans[:-1])
+        assert recorder.spans[0].attributes["tool"] == "add"
+
+
+def test_opentelemetry_exporter():
+    """Test that spans are forwarded with parents, attributes and end times."""
+    trace = pytest.importorskip("opentelemetry.trace")
+
+    class FakeOtelSpan(trace.NonRecordingSpan):
+        def __init__(self, name, parent, start_time):
+            super().__init__(trace.INVALID_SPAN_CONTEXT)
+            self.parent = parent
+            self.start_time = start_time
+            self.attributes = {}
+
+        def set_attribute(self, key, value):
+            self.attributes[key] = value
+
+        def end(self, end_time=None):
+            self.end_time = end_time
+
+    class FakeOtelTracer:
+        def __init__(self):
+            self.spans = []
+
+        def start_span(self, name, context=None, start_time=None, **kwargs):
+            parent = trace.get_current_span(context) if context is not None else None
+            span = FakeOtelSpan(name, parent, start_time)
+            self.spans.append(span)
+            return span
+
+    class FakeTracerProvider:
+        def __init__(self):
+            self.tracer = FakeOtelTracer()
+
+        def get_tracer(self, *args, **kwargs):
+            return self.tracer
+
+    provider = FakeTracerProvider()
+    exporter = tracer.add_processor(OpenTelemetryExporter(tracer_provider=provider))
+    try:
+        with tracer.span("agent.run", agent="a"):
+            with tracer.span("llm.call") as call:
+                call.set_attribute("total_tokens", 7)
+    finally:
+        tracer.remove_processor(exporter)
+
+    run_span, call_span = provider.tracer.spans
+    assert call_span.parent is run_span
+    assert call_span.attributes == {"total_tokens": 7}
+    assert run_span.attributes == {"agent": "a"}
+    assert call_span.end_time >= call_span.start_time
+    assert run_span.end_time >= call_span.end_time
@@ -0,0 +1,218 @@
+"""
+Tests for per-(tenant, agent, session) usage accounting.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from omnicoreagent.core.agents.react_agent import ReactAgent
+from omnicoreagent.core.token_usage import Usage, UsageLimitExceeded
+from omnicoreagent.core.types import AgentConfig
+from omnicoreagent.core.usage_ledger import (
+    InMemoryUsageSink,
+    UsageLedger,
+    UsageSink,
+    make_usage_key,
+)
+
+
+def call_usage(tokens: int = 15) -> Usage:
+    return Usage(
+        requests=1, request_tokens=tokens - 5, response_tokens=5, total_tokens=tokens
+    )
+
+
+class FakeLLM:
+    """LLM connection that answers immediately and reports token usage."""
+
+    async def llm_call(self, messages):
+        return SimpleNamespace(
+            usage=SimpleNamespace(
+                prompt_tokens=10, completion_tokens=5, total_tokens=15
+            ),
+            choices=[
+                SimpleNamespace(
+                    message=SimpleNamespace(
+                        content="<thought>ok</thought><final_answer>done</final_answer>"
+                    )
+                )
+            ],
+        )
+
+
+async def add_message(**kwargs):
+    return None
+
+
+async def get_messages(**kwargs):
+    return []
+
+
+class TestUsageLedger:
+    """Tests for UsageLedger bookkeeping."""
+
+    def test_record_updates_all_scopes(self):
+        """Test that one record is visible at session, agent and tenant scope."""
+        ledger = UsageLedger()
+        ledger.record(("acme", "support", "s1"), call_usage())
+        ledger.record(("acme", "support", "s2"), call_usage())
+        ledger.record(("acme", "billing", "s1"), call_usage())
+        ledger.record(("other", "support", "s1"), call_usage())
+
+        key = ("acme", "support", "s1")
+        assert ledger.get_usage(key, "session").requests == 1
+        assert ledger.get_usage(key, "agent").requests == 2
+        assert ledger.get_usage(key, "tenant").requests == 3
+        assert ledger.get_usage(("other", "support", "s1"), "tenant").requests == 1
+
+    def test_unknown_key_and_scope(self):
+        """Test that unknown keys are empty and unknown scopes are rejected."""
+        ledger = UsageLedger()
+
+        assert ledger.get_usage(("t", "a", "s")).requests == 0
+        with pytest.raises(ValueError):
+            ledger.get_usage(("t", "a", "s"), scope="global")
+
+    def test_session_totals_are_bounded(self):
+        """Test that per-session totals are evicted LRU while aggregates remain."""
+        ledger = UsageLedger(max_sessions=2)
+        for session_id in ("s1", "s2", "s3"):
+            ledger.record(("acme", "support", session_id), call_usage())
+
+        assert ledger.get_usage(("acme", "support", "s1")).requests == 0
+        assert ledger.get_usage(("acme", "support", "s3")).requests == 1
+        assert ledger.tenants()["acme"].requests == 3
+
+    def test_reset_tenant(self):
+        """Test that resetting one tenant leaves the others untouched."""
+        ledger = UsageLedger()
+        ledger.record(("a", "agent", "s"), call_usage())
+        ledger.record(("b", "agent", "s"), call_usage())
+
+        ledger.reset("a")
+
+        assert "a" not in ledger.tenants()
+        assert ledger.tenants()["b"].requests == 1
+
+    def test_make_usage_key_defaults(self):
+        """Test that missing tenant and session are filled in."""
+        assert make_usage_key(None, "agent", None) == ("default", "agent", "")
+
+
+class TestUsageFlush:
+    """Tests for flushing deltas to a sink."""
+
+    def test_flush_writes_deltas_once(self):
+        """Test that flushed deltas are not written twice."""
+        sink = InMemoryUsageSink()
+        ledger = UsageLedger(sink=sink)
+        key = ("acme", "support", "s1")
+        ledger.record(key, call_usage())
+        ledger.record(key, call_usage())
+
+        asyncio.run(ledger.flush())
+        asyncio.run(ledger.flush())
+
+        assert sink.totals[key].requests == 2
+        assert sink.totals[key].total_tokens == 30
+
+    def test_failed_flush_is_retried(self):
+        """Test that deltas are kept when the sink fails."""
+
+        class FlakySink(UsageSink):
+            def __init__(self):
+                self.fail = True
+                self.written = []
+
+            async def write(self, deltas):
+                if self.fail:
+                    raise ConnectionError("sink down")
+                self.written.append(deltas)
+
+        sink = FlakySink()
+        ledger = UsageLedger(sink=sink)
+        ledger.record(("acme", "support", "s1"), call_usage())
+
+        asyncio.run(ledger.flush())
+        sink.fail = False
+        asyncio.run(ledger.flush())
+
+        assert sink.written[0][("acme", "support", "s1")].requests == 1
+
+    def test_stop_flushes_pending(self):
+        """Test that stopping the background flush writes what is pending."""
+        sink = InMemoryUsageSink()
+        ledger = UsageLedger(sink=sink, flush_interval=3600)
+
+        async def main():
+            ledger.start()
+            ledger.record(("acme", "support", "s1"), call_usage())
+            await ledger.stop()
+
+        asyncio.run(main())
+
+        assert sink.totals[("acme", "support", "s1")].requests == 1
+
+    def test_export_prometheus(self):
+        """Test the Prometheus text exposition of per-agent totals."""
+        ledger = UsageLedger()
+        ledger.record(("acme", "support", "s1"), call_usage(tokens=42))
+
+        text = ledger.export_prometheus()
+
+        assert "# TYPE omnicoreagent_llm_total_tokens_total counter" in text
+        assert (
+            'omnicoreagent_llm_total_tokens_total{tenant="acme",agent="support"} 42'
+            in text
+        )
+
+
+class TestAgentUsageLimits:
+    """Tests for per-key limit enforcement in the ReAct loop."""
+
+    def run_agent(self, agent, tenant_id, session_id="s1"):
+        return asyncio.run(
+            agent.run(
+                system_prompt="system",
+                query="hello",
+                llm_connection=FakeLLM(),
+                add_message_to_history=add_message,
+                message_history=get_messages,
+                session_id=session_id,
+                tenant_id=tenant_id,
+            )
+        )
+
+    def test_request_limit_is_per_tenant(self):
+        """Test that one tenant exhausting its budget does not affect another."""
+        ledger = UsageLedger()
+        agent = ReactAgent(
+            AgentConfig(
+                agent_name="limited",
+                max_steps=5,
+                tool_call_timeout=5,
+                request_limit=1,
+                usage_limit_scope="tenant",
+            ),
+            usage_ledger=ledger,
+        )
+
+        assert self.run_agent(agent, "a")["answer"] == "done"
+        with pytest.raises(UsageLimitExceeded):
+            self.run_agent(agent, "a", session_id="s2")
+        assert self.run_agent(agent, "b")["answer"] == "done"
+
+        assert ledger.tenants()["a"].total_tokens == 15
+        assert ledger.tenants()["b"].total_tokens == 15
+
+    def test_invalid_scope_rejected(self):
+        """Test that AgentConfig validates usage_limit_scope."""
+        with pytest.raises(ValueError):
+            AgentConfig(
+                agent_name="x",
+                max_steps=5,
+                tool_call_timeout=5,
+                usage_limit_scope="process",
+            )
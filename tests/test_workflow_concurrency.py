@@ -0,0 +1,182 @@
+"""
+Tests for concurrent initialization, bounded concurrency and retry backoff in
+the workflow agents.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from omnicoreagent.omni_agent.workflow import utils as workflow_utils
+from omnicoreagent.omni_agent.workflow.parallel_agent import ParallelAgent
+from omnicoreagent.omni_agent.workflow.router_agent import RouterAgent
+from omnicoreagent.omni_agent.workflow.sequential_agent import SequentialAgent
+from omnicoreagent.omni_agent.workflow.utils import backoff_delay, gather_limited
+
+
+pytestmark = pytest.mark.usefixtures("isolated_cwd")
+
+
+class FakeAgent:
+    """Duck-typed sub-agent with slow MCP connects and runs."""
+
+    def __init__(self, name, delay=0.05, failures=0, tracker=None):
+        self.name = name
+        self.mcp_tools = [{"name": "server"}]
+        self.system_instruction = f"{name} instructions"
+        self.delay = delay
+        self.failures = failures
+        self.tracker = tracker if tracker is not None else {"now": 0, "peak": 0}
+        self.llm_connection = SimpleNamespace(llm_call=self.llm_call)
+
+    async def connect_mcp_servers(self):
+        await asyncio.sleep(self.delay)
+
+    async def cleanup(self):
+        await asyncio.sleep(self.delay)
+
+    async def list_all_available_tools(self):
+        return []
+
+    async def llm_call(self, messages):
+        await asyncio.sleep(self.delay)
+        return SimpleNamespace(
+            choices=[
+                SimpleNamespace(message=SimpleNamespace(content=f"{self.name} summary"))
+            ]
+        )
+
+    async def run(self, query, session_id=None):
+        self.tracker["now"] += 1
+        self.tracker["peak"] = max(self.tracker["peak"], self.tracker["now"])
+        try:
+            await asyncio.sleep(self.delay)
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("rate limited")
+            return {"response": f"{self.name}: {query}", "agent_name": self.name}
+        finally:
+            self.tracker["now"] -= 1
+
+
+def elapsed(coro_factory) -> float:
+    async def main():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await coro_factory()
+        return loop.time() - start
+
+    return asyncio.run(main())
+
+
+class TestHelpers:
+    """Tests for the shared workflow helpers."""
+
+    def test_gather_limited_keeps_order_and_limit(self):
+        """Test that results keep input order and the limit is respected."""
+        tracker = {"now": 0, "peak": 0}
+
+        async def job(i):
+            tracker["now"] += 1
+            tracker["peak"] = max(tracker["peak"], tracker["now"])
+            await asyncio.sleep(0.01 * (5 - i))
+            tracker["now"] -= 1
+            return i
+
+        results = asyncio.run(
+            gather_limited([lambda i=i: job(i) for i in range(5)], max_concurrency=2)
+        )
+
+        assert results == [0, 1, 2, 3, 4]
+        assert tracker["peak"] == 2
+
+    def test_backoff_delay_is_bounded(self):
+        """Test that jittered delays grow but stay within the cap."""
+        for attempt in range(1, 10):
+            delay = backoff_delay(attempt, base=0.5, max_delay=4.0)
+            assert 0 <= delay <= min(4.0, 0.5 * 2 ** (attempt - 1))
+        assert backoff_delay(3, base=0) == 0.0
+
+
+class TestConcurrentInitialization:
+    """Tests for concurrent MCP connects and capability summaries."""
+
+    def test_sequential_connects_concurrently(self):
+        """Test that SequentialAgent connects all sub-agents at once."""
+        agent = SequentialAgent([FakeAgent(f"a{i}") for i in range(6)])
+
+        assert elapsed(agent.initialize) < 0.2
+
+    def test_router_summarizes_concurrently(self):
+        """Test that RouterAgent connects and summarizes sub-agents concurrently."""
+        sub_agents = [FakeAgent(f"a{i}") for i in range(6)]
+        router = RouterAgent(
+            sub_agents=sub_agents,
+            model_config={"provider": "openai", "model": "gpt-4o-mini"},
+            agent_config={"max_steps": 5, "tool_call_timeout": 5},
+        )
+
+        # Each agent needs a connect plus an LLM call: 0.1s when concurrent.
+        assert elapsed(router.initialize) < 0.3
+        assert list(router.agent_registry) == [f"a{i}" for i in range(6)]
+        assert router.agent_registry["a3"] == "a3 summary"
+
+
+class TestParallelAgent:
+    """Tests for ParallelAgent limits and retries."""
+
+    def test_max_concurrency(self, monkeypatch):
+        """Test that at most max_concurrency sub-agents run at once."""
+        tracker = {"now": 0, "peak": 0}
+        agents = [FakeAgent(f"a{i}", delay=0.01, tracker=tracker) for i in range(6)]
+        parallel = ParallelAgent(agents, max_concurrency=2)
+
+        results = asyncio.run(parallel())
+
+        assert tracker["peak"] == 2
+        assert len(results) == 6
+
+    def test_retry_uses_backoff(self, monkeypatch):
+        """Test that a failed attempt is retried after a backoff delay."""
+        delays = []
+        monkeypatch.setattr(
+            workflow_utils.random, "uniform", lambda low, high: delays.append(high) or 0
+        )
+        parallel = ParallelAgent([FakeAgent("a", delay=0, failures=2)], max_retries=3)
+
+        results = asyncio.run(parallel(agent_tasks={"a": "hello"}))
+
+        assert results["a"]["response"] == "a: hello"
+        assert delays == [0.5, 1.0]
+
+    def test_backoff_releases_concurrency_slot(self, monkeypatch):
+        """Test that a sub-agent waiting to retry does not hold a slot."""
+        monkeypatch.setattr(workflow_utils.random, "uniform", lambda low, high: high)
+        started = []
+
+        class OrderedAgent(FakeAgent):
+            async def run(self, query, session_id=None):
+                started.append(self.name)
+                return await super().run(query, session_id)
+
+        parallel = ParallelAgent(
+            [
+                OrderedAgent("flaky", delay=0, failures=1),
+                OrderedAgent("steady", delay=0),
+            ],
+            max_concurrency=1,
+            retry_backoff=0.05,
+        )
+
+        results = asyncio.run(parallel())
+
+        assert started == ["flaky", "steady", "flaky"]
+        assert results["flaky"]["response"].startswith("flaky:")
+
+    def test_invalid_max_concurrency(self):
+        """Test that a non-positive limit is rejected."""
+        with pytest.raises(ValueError):
+            ParallelAgent([FakeAgent("a")], max_concurrency=0)
+        with pytest.raises(ValueError):
+            ParallelAgent([FakeAgent("a")], max_retries=0)